@@ -0,0 +1,170 @@
+from array import array
+
+# Per-team status codes kept in QuestionAnswers.status
+UNANSWERED = 0
+WRONG = 1
+CORRECT = 2
+
+TEXT_ANSWER = None  # Pass as the choice for answers stored as text (fill in the blank, unknown option)
+NO_ANSWER = -1  # Code for an empty slot; text answers are coded as -(text_id + 2)
+
+class QuestionAnswers:
+    """
+    Answers to one question, stored column-wise and indexed by team ordinal.
+
+    Multiple choice answers are kept as small option indices. Free-text
+    answers are interned per question, so each distinct text is stored once
+    and teams only hold its id. Answered/correct counts are maintained as
+    answers are recorded.
+    """
+    __slots__ = ('status', 'codes', 'times', 'texts', 'text_ids', 'answered_count', 'correct_count')
+
+    def __init__(self):
+        self.status = bytearray()  # UNANSWERED / WRONG / CORRECT
+        self.codes = array('i')  # Option index, NO_ANSWER, or -(text_id + 2)
+        self.times = array('f')  # Seconds from question start to answer
+        self.texts = []  # Distinct free-text answers, indexed by text_id
+        self.text_ids = {}  # answer text -> text_id
+        self.answered_count = 0
+        self.correct_count = 0
+
+    def _ensure(self, ordinal):
+        missing = ordinal + 1 - len(self.status)
+        if missing > 0:
+            # status goes last: lock-free readers check it before touching codes/times
+            self.codes.extend(array('i', [NO_ANSWER]) * missing)
+            self.times.extend(array('f', [0.0]) * missing)
+            self.status.extend(bytes(missing))
+
+    def _text_code(self, text):
+        try:
+            text_id = self.text_ids.get(text)
+        except TypeError:
+            # Unhashable answer payloads are stored without interning
+            self.texts.append(text)
+            return -(len(self.texts) - 1 + 2)
+        if text_id is None:
+            text_id = self.text_ids[text] = len(self.texts)
+            self.texts.append(text)
+        return -(text_id + 2)
+
+    def has_answered(self, ordinal):
+        return ordinal < len(self.status) and self.status[ordinal] != UNANSWERED
+
+    def record(self, ordinal, choice, text, correct, answer_time):
+        """Store a team's answer; choice is an option index or TEXT_ANSWER"""
+        if ordinal >= len(self.status):
+            self._ensure(ordinal)
+        self.codes[ordinal] = self._text_code(text) if choice is TEXT_ANSWER else choice
+        self.times[ordinal] = answer_time
+        # Publish the status only once the answer it describes is in place
+        self.status[ordinal] = CORRECT if correct else WRONG
+        self.answered_count += 1
+        if correct:
+            self.correct_count += 1
+
+    def clear(self, ordinal):
+        """Forget a team's answer (used when a team is deleted)"""
+        if not self.has_answered(ordinal):
+            return
+        self.answered_count -= 1
+        if self.status[ordinal] == CORRECT:
+            self.correct_count -= 1
+        self.status[ordinal] = UNANSWERED
+        self.codes[ordinal] = NO_ANSWER
+        self.times[ordinal] = 0.0
+
+    def remap_options(self, old_options, new_options):
+        """Re-code option answers after the question's options changed.
+        
+        Answers keep pointing at the same option text; an option that is gone
+        is kept as a text answer.
+        """
+        positions = {}
+        for index, option in enumerate(new_options):
+            positions.setdefault(option, index)
+        for ordinal, code in enumerate(self.codes):
+            if code >= 0:
+                option = old_options[code]
+                index = positions.get(option)
+                self.codes[ordinal] = self._text_code(option) if index is None else index
+
+    def answer(self, ordinal, options):
+        """The submitted answer as text, or None if the team has not answered"""
+        if not self.has_answered(ordinal):
+            return None
+        code = self.codes[ordinal]
+        if code <= -2:
+            return self.texts[-code - 2]
+        return options[code]
+
+    def is_correct(self, ordinal):
+        """True/False for answered teams, None otherwise"""
+        if not self.has_answered(ordinal):
+            return None
+        return self.status[ordinal] == CORRECT
+
+    def to_state(self):
+        """Compact picklable form used by game snapshots"""
+        return (bytes(self.status), self.codes.tobytes(), self.times.tobytes(), list(self.texts),
+                self.answered_count, self.correct_count)
+
+    @classmethod
+    def from_state(cls, state):
+        status, codes, times, texts, answered_count, correct_count = state
+        sheet = cls()
+        sheet.status = bytearray(status)
+        sheet.codes.frombytes(codes)
+        sheet.times.frombytes(times)
+        sheet.texts = texts
+        for text_id, text in enumerate(texts):
+            try:
+                sheet.text_ids.setdefault(text, text_id)
+            except TypeError:
+                pass
+        sheet.answered_count = answered_count
+        sheet.correct_count = correct_count
+        return sheet
+
+    def answer_time(self, ordinal):
+        if not self.has_answered(ordinal):
+            return None
+        return self.times[ordinal]
+
+class AnswerStore:
+    """Answers for every played question, keyed by question index"""
+
+    def __init__(self):
+        self.questions = {}  # question_index -> QuestionAnswers
+
+    def for_question(self, question_index):
+        sheet = self.questions.get(question_index)
+        if sheet is None:
+            sheet = self.questions[question_index] = QuestionAnswers()
+        return sheet
+
+    def get(self, question_index):
+        """QuestionAnswers for a question, or None if nobody has answered it"""
+        return self.questions.get(question_index)
+
+    def has_answered(self, question_index, ordinal):
+        sheet = self.questions.get(question_index)
+        return sheet is not None and sheet.has_answered(ordinal)
+
+    def answered_count(self, ordinal):
+        """Number of questions a team has answered"""
+        return sum(1 for sheet in self.questions.values() if sheet.has_answered(ordinal))
+
+    def to_state(self):
+        return {question_index: sheet.to_state() for question_index, sheet in self.questions.items()}
+
+    @classmethod
+    def from_state(cls, state):
+        store = cls()
+        store.questions = {question_index: QuestionAnswers.from_state(sheet_state)
+                           for question_index, sheet_state in state.items()}
+        return store
+
+    def clear_team(self, ordinal):
+        for sheet in self.questions.values():
+            sheet.clear(ordinal)
@@ -1,17 +1,177 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+# eventlet and gevent have to patch the standard library before anything else imports it
+import async_mode
+async_mode.monkey_patch()
+
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, g, abort
 from flask_socketio import SocketIO, emit, join_room, leave_room
+from werkzeug.local import LocalProxy
+from functools import partial
 import json
 import os
 import base64
+import threading
+import time
 from datetime import datetime
-from trivia_parser import TriviaParser
-from models import TriviaGame
+from question_bank import QuestionBank, load_bank
+from question_dedupe import DedupeIndex
+from question_pack import load_pack
+from question_search import QuestionSearch
+from question_reloader import QuestionReloader
+from models import TriviaGame, question_positions
+from game_registry import GameRegistry, DEFAULT_GAME_CODE
+from fanout import emit_to_room
+import serializer
+from icon_store import IconStore, decode_data_url, icon_url
+from score_feed import ScoreboardFeed
+from journal import GameJournal
+from storage import SQLiteStorage
+from traffic import TrafficRecorder
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'trivia-secret-key'
-socketio = SocketIO(app, cors_allowed_origins="*")
-
-game = TriviaGame()
+# jsonify and Socket.IO packets go through the configured encoder (orjson when installed, see serializer.py)
+app.json = serializer.JSONProvider(app)
+socketio = SocketIO(app, cors_allowed_origins="*", json=serializer, serializer=serializer.SOCKET_PACKETS,
+                    async_mode=async_mode.ASYNC_MODE)
+
+# Serving: TRIVIA_ASYNC_MODE picks threading, eventlet or gevent (see async_mode.py)
+HOST = os.environ.get('TRIVIA_HOST', '0.0.0.0')
+PORT = int(os.environ.get('TRIVIA_PORT') or 5001)
+# Debug (reloader and debugger) only when asked for
+DEBUG = os.environ.get('TRIVIA_DEBUG') == '1'
+# Simultaneous connections the eventlet server accepts (its own default is 1,024); gevent has no limit
+MAX_CONNECTIONS = int(os.environ.get('TRIVIA_MAX_CONNECTIONS') or 10000)
+# Optional caps on teams per room and players per team for rooms other than the default one
+MAX_TEAMS_PER_GAME = int(os.environ.get('TRIVIA_MAX_TEAMS') or 0) or None
+MAX_PLAYERS_PER_TEAM = int(os.environ.get('TRIVIA_MAX_PLAYERS_PER_TEAM') or 0) or None
+# Serialized responses kept per game for the versioned (ETag) endpoints
+RESPONSE_CACHE_SIZE = 256
+
+# When set, every game journals its state here and is recovered after a restart
+DATA_DIR = os.environ.get('TRIVIA_DATA_DIR')
+# When set, teams, answers and scores of every game are also kept in this SQLite database
+DB_PATH = os.environ.get('TRIVIA_DB')
+storage = SQLiteStorage(DB_PATH) if DB_PATH else None
+# Team icon thumbnails; kept next to the journals (in a name no game code can take) so recovered games keep their icons
+icon_store = IconStore(os.path.join(DATA_DIR, '.icons') if DATA_DIR else None)
+# Question bank: a markdown file, a directory of markdown files, or a glob
+QUESTIONS_SOURCE = os.environ.get('TRIVIA_QUESTIONS', 'questions.md')
+# When set (a Jaccard similarity such as 0.8), near-duplicate questions are dropped from multi-file banks
+DEDUPE_THRESHOLD = float(os.environ.get('TRIVIA_DEDUPE') or 0) or None
+# When set, edits to the question files are picked up while the server runs
+RELOAD_QUESTIONS = os.environ.get('TRIVIA_RELOAD_QUESTIONS') == '1'
+# When set, every HTTP request and socket event is recorded to this file for traffic.py to replay
+RECORD_PATH = os.environ.get('TRIVIA_RECORD')
+if RECORD_PATH:
+    TrafficRecorder(RECORD_PATH, metadata={'questions': QUESTIONS_SOURCE}).install(app, socketio)
+
+def create_room_game(game_code):
+    """Factory used by the registry for every new game room"""
+    room_game = TriviaGame()
+    room_game.game_code = game_code
+    setup_timer_callbacks(room_game)
+    # Score changes reach clients as coalesced scoreboard diffs
+    room = game_room(game_code)
+    room_game.score_feed = ScoreboardFeed(
+        room_game, lambda event, data: emit_to_room(socketio.server, event, data, room))
+    if storage is not None:
+        # A journaled game carries on with its database record after a restart
+        storage.open_game(game_code, resume=bool(DATA_DIR))
+        room_game.storage = storage
+    if DATA_DIR:
+        # Questions first: replayed answers are graded against them
+        room_game.load_questions(registry.questions)
+        room_game.question_bank = registry.question_bank
+        replayed = room_game.attach_journal(GameJournal(os.path.join(DATA_DIR, game_code)))
+        if replayed or room_game.teams:
+            print(f"Recovered game {game_code}: {len(room_game.teams)} teams, {replayed} journal events replayed")
+    return room_game
+
+registry = GameRegistry(game_factory=create_room_game, max_teams_per_game=MAX_TEAMS_PER_GAME,
+                        max_players_per_team=MAX_PLAYERS_PER_TEAM)
+
+def current_game_code():
+    """Resolve the game for this request: /games/<code>/ prefix, ?game=<code>, then the session"""
+    game_code = g.get('game_code') or request.args.get('game')
+    if game_code:
+        if game_code not in registry:
+            abort(404)
+        return game_code
+    
+    game_code = session.get('game_code')
+    if game_code and game_code in registry:
+        return game_code
+    return DEFAULT_GAME_CODE
+
+def get_current_game():
+    if 'game' not in g:
+        game_code = current_game_code()
+        g.game = registry.get_default() if game_code == DEFAULT_GAME_CODE else registry.get(game_code)
+    return g.game
+
+# The game for the current request; lets route code keep using `game.` directly
+game = LocalProxy(get_current_game)
+
+def game_room(game_code):
+    """Socket.IO room shared by every client of one game"""
+    return f'game:{game_code}'
+
+def broadcast(event, *args):
+    """Emit an event to every client connected to the current game"""
+    socketio.emit(event, *args, room=game_room(game.game_code))
+
+def broadcast_game_status():
+    """Broadcast the game status summary; admins fetch the per-team answer list over REST"""
+    broadcast('game_status_update', game.get_game_status(include_team_answers=False))
+
+def page_args(total):
+    """offset and limit query arguments clamped to a list of total items; limit None means the rest"""
+    offset = min(max(0, request.args.get('offset', 0, type=int)), total)
+    limit = request.args.get('limit', None, type=int)
+    if limit is not None and limit >= total - offset:
+        limit = None
+    return offset, limit if limit is None else max(0, limit)
+
+def versioned_json(key, version, build):
+    """JSON response for one version of a resource of the current game.
+
+    Clients that send the version's ETag get a 304 without the game being
+    read; otherwise the body built for this version is reused.
+    """
+    etag = f'{game.version_epoch}-{version}'
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        cache = game.response_cache
+        cached = cache.get(key)
+        if cached is None or cached[0] != etag:
+            # The version was read before building, so a body is never older than its ETag
+            cached = cache[key] = (etag, jsonify(build()).get_data())
+            # Keys carry client-chosen paging, so only the most recently used ones are kept
+            while len(cache) > RESPONSE_CACHE_SIZE:
+                try:
+                    cache.popitem(last=False)
+                except KeyError:
+                    break  # Emptied by another request
+        else:
+            try:
+                cache.move_to_end(key)
+            except KeyError:
+                pass  # Evicted by another request meanwhile
+        response = app.response_class(cached[1], mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'  # Always revalidate; a 304 is cheap
+    return response
+
+@app.context_processor
+def socket_client():
+    # The msgpack packet format needs the matching build of the Socket.IO client
+    return {'socketio_client_js': serializer.SOCKET_CLIENT_JS}
+
+@app.url_value_preprocessor
+def pull_game_code(endpoint, values):
+    if values and 'game_code' in values:
+        g.game_code = values.pop('game_code')
 
 # Team validation helper
 def validate_team_membership():
@@ -57,51 +217,40 @@ def invalidate_player_sessions(affected_players):
     pass
 
 # Helper function to emit question updates to all teams
-def emit_question_to_all_teams():
-    """Emit the current question to all teams with their specific answer status"""
-    base_question = game.get_current_question()
-    if not base_question:
+def attach_team_icon(room_game, team_id, icon_data):
+    """Process an uploaded icon in the background and give it to the team once it is stored"""
+    def on_ready(icon_hash):
+        if room_game.set_team_icon(team_id, icon_url(icon_hash))['success']:
+            socketio.emit('teams_update', room_game.get_teams(), room=game_room(room_game.game_code))
+    icon_store.submit(icon_data, on_ready)
+
+def emit_question_to_all_teams(room_game=None):
+    """Broadcast the current question once to the whole game; teams that already answered get a small delta"""
+    # Outside a request (e.g. a question reload) the game is passed in explicitly
+    game = room_game if room_game is not None else get_current_game()
+    question, deltas = game.get_question_broadcast()
+    if question is None:
         return
-    
-    for team_id in game.teams:
-        team_question = base_question.copy()
-        current_index = game.current_question_index
-        team_question['already_answered'] = game.has_team_answered_question(team_id, current_index)
-        
-        if team_question['already_answered']:
-            team_question['submitted_answer'] = game.get_team_answer(team_id, current_index)
-        
-        # Add timer information if game is active
-        if game.game_started and not game.game_paused:
-            time_remaining = game.get_time_remaining()
-            if time_remaining is not None and time_remaining > 0:
-                team_question['timer'] = {
-                    'time_remaining': time_remaining,
-                    'bonus_points': game.get_bonus_points(60 - time_remaining),
-                    'total_time': game.question_timer_duration
-                }
-        
-        # Emit to specific team
-        socketio.emit('new_question', team_question, room=team_id)
+    emit_to_room(socketio.server, 'new_question', question, game_room(game.game_code))
+    for team_id, delta in deltas.items():
+        socketio.emit('question_state', delta, room=team_id)
 
 # Timer callback functions for WebSocket synchronization
-def timer_update_callback(time_remaining, bonus_points):
-    """Called every second during question timer countdown"""
-    socketio.emit('timer_update', {
-        'time_remaining': time_remaining,
-        'bonus_points': bonus_points,
-        'expired': False
-    })
+def timer_update_callback(room, timer):
+    """Called when a question timer starts or resumes and at every bonus tier boundary"""
+    # Carries the deadline and bonus schedule; clients count down locally in between
+    socketio.emit('timer_update', dict(timer, expired=False), room=room)
 
-def timer_expired_callback():
+def timer_expired_callback(room):
     """Called when question timer expires"""
-    socketio.emit('timer_expired')
+    socketio.emit('timer_expired', room=room)
 
 # Register timer callbacks for WebSocket synchronization
-def setup_timer_callbacks():
+def setup_timer_callbacks(room_game):
     """Setup timer callbacks for WebSocket synchronization"""
-    game.timer_callbacks = [timer_update_callback]
-    game.timer_expired_callbacks = [timer_expired_callback]
+    room = game_room(room_game.game_code)
+    room_game.timer_callbacks = [partial(timer_update_callback, room)]
+    room_game.timer_expired_callbacks = [partial(timer_expired_callback, room)]
 
 # Admin authentication decorator
 def admin_required(f):
@@ -113,17 +262,70 @@ def admin_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def build_question_search(questions):
+    """Index the bank for admin search on a background thread; the previous index serves until then"""
+    def build():
+        # Indexing is CPU work a green thread would not give up
+        search = async_mode.run_blocking(QuestionSearch, questions)
+        if registry.questions is questions:  # Not replaced by a newer reload meanwhile
+            registry.question_search = search
+    threading.Thread(target=build, name='question-search', daemon=True).start()
+
+# Kept between reloads, so a reload only compares the questions it changed
+dedupe_index = DedupeIndex(DEDUPE_THRESHOLD) if DEDUPE_THRESHOLD else None
+
+def dedupe_bank(questions):
+    """Drop near-duplicates from a multi-file bank when TRIVIA_DEDUPE is set"""
+    if dedupe_index is None or os.path.isfile(QUESTIONS_SOURCE):
+        return questions
+    questions, clusters = dedupe_index.update(questions)
+    print(f"Dropped {sum(len(members) - 1 for members in clusters)} near-duplicate questions")
+    return questions
+
+def reload_questions(questions):
+    """Swap a reloaded question bank into every game still playing the previous one"""
+    questions = dedupe_bank(questions)
+    old_questions, old_bank = registry.questions, registry.question_bank
+    registry.questions = questions
+    if registry.question_bank is not None:
+        registry.question_bank = QuestionBank(questions)
+    search = registry.question_search
+    if search is not None:
+        # Only the postings of changed questions are touched; searches see the old or the new list
+        search.update(questions)
+    else:
+        build_question_search(questions)
+    positions = question_positions(questions)
+    for room_game in list(registry.games.values()):
+        current_question = room_game.get_current_question()
+        # Assembling samples indices from the registry's bank, so every game must resolve them against it
+        room_game.swap_question_bank(old_bank, registry.question_bank)
+        if room_game.swap_questions(old_questions, questions, positions):
+            if room_game.game_started and room_game.get_current_question() != current_question:
+                emit_question_to_all_teams(room_game)
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
+@app.route('/join/<code>')
+def join_game(code):
+    """Entry link for a game room: remember the game code and show team selection"""
+    if code not in registry:
+        abort(404)
+    if session.get('game_code') != code:
+        session.pop('team_id', None)
+        session.pop('player_name', None)
+    session['game_code'] = code
+    return redirect(url_for('index'))
+
 @app.route('/responsive-test')
 def responsive_test():
     return render_template('responsive_test.html')
 
 @app.route('/api/teams')
 def get_teams():
-    return jsonify(game.get_teams())
+    return versioned_json(('teams',), f't{game.teams_version}', game.get_teams)
 
 @app.route('/api/teams', methods=['POST'])
 def create_team():
@@ -132,27 +334,37 @@ def create_team():
     player_name = data.get('player_name')
     team_icon = data.get('team_icon')  # Base64 encoded image data
     
-    # Validate and process the icon if provided
-    processed_icon = None
+    # Cheap checks here; decoding and downscaling happen on the icon workers
+    icon_data = None
     if team_icon:
         try:
-            # Validate that it's a proper base64 image
-            if team_icon.startswith('data:image/'):
-                processed_icon = team_icon
-            else:
-                return jsonify({'success': False, 'error': 'Invalid image format'}), 400
-        except Exception as e:
-            return jsonify({'success': False, 'error': 'Invalid image data'}), 400
+            icon_data = decode_data_url(team_icon)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
     
-    result = game.create_team(team_name, player_name, icon=processed_icon)
+    result = game.create_team(team_name, player_name)
     
     if result['success']:
+        if icon_data is not None:
+            attach_team_icon(get_current_game(), result['team_id'], icon_data)
         session['team_id'] = result['team_id']
         session['player_name'] = player_name
+        session['game_code'] = game.game_code
         return jsonify({'team_id': result['team_id'], 'success': True})
     else:
         return jsonify({'success': False, 'error': result['error']}), 400
 
+@app.route('/icons/<icon_hash>')
+def get_icon(icon_hash):
+    thumbnail = icon_store.get(icon_hash)
+    if thumbnail is None:
+        abort(404)
+    # The URL is the content hash, so the response never changes
+    response = app.response_class(thumbnail, mimetype='image/png')
+    response.set_etag(icon_hash)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response.make_conditional(request)
+
 @app.route('/api/teams/<team_id>/join', methods=['POST'])
 def join_team(team_id):
     data = request.json
@@ -163,6 +375,7 @@ def join_team(team_id):
     if result['success']:
         session['team_id'] = team_id
         session['player_name'] = player_name
+        session['game_code'] = game.game_code
         return jsonify({'success': True})
     else:
         return jsonify({'success': False, 'error': result['error']}), 400
@@ -182,7 +395,7 @@ def leave_team():
         session.pop('player_name', None)
         
         # Emit team update to all clients
-        socketio.emit('teams_update', game.get_teams())
+        broadcast('teams_update', game.get_teams())
         
         return jsonify({'success': True})
     else:
@@ -216,28 +429,14 @@ def game_page():
 @team_required
 def get_current_question():
     team_id = session.get('team_id')
-    question_data = game.get_current_question()
-    
-    if question_data and team_id:
-        # Add team-specific information
-        current_index = game.current_question_index
-        question_data['already_answered'] = game.has_team_answered_question(team_id, current_index)
-        
-        if question_data['already_answered']:
-            # Include the team's submitted answer
-            question_data['submitted_answer'] = game.get_team_answer(team_id, current_index)
-        
-        # Add timer information
-        if game.game_started and not game.game_paused:
-            time_remaining = game.get_time_remaining()
-            if time_remaining is not None and time_remaining > 0:
-                question_data['timer'] = {
-                    'time_remaining': time_remaining,
-                    'bonus_points': game.get_bonus_points(60 - time_remaining),
-                    'total_time': game.question_timer_duration
-                }
-    
-    return jsonify(question_data)
+    # Payloads carry the countdown in whole seconds, so a running timer moves the version too
+    version = f'q{game.question_version}.s{game.scores_version}.r{game.get_time_remaining()}'
+    return versioned_json(('question', team_id), version, lambda: build_team_question(team_id))
+
+def build_team_question(team_id):
+    if not team_id:
+        return game.get_current_question()
+    return game.get_team_question(team_id)
 
 @app.route('/api/answer', methods=['POST'])
 @team_required
@@ -246,22 +445,35 @@ def submit_answer():
     team_id = session.get('team_id')
     answer = data.get('answer')
     
+    # Clients get the new score with the game's next coalesced score_update diff
     result = game.submit_answer(team_id, answer)
-    
-    # Emit score update to all clients
-    socketio.emit('score_update', game.get_scoreboard())
-    
     return jsonify(result)
 
 @app.route('/api/scoreboard')
 def get_scoreboard():
-    return jsonify(game.get_scoreboard())
+    # Optional paging: /api/scoreboard?offset=0&limit=10
+    offset, limit = page_args(len(game.teams))
+    return versioned_json(('scoreboard', offset, limit), f't{game.teams_version}.s{game.scores_version}',
+                          lambda: game.get_scoreboard(offset=offset, limit=limit))
+
+@app.route('/api/scoreboard/rank/<team_id>')
+def get_team_rank(team_id):
+    rank = game.get_team_rank(team_id)
+    if rank is None:
+        return jsonify({'success': False, 'error': 'Team not found'}), 404
+    return jsonify({
+        'success': True,
+        'team_id': team_id,
+        'rank': rank,
+        'score': game.teams[team_id].score,
+        'teams_total': len(game.teams)
+    })
 
 @app.route('/api/next_question', methods=['POST'])
 def next_question():
     game.next_question()
     emit_question_to_all_teams()
-    socketio.emit('game_status_update', game.get_game_status())
+    broadcast_game_status()
     return jsonify({'success': True})
 
 @app.route('/admin/login')
@@ -291,7 +503,13 @@ def admin_panel():
 @app.route('/admin/api/status')
 @admin_required
 def admin_get_status():
-    return jsonify(game.get_game_status())
+    # Optional paging of the per-team answer list: ?offset=0&limit=50 (team_answers=0 to omit it)
+    include_team_answers = request.args.get('team_answers', '1') != '0'
+    offset, limit = page_args(len(game.teams))
+    return versioned_json(('status', include_team_answers, offset, limit),
+                          f'g{game.status_version}.r{game.get_time_remaining()}',
+                          lambda: game.get_game_status(include_team_answers=include_team_answers,
+                                                       offset=offset, limit=limit))
 
 @app.route('/admin/api/game/start', methods=['POST'])
 @admin_required
@@ -300,7 +518,7 @@ def admin_start_game():
     if result['success']:
         # Start timer for first question
         game.start_question_timer()
-        socketio.emit('game_status_update', game.get_game_status())
+        broadcast_game_status()
         emit_question_to_all_teams()
     return jsonify(result)
 
@@ -309,8 +527,8 @@ def admin_start_game():
 def admin_stop_game():
     result = game.stop_game()
     if result['success']:
-        socketio.emit('game_status_update', game.get_game_status())
-        socketio.emit('game_stopped', {'scoreboard': game.get_scoreboard()})
+        broadcast_game_status()
+        broadcast('game_stopped', {'scoreboard': game.get_scoreboard()})
     return jsonify(result)
 
 @app.route('/admin/api/game/pause', methods=['POST'])
@@ -318,8 +536,8 @@ def admin_stop_game():
 def admin_pause_game():
     result = game.pause_game()
     if result['success']:
-        socketio.emit('game_status_update', game.get_game_status())
-        socketio.emit('game_paused', {'message': 'Game has been paused by the administrator'})
+        broadcast_game_status()
+        broadcast('game_paused', {'message': 'Game has been paused by the administrator'})
     return jsonify(result)
 
 @app.route('/admin/api/game/resume', methods=['POST'])
@@ -327,8 +545,8 @@ def admin_pause_game():
 def admin_resume_game():
     result = game.resume_game()
     if result['success']:
-        socketio.emit('game_status_update', game.get_game_status())
-        socketio.emit('game_resumed', {'message': 'Game has been resumed'})
+        broadcast_game_status()
+        broadcast('game_resumed', {'message': 'Game has been resumed'})
         emit_question_to_all_teams()
     return jsonify(result)
 
@@ -340,7 +558,7 @@ def admin_next_question():
         # Start timer for new question
         game.start_question_timer()
         emit_question_to_all_teams()
-        socketio.emit('game_status_update', game.get_game_status())
+        broadcast_game_status()
         return jsonify({'success': True})
     else:
         return jsonify({'success': False, 'error': 'No more questions available'})
@@ -355,7 +573,7 @@ def admin_set_question():
         # Start timer for new question
         game.start_question_timer()
         emit_question_to_all_teams()
-        socketio.emit('game_status_update', game.get_game_status())
+        broadcast_game_status()
     return jsonify(result)
 
 @app.route('/admin/api/teams/<team_id>/name', methods=['PUT'])
@@ -368,7 +586,7 @@ def admin_update_team_name(team_id):
     
     if result['success']:
         # Emit team update to all clients
-        socketio.emit('teams_update', game.get_teams())
+        broadcast('teams_update', game.get_teams())
     
     return jsonify(result)
 
@@ -382,7 +600,7 @@ def admin_add_player(team_id):
     
     if result['success']:
         # Emit team update to all clients
-        socketio.emit('teams_update', game.get_teams())
+        broadcast('teams_update', game.get_teams())
     
     return jsonify(result)
 
@@ -393,7 +611,7 @@ def admin_remove_player(team_id, player_name):
     
     if result['success']:
         # Emit team update to all clients
-        socketio.emit('teams_update', game.get_teams())
+        broadcast('teams_update', game.get_teams())
     
     return jsonify(result)
 
@@ -404,28 +622,200 @@ def admin_delete_team(team_id):
     
     if result['success']:
         # Emit team update to all clients
-        socketio.emit('teams_update', game.get_teams())
+        broadcast('teams_update', game.get_teams())
     
     return jsonify(result)
 
+@app.route('/admin/api/games')
+@admin_required
+def admin_list_games():
+    return jsonify(registry.list_games())
+
+@app.route('/admin/api/games', methods=['POST'])
+@admin_required
+def admin_create_game():
+    data = request.json or {}
+    result = registry.create_game(data.get('game_code'))
+    if result['success']:
+        session['game_code'] = result['game_code']
+    return jsonify(result)
+
+@app.route('/admin/api/games/<code>/select', methods=['POST'])
+@admin_required
+def admin_select_game(code):
+    if code not in registry:
+        return jsonify({'success': False, 'error': 'Game not found'}), 404
+    session['game_code'] = code
+    return jsonify({'success': True, 'game_code': code})
+
+@app.route('/admin/api/games/<code>', methods=['DELETE'])
+@admin_required
+def admin_delete_game(code):
+    if code == DEFAULT_GAME_CODE:
+        return jsonify({'success': False, 'error': 'The default game cannot be deleted'}), 400
+    if not registry.remove_game(code):
+        return jsonify({'success': False, 'error': 'Game not found'}), 404
+    socketio.emit('game_stopped', {'scoreboard': []}, room=game_room(code))
+    return jsonify({'success': True})
+
+@app.route('/admin/api/questions/facets')
+@admin_required
+def admin_question_facets():
+    if registry.question_bank is None:
+        return jsonify({'success': False, 'error': 'No question bank loaded'}), 404
+    return jsonify(registry.question_bank.facets())
+
+@app.route('/admin/api/questions/assemble', methods=['POST'])
+@admin_required
+def admin_assemble_questions():
+    """Pick this game's questions from the bank, e.g. {"count": 20, "mixed_difficulty": true, "exclude_recent": 5}"""
+    bank = registry.question_bank
+    if bank is None:
+        return jsonify({'success': False, 'error': 'No question bank loaded'}), 404
+    data = request.json or {}
+    count = data.get('count', 20)
+    if not isinstance(count, int) or not 1 <= count <= 1000:
+        return jsonify({'success': False, 'error': 'count must be between 1 and 1000'}), 400
+    exclude_recent = data.get('exclude_recent', 0)
+    if not isinstance(exclude_recent, int) or exclude_recent < 0:
+        return jsonify({'success': False, 'error': 'exclude_recent must be a number of games, 0 or more'}), 400
+    for name in ('categories', 'difficulties', 'tags'):
+        values = data.get(name)
+        if values is not None and not (isinstance(values, list) and all(isinstance(v, str) for v in values)):
+            return jsonify({'success': False, 'error': f'{name} must be a list of strings'}), 400
+    indices = bank.sample(count, categories=data.get('categories'), difficulties=data.get('difficulties'),
+                          tags=data.get('tags'), mixed_difficulty=bool(data.get('mixed_difficulty')),
+                          exclude_recent=exclude_recent)
+    if not indices:
+        return jsonify({'success': False, 'error': 'No questions match these filters'}), 400
+    result = game.use_question_set(indices)
+    if result['success']:
+        bank.remember(indices)
+        broadcast_game_status()
+    return jsonify(result)
+
+@app.route('/admin/api/questions/search')
+@admin_required
+def admin_search_questions():
+    """Find bank questions by words in their text, options or answer, e.g. ?q=capital fra*&offset=0&limit=20"""
+    search = registry.question_search
+    if search is None:
+        if registry.questions:
+            return jsonify({'success': False, 'error': 'Question search is still being indexed'}), 503
+        return jsonify({'success': False, 'error': 'No question bank loaded'}), 404
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'success': False, 'error': 'q is required'}), 400
+    offset = max(0, request.args.get('offset', 0, type=int))
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    with search.lock:
+        indices, has_more = search.search(query, offset=offset, limit=limit)
+        questions = search.questions  # The list the indices refer to
+    # Still on a bank a reload has replaced: its questions can't be matched to this game's
+    stale = questions is not registry.questions
+
+    # Number to pass to /admin/api/set_question, if the question is part of this game
+    if stale:
+        positions = {}
+    elif game.question_set is not None:
+        positions = {index: position for position, index in enumerate(game.question_set)}
+    elif game.questions is questions:
+        positions = None
+    else:
+        positions = {}
+    results = []
+    for index in indices:
+        result = questions[index].to_dict(include_answer=True)
+        position = index if positions is None else positions.get(index)
+        result['index'] = index
+        result['question_number'] = position + 1 if position is not None else None
+        results.append(result)
+    return jsonify({'success': True, 'results': results, 'offset': offset, 'limit': limit,
+                    'has_more': has_more, 'stale': stale})
+
+@app.route('/admin/api/history')
+@admin_required
+def admin_history():
+    if storage is None:
+        return jsonify({'success': False, 'error': 'Game history requires TRIVIA_DB'}), 404
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify(storage.list_games(limit=max(1, min(limit, 500))))
+
+@app.route('/admin/api/history/<int:game_id>')
+@admin_required
+def admin_history_game(game_id):
+    if storage is None:
+        return jsonify({'success': False, 'error': 'Game history requires TRIVIA_DB'}), 404
+    return jsonify(storage.game_results(game_id))
+
 @socketio.on('connect')
 def on_connect():
+    join_room(game_room(game.game_code))
     if 'team_id' in session:
         join_room(session['team_id'])
 
+@socketio.on('scoreboard_snapshot')
+def on_scoreboard_snapshot():
+    """Full scoreboard and its version, for clients that are new or missed a score_update"""
+    score_feed = game.score_feed
+    if score_feed is None:
+        # The game was shut down (or never got a feed); there is nothing to sync to
+        return {'version': 0, 'teams': []}
+    return score_feed.snapshot()
+
+@socketio.on('clock_sync')
+def on_clock_sync(client_time=None):
+    """Clock-offset handshake: the ack carries our clock so the client can estimate its offset"""
+    return {'client_time': client_time, 'server_time': round(time.time() * 1000)}
+
 @socketio.on('disconnect')
 def on_disconnect():
+    leave_room(game_room(game.game_code))
     if 'team_id' in session:
         leave_room(session['team_id'])
 
+# Every game API route is also served under /games/<game_code>/... so clients can address a room directly
+for rule in list(app.url_map.iter_rules()):
+    if (rule.rule.startswith(('/api/', '/admin/api/'))
+            and not rule.rule.startswith(('/admin/api/games', '/admin/api/history'))):
+        app.add_url_rule('/games/<game_code>' + rule.rule, endpoint=rule.endpoint, methods=rule.methods)
+
+def load_question_bank(reloader=None):
+    """Load QUESTIONS_SOURCE into the registry: a single file, or a directory / glob of category files.
+    
+    With a reloader the bank is its question list, so games can follow
+    questions through later reloads.
+    """
+    if reloader is not None:
+        questions = dedupe_bank(reloader.load())
+    elif os.path.isfile(QUESTIONS_SOURCE):
+        # Compiled once into <file>.pack and memory-mapped on later starts
+        questions = load_pack(QUESTIONS_SOURCE)
+    else:
+        questions = dedupe_bank(load_bank(QUESTIONS_SOURCE))
+    if questions:
+        registry.questions = questions
+        registry.question_bank = QuestionBank(questions)
+        build_question_search(questions)
+        # New games (the default one included) get the bank when they are built
+        registry.get_default()
+
 if __name__ == '__main__':
-    # Setup timer callbacks for WebSocket synchronization
-    setup_timer_callbacks()
+    reloader = None
+    if RELOAD_QUESTIONS:
+        reloader = QuestionReloader(QUESTIONS_SOURCE, reload_questions,
+                                    category_from_file=not os.path.isfile(QUESTIONS_SOURCE))
+    load_question_bank(reloader)
+    if reloader is not None:
+        reloader.start()
     
-    # Load questions from markdown file
-    if os.path.exists('questions.md'):
-        parser = TriviaParser('questions.md')
-        questions = parser.parse()
-        game.load_questions(questions)
+    # Recover every journaled game from the last run
+    if DATA_DIR and os.path.isdir(DATA_DIR):
+        for game_code in sorted(os.listdir(DATA_DIR)):
+            if not game_code.startswith('.') and game_code not in registry:
+                registry.create_game(game_code)
     
-    socketio.run(app, debug=True, host='0.0.0.0', port=5001, allow_unsafe_werkzeug=True)
\ No newline at end of file
+    print(f"Serving on {HOST}:{PORT} ({async_mode.ASYNC_MODE}{', debug' if DEBUG else ''})")
+    # Werkzeug only serves the threading mode; eventlet and gevent bring their own servers
+    server_options = {'max_size': MAX_CONNECTIONS} if async_mode.ASYNC_MODE == 'eventlet' else {}
+    socketio.run(app, debug=DEBUG, host=HOST, port=PORT, allow_unsafe_werkzeug=True, **server_options)
\ No newline at end of file
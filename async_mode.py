@@ -0,0 +1,41 @@
+"""
+How the server runs concurrent work.
+
+TRIVIA_ASYNC_MODE selects it: 'threading' (the default: Werkzeug's
+threaded server, one OS thread per connection), 'eventlet' or 'gevent'.
+With eventlet or gevent every connection, the timer wheel and every
+background thread is a green thread, so thousands of websockets share one
+OS thread. That only works if the standard library is patched before
+anything else imports it, which is why app.py calls monkey_patch() first.
+
+Green threads only switch at I/O, so work that holds on to the CPU or to
+the disk in C code (image decoding, fsync, SQLite) goes through
+run_blocking(), which hands it to a native thread while the others carry on.
+"""
+
+import os
+
+ASYNC_MODES = ('threading', 'eventlet', 'gevent')
+ASYNC_MODE = os.environ.get('TRIVIA_ASYNC_MODE') or 'threading'
+
+if ASYNC_MODE not in ASYNC_MODES:
+    raise ValueError(f"TRIVIA_ASYNC_MODE must be one of {', '.join(ASYNC_MODES)}, not {ASYNC_MODE!r}")
+
+def monkey_patch():
+    """Make sockets, threads, locks and sleeps cooperative for the selected mode"""
+    if ASYNC_MODE == 'eventlet':
+        import eventlet
+        eventlet.monkey_patch()
+    elif ASYNC_MODE == 'gevent':
+        from gevent import monkey
+        monkey.patch_all()
+
+def run_blocking(fn, *args):
+    """Call fn(*args) on a native thread without stalling other green threads; a plain call when threading"""
+    if ASYNC_MODE == 'eventlet':
+        from eventlet import tpool
+        return tpool.execute(fn, *args)
+    if ASYNC_MODE == 'gevent':
+        import gevent
+        return gevent.get_hub().threadpool.apply(fn, args)
+    return fn(*args)
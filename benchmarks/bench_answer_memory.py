@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for answer storage
+Measures (with tracemalloc) 20k teams x 100 questions of answers kept in the
+compact per-question arrays of AnswerStore, against the previous layout: an
+answers dict on every team plus a nested {question_index: {team_id: seconds}}
+dict of answer times. Also reports the cost of the Team objects themselves.
+"""
+
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from answer_store import AnswerStore, TEXT_ANSWER
+from models import Team, Question
+
+TEAMS = 20000
+QUESTIONS = 100
+
+def build_questions():
+    questions = []
+    for i in range(QUESTIONS):
+        if i % 2:
+            questions.append(Question(f'Question {i}', 'fill_in_blank', [], f'answer {i}'))
+        else:
+            questions.append(Question(f'Question {i}', 'multiple_choice',
+                                      ['Alpha', 'Bravo', 'Charlie', 'Delta'], 'Charlie'))
+    return questions
+
+def submitted_answers(question, rng):
+    """One submitted answer per team"""
+    if question.question_type == 'multiple_choice':
+        return [rng.choice(question.options) for _ in range(TEAMS)]
+    choices = [question.correct_answer, 'no idea', 'something else']
+    return [rng.choice(choices) for _ in range(TEAMS)]
+
+def build_store(questions, answers):
+    store = AnswerStore()
+    rng = random.Random(1)
+    for question_index, question in enumerate(questions):
+        sheet = store.for_question(question_index)
+        for ordinal, answer in enumerate(answers[question_index]):
+            choice = question.option_index(answer)
+            sheet.record(ordinal, TEXT_ANSWER if choice is None else choice, answer,
+                         answer == question.correct_answer, rng.random() * 60)
+    return store
+
+def build_dicts(questions, answers):
+    """The previous layout, reproduced with plain dicts"""
+    rng = random.Random(1)
+    team_answers = {f'team-{i}': {} for i in range(TEAMS)}
+    answer_times = {}
+    for question_index in range(len(questions)):
+        times = answer_times[question_index] = {}
+        column = answers[question_index]
+        for ordinal, (team_id, team_dict) in enumerate(team_answers.items()):
+            team_dict[question_index] = column[ordinal]
+            times[team_id] = rng.random() * 60
+    return team_answers, answer_times
+
+class DictTeam:
+    """Team as it was before __slots__"""
+    def __init__(self, name):
+        self.id = name
+        self.name = name
+        self.icon = None
+        self.players = [name]
+        self.player_keys = {name.lower()}
+        self.score = 0
+        self.answers = {}
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    state = build()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+    start = time.perf_counter()
+    gc.collect()
+    gc_time = time.perf_counter() - start
+    return state, memory, gc_time
+
+def main():
+    questions = build_questions()
+    rng = random.Random(7)
+    answers = [submitted_answers(question, rng) for question in questions]
+
+    print(f"{TEAMS} teams x {QUESTIONS} questions")
+    print(f"{'layout':>22} {'memory (MiB)':>14} {'full gc (ms)':>14}")
+    rows = [
+        ('answers: arrays', lambda: build_store(questions, answers)),
+        ('answers: dicts (old)', lambda: build_dicts(questions, answers)),
+        ('teams: __slots__', lambda: [Team(f'Team {i}') for i in range(TEAMS)]),
+        ('teams: __dict__ (old)', lambda: [DictTeam(f'Team {i}') for i in range(TEAMS)]),
+    ]
+    for label, build in rows:
+        state, memory, gc_time = measure(build)
+        print(f"{label:>22} {memory / 2**20:>14.1f} {gc_time * 1000:>14.1f}")
+        del state
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the server's async modes
+Starts app.py once per async mode (threading, eventlet, gevent, as far as
+they are installed) and connection count, opens that many websocket
+clients on the game, then has 50 teams answer at the same time. Reports
+how many clients got connected and how long that took, the answer
+latency over HTTP, and how long the score_update that follows took to
+reach every client. The clients speak the Engine.IO/Socket.IO protocol
+over websocket-client, one thread each, in this process; on a small
+machine they compete with the server for CPU, so compare modes with each
+other rather than with production numbers.
+"""
+
+import importlib.util
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import websocket
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = [mode for mode in ('threading', 'eventlet', 'gevent')
+         if mode == 'threading' or importlib.util.find_spec(mode) is not None]
+CONNECTION_COUNTS = [int(count) for count in sys.argv[1:]] or [100, 500, 1000]
+TEAM_COUNT = 50
+CONNECT_TIMEOUT = 30  # Seconds for all clients to connect
+DELIVERY_TIMEOUT = 10  # Seconds for the score_update to reach every client
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def start_server(mode, port):
+    env = dict(os.environ, TRIVIA_ASYNC_MODE=mode, TRIVIA_PORT=str(port), TRIVIA_HOST='127.0.0.1')
+    server = subprocess.Popen([sys.executable, 'app.py'], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f'http://127.0.0.1:{port}/', timeout=1)
+            return server
+        except requests.RequestException:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f'{mode} server did not start')
+
+class Client:
+    """One Socket.IO client on a raw websocket; records when the first score_update arrives"""
+
+    def __init__(self, port):
+        self.ws = websocket.create_connection(
+            f'ws://127.0.0.1:{port}/socket.io/?EIO=4&transport=websocket', timeout=CONNECT_TIMEOUT)
+        assert self.ws.recv().startswith('0')  # Engine.IO open
+        self.ws.send('40')  # Socket.IO connect to the default namespace
+        while not self.ws.recv().startswith('40'):
+            pass
+        self.score_update_at = None
+        self.ws.settimeout(None)
+        threading.Thread(target=self.read, daemon=True).start()
+
+    def read(self):
+        try:
+            while True:
+                message = self.ws.recv()
+                if message == '2':
+                    self.ws.send('3')  # Engine.IO heartbeat
+                elif message.startswith('42["score_update"') and self.score_update_at is None:
+                    self.score_update_at = time.perf_counter()
+        except Exception:
+            pass  # Closed
+
+    def close(self):
+        self.ws.shutdown()  # close() would wait for a close frame the reader thread takes
+
+def connect_clients(port, count):
+    clients = []
+    failures = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=50) as pool:
+        for result in [pool.submit(Client, port) for _ in range(count)]:
+            try:
+                clients.append(result.result())
+            except Exception:
+                failures += 1
+    return clients, failures, time.perf_counter() - start
+
+def answer_burst(port, teams):
+    def answer(session):
+        start = time.perf_counter()
+        response = session.post(f'http://127.0.0.1:{port}/api/answer', json={'answer': 'Paris'}, timeout=30)
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=TEAM_COUNT) as pool:
+        start = time.perf_counter()
+        latencies = list(pool.map(answer, teams))
+    return start, latencies
+
+def run(mode, connection_count):
+    port = free_port()
+    server = start_server(mode, port)
+    clients = []
+    try:
+        admin = requests.Session()
+        admin.post(f'http://127.0.0.1:{port}/admin/login', data={'password': 'admin123'})
+        teams = []
+        for number in range(TEAM_COUNT):
+            team = requests.Session()
+            team.post(f'http://127.0.0.1:{port}/api/teams',
+                      json={'team_name': f'Team {number}', 'player_name': f'Player {number}'}).raise_for_status()
+            teams.append(team)
+        admin.post(f'http://127.0.0.1:{port}/admin/api/game/start').raise_for_status()
+
+        clients, failures, connect_time = connect_clients(port, connection_count)
+        burst_start, latencies = answer_burst(port, teams)
+        deadline = time.perf_counter() + DELIVERY_TIMEOUT
+        while time.perf_counter() < deadline and any(client.score_update_at is None for client in clients):
+            time.sleep(0.05)
+        delivered = [client.score_update_at - burst_start for client in clients if client.score_update_at]
+        latencies.sort()
+        return {
+            'connected': len(clients), 'failed': failures, 'connect_s': connect_time,
+            'p50_ms': statistics.median(latencies) * 1000,
+            'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+            'delivered': len(delivered),
+            'delivery_s': max(delivered) if delivered else float('nan'),
+        }
+    finally:
+        for client in clients:
+            client.close()
+        server.kill()
+        server.wait()
+
+def main():
+    print(f"Modes: {', '.join(MODES)}; {TEAM_COUNT} teams answer at once while the clients are connected")
+    print(f"{'mode':>10} {'clients':>8} {'connected':>10} {'failed':>7} {'connect s':>10} "
+          f"{'answer p50 ms':>14} {'p95 ms':>8} {'score_update to all s':>22}")
+    for connection_count in CONNECTION_COUNTS:
+        for mode in MODES:
+            result = run(mode, connection_count)
+            reached = (f"{result['delivery_s']:.2f}" if result['delivered'] == result['connected']
+                       else f"{result['delivered']} got it")
+            print(f"{mode:>10} {connection_count:>8} {result['connected']:>10} {result['failed']:>7} "
+                  f"{result['connect_s']:>10.2f} {result['p50_ms']:>14.1f} {result['p95_ms']:>8.1f} {reached:>22}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Stress benchmark for concurrent answer submission
+32 threads hammer submit_answer during each question window (every team is
+submitted by two threads at once to provoke double scoring) and the run
+checks that scores, answers and the leaderboard stay consistent
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import TriviaGame, Question
+
+SUBMITTERS = 32
+TEAMS = 2000
+QUESTIONS = 10
+
+def main():
+    game = TriviaGame()
+    game.load_questions([Question(f'Question {i}', 'fill_in_blank', [], 'yes') for i in range(QUESTIONS)])
+    team_ids = [game.create_team(f'Team {i}', f'Player {i}')['team_id'] for i in range(TEAMS)]
+    game.start_game()
+    
+    accepted = Counter()  # (team_id, question_index) -> successful submissions
+    points = Counter()  # team_id -> points reported back to callers
+    tally_lock = threading.Lock()
+    total_time = 0.0
+    total_calls = 0
+    
+    for question_index in range(QUESTIONS):
+        game.set_question(question_index)
+        game.start_question_timer()
+        barrier = threading.Barrier(SUBMITTERS)
+        
+        def submitter(worker):
+            # Two workers share each slice of teams, so every team is submitted twice concurrently
+            mine = team_ids[(worker // 2)::SUBMITTERS // 2]
+            barrier.wait()
+            local_accepted = []
+            for team_id in mine:
+                answer = 'yes' if hash((team_id, question_index)) % 3 else 'no'
+                result = game.submit_answer(team_id, answer)
+                if result['success']:
+                    local_accepted.append((team_id, result['points_earned']))
+            with tally_lock:
+                for team_id, earned in local_accepted:
+                    accepted[(team_id, question_index)] += 1
+                    points[team_id] += earned
+        
+        threads = [threading.Thread(target=submitter, args=(w,)) for w in range(SUBMITTERS)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        total_time += time.perf_counter() - start
+        total_calls += 2 * TEAMS
+    
+    game.shutdown()
+    
+    # Invariants
+    double_scored = [key for key, count in accepted.items() if count > 1]
+    assert not double_scored, f"{len(double_scored)} answers were accepted twice"
+    assert len(accepted) == TEAMS * QUESTIONS, "Some answers were lost"
+    for team_id in team_ids:
+        team = game.teams[team_id]
+        assert team.score == points[team_id], f"Score mismatch for {team.name}"
+        assert game.leaderboard.score_of(team_id) == team.score, "Leaderboard out of sync"
+        assert game.answer_store.answered_count(team.ordinal) == QUESTIONS
+    
+    print(f"submitters:        {SUBMITTERS}")
+    print(f"submissions:       {total_calls} ({TEAMS * QUESTIONS} accepted, {total_calls - TEAMS * QUESTIONS} rejected duplicates)")
+    print(f"throughput:        {total_calls / total_time:,.0f} submissions/sec")
+    print(f"commands executed: {game.commands.executed}")
+    print("invariants:        OK (no double scoring, scores == leaderboard == reported points)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark for versioned conditional GETs
+With 1,000 teams in a running game, times the polled endpoints through
+Flask's test client three ways: rebuilding and serializing the response
+(the response cache is cleared before every request, as before), serving
+the body cached for the current version, and answering a client that
+already has the version with 304. The game clock is frozen, since a
+running countdown moves the question and status versions every second.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, registry
+from models import Question
+
+TEAM_COUNT = 1000
+REQUESTS = 200
+
+def measure(client, game, path, mode):
+    etag = client.get(path).headers['ETag']
+    headers = {'If-None-Match': etag} if mode == '304' else {}
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        if mode == 'rebuild':
+            game.response_cache.clear()
+        response = client.get(path, headers=headers)
+    elapsed = time.perf_counter() - start
+    assert response.status_code == (304 if mode == '304' else 200)
+    return elapsed / REQUESTS * 1000, len(response.get_data())
+
+def main():
+    game = registry.get_default()
+    game.load_questions([Question(f'Question {i}?', 'multiple_choice', ['A', 'B', 'C', 'D'], 'B')
+                         for i in range(10)])
+    team_ids = [game.create_team(f'Team {i}', f'Player {i}')['team_id'] for i in range(TEAM_COUNT)]
+    game.start_game()
+    now = game.clock()
+    game.clock = lambda: now  # The countdown second is part of the question and status versions
+    for team_id in team_ids[::2]:
+        game.submit_answer(team_id, 'B')
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['admin_logged_in'] = True
+        session['team_id'] = team_ids[0]
+        session['player_name'] = 'Player 0'
+
+    print(f"{TEAM_COUNT} teams; ms per request (response bytes)")
+    print(f"{'endpoint':>18} {'rebuild':>16} {'cached body':>16} {'304':>10}")
+    for path in ('/api/teams', '/api/scoreboard', '/api/question', '/admin/api/status'):
+        results = [measure(client, game, path, mode) for mode in ('rebuild', 'cached', '304')]
+        print(f"{path:>18} " + ' '.join(f"{ms:>8.3f} ({size:>6})" if mode != '304' else f"{ms:>10.3f}"
+                                        for mode, (ms, size) in zip(('rebuild', 'cached', '304'), results)))
+    game.stop_game()
+
+if __name__ == '__main__':
+    main()
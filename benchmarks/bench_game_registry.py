@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark for hosting many games in one process
+Reports memory per hosted game (tracemalloc) and request latency as the
+number of hosted games grows, using Flask's in-process test client
+"""
+
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import app as trivia_app
+from trivia_parser import TriviaParser
+
+GAME_COUNTS = [1, 100, 500]
+TEAMS_PER_GAME = 10
+REQUESTS_PER_RUN = 500
+
+def main():
+    trivia_app.registry.questions = TriviaParser('questions.md').parse()
+    trivia_app.registry.max_games = max(GAME_COUNTS) + 1
+    client = trivia_app.app.test_client()
+    
+    print(f"{'games':>7} {'KiB/game':>10} {'p50 (ms)':>10} {'p95 (ms)':>10}")
+    hosted = []
+    for game_count in GAME_COUNTS:
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        new_codes = []
+        while len(hosted) + len(new_codes) < game_count:
+            code = trivia_app.registry.create_game()['game_code']
+            room = trivia_app.registry.get(code)
+            for t in range(TEAMS_PER_GAME):
+                room.create_team(f'Team {t}', f'Player {t}')
+            room.start_game()
+            new_codes.append(code)
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        hosted.extend(new_codes)
+        per_game = (after - before) / max(1, len(new_codes)) / 1024
+        
+        latencies = []
+        for i in range(REQUESTS_PER_RUN):
+            code = hosted[i % len(hosted)]
+            start = time.perf_counter()
+            client.get(f'/games/{code}/api/scoreboard')
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        print(f"{game_count:>7} {per_game:>10.1f} {statistics.median(latencies) * 1000:>10.3f} "
+              f"{latencies[int(len(latencies) * 0.95)] * 1000:>10.3f}")
+    
+    for code in hosted:
+        trivia_app.registry.remove_game(code)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark for journal recovery
+Writes a 100k-event journal (team creation, joins, answers, question changes)
+and measures how long a fresh TriviaGame takes to recover from it, both by
+replaying the whole journal and from a recent snapshot plus the tail
+(the default configuration snapshots every 10k events, so recovery never
+replays more than that).
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from journal import GameJournal
+from models import TriviaGame, Question
+
+EVENTS = 100000
+TEAMS = 2000
+TARGET_SECONDS = 1.0
+
+def build_questions():
+    return [Question(f'Question {i}', 'multiple_choice', ['Alpha', 'Bravo', 'Charlie', 'Delta'], 'Charlie')
+            for i in range(200)]
+
+def write_journal(directory, questions, snapshot_every):
+    rng = random.Random(3)
+    game = TriviaGame()
+    game.load_questions(questions)
+    game.attach_journal(GameJournal(directory, snapshot_every=snapshot_every))
+    team_ids = []
+    for i in range(TEAMS):
+        team_ids.append(game.create_team(f'Team {i}', f'Captain {i}')['team_id'])
+        game.join_team(team_ids[-1], f'Player {i}')
+    game.start_game()
+    question_index = 0
+    while game.journal.seq < EVENTS:
+        for team_id in team_ids:
+            if game.journal.seq >= EVENTS - 1:
+                break
+            game.submit_answer(team_id, rng.choice(questions[question_index].options))
+        question_index += 1
+        game.set_question(question_index)
+    state = game.to_snapshot()
+    game.journal.close()
+    game.stop_game()
+    return state
+
+def recover(directory, questions):
+    game = TriviaGame()
+    game.load_questions(questions)
+    start = time.perf_counter()
+    replayed = game.attach_journal(GameJournal(directory))
+    elapsed = time.perf_counter() - start
+    state = game.to_snapshot()
+    game.journal.close()
+    game.stop_game()
+    return elapsed, replayed, state
+
+def main():
+    questions = build_questions()
+    root = tempfile.mkdtemp(prefix='trivia-journal-')
+    try:
+        print(f"{'mode':>22} {'events replayed':>16} {'recovery (ms)':>14} {'state ok':>9} {'< 1 s':>6}")
+        for label, snapshot_every in [('no snapshots', 0), ('snapshot every 30k', 30000),
+                                      ('snapshot every 10k', 10000)]:
+            directory = os.path.join(root, label.replace(' ', '_'))
+            expected = write_journal(directory, questions, snapshot_every)
+            elapsed, replayed, state = recover(directory, questions)
+            print(f"{label:>22} {replayed:>16} {elapsed * 1000:>14.1f} "
+                  f"{'yes' if state == expected else 'NO':>9} {'yes' if elapsed < TARGET_SECONDS else 'no':>6}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark for scoreboard maintenance
+Compares the incremental Leaderboard against re-sorting every team after each answer
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leaderboard import Leaderboard
+
+TEAM_COUNTS = [100, 1000, 20000]
+UPDATES = 2000
+TOP_K = 10
+
+def main():
+    random.seed(42)
+    print(f"{'teams':>8} {'update+top10 (us)':>18} {'resort+top10 (us)':>18} {'rank_of (us)':>14}")
+    for team_count in TEAM_COUNTS:
+        scores = {f'team-{i}': 0 for i in range(team_count)}
+        board = Leaderboard()
+        for team_id in scores:
+            board.add(team_id, 0)
+        
+        team_ids = list(scores)
+        updates = [(random.choice(team_ids), random.randint(1, 7)) for _ in range(UPDATES)]
+        
+        start = time.perf_counter()
+        for team_id, points in updates:
+            scores[team_id] += points
+            board.update(team_id, scores[team_id])
+            board.top(TOP_K)
+        incremental = (time.perf_counter() - start) / UPDATES
+        
+        resort_updates = updates[:max(20, UPDATES * 100 // team_count)]
+        start = time.perf_counter()
+        for team_id, points in resort_updates:
+            sorted(scores.items(), key=lambda item: item[1], reverse=True)[:TOP_K]
+        resort = (time.perf_counter() - start) / len(resort_updates)
+        
+        start = time.perf_counter()
+        for team_id, _ in updates:
+            board.rank_of(team_id)
+        rank = (time.perf_counter() - start) / UPDATES
+        
+        print(f"{team_count:>8} {incremental * 1e6:>18.2f} {resort * 1e6:>18.2f} {rank * 1e6:>14.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark for player -> team lookups
+Compares the indexed TriviaGame.find_player_team against the previous full scan
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import TriviaGame
+
+PLAYER_COUNTS = [10, 1000, 50000]
+PLAYERS_PER_TEAM = 5
+LOOKUPS = 2000
+
+def linear_find_player_team(game, player_name):
+    """The original O(teams x players) scan, kept here for comparison"""
+    player_name_lower = player_name.lower().strip()
+    for team_id, team in game.teams.items():
+        for existing_player in team.players:
+            if existing_player.lower().strip() == player_name_lower:
+                return team_id
+    return None
+
+def build_game(player_count):
+    game = TriviaGame()
+    team_id = None
+    for i in range(player_count):
+        player_name = f'Player {i}'
+        if i % PLAYERS_PER_TEAM == 0:
+            team_id = game.create_team(f'Team {i // PLAYERS_PER_TEAM}', player_name)['team_id']
+        else:
+            game.join_team(team_id, player_name)
+    return game
+
+def time_lookups(find, game, names):
+    start = time.perf_counter()
+    for name in names:
+        find(name)
+    return (time.perf_counter() - start) / len(names)
+
+def main():
+    print(f"{'players':>10} {'indexed (us)':>14} {'scan (us)':>14} {'speedup':>10}")
+    for player_count in PLAYER_COUNTS:
+        game = build_game(player_count)
+        # Worst case for the scan: look up players near the end of the lobby
+        names = [f'  player {player_count - 1 - (i % PLAYERS_PER_TEAM)} ' for i in range(LOOKUPS)]
+        scan_names = names if player_count <= 1000 else names[:50]
+        
+        indexed = time_lookups(game.find_player_team, game, names)
+        scan = time_lookups(lambda n: linear_find_player_team(game, n), game, scan_names)
+        
+        for name in scan_names[:5]:
+            assert game.find_player_team(name) == linear_find_player_team(game, name)
+        
+        print(f"{player_count:>10} {indexed * 1e6:>14.2f} {scan * 1e6:>14.2f} {scan / indexed:>9.0f}x")
+
+if __name__ == '__main__':
+    main()
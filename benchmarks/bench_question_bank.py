@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for the parallel question bank loader
+Writes a synthetic bank of 32 category files (5,000 questions each) and
+loads it with load_bank() using 1, 2, 4 and 8 worker processes, checking
+that every run returns the same questions in the same order. Speedup is
+bounded by the number of CPUs reported at the top.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_question_parser import write_bank
+from question_bank import load_bank
+
+FILES = 32
+QUESTIONS_PER_FILE = 5000
+WORKERS = [1, 2, 4, 8]
+
+def fingerprint(questions):
+    return [(q.source_file, q.source_line, q.question_text, q.correct_answer) for q in questions]
+
+def main():
+    directory = tempfile.mkdtemp()
+    try:
+        for n in range(FILES):
+            write_bank(os.path.join(directory, f'category-{n:02d}.md'), QUESTIONS_PER_FILE)
+        print(f"{FILES} files x {QUESTIONS_PER_FILE} questions, {os.cpu_count()} CPUs")
+        print(f"{'workers':>8} {'seconds':>9} {'speedup':>8}")
+        baseline = None
+        expected = None
+        for workers in WORKERS:
+            start = time.perf_counter()
+            questions = load_bank(directory, workers=workers)
+            elapsed = time.perf_counter() - start
+            if expected is None:
+                expected = fingerprint(questions)
+                baseline = elapsed
+            else:
+                assert fingerprint(questions) == expected, 'load order changed with the worker count'
+            print(f"{workers:>8} {elapsed:>9.2f} {baseline / elapsed:>7.2f}x")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
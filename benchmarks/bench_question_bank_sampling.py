@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark for assembling games from an indexed question bank
+Builds a 1M-question in-memory bank (20 categories, 3 difficulties, 50 tags)
+and times QuestionBank.assemble() for typical filters, reporting the memory
+each assembly allocates to show the bank is not copied. Also opens the
+indexes of a 100k-question pack, where they are mapped from the file.
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Question
+from question_bank import QuestionBank
+from question_pack import load_pack
+
+QUESTIONS = 1000000
+PACK_QUESTIONS = 100000
+CATEGORIES = [f'category{i}' for i in range(20)]
+DIFFICULTIES = ['easy', 'medium', 'hard']
+TAGS = [f'tag{i}' for i in range(50)]
+REPEAT = 20
+
+def build_questions(count, rng):
+    return [Question(f'Question {i}?', 'multiple_choice', ['Alpha', 'Bravo', 'Charlie', 'Delta'], 'Charlie',
+                     category=rng.choice(CATEGORIES), difficulty=rng.choice(DIFFICULTIES),
+                     tags=tuple(rng.sample(TAGS, 2)))
+            for i in range(count)]
+
+def write_pack_source(path, count, rng):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(1, count + 1):
+            f.write(f'## {i}. Question {i}?\nCategory: {rng.choice(CATEGORIES)}\n'
+                    f'Difficulty: {rng.choice(DIFFICULTIES)}\nTags: {", ".join(rng.sample(TAGS, 2))}\n'
+                    f'A) Alpha\nB) Bravo\nC) **Charlie**\nD) Delta\n\n')
+
+SCENARIOS = [
+    ('20 any', dict()),
+    ('20 mixed difficulty, no repeats from last 5', dict(mixed_difficulty=True, exclude_recent=5)),
+    ('20 from 2 categories, hard', dict(categories=['category3', 'category7'], difficulties=['hard'])),
+    ('20 tagged tag5 in category3, mixed', dict(categories=['category3'], tags=['tag5'], mixed_difficulty=True)),
+]
+
+def main():
+    rng = random.Random(9)
+    questions = build_questions(QUESTIONS, rng)
+    start = time.perf_counter()
+    bank = QuestionBank(questions)
+    print(f"{QUESTIONS} questions; index build {(time.perf_counter() - start) * 1000:.0f} ms (once per start)")
+    print(f"{'assemble':>46} {'ms':>8} {'KiB allocated':>14}")
+    for label, filters in SCENARIOS:
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            picked = bank.assemble(20, rng=rng, **filters)
+        elapsed = (time.perf_counter() - start) / REPEAT
+        assert len(picked) == 20
+        tracemalloc.start()
+        bank.assemble(20, rng=rng, **filters)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{label:>46} {elapsed * 1000:>8.3f} {peak / 1024:>14.1f}")
+
+    directory = tempfile.mkdtemp()
+    try:
+        source = os.path.join(directory, 'bank.md')
+        write_pack_source(source, PACK_QUESTIONS, rng)
+        load_pack(source).close()  # Compile once
+        start = time.perf_counter()
+        pack = load_pack(source)
+        pack_bank = QuestionBank(pack)
+        opened = time.perf_counter() - start
+        start = time.perf_counter()
+        pack_bank.assemble(20, rng=rng, mixed_difficulty=True, exclude_recent=5)
+        print(f"{PACK_QUESTIONS}-question pack: open with indexes {opened * 1000:.2f} ms, "
+              f"assemble {(time.perf_counter() - start) * 1000:.3f} ms")
+        del pack_bank
+        pack.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Fan-out benchmark for new_question
+Times how long the server spends sending one question to every client of a
+game with 1,000 and 5,000 teams: the previous per-team emits (a payload
+copy, timer lookups and a separate emit, i.e. JSON encoding, per team)
+against one pre-encoded broadcast plus small deltas for teams that already
+answered. Runs on a real python-socketio Server whose engine.io send only
+collects the packets, so only the server-side work is measured.
+"""
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import socketio
+
+from fanout import emit_to_room
+from models import TriviaGame, Question
+
+TEAM_COUNTS = [1000, 5000]
+ANSWERED_SHARES = [0.0, 0.1]
+ROUNDS = 10
+GAME_ROOM = 'game:bench'
+
+def build(team_count, answered_share):
+    server = socketio.Server()
+    sent = []
+    server.eio.send = lambda eio_sid, data: sent.append(data)
+    game = TriviaGame()
+    game.load_questions([Question(f'Question {i} asks something moderately long, as real questions do?',
+                                  'multiple_choice', ['First option', 'Second option', 'Third option',
+                                                      'Fourth option'], 'Third option') for i in range(5)])
+    team_ids = [game.create_team(f'Team {i}', f'Player {i}')['team_id'] for i in range(team_count)]
+    for number, team_id in enumerate(team_ids):
+        eio_sid = f'eio-{number}'
+        sid = server.manager.connect(eio_sid, '/')
+        server.manager.enter_room(sid, '/', GAME_ROOM, eio_sid)
+        server.manager.enter_room(sid, '/', team_id, eio_sid)
+    game.start_game()
+    for team_id in team_ids[:int(team_count * answered_share)]:
+        game.submit_answer(team_id, 'Second option')
+    return server, game, sent
+
+def per_team(server, game):
+    """emit_question_to_all_teams before the broadcast: one payload and emit per team"""
+    question = game.questions[game.current_question_index]
+    base_question = {
+        'question_number': game.current_question_index + 1,
+        'total_questions': len(game.questions),
+        'game_started': game.game_started,
+        'game_paused': game.game_paused,
+        **question.to_dict()
+    }
+    for team_id in game.teams:
+        team_question = base_question.copy()
+        current_index = game.current_question_index
+        team_question['already_answered'] = game.has_team_answered_question(team_id, current_index)
+        if team_question['already_answered']:
+            team_question['submitted_answer'] = game.get_team_answer(team_id, current_index)
+        if game.game_started and not game.game_paused:
+            time_remaining = game.get_time_remaining()
+            if time_remaining is not None and time_remaining > 0:
+                team_question['timer'] = {
+                    'time_remaining': time_remaining,
+                    'bonus_points': game.get_bonus_points(60 - time_remaining),
+                    'total_time': game.question_timer_duration
+                }
+        server.emit('new_question', team_question, room=team_id)
+
+def broadcast_once(server, game):
+    question, deltas = game.get_question_broadcast()
+    emit_to_room(server, 'new_question', question, GAME_ROOM)
+    for team_id, delta in deltas.items():
+        server.emit('question_state', delta, room=team_id)
+
+def measure(fan_out, team_count, answered_share):
+    server, game, sent = build(team_count, answered_share)
+    samples = []
+    for _ in range(ROUNDS):
+        sent.clear()
+        start = time.perf_counter()
+        fan_out(server, game)
+        samples.append(time.perf_counter() - start)
+    game.stop_game()
+    return statistics.median(samples) * 1000, len(sent), sum(map(len, sent))
+
+def main():
+    print(f"{'teams':>6} {'answered':>9} {'approach':>15} {'ms':>8} {'packets':>8} {'KiB sent':>9}")
+    for team_count in TEAM_COUNTS:
+        for answered_share in ANSWERED_SHARES:
+            for label, fan_out in (('per-team emit', per_team), ('broadcast once', broadcast_once)):
+                ms, packets, size = measure(fan_out, team_count, answered_share)
+                print(f"{team_count:>6} {answered_share:>9.0%} {label:>15} {ms:>8.1f} {packets:>8} {size / 1024:>9.0f}")
+
+if __name__ == '__main__':
+    main()
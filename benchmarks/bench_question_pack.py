@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for compiled question packs
+Builds a synthetic 1M-question markdown bank and compares what server
+startup pays to get a usable question list: parsing the markdown with
+iter_parse(), compiling the pack (first start after the bank changed) and
+opening an up-to-date pack (every other start). Also times random access
+to questions in the memory-mapped pack.
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_question_parser import write_bank
+from question_pack import load_pack, compile_pack
+from trivia_parser import TriviaParser
+
+QUESTIONS = 1000000
+LOOKUPS = 100000
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def main():
+    directory = tempfile.mkdtemp()
+    source = os.path.join(directory, 'bank.md')
+    pack_path = source + '.pack'
+    try:
+        write_bank(source, QUESTIONS)
+        print(f"{QUESTIONS} questions, {os.path.getsize(source) / 2**20:.0f} MiB of markdown")
+
+        questions, elapsed = timed(lambda: list(TriviaParser(source).iter_parse()))
+        print(f"{'parse markdown':>28} {elapsed * 1000:>10.1f} ms")
+        del questions
+
+        _, elapsed = timed(lambda: compile_pack(source, pack_path))
+        print(f"{'compile pack (bank changed)':>28} {elapsed * 1000:>10.1f} ms   "
+              f"({os.path.getsize(pack_path) / 2**20:.0f} MiB pack)")
+
+        pack, elapsed = timed(lambda: load_pack(source))
+        print(f"{'open up-to-date pack':>28} {elapsed * 1000:>10.1f} ms")
+
+        os.utime(source)
+        pack, elapsed = timed(lambda: load_pack(source))
+        print(f"{'open pack, bank touched':>28} {elapsed * 1000:>10.1f} ms   (content hash checked)")
+
+        rng = random.Random(2)
+        indices = [rng.randrange(len(pack)) for _ in range(LOOKUPS)]
+        _, elapsed = timed(lambda: [pack[i] for i in indices])
+        print(f"{'random question (decode)':>28} {elapsed / LOOKUPS * 1e6:>10.2f} us")
+        _, elapsed = timed(lambda: [pack[i] for i in indices[:1000] * 100])
+        print(f"{'current question (cached)':>28} {elapsed / LOOKUPS * 1e6:>10.2f} us")
+        pack.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
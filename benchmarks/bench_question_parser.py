@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the question parser
+Writes a synthetic 500k-question markdown bank (a mix of multiple choice with
+bold-marked answers, multiple choice with an Answer: line, and fill in the
+blank) and compares TriviaParser.parse() with the streaming iter_parse():
+wall time and peak RSS, each measured in a fresh process. The streaming
+run only counts questions, so its memory shows what iter_parse itself holds.
+"""
+
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from trivia_parser import TriviaParser
+
+QUESTIONS = 500000
+
+def write_bank(path, count=QUESTIONS):
+    rng = random.Random(11)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('# Synthetic Trivia Questions\n\n')
+        for i in range(1, count + 1):
+            kind = i % 3
+            if kind == 0:
+                f.write(f'## {i}. Fill in the blank: item {i} is ________.\n\n**Answer: word{rng.randrange(1000)}**\n\n')
+                continue
+            correct = rng.randrange(4)
+            f.write(f'## {i}. Which option is right for question {i}?\n\n')
+            for n, label in enumerate('ABCD'):
+                text = f'Option {label}{rng.randrange(100000)}'
+                f.write(f'{label}) **{text}**\n' if kind == 1 and n == correct else f'{label}) {text}\n')
+            if kind == 2:
+                f.write(f'\nAnswer: Option {"ABCD"[correct]}\n')
+            f.write('\n')
+
+def measure(path, mode):
+    """Run one parser mode in this process; prints seconds, peak RSS (MiB) and question count"""
+    parser = TriviaParser(path)
+    start = time.perf_counter()
+    if mode == 'parse':
+        count = len(parser.parse())
+    elif mode == 'iter_parse':
+        count = len(list(parser.iter_parse()))
+    else:
+        count = sum(1 for _ in parser.iter_parse())
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f'{elapsed} {peak} {count}')
+
+def main():
+    if len(sys.argv) == 3:
+        measure(sys.argv[1], sys.argv[2])
+        return
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'bank.md')
+    try:
+        write_bank(path)
+        print(f"{QUESTIONS} questions, {os.path.getsize(path) / 2**20:.0f} MiB")
+        print(f"{'mode':>24} {'seconds':>9} {'peak RSS (MiB)':>15}")
+        labels = [('parse', 'parse()'), ('iter_parse', 'list(iter_parse())'),
+                  ('stream', 'iter_parse() streamed')]
+        for mode, label in labels:
+            output = subprocess.run([sys.executable, __file__, path, mode], capture_output=True,
+                                    text=True, check=True).stdout.split()
+            elapsed, peak, count = float(output[0]), float(output[1]), int(output[2])
+            print(f"{label:>24} {elapsed:>9.2f} {peak:>15.0f}   ({count} questions)")
+
+        # The two parsers must agree
+        parsed = TriviaParser(path)
+        for expected, streamed in zip(parsed.parse(), parsed.iter_parse()):
+            assert expected.to_dict(include_answer=True) == streamed.to_dict(include_answer=True)
+        print("iter_parse() output matches parse()")
+    finally:
+        os.remove(path)
+        os.rmdir(directory)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark for incremental question reloads
+For 100k- and 500k-question banks, edits 1 and 1,000 questions in the
+middle of the file and times QuestionReloader.check(), which reparses only
+the blocks inside the edited range, against a full reparse with
+iter_parse(). The remaining cost of an incremental reload is reading the
+file and diffing it against the previous content, both done in C.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_question_parser import write_bank
+from question_reloader import QuestionReloader
+from trivia_parser import TriviaParser
+
+SIZES = [100000, 500000]
+EDITS = [1, 1000]
+
+def edit(path, count, round_number):
+    """Reword count questions in the middle of the bank"""
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    headers = [i for i, line in enumerate(lines) if line.startswith('## ')]
+    middle = len(headers) // 2
+    for i in headers[middle:middle + count]:
+        lines[i] += f' (edit {round_number})'
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+def main():
+    directory = tempfile.mkdtemp()
+    try:
+        print(f"{'bank':>8} {'edited':>7} {'incremental (ms)':>17} {'parsed':>7} {'full reparse (ms)':>18}")
+        for size in SIZES:
+            path = os.path.join(directory, f'bank-{size}.md')
+            write_bank(path, size)
+            reloaded = []
+            reloader = QuestionReloader(path, reloaded.append)
+            reloader.load()
+            for round_number, count in enumerate(EDITS):
+                edit(path, count, round_number)
+                start = time.perf_counter()
+                parsed = reloader.check()
+                incremental = time.perf_counter() - start
+                start = time.perf_counter()
+                full = list(TriviaParser(path).iter_parse())
+                full_time = time.perf_counter() - start
+                assert [q.question_text for q in reloaded[-1]] == [q.question_text for q in full]
+                print(f"{size:>8} {count:>7} {incremental * 1000:>17.1f} {parsed:>7} {full_time * 1000:>18.1f}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
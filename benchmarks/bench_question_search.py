@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark for admin question search
+Indexes 1M synthetic questions whose words follow a Zipf-like
+distribution (a few very common words, a long tail of rare ones), then
+times first-page searches for rare, common and combined terms and
+prefixes, plus a deep page. Each query is run several times; the table
+shows median and worst latency. Last, times update() for a reload that
+inserts, edits and deletes a few questions against indexing from scratch.
+"""
+
+import os
+import random
+import sys
+import time
+from itertools import accumulate
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Question
+from question_search import QuestionSearch
+
+QUESTIONS = 1000000
+VOCABULARY = [f'w{i}x' for i in range(200000)]
+CUMULATIVE = list(accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+QUERIES = [
+    ('rare term', 'w150000x'),
+    ('common term', 'w0x'),
+    ('two common terms', 'w1x w2x'),
+    ('common + rare', 'w3x w120000x'),
+    ('short prefix', 'w1*'),
+    ('long prefix', 'w1234*'),
+    ('prefix + term', 'w99* w5x'),
+    ('no match', 'w0x w1x w2x w3x w150001x'),
+]
+RUNS = 20
+
+def build_bank(rng):
+    questions = []
+    for _ in range(QUESTIONS):
+        words = rng.choices(VOCABULARY, cum_weights=CUMULATIVE, k=10)
+        options = rng.choices(VOCABULARY, cum_weights=CUMULATIVE, k=4)
+        questions.append(Question(' '.join(words) + '?', 'multiple_choice', options, options[0]))
+    return questions
+
+def timed(search, query, offset=0):
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        results, more = search.search(query, offset=offset)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return len(results), more, samples[len(samples) // 2] * 1000, samples[-1] * 1000
+
+def main():
+    questions = build_bank(random.Random(4))
+    start = time.perf_counter()
+    search = QuestionSearch(questions)
+    print(f"Indexed {len(questions)} questions ({len(search.terms)} words) in {time.perf_counter() - start:.1f} s")
+    print(f"{'query':>18} {'results':>8} {'more':>5} {'p50 (ms)':>9} {'max (ms)':>9}")
+    for label, query in QUERIES:
+        count, more, p50, worst = timed(search, query)
+        print(f"{label:>18} {count:>8} {str(more):>5} {p50:>9.2f} {worst:>9.2f}")
+    count, more, p50, worst = timed(search, 'w5x', offset=2000)
+    print(f"{'page 101 of w5x':>18} {count:>8} {str(more):>5} {p50:>9.2f} {worst:>9.2f}")
+
+    rng = random.Random(5)
+    reloaded = list(questions)
+    for position in rng.sample(range(len(reloaded)), 10):
+        reloaded.insert(position, Question('Inserted by a reload?', 'fill_in_blank', [], 'x'))
+    for position in rng.sample(range(len(reloaded)), 10):
+        edited = Question(reloaded[position].question_text + ' edited', 'fill_in_blank', [], 'x')
+        edited.uid = reloaded[position].uid
+        reloaded[position] = edited
+    del reloaded[500000:500010]
+    start = time.perf_counter()
+    search.update(reloaded)
+    updated = time.perf_counter() - start
+    start = time.perf_counter()
+    QuestionSearch(reloaded)
+    print(f"Reload of 30 questions: update() {updated:.2f} s, from scratch {time.perf_counter() - start:.1f} s")
+
+if __name__ == '__main__':
+    main()
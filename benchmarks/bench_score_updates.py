@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark for score_update broadcasting
+2,000 teams (each with a small base64 icon) answer within 5 seconds while
+200 clients watch the game. Compares the previous full scoreboard emit
+after every answer against the ScoreboardFeed, which sends at most four
+versioned diffs a second. Counts the packets and bytes the clients receive
+and the server time spent on the burst. Runs on a simulated clock and a
+real python-socketio Server whose engine.io send only collects the
+packets; the full-scoreboard run is timed on its first 10 answers and
+scaled up, as the whole burst would take hours.
+"""
+
+import base64
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import socketio
+
+from fanout import emit_to_room
+from models import TriviaGame, Question
+from scheduler import TimerHandle
+from score_feed import ScoreboardFeed
+
+TEAM_COUNT = 2000
+CLIENT_COUNT = 200
+BURST_SECONDS = 5.0
+FULL_SAMPLE = 10  # Answers the full-scoreboard run is measured on
+GAME_ROOM = 'game:bench'
+ICON = 'data:image/png;base64,' + base64.b64encode(os.urandom(1024)).decode()
+
+class SimulatedScheduler:
+    """Runs scheduled callbacks in deadline order on a simulated clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.handles = []
+
+    def clock(self):
+        return self.now
+
+    def schedule_at(self, deadline, callback, *args):
+        handle = TimerHandle(deadline, 0, callback, args)
+        self.handles.append(handle)
+        return handle
+
+    def run_until(self, end):
+        while True:
+            due = [handle for handle in self.handles if not handle.cancelled and handle.deadline <= end]
+            if not due:
+                break
+            handle = min(due, key=lambda handle: handle.deadline)
+            self.handles.remove(handle)
+            self.now = max(self.now, handle.deadline)
+            handle.callback(*handle.args)
+        self.now = max(self.now, end)
+
+def build():
+    server = socketio.Server()
+    sent = [0, 0]  # Packets and bytes; full scoreboards are far too big to keep
+
+    def send(eio_sid, data):
+        sent[0] += 1
+        sent[1] += len(data)
+
+    server.eio.send = send
+    for number in range(CLIENT_COUNT):
+        sid = server.manager.connect(f'eio-{number}', '/')
+        server.manager.enter_room(sid, '/', GAME_ROOM, f'eio-{number}')
+    scheduler = SimulatedScheduler()
+    game = TriviaGame(scheduler=scheduler)
+    game.clock = scheduler.clock
+    game.load_questions([Question('Which answer is right?', 'multiple_choice', ['Left', 'Right'], 'Right')])
+    team_ids = [game.create_team(f'Team {i}', f'Player {i}', icon=ICON)['team_id'] for i in range(TEAM_COUNT)]
+    game.start_game()
+    return server, scheduler, game, team_ids, sent
+
+def full_scoreboard():
+    """The previous /api/answer: the whole scoreboard to every client after each answer"""
+    server, scheduler, game, team_ids, sent = build()
+    start = time.perf_counter()
+    for number, team_id in enumerate(team_ids[:FULL_SAMPLE]):
+        scheduler.run_until(scheduler.now + BURST_SECONDS / TEAM_COUNT)
+        game.submit_answer(team_id, 'Right' if number % 3 else 'Left')
+        server.emit('score_update', game.get_scoreboard(), room=GAME_ROOM)
+    elapsed = time.perf_counter() - start
+    game.stop_game()
+    scale = TEAM_COUNT / FULL_SAMPLE
+    return sent[0] * scale, sent[1] * scale, elapsed * scale
+
+def coalesced_diffs():
+    server, scheduler, game, team_ids, sent = build()
+    feed = game.score_feed = ScoreboardFeed(
+        game, lambda event, data: emit_to_room(server, event, data, GAME_ROOM), scheduler=scheduler)
+    feed.mark_changed()
+    scheduler.run_until(scheduler.now + 1)
+    sent[:] = [0, 0]  # The initial diff with every team is what a snapshot would have sent anyway
+    start = time.perf_counter()
+    for number, team_id in enumerate(team_ids):
+        scheduler.run_until(scheduler.now + BURST_SECONDS / TEAM_COUNT)
+        game.submit_answer(team_id, 'Right' if number % 3 else 'Left')
+    scheduler.run_until(scheduler.now + 1)
+    elapsed = time.perf_counter() - start
+    game.stop_game()
+    assert feed.snapshot()['teams'] == game.get_scoreboard_entries()
+    return sent[0], sent[1], elapsed
+
+def main():
+    print(f"{TEAM_COUNT} teams answer within {BURST_SECONDS:.0f} s, {CLIENT_COUNT} clients")
+    print(f"{'approach':>22} {'updates/client':>15} {'MiB/client':>11} {'server s':>9}")
+    for label, run in (('full scoreboard (est.)', full_scoreboard), ('coalesced diffs', coalesced_diffs)):
+        packets, size, elapsed = run()
+        print(f"{label:>22} {packets / CLIENT_COUNT:>15.0f} {size / CLIENT_COUNT / 2 ** 20:>11.2f} {elapsed:>9.2f}")
+
+if __name__ == '__main__':
+    main()
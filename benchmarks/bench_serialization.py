@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of serialization cost per emit
+Times building and encoding one Socket.IO packet for the payloads the
+server sends most: new_question (rebuilt through Question.to_dict as
+before, or the question's payload encoded at load time with only the
+per-game fields added), a score_update diff of 20 teams and a teams_update
+list of 200 teams. Each is encoded with the standard json module, orjson
+and MessagePack, as far as they are installed.
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from socketio import packet
+
+from fanout import raw_event_packet
+from models import TriviaGame, Question
+import serializer
+
+REPEAT = 20000
+
+class OrjsonModule:
+    """orjson behind the json module interface Socket.IO packets use"""
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        return serializer.orjson.dumps(obj, option=serializer.orjson.OPT_NON_STR_KEYS).decode()
+
+    @staticmethod
+    def loads(s):
+        return serializer.orjson.loads(s)
+
+def packet_classes():
+    classes = {'json': type('JSONPacket', (packet.Packet,), {'json': json})}
+    if serializer.orjson is not None:
+        classes['orjson'] = type('OrjsonPacket', (packet.Packet,), {'json': OrjsonModule})
+    if serializer.msgpack is not None:
+        from socketio.msgpack_packet import MsgPackPacket
+        classes['msgpack'] = MsgPackPacket
+    return classes
+
+def build_game():
+    game = TriviaGame()
+    game.load_questions([Question(f'Question {i} asks something moderately long, as real questions do?',
+                                  'multiple_choice', ['First option', 'Second option', 'Third option',
+                                                      'Fourth option'], 'Third option', category='Science',
+                                  difficulty='medium') for i in range(5)])
+    for i in range(200):
+        game.create_team(f'Team {i}', f'Player {i}')
+    game.start_game()
+    return game
+
+def rebuilt_question(game):
+    """The new_question payload as it was built before: a fresh dict from Question.to_dict"""
+    question = game.questions[game.current_question_index]
+    payload = {
+        'question_number': game.current_question_index + 1,
+        'total_questions': len(game.questions),
+        'game_started': game.game_started,
+        'game_paused': game.game_paused,
+        **question.to_dict()
+    }
+    payload['already_answered'] = False
+    payload['timer'] = game.get_timer_state()
+    return payload
+
+def per_emit(encode):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        encoded = encode()
+    return (time.perf_counter() - start) / REPEAT * 1e6, len(encoded)
+
+def main():
+    game = build_game()
+    entries = game.get_scoreboard_entries()
+    diff = {'version': 42, 'changed': [{'team_id': entry['team_id'], 'rank': rank, 'score': entry['score']}
+                                       for rank, entry in enumerate(entries[:20], 1)], 'removed': []}
+    teams = game.get_teams()
+    classes = packet_classes()
+    print(f"Encoders: {', '.join(classes)}"
+          + ('' if serializer.msgpack is not None else ' (msgpack not installed)')
+          + f"; serializer.py backend: {serializer.JSON_BACKEND}")
+    print(f"{'payload':>14} {'approach':>26} {'us/emit':>8} {'bytes':>6}")
+
+    def row(label, approach, encode):
+        us, size = per_emit(encode)
+        print(f"{label:>14} {approach:>26} {us:>8.2f} {size:>6}")
+
+    for name, packet_class in classes.items():
+        row('new_question', f'rebuilt dict, {name}',
+            lambda: packet_class(packet.EVENT, data=['new_question', rebuilt_question(game)]).encode())
+    row('new_question', f'encoded at load, {serializer.JSON_BACKEND}',
+        lambda: raw_event_packet('new_question', game.get_question_broadcast()[0]))
+    for label, event, data in (('score_update', 'score_update', diff), ('teams_update', 'teams_update', teams)):
+        for name, packet_class in classes.items():
+            row(label, name, lambda: packet_class(packet.EVENT, data=[event, data]).encode())
+    game.stop_game()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for storage backends
+Submits answers at a steady rate (1,000 and 5,000 answers/s from 5,000
+teams) and reports submit_answer latency percentiles for the in-memory
+backend, SQLiteStorage with group commit, and SQLite committing every answer
+on its own (what a naive write-through layer would do).
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import TriviaGame, Question
+from storage import SQLiteStorage
+
+TEAMS = 5000
+SECONDS = 2.0
+RATES = [1000, 5000]
+
+class CommitEveryAnswer(SQLiteStorage):
+    """SQLiteStorage without batching: each recorded change is its own transaction"""
+    def _enqueue(self, rows):
+        super()._enqueue(rows)
+        self.flush()
+
+def build_game(storage):
+    game = TriviaGame()
+    game.game_code = 'bench'
+    game.load_questions([Question(f'Question {i}', 'multiple_choice', ['Alpha', 'Bravo', 'Charlie', 'Delta'],
+                                  'Charlie') for i in range(50)])
+    game.storage = storage
+    team_ids = [game.create_team(f'Team {i}', f'Player {i}')['team_id'] for i in range(TEAMS)]
+    if storage is not None:
+        storage.flush()
+    game.start_game()
+    return game, team_ids
+
+def run(storage, rate):
+    game, team_ids = build_game(storage)
+    rng = random.Random(5)
+    latencies = []
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    position = 0
+    for n in range(int(rate * SECONDS)):
+        # Pace submissions to the target rate
+        target = start + n * interval
+        delay = target - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        if position == len(team_ids):
+            position = 0
+            game.next_question()
+        began = time.perf_counter()
+        game.submit_answer(team_ids[position], rng.choice(['Alpha', 'Bravo', 'Charlie', 'Delta']))
+        latencies.append(time.perf_counter() - began)
+        position += 1
+    achieved = len(latencies) / (time.perf_counter() - start)
+    game.stop_game()
+    if storage is not None:
+        storage.close()
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1e6
+    return achieved, pick(0.5), pick(0.99), latencies[-1] * 1e6
+
+def main():
+    directory = tempfile.mkdtemp()
+    try:
+        print(f"{TEAMS} teams, {SECONDS:.0f} s per run")
+        print(f"{'backend':>24} {'target/s':>9} {'achieved/s':>11} {'p50 (us)':>9} {'p99 (us)':>9} {'max (us)':>10}")
+        for rate in RATES:
+            backends = [
+                ('in-memory', lambda: None),
+                ('sqlite group commit', lambda: SQLiteStorage(os.path.join(directory, f'group-{rate}.db'))),
+                ('sqlite commit/answer', lambda: CommitEveryAnswer(os.path.join(directory, f'each-{rate}.db'))),
+            ]
+            for label, make in backends:
+                achieved, p50, p99, worst = run(make(), rate)
+                print(f"{label:>24} {rate:>9} {achieved:>11.0f} {p50:>9.1f} {p99:>9.1f} {worst:>10.1f}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark for team icons
+500 teams upload photo-sized JPEG icons (about 100 KiB each, 50 distinct
+images). Compares the JSON payloads that carry icons (/api/teams, the
+scoreboard and the full scoreboard_snapshot) when teams keep the uploaded
+data URL, as before, against /icons/<hash> references into the IconStore,
+and times the icon workers that produce the thumbnails.
+"""
+
+import base64
+import io
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from icon_store import IconStore, decode_data_url, icon_url
+from models import TriviaGame
+
+TEAM_COUNT = 500
+DISTINCT_ICONS = 50
+
+def photo(seed):
+    """A noisy 640x480 JPEG, which compresses about as badly as a real photo"""
+    rng = random.Random(seed)
+    image = Image.frombytes('RGB', (640, 480), rng.randbytes(640 * 480 * 3)).resize((640, 480))
+    image = image.reduce(4).resize((640, 480))
+    output = io.BytesIO()
+    image.save(output, 'JPEG', quality=85)
+    return 'data:image/jpeg;base64,' + base64.b64encode(output.getvalue()).decode()
+
+def payload_sizes(game):
+    sizes = {}
+    for label, build in (('/api/teams', game.get_teams), ('/api/scoreboard', game.get_scoreboard),
+                         ('scoreboard snapshot', game.get_scoreboard_entries)):
+        start = time.perf_counter()
+        encoded = json.dumps(build())
+        sizes[label] = (len(encoded), time.perf_counter() - start)
+    return sizes
+
+def main():
+    uploads = [photo(seed) for seed in range(DISTINCT_ICONS)]
+    print(f"{TEAM_COUNT} teams, {DISTINCT_ICONS} distinct icons of "
+          f"{sum(map(len, uploads)) / len(uploads) / 1024:.0f} KiB (base64) on average")
+
+    inline = TriviaGame()
+    for i in range(TEAM_COUNT):
+        inline.create_team(f'Team {i}', f'Player {i}', icon=uploads[i % DISTINCT_ICONS])
+
+    store = IconStore()
+    stored = TriviaGame()
+    start = time.perf_counter()
+    futures = []
+    for i in range(TEAM_COUNT):
+        team_id = stored.create_team(f'Team {i}', f'Player {i}')['team_id']
+        data = decode_data_url(uploads[i % DISTINCT_ICONS])
+        futures.append(store.submit(data, lambda icon_hash, team_id=team_id:
+                                    stored.set_team_icon(team_id, icon_url(icon_hash))))
+    request_time = time.perf_counter() - start
+    for future in futures:
+        future.result()
+    processing_time = time.perf_counter() - start
+    print(f"request path: {request_time / TEAM_COUNT * 1000:.2f} ms per team; all thumbnails ready after "
+          f"{processing_time:.2f} s; {len(store.icons)} icons stored, "
+          f"{sum(map(len, store.icons.values())) / len(store.icons) / 1024:.1f} KiB each")
+
+    print(f"{'payload':>20} {'data URLs (KiB)':>16} {'encode ms':>10} {'icon refs (KiB)':>16} {'encode ms':>10}")
+    before, after = payload_sizes(inline), payload_sizes(stored)
+    for label in before:
+        print(f"{label:>20} {before[label][0] / 1024:>16.0f} {before[label][1] * 1000:>10.1f} "
+              f"{after[label][0] / 1024:>16.0f} {after[label][1] * 1000:>10.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Message volume of question timers
+Plays one 60-second question, paused for 5 seconds at the 25-second mark,
+for games with 100 and 1,000 connected clients, and counts the timer
+packets (timer_update and timer_expired) the server sends: the previous
+once-a-second timer_update broadcast against the deadline-based timer,
+which only pushes at start, resume, bonus tier boundaries and expiry. The
+game runs on a simulated clock and a real python-socketio Server whose
+engine.io send only collects the packets.
+"""
+
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import socketio
+
+from models import TriviaGame, Question
+from scheduler import TimerHandle
+
+CLIENT_COUNTS = [100, 1000]
+GAME_ROOM = 'game:bench'
+PAUSE_AT, PAUSE_FOR = 25, 5
+
+class SimulatedScheduler:
+    """Runs scheduled callbacks in deadline order on a simulated clock"""
+
+    def __init__(self):
+        self.now = 1000.0  # question_start_time of 0 would read as "no timer"
+        self.handles = []
+
+    def schedule_at(self, deadline, callback, *args):
+        handle = TimerHandle(deadline, 0, callback, args)
+        self.handles.append(handle)
+        return handle
+
+    def run_until(self, end):
+        while True:
+            due = [handle for handle in self.handles if not handle.cancelled and handle.deadline <= end]
+            if not due:
+                break
+            handle = min(due, key=lambda handle: handle.deadline)
+            self.handles.remove(handle)
+            self.now = max(self.now, handle.deadline)
+            handle.callback(*handle.args)
+        self.now = end
+
+class PerSecondGame(TriviaGame):
+    """TriviaGame with the previous timer: a timer_update every second of the question"""
+
+    def _advance_timer(self, generation):
+        if generation != self.timer_generation or not self.question_start_time or self.game_paused:
+            return None
+        remaining = self.get_time_remaining()
+        bonus_points = self.get_bonus_points(self.question_timer_duration - remaining)
+        tier_changed = bonus_points != self.current_bonus_tier
+        self.current_bonus_tier = bonus_points
+        if remaining <= 0:
+            self.timer_handle = None
+            return remaining, bonus_points, tier_changed, None
+        elapsed = self.clock() - self.question_start_time
+        next_deadline = self.question_start_time + math.floor(elapsed) + 1
+        self.timer_handle = self.scheduler.schedule_at(next_deadline, self._on_timer_tick, generation)
+        return remaining, bonus_points, tier_changed, {
+            'time_remaining': remaining, 'bonus_points': bonus_points, 'total_time': self.question_timer_duration
+        }
+
+def play_question(game_class, client_count):
+    server = socketio.Server()
+    sent = []
+    server.eio.send = lambda eio_sid, data: sent.append(data)
+    for number in range(client_count):
+        sid = server.manager.connect(f'eio-{number}', '/')
+        server.manager.enter_room(sid, '/', GAME_ROOM, f'eio-{number}')
+
+    scheduler = SimulatedScheduler()
+    game = game_class(scheduler=scheduler)
+    game.clock = lambda: scheduler.now
+    game.wall_clock = lambda: 1.7e9 + scheduler.now
+    game.load_questions([Question('How long is this question open?', 'multiple_choice', ['10s', '60s'], '60s')])
+    game.timer_callbacks = [lambda timer: server.emit('timer_update', dict(timer, expired=False), room=GAME_ROOM)]
+    game.timer_expired_callbacks = [lambda: server.emit('timer_expired', room=GAME_ROOM)]
+
+    start = time.perf_counter()
+    started = scheduler.now
+    game.start_game()
+    scheduler.run_until(started + PAUSE_AT)
+    game.pause_game()
+    scheduler.run_until(started + PAUSE_AT + PAUSE_FOR)
+    game.resume_game()
+    scheduler.run_until(started + game.question_timer_duration + 1)
+    elapsed = time.perf_counter() - start
+    game.stop_game()
+    return len(sent), sum(map(len, sent)), elapsed
+
+def main():
+    print(f"{'clients':>8} {'timer':>15} {'packets':>8} {'per client':>11} {'KiB sent':>9} {'send ms':>8}")
+    for client_count in CLIENT_COUNTS:
+        results = {}
+        for label, game_class in (('every second', PerSecondGame), ('deadline', TriviaGame)):
+            packets, size, elapsed = results[label] = play_question(game_class, client_count)
+            print(f"{client_count:>8} {label:>15} {packets:>8} {packets // client_count:>11} "
+                  f"{size / 1024:>9.0f} {elapsed * 1000:>8.1f}")
+        before, after = results['every second'][0], results['deadline'][0]
+        print(f"{'':>8} {'packets saved':>15} {1 - after / before:>8.0%}")
+
+if __name__ == '__main__':
+    main()
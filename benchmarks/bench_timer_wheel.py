@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark for question timers
+Measures firing drift and CPU usage of the shared TimerWheel against one
+sleeping thread per timer (the previous TriviaGame approach)
+"""
+
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import TimerWheel
+
+TIMER_COUNTS = [1, 100, 1000, 10000]
+THREAD_TIMER_LIMIT = 1000  # Thousands of OS threads is exactly what we are replacing
+TICKS_PER_TIMER = 3  # Each timer re-arms itself once a second, like a question countdown
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+def run_wheel(timer_count):
+    wheel = TimerWheel()
+    lateness = []
+    lock = threading.Lock()
+    done = threading.Event()
+    remaining = [timer_count]
+    
+    def tick(start, n):
+        now = time.monotonic()
+        with lock:
+            lateness.append(now - (start + n))
+        if n < TICKS_PER_TIMER:
+            wheel.schedule_at(start + n + 1, tick, start, n + 1)
+        else:
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    done.set()
+    
+    cpu_start = time.process_time()
+    wall_start = time.monotonic()
+    for _ in range(timer_count):
+        start = wall_start + random.random()
+        wheel.schedule_at(start + 1, tick, start, 1)
+    done.wait()
+    wall = time.monotonic() - wall_start
+    cpu = time.process_time() - cpu_start
+    wheel.stop()
+    return lateness, cpu, wall
+
+def run_threads(timer_count):
+    lateness = []
+    lock = threading.Lock()
+    
+    def worker(start):
+        # Mirrors the old _timer_worker loop: sleep(1) between updates
+        time.sleep(max(0, start - time.monotonic()))
+        expected = start
+        for _ in range(TICKS_PER_TIMER):
+            time.sleep(1)
+            expected += 1
+            with lock:
+                lateness.append(time.monotonic() - expected)
+    
+    cpu_start = time.process_time()
+    wall_start = time.monotonic()
+    threads = [threading.Thread(target=worker, args=(wall_start + random.random(),), daemon=True)
+               for _ in range(timer_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return lateness, time.process_time() - cpu_start, time.monotonic() - wall_start
+
+def report(label, timer_count, lateness, cpu, wall):
+    print(f"{label:>8} {timer_count:>7} "
+          f"{statistics.median(lateness) * 1000:>10.1f} {percentile(lateness, 99) * 1000:>10.1f} "
+          f"{max(lateness) * 1000:>10.1f} {cpu / wall * 100:>8.1f}%")
+
+def main():
+    random.seed(1)
+    print(f"{'mode':>8} {'timers':>7} {'p50 (ms)':>10} {'p99 (ms)':>10} {'max (ms)':>10} {'cpu':>9}")
+    for timer_count in TIMER_COUNTS:
+        report('wheel', timer_count, *run_wheel(timer_count))
+        if timer_count <= THREAD_TIMER_LIMIT:
+            report('threads', timer_count, *run_threads(timer_count))
+    print("\nDrift for threads accumulates with every sleep(1); wheel deadlines are absolute.")
+
+if __name__ == '__main__':
+    main()
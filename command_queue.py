@@ -0,0 +1,68 @@
+import threading
+from collections import deque
+from functools import wraps
+
+class _Command:
+    __slots__ = ('fn', 'args', 'kwargs', 'done', 'result', 'error')
+
+    def __init__(self, fn, args, kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.done = False
+        self.result = None
+        self.error = None
+
+class CommandQueue:
+    """
+    Single-writer command queue for one game.
+
+    Callers enqueue a command and then take the combiner lock. Whoever holds
+    the lock drains every queued command in FIFO order, so commands never run
+    concurrently and a burst of submissions is executed in one lock hold
+    instead of one hand-off per request (flat combining). Callers whose
+    command was already run by another thread return as soon as they get the
+    lock. Commands issued from inside a running command execute inline.
+    """
+
+    def __init__(self):
+        self.pending = deque()
+        self.lock = threading.Lock()
+        self.owner = None  # Thread id currently draining the queue
+        self.executed = 0
+
+    def run(self, fn, *args, **kwargs):
+        """Execute fn(*args, **kwargs) on the single writer and return its result"""
+        if self.owner == threading.get_ident():
+            return fn(*args, **kwargs)  # Nested command from the writer itself
+
+        command = _Command(fn, args, kwargs)
+        self.pending.append(command)
+        with self.lock:
+            if not command.done:
+                self.owner = threading.get_ident()
+                try:
+                    self._drain()
+                finally:
+                    self.owner = None
+
+        if command.error is not None:
+            raise command.error
+        return command.result
+
+    def _drain(self):
+        while self.pending:
+            command = self.pending.popleft()
+            try:
+                command.result = command.fn(*command.args, **command.kwargs)
+            except Exception as e:
+                command.error = e
+            command.done = True
+            self.executed += 1
+
+def serialized(method):
+    """Run a TriviaGame method through the game's command queue"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self.commands.run(method, self, *args, **kwargs)
+    return wrapper
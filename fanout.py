@@ -0,0 +1,44 @@
+import json
+
+from socketio import BaseManager, packet
+
+from serializer import RawJSON
+
+YIELD_EVERY = 256  # Sends between yields to other green threads during a fan-out
+
+def emit_to_room(server, event, data, room, namespace='/'):
+    """Emit an event to every client in a room, encoding the packet once.
+
+    python-socketio encodes a room emit separately for each client in the
+    room. With the in-process manager the same encoded packet is sent to
+    every client instead. Managers backed by a message queue go through
+    server.emit so clients of other server processes still get the event.
+    RawJSON data goes into JSON packets without being encoded again.
+    Under eventlet or gevent the loop yields every YIELD_EVERY clients, so a
+    fan-out to thousands of clients does not hold up every other connection.
+    """
+    manager = server.manager
+    direct = type(manager) is BaseManager
+    if isinstance(data, RawJSON) and not (direct and server.packet_class is packet.Packet):
+        data = data.decode()  # Other packet formats and message queues need the object
+    if not direct:
+        server.emit(event, data, room=room, namespace=namespace)
+        return
+    if namespace not in manager.get_namespaces():
+        return  # No client has connected yet
+    if isinstance(data, RawJSON):
+        encoded = raw_event_packet(event, data, namespace)
+    else:
+        encoded = server.packet_class(packet.EVENT, namespace=namespace, data=[event, data]).encode()
+    encoded_packets = encoded if isinstance(encoded, list) else [encoded]
+    cooperative = server.async_mode != 'threading'
+    for count, (_, eio_sid) in enumerate(manager.get_participants(namespace, room), 1):
+        for encoded_packet in encoded_packets:
+            server.eio.send(eio_sid, encoded_packet)
+        if cooperative and count % YIELD_EVERY == 0:
+            server.sleep(0)
+
+def raw_event_packet(event, data, namespace='/'):
+    """The JSON Socket.IO EVENT packet Packet.encode() would build, around already encoded data"""
+    prefix = str(packet.EVENT) if namespace == '/' else f'{packet.EVENT}{namespace},'
+    return f'{prefix}[{json.dumps(event)},{data.data.decode()}]'
@@ -0,0 +1,150 @@
+import random
+import re
+import string
+import threading
+import time
+
+from models import TriviaGame
+from scheduler import get_scheduler
+
+DEFAULT_GAME_CODE = 'default'
+GAME_CODE_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,32}$')
+
+class GameRegistry:
+    """
+    Hosts many TriviaGame rooms in one process, keyed by a short game code.
+
+    Games that have not been touched for idle_timeout seconds are evicted by a
+    periodic sweep on the shared scheduler (the default game is never evicted).
+    max_teams_per_game / max_players_per_team, when set, cap every game but the
+    default one, which stays open to any number of teams.
+    """
+
+    def __init__(self, game_factory=None, max_games=500, idle_timeout=4 * 60 * 60,
+                 max_teams_per_game=None, max_players_per_team=None,
+                 sweep_interval=60, scheduler=None):
+        self.game_factory = game_factory
+        self.max_games = max_games
+        self.idle_timeout = idle_timeout
+        self.max_teams_per_game = max_teams_per_game  # None means unlimited
+        self.max_players_per_team = max_players_per_team
+        self.sweep_interval = sweep_interval
+        self.scheduler = scheduler or get_scheduler()
+        self.clock = time.monotonic
+        self.questions = []  # Question bank handed to newly created games
+        self.question_bank = None  # Indexed QuestionBank over self.questions, if one was built
+        self.question_search = None  # QuestionSearch over self.questions for the admin, once built
+        self.games = {}  # game_code -> TriviaGame
+        self.last_access = {}  # game_code -> clock() of last use
+        self.lock = threading.Lock()
+        self.sweep_handle = None
+
+    def __len__(self):
+        return len(self.games)
+
+    def __contains__(self, game_code):
+        return game_code in self.games
+
+    def _new_code(self):
+        alphabet = string.ascii_uppercase + string.digits
+        while True:
+            code = ''.join(random.choices(alphabet, k=6))
+            if code not in self.games:
+                return code
+
+    def _build_game(self, game_code):
+        if self.game_factory:
+            game = self.game_factory(game_code)
+        else:
+            game = TriviaGame(scheduler=self.scheduler)
+        game.game_code = game_code
+        if game_code != DEFAULT_GAME_CODE:
+            game.max_teams = self.max_teams_per_game
+            game.max_players_per_team = self.max_players_per_team
+        if not game.questions and self.questions:
+            game.load_questions(self.questions)
+        if game.question_bank is None:
+            game.question_bank = self.question_bank
+        return game
+
+    def create_game(self, game_code=None):
+        """Create a new game room and return {'success', 'game_code'}"""
+        if game_code and not GAME_CODE_PATTERN.match(game_code):
+            return {'success': False, 'error': 'Game codes may only contain letters, digits, - and _'}
+        with self.lock:
+            if game_code and game_code in self.games:
+                return {'success': False, 'error': 'Game code already in use'}
+            if len(self.games) >= self.max_games:
+                self._evict_idle_locked()
+                if len(self.games) >= self.max_games:
+                    return {'success': False, 'error': 'Server is hosting the maximum number of games'}
+            game_code = game_code or self._new_code()
+            self.games[game_code] = self._build_game(game_code)
+            self.last_access[game_code] = self.clock()
+        self._ensure_sweep()
+        return {'success': True, 'game_code': game_code}
+
+    def get(self, game_code):
+        """Look up a game and mark it as recently used; None if unknown"""
+        game = self.games.get(game_code)
+        if game is not None:
+            self.last_access[game_code] = self.clock()
+        return game
+
+    def get_default(self):
+        """The default room used by clients that do not pick a game code"""
+        game = self.get(DEFAULT_GAME_CODE)
+        if game is None:
+            self.create_game(DEFAULT_GAME_CODE)
+            game = self.games[DEFAULT_GAME_CODE]
+        return game
+
+    def remove_game(self, game_code):
+        """Shut down and drop a game"""
+        with self.lock:
+            return self._remove_locked(game_code)
+
+    def _remove_locked(self, game_code):
+        game = self.games.pop(game_code, None)
+        self.last_access.pop(game_code, None)
+        if game is None:
+            return False
+        game.shutdown()
+        return True
+
+    def evict_idle(self):
+        """Remove games idle for longer than idle_timeout; returns the evicted codes"""
+        with self.lock:
+            return self._evict_idle_locked()
+
+    def _evict_idle_locked(self):
+        cutoff = self.clock() - self.idle_timeout
+        evicted = [code for code, last in self.last_access.items()
+                   if last < cutoff and code != DEFAULT_GAME_CODE]
+        for code in evicted:
+            self._remove_locked(code)
+        return evicted
+
+    def _ensure_sweep(self):
+        if self.sweep_handle is None and self.sweep_interval:
+            self.sweep_handle = self.scheduler.schedule(self.sweep_interval, self._sweep)
+
+    def _sweep(self):
+        self.sweep_handle = None
+        evicted = self.evict_idle()
+        if evicted:
+            print(f"Evicted idle games: {', '.join(evicted)}")
+        self._ensure_sweep()
+
+    def list_games(self):
+        """Summary of every hosted game for the admin panel"""
+        now = self.clock()
+        return [{
+            'game_code': code,
+            'teams_count': len(game.teams),
+            'started': game.game_started,
+            'paused': game.game_paused,
+            'current_question': game.current_question_index + 1,
+            'total_questions': len(game.questions),
+            'idle_seconds': round(now - self.last_access.get(code, now))
+        } for code, game in list(self.games.items())]
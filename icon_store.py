@@ -0,0 +1,121 @@
+import base64
+import binascii
+import hashlib
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps
+
+from async_mode import run_blocking
+
+MAX_ICON_BYTES = 2 * 1024 * 1024  # Same limit as the upload form
+MAX_ICON_PIXELS = 4096 * 4096  # Larger images are refused before they are decoded
+THUMBNAIL_SIZE = 96  # Icons are shown at up to 40 CSS pixels, so this covers 2x screens
+ICON_FORMATS = {'PNG', 'JPEG', 'GIF', 'WEBP'}
+# Leading bytes of each accepted format, checked before any work is queued
+SIGNATURES = (b'\x89PNG\r\n\x1a\n', b'\xff\xd8\xff', b'GIF87a', b'GIF89a')
+
+def icon_url(icon_hash):
+    return f'/icons/{icon_hash}'
+
+def decode_data_url(data_url):
+    """Raw image bytes of a data:image/ URL; raises ValueError if it cannot be an icon"""
+    if not isinstance(data_url, str) or not data_url.startswith('data:image/'):
+        raise ValueError('Invalid image format')
+    header, _, payload = data_url.partition(',')
+    if not header.endswith(';base64') or len(payload) > MAX_ICON_BYTES * 4 // 3 + 4:
+        raise ValueError('Invalid image data')
+    try:
+        data = base64.b64decode(payload, validate=True)
+    except (binascii.Error, ValueError):
+        raise ValueError('Invalid image data')
+    if not (data.startswith(SIGNATURES) or (data[:4] == b'RIFF' and data[8:12] == b'WEBP')):
+        raise ValueError('Invalid image format')
+    return data
+
+def make_thumbnail(data):
+    """Decode, validate and downscale an image to a PNG of at most THUMBNAIL_SIZE pixels a side"""
+    with Image.open(io.BytesIO(data)) as image:
+        if image.format not in ICON_FORMATS:
+            raise ValueError(f'Unsupported image format {image.format}')
+        if image.width * image.height > MAX_ICON_PIXELS:
+            raise ValueError('Image is too large')
+        image.seek(0)  # First frame of an animation
+        image = ImageOps.exif_transpose(image).convert('RGBA')
+        image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.LANCZOS)
+        output = io.BytesIO()
+        image.save(output, 'PNG', optimize=True)
+        return output.getvalue()
+
+class IconStore:
+    """
+    Content-addressed store of team icons.
+
+    Uploaded images are decoded, validated and downscaled on a worker pool,
+    never on the request thread, and kept under the SHA-256 of the
+    thumbnail, so a thousand teams with the same icon store it once. Teams
+    and every payload refer to an icon by its /icons/<hash> URL only; the
+    bytes behind a hash never change, so they can be cached forever. With a
+    directory, thumbnails are also written there and survive a restart.
+    """
+
+    def __init__(self, directory=None, workers=2):
+        self.directory = directory
+        self.icons = {}  # hash -> PNG bytes
+        self.sources = {}  # SHA-256 of an uploaded image -> hash of its thumbnail, so re-uploads skip the work
+        self.lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='icon-worker')
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def submit(self, data, on_ready):
+        """Process raw image bytes in the background, then call on_ready(icon_hash)"""
+        def work():
+            try:
+                icon_hash = self.add(data)
+            except Exception as e:
+                print(f"Icon processing error: {e}")
+                return
+            on_ready(icon_hash)
+        return self.pool.submit(work)
+
+    def add(self, data):
+        """Store the thumbnail of raw image bytes; returns its hash"""
+        source = hashlib.sha256(data).digest()
+        with self.lock:
+            icon_hash = self.sources.get(source)
+        if icon_hash is not None:
+            return icon_hash
+        thumbnail = run_blocking(make_thumbnail, data)  # Off the event loop under eventlet/gevent
+        icon_hash = hashlib.sha256(thumbnail).hexdigest()
+        with self.lock:
+            self.sources[source] = icon_hash
+            if icon_hash in self.icons:
+                return icon_hash
+            self.icons[icon_hash] = thumbnail
+        if self.directory:
+            path = os.path.join(self.directory, f'{icon_hash}.png')
+            if not os.path.exists(path):
+                with open(path + '.tmp', 'wb') as f:
+                    f.write(thumbnail)
+                os.replace(path + '.tmp', path)
+        return icon_hash
+
+    def get(self, icon_hash):
+        """PNG bytes of an icon, or None"""
+        with self.lock:
+            thumbnail = self.icons.get(icon_hash)
+        if thumbnail is not None or not self.directory:
+            return thumbnail
+        if len(icon_hash) != 64 or not all(c in '0123456789abcdef' for c in icon_hash):
+            return None  # Never build a path from anything but a hash
+        try:
+            with open(os.path.join(self.directory, f'{icon_hash}.png'), 'rb') as f:
+                thumbnail = f.read()
+        except OSError:
+            return None
+        with self.lock:
+            self.icons[icon_hash] = thumbnail
+        return thumbnail
@@ -0,0 +1,210 @@
+import json
+import os
+import pickle
+import shutil
+import threading
+
+from async_mode import run_blocking
+from scheduler import get_scheduler
+
+class GameJournal:
+    """
+    Append-only event journal with periodic snapshots for one game.
+
+    Every state change is appended as a JSON line carrying a sequence number.
+    Writes are buffered and fsync'd in batches by a flush scheduled on the
+    shared timer wheel, so recording an event never waits for the disk.
+    Every snapshot_every events the game hands over a snapshot of its state.
+    The journal file is rotated on the spot, and the snapshot is pickled and
+    fsync'd on a background thread, so the game's command queue does not
+    wait for it either. Once the snapshot is durable the rotated journals it
+    covers are deleted; until then recovery still finds their events, and
+    it only replays the events recorded after the snapshot.
+    """
+
+    JOURNAL_FILE = 'journal.jsonl'
+    SNAPSHOT_FILE = 'snapshot.pickle'
+
+    def __init__(self, directory, fsync_interval=0.05, snapshot_every=10000, scheduler=None):
+        self.directory = directory
+        self.journal_path = os.path.join(directory, self.JOURNAL_FILE)
+        self.snapshot_path = os.path.join(directory, self.SNAPSHOT_FILE)
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.scheduler = scheduler or get_scheduler()
+        self.file = None
+        self.seq = 0
+        self.events_since_snapshot = 0
+        self.dirty = False
+        self.flush_handle = None
+        self.snapshot_thread = None  # Writes the latest snapshot while the game carries on
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _rotated_journals(self):
+        """(last seq, path) of the journals rotated out for a snapshot, oldest first"""
+        rotated = []
+        for name in os.listdir(self.directory):
+            prefix, _, seq = name[:-len('.jsonl')].rpartition('.')
+            if name.endswith('.jsonl') and prefix == 'journal' and seq.isdigit():
+                rotated.append((int(seq), os.path.join(self.directory, name)))
+        return sorted(rotated)
+
+    def load(self):
+        """Read the last snapshot (or None) and the events recorded after it.
+
+        A torn final line from a crash is cut off so new events append cleanly.
+        """
+        snapshot = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+        base_seq = snapshot['seq'] if snapshot else 0
+
+        events = []
+        # Journals rotated out for a snapshot that did not become durable come first
+        for _, path in self._rotated_journals():
+            with open(path, 'rb') as f:
+                records, _ = self._parse(f.read())
+            events.extend(record for record in records if record['seq'] > base_seq)
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'rb') as f:
+                content = f.read()
+            records, good_end = self._parse(content)
+            if good_end < len(content):
+                with open(self.journal_path, 'r+b') as f:
+                    f.truncate(good_end)
+            events.extend(record for record in records if record['seq'] > base_seq)
+
+        last_seq = events[-1]['seq'] if events else base_seq
+        self.seq = last_seq
+        self.events_since_snapshot = len(events)
+        return snapshot, events
+
+    @staticmethod
+    def _parse(content):
+        """Decode journal lines; returns (records, byte length of the intact prefix)"""
+        # Only the final line can be torn, so drop anything after the last newline
+        good_end = content.rfind(b'\n') + 1
+        body = content[:good_end].decode('utf-8')
+        if not body:
+            return [], 0
+        try:
+            # One C-level decode for the whole journal is far faster than a loads() per line
+            return json.loads('[' + ','.join(body.splitlines()) + ']'), good_end
+        except ValueError:
+            pass
+
+        # Damaged line somewhere: keep every record before it
+        records = []
+        good_end = 0
+        for line in body.splitlines(keepends=True):
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+            good_end += len(line.encode('utf-8'))
+        return records, good_end
+
+    def open(self):
+        """Start accepting new events (call after load)"""
+        self.file = open(self.journal_path, 'a', encoding='utf-8')
+
+    def append(self, event, data):
+        """Buffer one event; it reaches the disk with the next batched fsync"""
+        with self.lock:
+            if self.file is None:
+                return
+            self.seq += 1
+            self.file.write(json.dumps({'seq': self.seq, 'event': event, 'data': data},
+                                       separators=(',', ':')) + '\n')
+            self.events_since_snapshot += 1
+            self.dirty = True
+            if self.flush_handle is None:
+                self.flush_handle = self.scheduler.schedule(self.fsync_interval, self.flush)
+
+    def flush(self):
+        """Write buffered events and fsync them"""
+        with self.lock:
+            self.flush_handle = None
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self.file is None or not self.dirty:
+            return
+        self.file.flush()
+        run_blocking(os.fsync, self.file.fileno())
+        self.dirty = False
+
+    def needs_snapshot(self):
+        if self.snapshot_thread is not None and self.snapshot_thread.is_alive():
+            return False  # The previous snapshot is still being written
+        return bool(self.snapshot_every) and self.events_since_snapshot >= self.snapshot_every
+
+    def write_snapshot(self, state):
+        """Start a new journal and store state (a copy the game no longer changes) in the background"""
+        with self.lock:
+            if self.file is None:
+                return  # Closed
+            state = dict(state, seq=self.seq)
+            # Events up to seq move to a rotated journal, which the snapshot makes redundant
+            self.file.close()
+            rotated_path = os.path.join(self.directory, f'journal.{self.seq}.jsonl')
+            os.replace(self.journal_path, rotated_path)
+            unsynced = rotated_path if self.dirty else None
+            self.file = open(self.journal_path, 'w', encoding='utf-8')
+            self.dirty = False
+            self.events_since_snapshot = 0
+            self.snapshot_thread = threading.Thread(target=self._store_snapshot, args=(state, unsynced),
+                                                    name='journal-snapshot', daemon=True)
+            self.snapshot_thread.start()
+
+    def _store_snapshot(self, state, unsynced):
+        try:
+            # Pickling a large game and the fsyncs run on a native thread under eventlet/gevent
+            if unsynced is not None:
+                run_blocking(self._fsync_path, unsynced)
+            run_blocking(self._write_snapshot_file, state)
+        except Exception as e:
+            print(f"Error writing snapshot to {self.snapshot_path}: {e}")
+            return
+        for seq, path in self._rotated_journals():
+            if seq <= state['seq']:
+                os.remove(path)
+
+    @staticmethod
+    def _fsync_path(path):
+        with open(path, 'rb') as f:
+            os.fsync(f.fileno())
+
+    def _write_snapshot_file(self, state):
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def wait_for_snapshot(self):
+        """Block until a snapshot being written in the background is stored"""
+        thread = self.snapshot_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def close(self):
+        """Flush outstanding events, finish any snapshot and stop writing"""
+        with self.lock:
+            if self.flush_handle:
+                self.flush_handle.cancel()
+                self.flush_handle = None
+            self._flush_locked()
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+        # No snapshot can start once the file is closed
+        self.wait_for_snapshot()
+
+    def destroy(self):
+        """Close the journal and delete everything it stored (the game is over)"""
+        self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
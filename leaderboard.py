@@ -0,0 +1,160 @@
+from bisect import bisect_left, insort
+
+class Leaderboard:
+    """
+    Score-ordered leaderboard that is updated in place as scores change.
+
+    Teams are grouped into buckets by score, and a Fenwick tree over the
+    bucket sizes answers "how many teams score higher than X" in O(log S),
+    where S is the highest score seen. Ties keep the order in which teams
+    were added, matching a stable sort of the teams by score.
+    """
+
+    def __init__(self, initial_capacity=64):
+        self.scores = {}  # team_id -> score
+        self.ordinals = {}  # team_id -> insertion ordinal (tie-breaker)
+        self.buckets = {}  # score -> sorted list of (ordinal, team_id)
+        self.next_ordinal = 0
+        self.capacity = initial_capacity
+        self.tree = [0] * (self.capacity + 1)  # Fenwick tree indexed by score + 1
+
+    def __len__(self):
+        return len(self.scores)
+
+    def __contains__(self, team_id):
+        return team_id in self.scores
+
+    # Fenwick tree helpers
+
+    def _tree_add(self, score, delta):
+        i = score + 1
+        while i <= self.capacity:
+            self.tree[i] += delta
+            i += i & -i
+
+    def _tree_prefix(self, score):
+        """Number of teams with a score <= score"""
+        i = min(score + 1, self.capacity)
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def _grow(self, score):
+        """Rebuild the tree so that it can hold the given score"""
+        while self.capacity <= score:
+            self.capacity *= 2
+        self.tree = [0] * (self.capacity + 1)
+        for bucket_score, bucket in self.buckets.items():
+            self._tree_add(bucket_score, len(bucket))
+
+    def _count_above(self, score):
+        """Number of teams with a strictly higher score"""
+        return len(self.scores) - self._tree_prefix(score)
+
+    # Mutation
+
+    def add(self, team_id, score=0):
+        """Add a team to the leaderboard (or update it if already present)"""
+        if team_id in self.scores:
+            self.update(team_id, score)
+            return
+        self.ordinals[team_id] = self.next_ordinal
+        self.next_ordinal += 1
+        self._place(team_id, score)
+
+    def remove(self, team_id):
+        """Remove a team from the leaderboard"""
+        if team_id not in self.scores:
+            return
+        self._unplace(team_id)
+        del self.ordinals[team_id]
+
+    def update(self, team_id, score):
+        """Move a team to its new score"""
+        if team_id not in self.scores:
+            self.add(team_id, score)
+            return
+        if self.scores[team_id] == score:
+            return
+        self._unplace(team_id)
+        self._place(team_id, score)
+
+    def _place(self, team_id, score):
+        if score < 0:
+            raise ValueError('Leaderboard scores must be non-negative')
+        if score >= self.capacity:
+            self._grow(score)
+        self.scores[team_id] = score
+        insort(self.buckets.setdefault(score, []), (self.ordinals[team_id], team_id))
+        self._tree_add(score, 1)
+
+    def _unplace(self, team_id):
+        score = self.scores.pop(team_id)
+        bucket = self.buckets[score]
+        entry = (self.ordinals[team_id], team_id)
+        del bucket[bisect_left(bucket, entry)]
+        if not bucket:
+            del self.buckets[score]
+        self._tree_add(score, -1)
+
+    # Queries
+
+    def score_of(self, team_id):
+        return self.scores.get(team_id)
+
+    def rank_of(self, team_id):
+        """0-based position of a team on the leaderboard, or None if unknown"""
+        if team_id not in self.scores:
+            return None
+        score = self.scores[team_id]
+        bucket = self.buckets[score]
+        return self._count_above(score) + bisect_left(bucket, (self.ordinals[team_id], team_id))
+
+    def _score_at(self, position):
+        """Score of the team at a 0-based position (Fenwick descent)"""
+        # Position p from the top is position (n - 1 - p) from the bottom;
+        # find the smallest score whose prefix count exceeds it.
+        target = len(self.scores) - position
+        index = 0
+        step = 1
+        while step * 2 <= self.capacity:
+            step *= 2
+        while step:
+            if index + step <= self.capacity and self.tree[index + step] < target:
+                index += step
+                target -= self.tree[index]
+            step //= 2
+        return index  # tree index + 1 == score + 1
+
+    def range(self, start=0, count=None):
+        """Team ids at positions [start, start + count) in leaderboard order"""
+        total = len(self.scores)
+        if start < 0:
+            start = 0
+        if start >= total:
+            return []
+        end = total if count is None else min(total, start + count)
+
+        score = self._score_at(start)
+        bucket = self.buckets[score]
+        offset = start - self._count_above(score)
+        result = []
+        while len(result) < end - start:
+            for _, team_id in bucket[offset:offset + (end - start - len(result))]:
+                result.append(team_id)
+            if len(result) >= end - start:
+                break
+            # Walk down to the next non-empty score bucket
+            remaining_below = self._tree_prefix(score - 1) if score > 0 else 0
+            if remaining_below == 0:
+                break
+            score = self._score_at(total - remaining_below)
+            bucket = self.buckets[score]
+            offset = 0
+        return result
+
+    def top(self, k):
+        """Team ids of the k highest-scoring teams"""
+        return self.range(0, k)
@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+Load generator for the trivia server
+Usage: python load_test.py [--teams 200] [--players 1000] [--questions 5] [--window 20]
+                           [--arrival lognormal] [--async-mode eventlet] [--json report.json]
+
+Starts app.py on a free localhost port, creates the teams and players over
+the REST API, connects every player over Socket.IO and plays a game: the
+admin opens each question, players answer at times drawn from the arrival
+distribution within the question window, and the next question follows.
+Reports latency percentiles of /api/answer, how long new_question and
+score_update took to reach the players, and the server's CPU and memory.
+
+All players run on one asyncio event loop (raw HTTP/1.1 and wsproto
+websockets), so thousands of them fit in this process.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlencode
+
+from wsproto import ConnectionType, WSConnection
+from wsproto.events import AcceptConnection, CloseConnection, Ping, RejectConnection, Request, TextMessage
+
+from question_bank import load_bank
+from traffic import percentiles
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+HOST = '127.0.0.1'
+ADMIN_PASSWORD = 'admin123'
+SETUP_CONCURRENCY = 50  # Teams created / sockets connected at a time before the game
+
+def free_port():
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+def start_server(port, async_mode=None, env=None):
+    """Run app.py on localhost:port; returns the process once it answers HTTP"""
+    server_env = dict(os.environ, TRIVIA_HOST=HOST, TRIVIA_PORT=str(port), **(env or {}))
+    if async_mode:
+        server_env['TRIVIA_ASYNC_MODE'] = async_mode
+    server = subprocess.Popen([sys.executable, 'app.py'], cwd=ROOT, env=server_env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f'The server exited with status {server.returncode}')
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError('The server did not start within 60 seconds')
+
+class HTTPClient:
+    """Keep-alive HTTP/1.1 connection with a cookie jar; enough for the app's JSON API"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.cookies = {}
+        self.reader = None
+        self.writer = None
+
+    def cookie_header(self):
+        return '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+
+    async def request(self, method, path, json_body=None, form=None):
+        """Returns (status, body bytes); reconnects once if a kept-alive connection was closed"""
+        for attempt in range(2):
+            reused = self.writer is not None
+            if not reused:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                return await self._exchange(method, path, json_body, form)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self.close()
+                if not reused or attempt:
+                    raise
+
+    async def _exchange(self, method, path, json_body, form):
+        body = b''
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {self.host}:{self.port}']
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            lines.append('Content-Type: application/json')
+        elif form is not None:
+            body = urlencode(form).encode()
+            lines.append('Content-Type: application/x-www-form-urlencoded')
+        lines.append(f'Content-Length: {len(body)}')
+        if self.cookies:
+            lines.append(f'Cookie: {self.cookie_header()}')
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode() + body)
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('Connection closed')
+        status = int(status_line.split()[1])
+        length = None
+        chunked = close = False
+        while True:
+            line = (await self.reader.readline()).decode('latin-1').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            name, value = name.lower(), value.strip()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'set-cookie':
+                cookie_name, _, cookie_value = value.split(';', 1)[0].partition('=')
+                self.cookies[cookie_name] = cookie_value
+            elif name == 'transfer-encoding':
+                chunked = value.lower() == 'chunked'
+            elif name == 'connection':
+                close = value.lower() == 'close'
+        if chunked:
+            data = b''
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if not size:
+                    break
+                data += chunk[:-2]
+        elif length is not None:
+            data = await self.reader.readexactly(length)
+        elif status in (204, 304):
+            data = b''
+        else:
+            data = await self.reader.read()
+            close = True
+        if close:
+            self.close()
+        return status, data
+
+    async def json(self, method, path, json_body=None, form=None):
+        status, data = await self.request(method, path, json_body, form)
+        return status, json.loads(data) if data else None
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+class SocketIOClient:
+    """Socket.IO client over a raw websocket; calls on_event(event, data, received_at) for every event"""
+
+    def __init__(self, host, port, on_event, cookie=''):
+        self.host = host
+        self.port = port
+        self.on_event = on_event
+        self.cookie = cookie
+        self.ws = WSConnection(ConnectionType.CLIENT)
+        self.connected = asyncio.Event()
+        self.closed = asyncio.Event()
+        self.writer = None
+        self.task = None
+        self.partial = ''
+
+    async def connect(self, timeout=30):
+        reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        headers = [(b'cookie', self.cookie.encode())] if self.cookie else []
+        self.writer.write(self.ws.send(Request(host=f'{self.host}:{self.port}',
+                                               target='/socket.io/?EIO=4&transport=websocket',
+                                               extra_headers=headers)))
+        self.task = asyncio.ensure_future(self._read(reader))
+        await asyncio.wait_for(self.connected.wait(), timeout)
+
+    def _send_text(self, text):
+        if self.writer is not None and not self.writer.is_closing():
+            self.writer.write(self.ws.send(TextMessage(data=text)))
+
+    async def _read(self, reader):
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                received_at = time.perf_counter()
+                self.ws.receive_data(data)
+                for event in self.ws.events():
+                    if isinstance(event, TextMessage):
+                        self.partial += event.data
+                        if event.message_finished:
+                            text, self.partial = self.partial, ''
+                            self._handle(text, received_at)
+                    elif isinstance(event, Ping):
+                        self.writer.write(self.ws.send(event.response()))
+                    elif isinstance(event, (CloseConnection, RejectConnection)):
+                        return
+                    elif isinstance(event, AcceptConnection):
+                        pass  # Engine.IO's open packet follows
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.closed.set()
+
+    def _handle(self, text, received_at):
+        if text == '2':
+            self._send_text('3')  # Engine.IO heartbeat
+        elif text.startswith('0'):
+            self._send_text('40')  # Engine.IO is open; connect to the default namespace
+        elif text.startswith('40'):
+            self.connected.set()
+        elif text.startswith('42'):
+            event, *args = json.loads(text[2:])
+            self.on_event(event, args[0] if args else None, received_at)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        if self.task is not None:
+            self.task.cancel()
+
+class ServerMonitor:
+    """Samples a process's CPU use and resident memory from /proc (Linux only)"""
+
+    def __init__(self, pid, interval=0.5):
+        self.pid = pid
+        self.interval = interval
+        self.ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+        self.samples = []  # (wall time, CPU seconds, RSS bytes)
+        self.available = os.path.exists(f'/proc/{pid}/stat')
+
+    def sample(self):
+        with open(f'/proc/{self.pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / self.ticks  # utime + stime
+        rss = 0
+        with open(f'/proc/{self.pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    rss = int(line.split()[1]) * 1024
+        self.samples.append((time.perf_counter(), cpu, rss))
+
+    async def run(self):
+        while self.available:
+            try:
+                self.sample()
+            except OSError:
+                return  # The server exited
+            await asyncio.sleep(self.interval)
+
+    def report(self, since=None):
+        samples = [sample for sample in self.samples if since is None or sample[0] >= since]
+        if len(samples) < 2:
+            return None
+        busiest = max((later[1] - earlier[1]) / (later[0] - earlier[0])
+                      for earlier, later in zip(samples, samples[1:]))
+        return {
+            'cpu_percent_mean': (samples[-1][1] - samples[0][1]) / (samples[-1][0] - samples[0][0]) * 100,
+            'cpu_percent_peak': busiest * 100,
+            'rss_mib_start': samples[0][2] / 2 ** 20,
+            'rss_mib_peak': max(sample[2] for sample in samples) / 2 ** 20,
+        }
+
+class Stats:
+    def __init__(self):
+        self.answer_latencies = []
+        self.answer_results = {}  # 'accepted' / rejection error / HTTP status -> count
+        self.new_question_delays = []
+        self.score_update_delays = []
+        self.question_opened_at = {}  # question_number -> perf_counter when the admin opened it
+        self.events = {}  # Socket.IO event -> count received
+
+    def count(self, table, key):
+        table[key] = table.get(key, 0) + 1
+
+class Player:
+    def __init__(self, name, team, port, stats, answers, accuracy):
+        self.name = name
+        self.team = team  # Shared dict: team_id, players, answered
+        self.http = HTTPClient(HOST, port)
+        self.stats = stats
+        self.answers = answers  # question_text -> correct answer, from the question bank
+        self.accuracy = accuracy
+        self.socket = None
+        self.questions = {}  # question_number -> new_question payload
+        self.question_seen = {}  # question_number -> asyncio.Event
+        self.expected_scores = []  # (team score, answer sent at) waiting for a score_update
+        self.seen_score = (None, None)  # Last team score seen in a score_update and when
+
+    def question_event(self, number):
+        return self.question_seen.setdefault(number, asyncio.Event())
+
+    def on_event(self, event, data, received_at):
+        self.stats.count(self.stats.events, event)
+        if event == 'new_question':
+            number = data['question_number']
+            if number not in self.questions:
+                self.questions[number] = data
+                opened_at = self.stats.question_opened_at.get(number)
+                if opened_at is not None:
+                    self.stats.new_question_delays.append(received_at - opened_at)
+                self.question_event(number).set()
+        elif event == 'score_update':
+            for change in data.get('changed', ()):
+                if change.get('team_id') == self.team['team_id'] and 'score' in change:
+                    self.seen_score = (change['score'], received_at)
+                    self._match_scores()
+
+    def expect_score(self, score, sent_at):
+        self.expected_scores.append((score, sent_at))
+        self._match_scores()
+
+    def _match_scores(self):
+        score, seen_at = self.seen_score
+        if score is None:
+            return
+        waiting = []
+        for expected, sent_at in self.expected_scores:
+            if score >= expected:
+                self.stats.score_update_delays.append(seen_at - sent_at)
+            else:
+                waiting.append((expected, sent_at))
+        self.expected_scores = waiting
+
+    async def join(self):
+        if self.team['team_id'] is None:
+            status, result = await self.http.json('POST', '/api/teams', {
+                'team_name': self.team['name'], 'player_name': self.name})
+            if status != 200:
+                raise RuntimeError(f"Could not create {self.team['name']}: {result}")
+            self.team['team_id'] = result['team_id']
+        else:
+            status, result = await self.http.json('POST', f"/api/teams/{self.team['team_id']}/join",
+                                                  {'player_name': self.name})
+            if status != 200:
+                raise RuntimeError(f"{self.name} could not join {self.team['name']}: {result}")
+
+    async def connect(self):
+        self.socket = SocketIOClient(HOST, self.http.port, self.on_event, self.http.cookie_header())
+        await self.socket.connect()
+
+    async def answer(self, number, delay, window):
+        """Answer question `number` after delay seconds, once its new_question has arrived"""
+        await asyncio.sleep(delay)
+        try:
+            await asyncio.wait_for(self.question_event(number).wait(), window)
+        except asyncio.TimeoutError:
+            self.stats.count(self.stats.answer_results, 'new_question never arrived')
+            return
+        question = self.questions[number]
+        correct = self.answers.get(question['question_text'])
+        if correct is not None and random.random() < self.accuracy:
+            answer = correct
+        else:
+            answer = random.choice(question['options']) if question.get('options') else 'no idea'
+        sent_at = time.perf_counter()
+        status, result = await self.http.json('POST', '/api/answer', {'answer': answer})
+        self.stats.answer_latencies.append(time.perf_counter() - sent_at)
+        if status != 200:
+            self.stats.count(self.stats.answer_results, f'HTTP {status}')
+        elif not result.get('success'):
+            self.stats.count(self.stats.answer_results, result.get('error', 'rejected'))
+        else:
+            self.stats.count(self.stats.answer_results, 'accepted')
+            if result.get('points_earned'):
+                for teammate in self.team['players']:
+                    teammate.expect_score(result['team_score'], sent_at)
+
+def arrival_delay(distribution, window, rng):
+    """Seconds after a question opens at which one player answers"""
+    latest = window * 0.95
+    if distribution == 'uniform':
+        delay = rng.uniform(0, latest)
+    elif distribution == 'burst':
+        delay = rng.expovariate(2.0)  # Most answers within the first second
+    elif distribution == 'exponential':
+        delay = rng.expovariate(4.0 / window)
+    else:
+        # Reading and thinking time: most answers cluster around a third of the window, with a long tail
+        delay = rng.lognormvariate(0, 0.5) * window / 3
+    return min(max(delay, 0.05), latest)
+
+async def limited(coroutines, limit):
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coroutine):
+        async with semaphore:
+            return await coroutine
+    return await asyncio.gather(*(run(coroutine) for coroutine in coroutines))
+
+async def play(options, port, monitor):
+    stats = Stats()
+    rng = random.Random(options.seed)
+    random.seed(options.seed)
+    admin = HTTPClient(HOST, port)
+    status, _ = await admin.request('POST', '/admin/login', form={'password': ADMIN_PASSWORD})
+    if not admin.cookies:
+        raise RuntimeError(f'Admin login failed (HTTP {status})')
+
+    answers = {question.question_text: question.correct_answer
+               for question in load_bank(os.path.join(ROOT, os.environ.get('TRIVIA_QUESTIONS', 'questions.md')))}
+    teams = [{'name': f'Load Team {number}', 'team_id': None, 'players': []} for number in range(options.teams)]
+    players = []
+    for number in range(options.players):
+        team = teams[number % options.teams]
+        player = Player(f'Player {number}', team, port, stats, answers, options.accuracy)
+        team['players'].append(player)
+        players.append(player)
+
+    setup_start = time.perf_counter()
+    captains = [team['players'][0] for team in teams]
+    await limited((player.join() for player in captains), SETUP_CONCURRENCY)
+    await limited((player.join() for player in players if player not in captains), SETUP_CONCURRENCY)
+    joined_at = time.perf_counter()
+    await limited((player.connect() for player in players), SETUP_CONCURRENCY)
+    connected_at = time.perf_counter()
+    print(f"{options.teams} teams, {options.players} players joined in {joined_at - setup_start:.1f} s "
+          f"and connected in {connected_at - joined_at:.1f} s")
+
+    game_start = time.perf_counter()
+    for number in range(1, options.questions + 1):
+        stats.question_opened_at[number] = time.perf_counter()
+        path = '/admin/api/game/start' if number == 1 else '/admin/api/next_question'
+        status, result = await admin.json('POST', path)
+        if status != 200 or not result.get('success'):
+            print(f"Question {number} could not be opened: {result}")
+            break
+        answers = [player.answer(number, arrival_delay(options.arrival, options.window, rng), options.window)
+                   for player in players if rng.random() < options.answer_share]
+        await asyncio.gather(asyncio.gather(*answers), asyncio.sleep(options.window))
+        print(f"Question {number}: {len(answers)} answers")
+    await asyncio.sleep(1)  # Last coalesced score updates
+    game_time = time.perf_counter() - game_start
+    await admin.request('POST', '/admin/api/game/stop')
+
+    for player in players:
+        player.socket.close()
+        player.http.close()
+    admin.close()
+    return stats, game_time, monitor.report(since=game_start)
+
+def build_report(options, stats, game_time, server):
+    def milliseconds(values):
+        return {f'p{point}': None if value is None else round(value * 1000, 1)
+                for point, value in percentiles(values).items()}
+
+    return {
+        'teams': options.teams, 'players': options.players, 'questions': options.questions,
+        'window_s': options.window, 'arrival': options.arrival, 'async_mode': options.async_mode or 'default',
+        'answers': {'count': len(stats.answer_latencies), 'per_second': round(len(stats.answer_latencies) / game_time, 1),
+                    'results': stats.answer_results, 'latency_ms': milliseconds(stats.answer_latencies)},
+        'new_question_delay_ms': dict(milliseconds(stats.new_question_delays), count=len(stats.new_question_delays)),
+        'score_update_delay_ms': dict(milliseconds(stats.score_update_delays), count=len(stats.score_update_delays)),
+        'events_received': stats.events,
+        'server': server,
+    }
+
+def print_report(report):
+    print(f"\n{report['players']} players in {report['teams']} teams, {report['questions']} questions of "
+          f"{report['window_s']} s, {report['arrival']} arrivals, async mode {report['async_mode']}")
+    answers = report['answers']
+    print(f"answers: {answers['count']} ({answers['per_second']}/s); " +
+          ', '.join(f'{result}: {count}' for result, count in sorted(answers['results'].items())))
+    print(f"{'':>24} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for label, latency in (('/api/answer', dict(answers['latency_ms'], count=answers['count'])),
+                           ('new_question delivery', report['new_question_delay_ms']),
+                           ('score_update delivery', report['score_update_delay_ms'])):
+        print(f"{label:>24} {latency['count']:>7} " +
+              ' '.join(f"{'-' if latency[point] is None else latency[point]:>8}" for point in ('p50', 'p95', 'p99')))
+    server = report['server']
+    if server:
+        print(f"server CPU {server['cpu_percent_mean']:.0f}% mean, {server['cpu_percent_peak']:.0f}% peak; "
+              f"RSS {server['rss_mib_start']:.0f} MiB at the start, {server['rss_mib_peak']:.0f} MiB peak")
+    else:
+        print("server CPU and memory: not available (needs /proc)")
+
+async def main_async(options):
+    port = options.port or free_port()
+    server = start_server(port, options.async_mode)
+    monitor = ServerMonitor(server.pid)
+    monitor_task = asyncio.ensure_future(monitor.run())
+    try:
+        stats, game_time, server_usage = await play(options, port, monitor)
+    finally:
+        monitor_task.cancel()
+        server.terminate()
+        server.wait()
+    return build_report(options, stats, game_time, server_usage)
+
+def main():
+    parser = argparse.ArgumentParser(description='Play a simulated game against a local trivia server')
+    parser.add_argument('--teams', type=int, default=200)
+    parser.add_argument('--players', type=int, default=1000, help='players in total, spread evenly over the teams')
+    parser.add_argument('--questions', type=int, default=5)
+    parser.add_argument('--window', type=float, default=20, help='seconds each question stays open')
+    parser.add_argument('--arrival', choices=['lognormal', 'uniform', 'exponential', 'burst'], default='lognormal',
+                        help='when players answer within the window')
+    parser.add_argument('--answer-share', type=float, default=1.0,
+                        help='share of players who answer each question (teammates of a team that already '
+                             'answered are turned away, as in the game)')
+    parser.add_argument('--accuracy', type=float, default=0.5,
+                        help='chance that a player knows the answer (otherwise they guess)')
+    parser.add_argument('--async-mode', choices=['threading', 'eventlet', 'gevent'],
+                        help='TRIVIA_ASYNC_MODE for the server')
+    parser.add_argument('--port', type=int, help='port for the server (default: a free one)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='also write the report here as JSON')
+    options = parser.parse_args()
+    if options.players < options.teams:
+        parser.error('every team needs at least one player')
+
+    report = asyncio.run(main_async(options))
+    print_report(report)
+    if options.json:
+        with open(options.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,31 +1,70 @@
 import uuid
 from datetime import datetime, timedelta
 import time
-import threading
+import math
+from collections import OrderedDict
+from itertools import count, islice
+from leaderboard import Leaderboard
+from scheduler import get_scheduler
+from command_queue import CommandQueue, serialized
+from answer_store import AnswerStore, TEXT_ANSWER
+from serializer import RawJSON, dumpb, extend
+
+BONUS_TIER_SECONDS = 10  # One bonus point is lost every this many seconds
+
+TEAM_EVENTS = ('create_team', 'join_team', 'leave_team', 'update_team_name', 'add_player_to_team',
+               'remove_player_from_team', 'delete_team', 'set_team_icon')
+QUESTION_EVENTS = ('next_question', 'set_question', 'use_question_set', 'start_game', 'stop_game',
+                   'pause_game', 'resume_game')
+# Version counters each recorded change moves, besides status_version which every change moves.
+# Team lists carry scores and the scoreboard carries team names, icons and players.
+EVENT_VERSIONS = {
+    **{event: ('teams_version', 'scores_version') for event in TEAM_EVENTS},
+    **{event: ('question_version',) for event in QUESTION_EVENTS},
+    'submit_answer': ('teams_version', 'scores_version'),
+}
+
+_question_uids = count()
+
+def question_positions(questions):
+    """uid -> index of every question, to follow questions into a reloaded list"""
+    return {question.uid: index for index, question in enumerate(questions)}
+
+def normalize_player_name(player_name):
+    """Normalize a player name for case-insensitive comparisons"""
+    return player_name.lower().strip()
 
 class Team:
+    __slots__ = ('id', 'name', 'icon', 'players', 'player_keys', 'score', 'ordinal', 'created_at')
+    
     def __init__(self, name, team_id=None, icon=None):
         self.id = team_id or str(uuid.uuid4())
         self.name = name
-        self.icon = icon  # Base64 encoded image or file path
+        self.icon = icon  # /icons/<hash> URL of the team's icon (older games: a base64 data URL)
         self.players = []
+        self.player_keys = set()  # Normalized player names for O(1) duplicate checks
         self.score = 0
-        self.answers = {}
+        self.ordinal = None  # Dense per-game index into the answer arrays, set by TriviaGame
         self.created_at = datetime.now()
     
     def add_player(self, player_name):
         # Case-insensitive check for duplicate names within the team
-        player_name_lower = player_name.lower().strip()
-        for existing_player in self.players:
-            if existing_player.lower().strip() == player_name_lower:
-                return False  # Duplicate name within same team
+        player_key = normalize_player_name(player_name)
+        if player_key in self.player_keys:
+            return False  # Duplicate name within same team
         
         self.players.append(player_name)
+        self.player_keys.add(player_key)
         return True
     
+    def has_player(self, player_name):
+        """Case-insensitive membership check"""
+        return normalize_player_name(player_name) in self.player_keys
+    
     def remove_player(self, player_name):
         if player_name in self.players:
             self.players.remove(player_name)
+            self.player_keys.discard(normalize_player_name(player_name))
             return True
         return False
     
@@ -43,11 +82,32 @@ class Team:
         }
 
 class Question:
-    def __init__(self, question_text, question_type, options=None, correct_answer=None):
+    __slots__ = ('question_text', 'question_type', 'options', 'correct_answer', 'source_file', 'source_line',
+                 'category', 'difficulty', 'tags', 'uid', '_option_lookup', '_public_json')
+    
+    def __init__(self, question_text, question_type, options=None, correct_answer=None,
+                 source_file=None, source_line=None, category=None, difficulty=None, tags=()):
         self.question_text = question_text
         self.question_type = question_type  # 'multiple_choice' or 'fill_in_blank'
         self.options = options or []
         self.correct_answer = correct_answer
+        self.source_file = source_file  # Where the question was parsed from, if known
+        self.source_line = source_line
+        self.category = category  # Optional metadata used by QuestionBank filters
+        self.difficulty = difficulty
+        self.tags = tags
+        # Identity across hot reloads: copies of a moved question and edits of its block keep it
+        self.uid = next(_question_uids)
+        self._option_lookup = None
+        self._public_json = None
+    
+    def option_index(self, answer):
+        """Index of an answer among the options, or None if it is not one of them"""
+        if self._option_lookup is None:
+            self._option_lookup = {}
+            for index, option in enumerate(self.options):
+                self._option_lookup.setdefault(option, index)
+        return self._option_lookup.get(answer) if isinstance(answer, str) else None
     
     def to_dict(self, include_answer=False):
         data = {
@@ -55,12 +115,36 @@ class Question:
             'question_type': self.question_type,
             'options': self.options
         }
+        if self.category:
+            data['category'] = self.category
+        if self.difficulty:
+            data['difficulty'] = self.difficulty
         if include_answer:
             data['correct_answer'] = self.correct_answer
         return data
+    
+    def public_json(self):
+        """to_dict() encoded once, as RawJSON.
+        
+        Questions are not edited in place: a reload parses edited blocks into
+        new Questions, so a new payload comes with them. Anything that does
+        change a field must call invalidate_payload().
+        """
+        if self._public_json is None:
+            self._public_json = RawJSON(dumpb(self.to_dict()))
+        return self._public_json
+    
+    def invalidate_payload(self):
+        self._public_json = None
 
 class TriviaGame:
-    def __init__(self):
+    def __init__(self, scheduler=None, max_teams=None, max_players_per_team=None):
+        self.game_code = None  # Set when hosted by a GameRegistry
+        self.max_teams = max_teams  # None means unlimited
+        self.max_players_per_team = max_players_per_team
+        # Every public mutation (and every read that walks game state) runs through
+        # this single-writer queue, so concurrent requests never interleave
+        self.commands = CommandQueue()
         self.teams = {}
         self.questions = []
         self.current_question_index = 0
@@ -68,18 +152,96 @@ class TriviaGame:
         self.game_paused = False
         # Timer functionality
         self.question_timer_duration = 60  # seconds
-        self.question_start_time = None
-        self.timer_thread = None
-        self.timer_callbacks = []  # For WebSocket updates
+        self.question_start_time = None  # Monotonic timestamp, see self.clock
+        self.clock = time.monotonic
+        self.wall_clock = time.time  # Only used to turn timer deadlines into times clients understand
+        self.scheduler = scheduler or get_scheduler()  # Shared timer wheel drives every game's timer
+        self.timer_handle = None  # Next scheduled tick (bonus tier boundary or expiry) for the current question
+        self.timer_generation = 0  # Bumped whenever the timer is restarted or cancelled
+        self.current_bonus_tier = None
+        self.timer_callbacks = []  # For WebSocket updates: called with get_timer_state() at start, resume and tier boundaries
         self.timer_expired_callbacks = []  # Called when timer expires
-        self.answer_times = {}  # Store when each team answered: {question_index: {team_id: timestamp}}
+        self.bonus_tier_callbacks = []  # Called when the available bonus points change
+        # Answers, correctness and answer times, stored per question in arrays indexed by team ordinal
+        self.answer_store = AnswerStore()
+        self.next_team_ordinal = 0
+        # Normalized player name -> {team_id: None}, in join order (dict used as ordered set)
+        self.player_index = {}
+        self.leaderboard = Leaderboard()  # Kept in step with team.score
+        self.question_bank = None  # QuestionBank that use_question_set picks from
+        self.question_set = None  # Bank indices of the questions in play, if picked from the bank
+        self.journal = None  # Optional GameJournal, see attach_journal
+        self.storage = None  # Optional storage backend (see storage.py) that every change is recorded to
+        self.score_feed = None  # Optional ScoreboardFeed (see score_feed.py) told about every change
+        self.replaying = False  # True while state is being rebuilt from the journal
+        # Monotonic versions of what clients fetch, bumped after every change they cover, so
+        # responses can be revalidated (ETag/304) without reading game state. The epoch keeps
+        # a restarted server from reusing a version for different content.
+        self.version_epoch = uuid.uuid4().hex[:8]
+        self.teams_version = 0
+        self.scores_version = 0
+        self.question_version = 0
+        self.status_version = 0
+        self.response_cache = OrderedDict()  # Serialized responses by endpoint and version, LRU kept by app.py
     
-    def create_team(self, team_name, player_name, icon=None):
-        team = Team(team_name, icon=icon)
-        team.add_player(player_name)
+    def _index_player(self, team_id, player_name):
+        """Record a player's membership in the player index"""
+        player_key = normalize_player_name(player_name)
+        self.player_index.setdefault(player_key, {})[team_id] = None
+    
+    def _unindex_player(self, team_id, player_name):
+        """Drop a player's membership from the player index"""
+        player_key = normalize_player_name(player_name)
+        team_ids = self.player_index.get(player_key)
+        if team_ids is None:
+            return
+        team_ids.pop(team_id, None)
+        if not team_ids:
+            del self.player_index[player_key]
+    
+    def _add_player(self, team_id, player_name):
+        """Add a player to a team and keep the player index in sync"""
+        success = self.teams[team_id].add_player(player_name)
+        if success:
+            self._index_player(team_id, player_name)
+        return success
+    
+    def _remove_player(self, team_id, player_name):
+        """Remove a player from a team and keep the player index in sync"""
+        success = self.teams[team_id].remove_player(player_name)
+        if success:
+            self._unindex_player(team_id, player_name)
+        return success
+    
+    def _team_is_full(self, team):
+        return (self.max_players_per_team is not None
+                and len(team.players) >= self.max_players_per_team)
+    
+    def _remove_team(self, team_id):
+        """Delete a team and drop all of its players from the player index"""
+        team = self.teams.pop(team_id)
+        self.leaderboard.remove(team_id)
+        self.answer_store.clear_team(team.ordinal)
+        for player_name in team.players:
+            self._unindex_player(team_id, player_name)
+        return team
+    
+    @serialized
+    def create_team(self, team_name, player_name, icon=None, team_id=None):
+        if self.max_teams is not None and len(self.teams) >= self.max_teams:
+            return {'success': False, 'error': 'This game is full'}
+        
+        team = Team(team_name, team_id=team_id, icon=icon)
+        team.ordinal = self.next_team_ordinal
+        self.next_team_ordinal += 1
         self.teams[team.id] = team
+        self.leaderboard.add(team.id, team.score)
+        self._add_player(team.id, player_name)
+        self._record('create_team', team_name=team_name, player_name=player_name,
+                     icon=icon, team_id=team.id)
         return {'success': True, 'team_id': team.id}
     
+    @serialized
     def join_team(self, team_id, player_name):
         if team_id not in self.teams:
             return {'success': False, 'error': 'Team not found'}
@@ -87,69 +249,204 @@ class TriviaGame:
         team = self.teams[team_id]
         
         # Check if player name already exists in THIS team (case-insensitive)
-        player_name_lower = player_name.lower().strip()
-        for existing_player in team.players:
-            if existing_player.lower().strip() == player_name_lower:
-                return {'success': False, 'error': 'You are already a member of this team'}
+        if team.has_player(player_name):
+            return {'success': False, 'error': 'You are already a member of this team'}
+        
+        if self._team_is_full(team):
+            return {'success': False, 'error': 'Team is full'}
         
         # Add player to team
-        success = team.add_player(player_name)
+        success = self._add_player(team_id, player_name)
         if success:
+            self._record('join_team', team_id=team_id, player_name=player_name)
             return {'success': True}
         else:
             return {'success': False, 'error': 'Failed to join team'}
     
+    @serialized
     def leave_team(self, team_id, player_name):
         if team_id in self.teams:
             team = self.teams[team_id]
-            success = team.remove_player(player_name)
+            success = self._remove_player(team_id, player_name)
             
             # Remove empty teams
             if team.is_empty():
-                del self.teams[team_id]
+                self._remove_team(team_id)
             
+            if success:
+                self._record('leave_team', team_id=team_id, player_name=player_name)
             return success
         return False
     
+    @serialized
     def find_player_team(self, player_name):
-        # Case-insensitive search for player name
-        player_name_lower = player_name.lower().strip()
-        for team_id, team in self.teams.items():
-            for existing_player in team.players:
-                if existing_player.lower().strip() == player_name_lower:
-                    return team_id
-        return None
+        # Case-insensitive lookup; the earliest membership wins if a name is on several teams
+        team_ids = self.player_index.get(normalize_player_name(player_name))
+        if not team_ids:
+            return None
+        return next(iter(team_ids))
     
+    @serialized
     def get_teams(self):
         return [team.to_dict() for team in self.teams.values()]
     
+    @serialized
     def load_questions(self, questions):
         self.questions = questions
+        self._encode_questions()
+        self._bump_versions('question_version')
+    
+    @serialized
+    def swap_questions(self, old_questions, new_questions, positions=None):
+        """Switch to a reloaded question list if this game still plays old_questions.
+        
+        The current question and recorded answers follow their questions (by
+        uid; positions is question_positions(new_questions) if already built)
+        to wherever they moved. Answers to a question whose options changed are
+        re-coded against the new options; answers to a deleted question are
+        dropped (team scores are kept).
+        """
+        if self.questions and self.questions is not old_questions:
+            return False
+        if positions is None:
+            positions = question_positions(new_questions)
+        
+        def new_index(question_index):
+            if question_index >= len(old_questions):
+                return None
+            return positions.get(old_questions[question_index].uid)
+        
+        sheets = {}
+        for question_index, sheet in self.answer_store.questions.items():
+            moved_to = new_index(question_index)
+            if moved_to is None:
+                continue
+            old_options = old_questions[question_index].options
+            new_options = new_questions[moved_to].options
+            if old_options != new_options:
+                sheet.remap_options(old_options, new_options)
+            sheets[moved_to] = sheet
+        self.answer_store.questions = sheets
+        
+        if old_questions and self.current_question_index >= len(old_questions):
+            self.current_question_index = len(new_questions)  # Past the last question: still finished
+        else:
+            moved_to = new_index(self.current_question_index)
+            # A deleted current question leaves the game on whatever now has its place
+            self.current_question_index = (moved_to if moved_to is not None
+                                           else min(self.current_question_index, max(len(new_questions) - 1, 0)))
+        self.questions = new_questions
+        self._encode_questions()
+        self._bump_versions('question_version')
+        return True
+    
+    @serialized
+    def swap_question_bank(self, old_bank, new_bank):
+        """Pick future question sets from new_bank if this game used old_bank.
+        
+        Questions already picked stay as they are.
+        """
+        if self.question_bank is old_bank:
+            self.question_bank = new_bank
+    
+    def _encode_questions(self):
+        """Encode the public payload of every question now rather than when it is first shown"""
+        if not isinstance(self.questions, list):
+            return  # A QuestionPack decodes questions lazily; they are encoded when first shown
+        for question in self.questions:
+            question.public_json()
+    
+    @serialized
+    def use_question_set(self, indices):
+        """Play the given questions of self.question_bank from the first one.
+        
+        Answers to the previous questions are dropped (team scores are kept).
+        """
+        if self.game_started:
+            return {'success': False, 'error': 'Stop the game before changing its questions'}
+        self.questions = [self.question_bank.questions[index] for index in indices]
+        self._encode_questions()
+        self.question_set = list(indices)
+        self.current_question_index = 0
+        self.answer_store = AnswerStore()
+        self._record('use_question_set', indices=self.question_set)
+        return {'success': True, 'message': f'Loaded {len(indices)} questions'}
     
-    def get_current_question(self):
+    @serialized
+    def get_current_question(self, **fields):
+        """The current question's payload as RawJSON, with any extra fields, or None.
+        
+        Only the few per-game fields are encoded here; the question itself
+        was encoded when it was loaded.
+        """
         if self.current_question_index < len(self.questions):
             question = self.questions[self.current_question_index]
-            return {
+            return extend(question.public_json(), {
                 'question_number': self.current_question_index + 1,
                 'total_questions': len(self.questions),
                 'game_started': self.game_started,
                 'game_paused': self.game_paused,
-                **question.to_dict()
-            }
+                **fields
+            })
         return None
     
+    @serialized
+    def get_question_broadcast(self):
+        """The current question as sent to every team, plus the changes for teams that already answered it.
+
+        Returns (payload, {team_id: delta}); payload is RawJSON, or None when
+        there is no current question. Only teams whose view differs get a delta.
+        """
+        fields = {'already_answered': False}
+        timer = self.get_timer_state()
+        if timer is not None and timer['time_remaining'] > 0:
+            fields['timer'] = timer
+        payload = self.get_current_question(**fields)
+        if payload is None:
+            return None, {}
+
+        deltas = {}
+        sheet = self.answer_store.get(self.current_question_index)
+        if sheet is not None and sheet.answered_count:
+            options = self.questions[self.current_question_index].options
+            for team in self.teams.values():
+                if sheet.has_answered(team.ordinal):
+                    deltas[team.id] = {
+                        'question_number': self.current_question_index + 1,
+                        'already_answered': True,
+                        'submitted_answer': sheet.answer(team.ordinal, options)
+                    }
+        return payload, deltas
+    
+    @serialized
+    def get_team_question(self, team_id):
+        """The current question as one team sees it: whether and what it answered, and the running timer"""
+        fields = {'already_answered': self.has_team_answered_question(team_id, self.current_question_index)}
+        if fields['already_answered']:
+            fields['submitted_answer'] = self.get_team_answer(team_id, self.current_question_index)
+        timer = self.get_timer_state()
+        if timer is not None and timer['time_remaining'] > 0:
+            fields['timer'] = timer
+        return self.get_current_question(**fields)
+    
+    @serialized
     def has_team_answered_question(self, team_id, question_index):
         """Check if a team has already answered a specific question"""
-        if team_id not in self.teams:
+        team = self.teams.get(team_id)
+        if team is None:
             return False
-        return question_index in self.teams[team_id].answers
+        return self.answer_store.has_answered(question_index, team.ordinal)
     
+    @serialized
     def get_team_answer(self, team_id, question_index):
         """Get a team's answer for a specific question"""
-        if team_id not in self.teams:
+        team = self.teams.get(team_id)
+        sheet = self.answer_store.get(question_index)
+        if team is None or sheet is None:
             return None
-        return self.teams[team_id].answers.get(question_index)
+        return sheet.answer(team.ordinal, self.questions[question_index].options)
     
+    @serialized
     def submit_answer(self, team_id, answer):
         if team_id not in self.teams:
             return {'success': False, 'error': 'Team not found'}
@@ -166,28 +463,39 @@ class TriviaGame:
         bonus_points = 0
         
         if self.question_start_time:
-            answer_time_seconds = time.time() - self.question_start_time
+            answer_time_seconds = self.clock() - self.question_start_time
             bonus_points = self.get_bonus_points(answer_time_seconds)
-            
-            # Store answer time
-            if self.current_question_index not in self.answer_times:
-                self.answer_times[self.current_question_index] = {}
-            self.answer_times[self.current_question_index][team_id] = answer_time_seconds
         
-        question = self.questions[self.current_question_index]
+        result = self._apply_answer(team_id, self.current_question_index, answer,
+                                    answer_time_seconds, bonus_points)
+        self._record('submit_answer', team_id=team_id, question_index=self.current_question_index,
+                     answer=answer, answer_time=answer_time_seconds, bonus_points=bonus_points)
+        return result
+    
+    def _apply_answer(self, team_id, question_index, answer, answer_time_seconds, bonus_points):
+        """Grade and store an accepted answer and update the team's score"""
+        question = self.questions[question_index]
         team = self.teams[team_id]
         
-        # Store the answer
-        team.answers[self.current_question_index] = answer
-        
         # Check if answer is correct
         is_correct = self._check_answer(answer, question.correct_answer)
         
+        # Store the answer (multiple choice answers as their option index) with its answer time
+        choice = question.option_index(answer)
+        self.answer_store.for_question(question_index).record(
+            team.ordinal,
+            TEXT_ANSWER if choice is None else choice,
+            answer,
+            is_correct,
+            answer_time_seconds
+        )
+        
         # Calculate points (1 for correct + bonus)
         points_earned = 0
         if is_correct:
             points_earned = 1 + bonus_points
             team.score += points_earned
+            self.leaderboard.update(team_id, team.score)
         
         return {
             'success': True,
@@ -204,66 +512,130 @@ class TriviaGame:
             return submitted_answer.strip().lower() == correct_answer.strip().lower()
         return submitted_answer == correct_answer
     
+    @serialized
     def next_question(self):
         self.current_question_index += 1
+        self._record('next_question')
         # Start timer for new question
         if self.game_started and not self.game_paused:
             self.start_question_timer()
     
-    def get_scoreboard(self):
-        scoreboard = []
-        for team in self.teams.values():
-            scoreboard.append({
-                'team_name': team.name,
-                'team_icon': team.icon,
-                'score': team.score,
-                'players': team.players
-            })
+    def _scoreboard_entry(self, team):
+        return {
+            'team_name': team.name,
+            'team_icon': team.icon,
+            'score': team.score,
+            'players': team.players
+        }
+    
+    @serialized
+    def get_scoreboard(self, offset=0, limit=None):
+        """Scoreboard in rank order, optionally paged; read straight off the leaderboard"""
+        return [self._scoreboard_entry(self.teams[team_id])
+                for team_id in self.leaderboard.range(offset, limit)]
+    
+    @serialized
+    def get_scoreboard_entries(self, team_ids=None):
+        """Scoreboard entries with their id, 1-based rank and tie-break order.
         
-        # Sort by score descending
-        scoreboard.sort(key=lambda x: x['score'], reverse=True)
-        return scoreboard
+        Every team's in rank order, or only those of team_ids that still exist.
+        """
+        if team_ids is None:
+            team_ids = self.leaderboard.range()
+            ranks = count(1)
+        else:
+            team_ids = [team_id for team_id in team_ids if team_id in self.teams]
+            ranks = (self.leaderboard.rank_of(team_id) + 1 for team_id in team_ids)
+        entries = []
+        for team_id, rank in zip(team_ids, ranks):
+            team = self.teams[team_id]
+            entry = self._scoreboard_entry(team)
+            entry['players'] = list(team.players)  # A copy, so later changes show up as differences
+            entry['team_id'] = team_id
+            entry['order'] = team.ordinal  # Equal scores rank in this order
+            entry['rank'] = rank
+            entries.append(entry)
+        return entries
     
+    @serialized
+    def get_team_rank(self, team_id):
+        """1-based leaderboard rank of a team, or None if the team does not exist"""
+        rank = self.leaderboard.rank_of(team_id)
+        return rank + 1 if rank is not None else None
+    
+    @serialized
     def start_game(self):
         self.game_started = True
         self.game_paused = False
+        self._record('start_game')
         # Start timer for first question
         self.start_question_timer()
         return {'success': True, 'message': 'Game started'}
     
+    @serialized
     def stop_game(self):
         self.game_started = False
         self.game_paused = True
         self.question_start_time = None  # Stop timer
+        self._cancel_timer_events()
+        self._record('stop_game')
         return {'success': True, 'message': 'Game stopped'}
     
+    @serialized
+    def shutdown(self):
+        """Stop the game and release its timer so it can be discarded"""
+        self.stop_game()
+        self.timer_callbacks = []
+        self.timer_expired_callbacks = []
+        self.bonus_tier_callbacks = []
+        if self.score_feed is not None:
+            self.score_feed.stop()
+            self.score_feed = None
+        if self.journal is not None:
+            # A discarded game is over; drop its journal so it is not recovered on restart
+            self.journal.destroy()
+            self.journal = None
+        if self.storage is not None:
+            self.storage.end_game(self.game_code)
+            self.storage = None
+    
+    @serialized
     def pause_game(self):
         if self.game_started:
             self.game_paused = True
+            self._cancel_timer_events()
+            self._record('pause_game')
             return {'success': True, 'message': 'Game paused'}
         return {'success': False, 'message': 'Game is not started'}
     
+    @serialized
     def resume_game(self):
         if self.game_started:
             self.game_paused = False
+            self._schedule_timer_events()
+            self._record('resume_game')
             return {'success': True, 'message': 'Game resumed'}
         return {'success': False, 'message': 'Game is not started'}
     
+    @serialized
     def set_question(self, question_index):
         if 0 <= question_index < len(self.questions):
             self.current_question_index = question_index
+            self._record('set_question', question_index=question_index)
             return {'success': True, 'message': f'Set to question {question_index + 1}'}
         return {'success': False, 'message': 'Invalid question index'}
     
-    def get_game_status(self):
+    @serialized
+    def get_game_status(self, include_team_answers=True, offset=0, limit=None):
+        """Game status; the per-team answer list is optional and can be paged with offset/limit"""
         status = {
             'started': self.game_started,
             'paused': self.game_paused,
             'current_question': self.current_question_index + 1,
             'total_questions': len(self.questions),
             'teams_count': len(self.teams),
-            # Timer information
-            'timer': {
+            # Timer information (with its deadline while the timer runs)
+            'timer': self.get_timer_state() or {
                 'time_remaining': self.get_time_remaining(),
                 'total_time': self.question_timer_duration,
                 'bonus_points': self.get_bonus_points(self.question_timer_duration - self.get_time_remaining())
@@ -280,32 +652,10 @@ class TriviaGame:
                 'options': current_question.options if hasattr(current_question, 'options') else None
             }
             
-            # Add team answer status
-            team_answers = []
-            for team_id, team in self.teams.items():
-                has_answered = self.has_team_answered_question(team_id, self.current_question_index)
-                answer_data = {
-                    'team_id': team_id,
-                    'team_name': team.name,
-                    'team_icon': team.icon,
-                    'has_answered': has_answered,
-                    'submitted_answer': None,
-                    'is_correct': None
-                }
-                
-                if has_answered:
-                    submitted_answer = self.get_team_answer(team_id, self.current_question_index)
-                    answer_data['submitted_answer'] = submitted_answer
-                    answer_data['is_correct'] = (submitted_answer.lower().strip() == 
-                                               current_question.correct_answer.lower().strip())
-                
-                team_answers.append(answer_data)
-            
-            status['team_answers'] = team_answers
-            
-            # Add summary stats
-            answered_count = sum(1 for t in team_answers if t['has_answered'])
-            correct_count = sum(1 for t in team_answers if t['is_correct'])
+            # Summary counts are kept up to date by submit_answer, so this is O(1)
+            sheet = self.answer_store.get(self.current_question_index)
+            answered_count = sheet.answered_count if sheet else 0
+            correct_count = sheet.correct_count if sheet else 0
             
             status['answer_summary'] = {
                 'teams_answered': answered_count,
@@ -313,9 +663,35 @@ class TriviaGame:
                 'correct_answers': correct_count,
                 'completion_percentage': round((answered_count / len(self.teams)) * 100) if self.teams else 0
             }
+            
+            if include_team_answers:
+                status['team_answers'] = self._team_answer_page(sheet, current_question, offset, limit)
         
         return status
     
+    def _team_answer_page(self, sheet, question, offset=0, limit=None):
+        """Per-team answer status for one page of teams, read straight from the answer arrays"""
+        offset = max(0, offset)
+        stop = None if limit is None else offset + max(0, limit)
+        team_answers = []
+        for team in islice(self.teams.values(), offset, stop):
+            answer_data = {
+                'team_id': team.id,
+                'team_name': team.name,
+                'team_icon': team.icon,
+                'has_answered': False,
+                'submitted_answer': None,
+                'is_correct': None
+            }
+            
+            if sheet is not None and sheet.has_answered(team.ordinal):
+                answer_data['has_answered'] = True
+                answer_data['submitted_answer'] = sheet.answer(team.ordinal, question.options)
+                answer_data['is_correct'] = sheet.is_correct(team.ordinal)
+            
+            team_answers.append(answer_data)
+        return team_answers
+    
     def add_timer_callback(self, callback):
         """Add callback function for timer updates (WebSocket events)"""
         self.timer_callbacks.append(callback)
@@ -325,72 +701,150 @@ class TriviaGame:
         if not self.question_start_time or self.game_paused:
             return self.question_timer_duration
         
-        elapsed = time.time() - self.question_start_time
+        elapsed = self.clock() - self.question_start_time
         remaining = max(0, self.question_timer_duration - elapsed)
-        return int(remaining)
+        # Round up so the countdown shows 60..1 and only reaches 0 at the deadline
+        return math.ceil(remaining)
     
     def get_bonus_points(self, answer_time_seconds):
         """Calculate bonus points based on answer time - deduct 1 point every 10 seconds"""
         # Start with 6 points, deduct 1 point every 10 seconds
         # 0-10s: 6 points, 10-20s: 5 points, 20-30s: 4 points, 30-40s: 3 points, 40-50s: 2 points, 50-60s: 1 point, 60s+: 0 points
-        points = 6 - int(answer_time_seconds // 10)
+        points = 6 - int(answer_time_seconds // BONUS_TIER_SECONDS)
         return max(0, points)  # Ensure points never go below 0
     
+    @serialized
+    def get_timer_state(self):
+        """The running timer as clients count it down, or None if no timer is running.
+
+        Clients get the absolute deadline and the end of every bonus tier in
+        wall-clock milliseconds, plus server_time so they can estimate their
+        clock offset, and count down locally; the server only pushes this
+        again on resume and at tier boundaries.
+        """
+        if not self.game_started or not self.question_start_time or self.game_paused:
+            return None
+        now = self.clock()
+        wall_now = self.wall_clock()
+        started = wall_now - (now - self.question_start_time)
+        time_remaining = self.get_time_remaining()
+        duration = self.question_timer_duration
+        return {
+            'time_remaining': time_remaining,
+            'bonus_points': self.get_bonus_points(duration - time_remaining),
+            'total_time': duration,
+            'server_time': round(wall_now * 1000),
+            'deadline': round((started + duration) * 1000),
+            # Bonus points on offer until each tier ends; none after the last
+            'bonus_schedule': [
+                {'ends_at': round((started + tier_end) * 1000),
+                 'bonus_points': self.get_bonus_points(tier_end - BONUS_TIER_SECONDS)}
+                for tier_end in range(BONUS_TIER_SECONDS, duration + BONUS_TIER_SECONDS, BONUS_TIER_SECONDS)
+                if self.get_bonus_points(tier_end - BONUS_TIER_SECONDS) > 0
+            ]
+        }
+    
+    @serialized
     def start_question_timer(self):
         """Start the timer for the current question"""
-        if self.game_paused:
+        if self.game_paused or self.replaying:
             return
             
-        self.question_start_time = time.time()
-        
-        # Initialize answer times for current question if not exists
-        if self.current_question_index not in self.answer_times:
-            self.answer_times[self.current_question_index] = {}
+        self.question_start_time = self.clock()
         
-        # Start timer thread for WebSocket updates
-        if self.timer_thread and self.timer_thread.is_alive():
-            return  # Timer already running
-            
-        self.timer_thread = threading.Thread(target=self._timer_worker, daemon=True)
-        self.timer_thread.start()
+        # Restarting replaces any ticks still pending for the previous question
+        self._schedule_timer_events()
+        self._bump_versions('question_version')  # New deadline
     
-    def _timer_worker(self):
-        """Background worker for timer updates"""
-        while self.question_start_time and not self.game_paused:
-            remaining = self.get_time_remaining()
-            
-            # Notify callbacks (WebSocket updates)
+    def _cancel_timer_events(self):
+        """Drop any pending timer ticks; stale ticks are also ignored by generation"""
+        self.timer_generation += 1
+        if self.timer_handle:
+            self.timer_handle.cancel()
+            self.timer_handle = None
+    
+    def _schedule_timer_events(self):
+        """Schedule the next timer tick for the current question on the shared scheduler"""
+        self._cancel_timer_events()
+        if not self.question_start_time or self.game_paused:
+            return
+        self.current_bonus_tier = None
+        # First tick fires right away (clients get the deadline), later ones only at bonus tier boundaries
+        self.timer_handle = self.scheduler.schedule_at(self.clock(), self._on_timer_tick, self.timer_generation)
+    
+    def _on_timer_tick(self, generation):
+        """Timer tick: advance timer state on the writer, then notify callbacks outside it"""
+        tick = self._advance_timer(generation)
+        if tick is None:
+            return
+        remaining, bonus_points, tier_changed, timer = tick
+        
+        # Notify callbacks (WebSocket updates); clients count down between ticks on their own
+        if timer is not None:
             for callback in self.timer_callbacks:
                 try:
-                    callback(remaining, self.get_bonus_points(60 - remaining))
+                    callback(timer)
                 except Exception as e:
                     print(f"Timer callback error: {e}")
-            
-            if remaining <= 0:
-                # Timer expired - notify expired callbacks
-                for callback in self.timer_expired_callbacks:
-                    try:
-                        callback()
-                    except Exception as e:
-                        print(f"Timer expired callback error: {e}")
-                break
-                
-            time.sleep(1)  # Update every second
+        
+        if tier_changed:
+            for callback in self.bonus_tier_callbacks:
+                try:
+                    callback(bonus_points)
+                except Exception as e:
+                    print(f"Bonus tier callback error: {e}")
+        
+        if remaining <= 0:
+            # Timer expired - notify expired callbacks
+            for callback in self.timer_expired_callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"Timer expired callback error: {e}")
+    
+    @serialized
+    def _advance_timer(self, generation):
+        """Compute this tick's state and schedule the next tick at the next bonus tier boundary or expiry"""
+        if generation != self.timer_generation or not self.question_start_time or self.game_paused:
+            return None  # Stale tick from a restarted, paused or stopped timer
+        
+        remaining = self.get_time_remaining()
+        bonus_points = self.get_bonus_points(self.question_timer_duration - remaining)
+        tier_changed = bonus_points != self.current_bonus_tier
+        self.current_bonus_tier = bonus_points
+        
+        if remaining <= 0:
+            self.timer_handle = None
+            return remaining, bonus_points, tier_changed, None
+        elapsed = self.clock() - self.question_start_time
+        next_tick = min((math.floor(elapsed / BONUS_TIER_SECONDS) + 1) * BONUS_TIER_SECONDS,
+                        self.question_timer_duration)
+        self.timer_handle = self.scheduler.schedule_at(self.question_start_time + next_tick,
+                                                       self._on_timer_tick, generation)
+        return remaining, bonus_points, tier_changed, self.get_timer_state()
     
+    @serialized
     def pause_question_timer(self):
         """Pause the current question timer"""
         if self.question_start_time:
             # Store elapsed time
-            elapsed = time.time() - self.question_start_time
+            elapsed = self.clock() - self.question_start_time
             self.question_start_time = None
+            self._cancel_timer_events()
+            self._bump_versions('question_version')
             return elapsed
         return 0
     
+    @serialized
     def resume_question_timer(self, elapsed_time=0):
         """Resume the question timer with previous elapsed time"""
-        self.question_start_time = time.time() - elapsed_time
-        self.start_question_timer()
+        if self.game_paused:
+            return
+        self.question_start_time = self.clock() - elapsed_time
+        self._schedule_timer_events()
+        self._bump_versions('question_version')
     
+    @serialized
     def update_team_name(self, team_id, new_name):
         """Update a team's name"""
         if team_id not in self.teams:
@@ -400,8 +854,19 @@ class TriviaGame:
             return {'success': False, 'error': 'Team name cannot be empty'}
         
         self.teams[team_id].name = new_name.strip()
+        self._record('update_team_name', team_id=team_id, new_name=new_name)
         return {'success': True, 'message': f'Team name updated to "{new_name.strip()}"'}
     
+    @serialized
+    def set_team_icon(self, team_id, icon):
+        """Attach a processed icon to a team"""
+        if team_id not in self.teams:
+            return {'success': False, 'error': 'Team not found'}
+        self.teams[team_id].icon = icon
+        self._record('set_team_icon', team_id=team_id, icon=icon)
+        return {'success': True}
+    
+    @serialized
     def add_player_to_team(self, team_id, player_name):
         """Add a player to a team (admin function)"""
         if team_id not in self.teams:
@@ -416,18 +881,25 @@ class TriviaGame:
         if player_name in self.teams[team_id].players:
             return {'success': False, 'error': 'Player already in this team'}
         
+        if self._team_is_full(self.teams[team_id]):
+            return {'success': False, 'error': 'Team is full'}
+        
         # Remove player from any other team first
         current_team_id = self.find_player_team(player_name)
         if current_team_id:
-            self.teams[current_team_id].remove_player(player_name)
+            self._remove_player(current_team_id, player_name)
             # Remove team if it becomes empty
             if self.teams[current_team_id].is_empty():
-                del self.teams[current_team_id]
+                self._remove_team(current_team_id)
+            # Recorded as its own event so storage drops the old membership (and team) too
+            self._record('remove_player_from_team', team_id=current_team_id, player_name=player_name)
         
         # Add to new team
-        self.teams[team_id].add_player(player_name)
+        self._add_player(team_id, player_name)
+        self._record('add_player_to_team', team_id=team_id, player_name=player_name)
         return {'success': True, 'message': f'Added "{player_name}" to team'}
     
+    @serialized
     def remove_player_from_team(self, team_id, player_name):
         """Remove a player from a team (admin function)"""
         if team_id not in self.teams:
@@ -436,20 +908,130 @@ class TriviaGame:
         if not player_name or player_name not in self.teams[team_id].players:
             return {'success': False, 'error': 'Player not found in this team'}
         
-        self.teams[team_id].remove_player(player_name)
+        self._remove_player(team_id, player_name)
         
         # Remove team if it becomes empty
         if self.teams[team_id].is_empty():
-            del self.teams[team_id]
+            self._remove_team(team_id)
+            self._record('remove_player_from_team', team_id=team_id, player_name=player_name)
             return {'success': True, 'message': f'Removed "{player_name}" and deleted empty team'}
         
+        self._record('remove_player_from_team', team_id=team_id, player_name=player_name)
         return {'success': True, 'message': f'Removed "{player_name}" from team'}
     
+    @serialized
     def delete_team(self, team_id):
         """Delete an entire team (admin function)"""
         if team_id not in self.teams:
             return {'success': False, 'error': 'Team not found'}
         
         team_name = self.teams[team_id].name
-        del self.teams[team_id]
-        return {'success': True, 'message': f'Deleted team "{team_name}"'}
\ No newline at end of file
+        self._remove_team(team_id)
+        self._record('delete_team', team_id=team_id)
+        return {'success': True, 'message': f'Deleted team "{team_name}"'}
+    
+    # Persistence: journal, snapshots and replay
+    
+    def _bump_versions(self, *names):
+        for name in names:
+            setattr(self, name, getattr(self, name) + 1)
+        self.status_version += 1
+    
+    def _record(self, event, **data):
+        """Bump the versions a change affects; pass it to storage, journal and score feed unless replaying"""
+        self._bump_versions(*EVENT_VERSIONS.get(event, ()))
+        if self.replaying:
+            return
+        if self.score_feed is not None and 'scores_version' in EVENT_VERSIONS.get(event, ()):
+            self.score_feed.mark_changed(data.get('team_id'))
+        if self.storage is not None:
+            self.storage.record(self, event, data)
+        if self.journal is None:
+            return
+        self.journal.append(event, data)
+        if self.journal.needs_snapshot():
+            self.journal.write_snapshot(self.to_snapshot())
+    
+    def to_snapshot(self):
+        """Compact picklable copy of the game state (questions are not included)"""
+        return {
+            'teams': [(team.id, team.name, team.icon, list(team.players), team.score, team.ordinal)
+                      for team in self.teams.values()],
+            'next_team_ordinal': self.next_team_ordinal,
+            'current_question_index': self.current_question_index,
+            'game_started': self.game_started,
+            'game_paused': self.game_paused,
+            'question_set': self.question_set,
+            'answers': self.answer_store.to_state()
+        }
+    
+    def _restore_snapshot(self, snapshot):
+        self.teams = {}
+        self.player_index = {}
+        self.leaderboard = Leaderboard()
+        for team_id, name, icon, players, score, ordinal in snapshot['teams']:
+            team = Team(name, team_id=team_id, icon=icon)
+            team.ordinal = ordinal
+            team.score = score
+            self.teams[team_id] = team
+            self.leaderboard.add(team_id, score)
+            for player_name in players:
+                self._add_player(team_id, player_name)
+        self.next_team_ordinal = snapshot['next_team_ordinal']
+        self.current_question_index = snapshot['current_question_index']
+        self.game_started = snapshot['game_started']
+        self.game_paused = snapshot['game_paused']
+        if snapshot.get('question_set') is not None:
+            self.question_set = snapshot['question_set']
+            self.questions = [self.question_bank.questions[index] for index in self.question_set]
+        self.answer_store = AnswerStore.from_state(snapshot['answers'])
+    
+    def _replay_answer(self, team_id, question_index, answer, answer_time, bonus_points):
+        team = self.teams.get(team_id)
+        if team is not None and not self.answer_store.has_answered(question_index, team.ordinal):
+            self._apply_answer(team_id, question_index, answer, answer_time, bonus_points)
+    
+    def _event_handlers(self):
+        """Journal event name -> method that re-applies it"""
+        return {
+            'create_team': self.create_team,
+            'join_team': self.join_team,
+            'leave_team': self.leave_team,
+            'submit_answer': self._replay_answer,
+            'next_question': self.next_question,
+            'set_question': self.set_question,
+            'start_game': self.start_game,
+            'stop_game': self.stop_game,
+            'pause_game': self.pause_game,
+            'resume_game': self.resume_game,
+            'update_team_name': self.update_team_name,
+            'set_team_icon': self.set_team_icon,
+            'add_player_to_team': self.add_player_to_team,
+            'remove_player_from_team': self.remove_player_from_team,
+            'delete_team': self.delete_team,
+            'use_question_set': self.use_question_set,
+        }
+    
+    @serialized
+    def attach_journal(self, journal):
+        """Recover state from a journal (last snapshot + replay) and record to it from now on.
+        
+        Questions (and question_bank) must already be set, since replayed answers are graded against them.
+        """
+        snapshot, events = journal.load()
+        self.replaying = True
+        try:
+            if snapshot is not None:
+                self._restore_snapshot(snapshot)
+            handlers = self._event_handlers()
+            for record in events:
+                handlers[record['event']](**record['data'])
+        finally:
+            self.replaying = False
+        journal.open()
+        self.journal = journal
+        
+        # Timer deadlines do not survive a restart; give the current question a fresh timer
+        if self.game_started and not self.game_paused:
+            self.start_question_timer()
+        return len(events)
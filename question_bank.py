@@ -0,0 +1,219 @@
+import glob
+import os
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, islice
+
+from models import Question
+from trivia_parser import TriviaParser
+
+INDEX_KINDS = ('category', 'difficulty', 'tag')
+
+def find_bank_files(source):
+    """Markdown files making up a bank: a file, a directory (searched recursively) or a glob.
+
+    Paths are returned sorted so a bank always loads in the same order.
+    """
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, '**', '*.md'), recursive=True))
+    if os.path.isfile(source):
+        return [source]
+    return sorted(path for path in glob.glob(source, recursive=True) if os.path.isfile(path))
+
+def _parse_file(path):
+    """Worker: parse one file into plain tuples (much cheaper to send back than Question objects)"""
+    return [(question.question_text, question.question_type, question.options, question.correct_answer,
+             question.source_line, question.category, question.difficulty, question.tags)
+            for question in TriviaParser(path).iter_parse()]
+
+def load_bank(source, workers=None):
+    """Parse every file of a question bank across a process pool.
+
+    Questions come back in a deterministic order (files sorted by path, then
+    file order) whatever the worker count, each carrying its source file and
+    line. Questions without a Category: line take the file name as their
+    category. workers=None uses one process per CPU; workers=1 parses in-process.
+    """
+    paths = find_bank_files(source)
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        parsed = map(_parse_file, paths)
+        return _merge(paths, parsed)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() yields results in submission order, which keeps the merge deterministic
+        return _merge(paths, pool.map(_parse_file, paths))
+
+def _merge(paths, parsed):
+    questions = []
+    for path, records in zip(paths, parsed):
+        file_category = os.path.splitext(os.path.basename(path))[0]
+        for (question_text, question_type, options, correct_answer, source_line,
+             category, difficulty, tags) in records:
+            questions.append(Question(question_text, question_type, options, correct_answer, path,
+                                      source_line, category or file_category, difficulty, tags))
+    return questions
+
+def index_key(value):
+    """Index keys are case-insensitive"""
+    return value.strip().lower()
+
+class IndexBuilder:
+    """Collects sorted question-index arrays per category, difficulty and tag"""
+
+    def __init__(self):
+        self.indexes = {kind: {} for kind in INDEX_KINDS}
+
+    def _add(self, kind, value, index):
+        postings = self.indexes[kind].get(value)
+        if postings is None:
+            postings = self.indexes[kind][value] = array('I')
+        postings.append(index)
+
+    def add(self, index, question):
+        """Add questions in increasing index order so every array stays sorted"""
+        if question.category:
+            self._add('category', index_key(question.category), index)
+        if question.difficulty:
+            self._add('difficulty', index_key(question.difficulty), index)
+        for tag in set(index_key(tag) for tag in question.tags):
+            self._add('tag', tag, index)
+
+class QuestionBank:
+    """
+    Question bank with category, difficulty and tag indexes for assembling games.
+
+    The bank wraps a sequence of Questions (a list or a QuestionPack) without
+    copying it. Each index maps a key to a sorted array of question indices;
+    a QuestionPack supplies them straight from the file, otherwise they are
+    built once here. Sampling draws random positions from the smallest
+    matching index and checks the other filters by binary search, so a
+    game's questions are picked in time proportional to the questions
+    drawn, not the size of the bank.
+    """
+
+    def __init__(self, questions, recent_games=20):
+        self.questions = questions
+        if hasattr(questions, 'indexes'):
+            self.indexes = questions.indexes()
+        else:
+            builder = IndexBuilder()
+            for index, question in enumerate(questions):
+                builder.add(index, question)
+            self.indexes = builder.indexes
+        self.recent = deque(maxlen=recent_games)  # Question indices of recently assembled games
+
+    def __len__(self):
+        return len(self.questions)
+
+    def facets(self):
+        """Every category, difficulty and tag with its question count"""
+        return {kind: {key: len(postings) for key, postings in sorted(self.indexes[kind].items())}
+                for kind in INDEX_KINDS}
+
+    def _filter(self, kind, values):
+        """The index arrays matching any of values (None means no filter)"""
+        if not values:
+            return None
+        index = self.indexes[kind]
+        return [index[key] for key in set(index_key(value) for value in values) if key in index]
+
+    @staticmethod
+    def _contains(postings_list, question_index):
+        for postings in postings_list:
+            position = bisect_left(postings, question_index)
+            if position < len(postings) and postings[position] == question_index:
+                return True
+        return False
+
+    def _draw(self, count, filters, excluded, rng):
+        """Pick up to count distinct question indices passing every filter and not in excluded"""
+        if count <= 0 or any(postings_list == [] for postings_list in filters):
+            return []
+
+        if filters:
+            # Draw from the smallest filter; the others are checked per candidate
+            pool = min(filters, key=lambda postings_list: sum(map(len, postings_list)))
+            others = [postings_list for postings_list in filters if postings_list is not pool]
+            ends = list(accumulate(len(postings) for postings in pool))
+            total = ends[-1]
+        else:
+            pool, others, ends, total = None, [], None, len(self.questions)
+
+        def candidate(position):
+            if pool is None:
+                return position
+            which = bisect_right(ends, position)
+            return pool[which][position - (ends[which - 1] if which else 0)]
+
+        picked = []
+        seen = set(excluded)
+        # Probing costs about the same per candidate as the scan fallback, so allow
+        # up to a quarter of the pool before giving up on narrow filters
+        attempts = max(20 * count + 100, total // 4)
+        while len(picked) < count and attempts:
+            attempts -= 1
+            question_index = candidate(rng.randrange(total))
+            if question_index in seen:
+                continue
+            seen.add(question_index)
+            if all(self._contains(postings_list, question_index) for postings_list in others):
+                picked.append(question_index)
+
+        if len(picked) < count:
+            # Filters are too narrow for random probing; fall back to scanning the pool once
+            remaining = [question_index for question_index in map(candidate, range(total))
+                         if question_index not in seen
+                         and all(self._contains(postings_list, question_index) for postings_list in others)]
+            remaining = list(dict.fromkeys(remaining))  # A question can sit in several tag arrays
+            picked.extend(rng.sample(remaining, min(count - len(picked), len(remaining))))
+        return picked
+
+    def sample(self, count, categories=None, difficulties=None, tags=None, mixed_difficulty=False,
+               exclude_recent=0, rng=None):
+        """Indices of count distinct questions matching the filters, in random order.
+
+        categories / difficulties / tags each match any of the given values.
+        mixed_difficulty spreads the picks evenly over the requested (or all)
+        difficulties; a bank without difficulties is sampled uniformly. exclude_recent skips questions used by that many of the
+        most recently assembled games.
+        """
+        rng = rng or random
+        excluded = set()
+        for indices in islice(reversed(self.recent), exclude_recent):
+            excluded.update(indices)
+        base_filters = [f for f in (self._filter('category', categories), self._filter('tag', tags))
+                        if f is not None]
+
+        levels = []
+        if mixed_difficulty:
+            levels = sorted(set(index_key(level) for level in difficulties) if difficulties
+                            else self.indexes['difficulty'])
+        if not levels:
+            # Also the fallback for mixed_difficulty on a bank without difficulty metadata
+            difficulty_filter = self._filter('difficulty', difficulties)
+            filters = base_filters + ([difficulty_filter] if difficulty_filter is not None else [])
+            picked = self._draw(count, filters, excluded, rng)
+        else:
+            picked = []
+            for position, level in enumerate(levels):
+                # Share what is left evenly between the remaining levels
+                share = -(-(count - len(picked)) // (len(levels) - position))
+                postings = self.indexes['difficulty'].get(level)
+                drawn = self._draw(share, base_filters + [[postings] if postings is not None else []],
+                                   excluded.union(picked), rng)
+                picked.extend(drawn)
+            rng.shuffle(picked)
+        return picked
+
+    def remember(self, indices):
+        """Record a game's question indices for later exclude_recent filters"""
+        self.recent.append(tuple(indices))
+
+    def assemble(self, count, **filters):
+        """Sample questions for a new game and remember them"""
+        indices = self.sample(count, **filters)
+        self.remember(indices)
+        return [self.questions[index] for index in indices]
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection for question banks
+Usage: python question_dedupe.py SOURCE [--threshold 0.8] [--report report.json] [--output deduped.md]
+"""
+
+import argparse
+import json
+import re
+import sys
+from array import array
+from hashlib import blake2b
+from itertools import compress, repeat
+
+from question_bank import load_bank
+
+WORD = re.compile(r'\w+')
+MIN_BAND_ROWS = 2  # Filled bins a band needs to be bucketed
+MAX_BUCKET = 64  # Members kept per LSH bucket; later arrivals are still compared against them
+
+def content_key(question):
+    """The text and options a question is compared on; equal for copies and unchanged reloads"""
+    return (question.question_text, *question.options)
+
+def key_words(key):
+    return set(WORD.findall(' '.join(key).lower()))
+
+def shingles(question):
+    """Lower-cased words of the question text and its options"""
+    return key_words(content_key(question))
+
+class WordHashes(dict):
+    """Word -> stable 64-bit hash, computed once per distinct word.
+
+    Python's hash() of a str is salted per process, which would make the
+    deduped bank (and so the question indices journals and the answers
+    table refer to) differ between runs.
+    """
+
+    def __missing__(self, word):
+        value = self[word] = int.from_bytes(blake2b(word.encode(), digest_size=8).digest(), 'little', signed=True)
+        return value
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+class DuplicateFinder:
+    """
+    Finds near-duplicate questions with MinHash signatures and LSH banding.
+
+    Each question is reduced to its set of words (text plus options) and
+    summarised by a one-permutation MinHash: every word is hashed once, the
+    hash modulo bands * rows picks its bin and each bin keeps its smallest
+    hash. That is one hash per word instead of one per word and bin, and
+    all of it runs in C (map, sorted, dict). Questions
+    whose signatures agree on every row of some band land in the same
+    bucket; only those candidate pairs get an exact Jaccard check, so the
+    cost grows with the bank size rather than its square. Word hashes are
+    stable digests, so a bank dedupes the same way in every process.
+    """
+
+    def __init__(self, threshold=0.8, bands=8, rows=4):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+
+    def band_keys(self, questions):
+        """One hash per band per question, question-major"""
+        keys = array('q')
+        rows = self.rows
+        bins = range(self.bands * rows)
+        bin_of = len(bins).__rmod__
+        min_rows = min(rows, MIN_BAND_ROWS)
+        word_hash = WordHashes().__getitem__
+        empty = repeat(0)  # Empty bins; tuples of ints (unlike None) hash the same in every process
+        for index, question in enumerate(questions):
+            # Largest first, so the dict ends up holding each bin's smallest hash
+            hashes = sorted(map(word_hash, shingles(question)), reverse=True)
+            values = dict(zip(map(bin_of, hashes), hashes))
+            # A band with (nearly) all bins empty would match any question sharing one word,
+            # so it matches on the whole word set instead. Short questions only reach the
+            # threshold with the same words anyway.
+            whole = hash(tuple(hashes))
+            for band in zip(*[map(values.get, bins, empty)] * rows):
+                keys.append(hash(band) if rows - band.count(0) >= min_rows else whole)
+        return keys
+
+    def find(self, questions):
+        """Clusters of near-duplicate question indices, each sorted, in bank order"""
+        count = len(questions)
+        keys = self.band_keys(questions)
+        parent = array('q', range(count))
+        cache = {}  # index -> word set, for questions that turned up in a candidate pair
+
+        def root(index):
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        def words(index):
+            result = cache.get(index)
+            if result is None:
+                result = cache[index] = shingles(questions[index])
+            return result
+
+        for band in range(self.bands):
+            band_keys = keys[band::self.bands]
+            # First question of every bucket, found without a Python-level loop over the bank
+            first = dict(zip(reversed(band_keys), range(count - 1, -1, -1)))
+            firsts = map(first.__getitem__, band_keys)
+            buckets = {}
+            for index in compress(range(count), map(int.__ne__, firsts, range(count))):
+                key = band_keys[index]
+                members = buckets.get(key)
+                if members is None:
+                    members = buckets[key] = [first[key]]
+                for member in members:
+                    a, b = root(member), root(index)
+                    if a != b and jaccard(words(member), words(index)) >= self.threshold:
+                        # The earlier question becomes the root, so it is the one kept
+                        parent[max(a, b)] = min(a, b)
+                if len(members) < MAX_BUCKET:
+                    members.append(index)
+
+        clusters = {}
+        for index in cache:
+            clusters.setdefault(root(index), []).append(index)
+        return sorted(sorted(members) for members in clusters.values() if len(members) > 1)
+
+class DedupeIndex:
+    """
+    Near-duplicate clusters of a bank, kept up to date as it is reloaded.
+
+    Band keys, LSH buckets and the near-duplicate pairs found are kept per
+    question content, so update() only hashes and compares questions with
+    new content and forgets the ones that left the bank; the pairs are few,
+    so clustering them again is cheap. While buckets stay under MAX_BUCKET
+    the clusters are the ones DuplicateFinder.find() gives for the bank.
+    """
+
+    def __init__(self, threshold=0.8, bands=8, rows=4):
+        self.finder = DuplicateFinder(threshold, bands, rows)
+        self.band_keys = {}  # content key -> its key in each band
+        self.buckets = [{} for _ in range(bands)]  # band key -> content keys
+        self.pairs = {}  # content key -> content keys similar enough to it
+
+    def update(self, questions):
+        """Same as dedupe(questions), comparing only the questions that are new since the last update"""
+        keys = list(map(content_key, questions))
+        current = set(keys)
+        for key in [key for key in self.band_keys if key not in current]:
+            self._forget(key)
+        added = {}
+        for key, question in zip(keys, questions):
+            if key not in self.band_keys and key not in added:
+                added[key] = question
+        if added:
+            bands = self.finder.bands
+            band_keys = self.finder.band_keys(list(added.values()))
+            words = {}
+            for number, key in enumerate(added):
+                self._add(key, tuple(band_keys[number * bands:(number + 1) * bands]), words)
+
+        positions = {}
+        for index, key in enumerate(keys):
+            positions.setdefault(key, []).append(index)
+        parent = {}
+
+        def root(key):
+            while key in parent:
+                key = parent[key]
+            return key
+
+        for key, others in self.pairs.items():
+            for other in others:
+                a, b = root(key), root(other)
+                if a != b:
+                    parent[b] = a
+        groups = {}
+        for key in self.pairs:
+            groups.setdefault(root(key), []).extend(positions[key])
+        for key, found in positions.items():
+            # Identical questions are one cluster, as long as they have words to compare
+            if len(found) > 1 and key not in self.pairs and key_words(key):
+                groups[key] = found
+        clusters = sorted(sorted(members) for members in groups.values() if len(members) > 1)
+        return _drop(questions, clusters), clusters
+
+    def _add(self, key, band_keys, words):
+        threshold = self.finder.threshold
+        key_set = words[key] = key_words(key)
+        for buckets, band_key in zip(self.buckets, band_keys):
+            members = buckets.setdefault(band_key, [])
+            for member in members:
+                member_set = words.get(member)
+                if member_set is None:
+                    member_set = words[member] = key_words(member)
+                if jaccard(key_set, member_set) >= threshold:
+                    self.pairs.setdefault(key, set()).add(member)
+                    self.pairs.setdefault(member, set()).add(key)
+            if len(members) < MAX_BUCKET:
+                members.append(key)
+        self.band_keys[key] = band_keys
+
+    def _forget(self, key):
+        for buckets, band_key in zip(self.buckets, self.band_keys.pop(key)):
+            members = buckets[band_key]
+            if key in members:
+                members.remove(key)
+                if not members:
+                    del buckets[band_key]
+        for other in self.pairs.pop(key, ()):
+            others = self.pairs[other]
+            others.discard(key)
+            if not others:
+                del self.pairs[other]
+
+def _drop(questions, clusters):
+    """questions without all but the first member of each cluster"""
+    dropped = set()
+    for members in clusters:
+        dropped.update(members[1:])
+    return [question for index, question in enumerate(questions) if index not in dropped]
+
+def dedupe(questions, threshold=0.8):
+    """The bank without near-duplicates (the first question of each cluster is kept), and the clusters"""
+    clusters = DuplicateFinder(threshold).find(questions)
+    return _drop(questions, clusters), clusters
+
+def _describe(question):
+    return {'question_text': question.question_text, 'source_file': question.source_file,
+            'source_line': question.source_line}
+
+def write_report(path, questions, clusters, threshold):
+    """JSON report: each cluster's kept question and its duplicates with their similarity to it"""
+    report = {'questions': len(questions), 'threshold': threshold,
+              'duplicates': sum(len(members) - 1 for members in clusters), 'clusters': []}
+    for members in clusters:
+        kept = questions[members[0]]
+        kept_words = shingles(kept)
+        report['clusters'].append({
+            'kept': _describe(kept),
+            'duplicates': [dict(_describe(questions[index]),
+                                similarity=round(jaccard(kept_words, shingles(questions[index])), 3))
+                           for index in members[1:]],
+        })
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+def write_bank(path, questions):
+    """Write questions back out in the markdown format TriviaParser reads"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('# Trivia Questions\n\n')  # Question separators need a line above them
+        for question in questions:
+            f.write(f'## {question.question_text}\n\n')
+            if question.category:
+                f.write(f'Category: {question.category}\n')
+            if question.difficulty:
+                f.write(f'Difficulty: {question.difficulty}\n')
+            if question.tags:
+                f.write(f'Tags: {", ".join(question.tags)}\n')
+            for label, option in zip('ABCD', question.options):
+                f.write(f'{label}) **{option}**\n' if option == question.correct_answer else f'{label}) {option}\n')
+            if question.correct_answer is not None and question.correct_answer not in question.options:
+                f.write(f'\n**Answer: {question.correct_answer}**\n')
+            f.write('\n')
+
+def main():
+    parser = argparse.ArgumentParser(description='Find near-duplicate questions in a question bank')
+    parser.add_argument('source', help='markdown file, directory or glob')
+    parser.add_argument('--threshold', type=float, default=0.8, help='Jaccard similarity of duplicates')
+    parser.add_argument('--report', help='write a JSON report of the duplicate clusters here')
+    parser.add_argument('--output', help='write the deduplicated bank here as markdown')
+    args = parser.parse_args()
+
+    questions = load_bank(args.source)
+    kept, clusters = dedupe(questions, args.threshold)
+    print(f"{len(questions)} questions, {len(questions) - len(kept)} duplicates in {len(clusters)} clusters")
+    if args.report:
+        write_report(args.report, questions, clusters, args.threshold)
+    if args.output:
+        write_bank(args.output, kept)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+
+from models import Question
+from question_bank import IndexBuilder
+from trivia_parser import TriviaParser
+
+MAGIC = b'TQPK'
+VERSION = 3
+# magic, version, question count, offset index position, filter index position,
+# source size, source mtime (ns), source sha256
+HEADER = struct.Struct('<4sIQQQQQ32s')
+OFFSET = struct.Struct('<QQ')  # Start of a record and start of the next one
+
+def source_digest(path):
+    """SHA-256 of a question bank, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+def compile_pack(source_path, pack_path):
+    """Parse a markdown question bank once and write it as a question pack.
+
+    Layout: header, one compact JSON record per question, an index of
+    count + 1 little-endian u64 record offsets, then the category /
+    difficulty / tag indexes used by QuestionBank: a u64-length-prefixed JSON
+    directory of {kind: {key: [position, length]}} followed by the sorted
+    u32 question-index arrays it points to.
+    """
+    stat = os.stat(source_path)
+    digest = source_digest(source_path)
+    offsets = array('Q')
+    builder = IndexBuilder()
+    tmp_path = pack_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(bytes(HEADER.size))
+        position = HEADER.size
+        for index, question in enumerate(TriviaParser(source_path).iter_parse()):
+            record = json.dumps([question.question_text, question.question_type, question.options,
+                                 question.correct_answer, question.source_line, question.category,
+                                 question.difficulty, question.tags], ensure_ascii=False,
+                                separators=(',', ':')).encode('utf-8')
+            offsets.append(position)
+            f.write(record)
+            position += len(record)
+            builder.add(index, question)
+        offsets_position = position
+        offsets.append(position)
+        f.write(_little_endian(offsets))
+        filters_position = offsets_position + len(offsets) * offsets.itemsize
+
+        directory = {}
+        arrays_position = 0
+        for kind, postings_by_key in builder.indexes.items():
+            directory[kind] = {}
+            for key, postings in postings_by_key.items():
+                directory[kind][key] = [arrays_position, len(postings)]
+                arrays_position += len(postings) * postings.itemsize
+        directory = json.dumps(directory, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        f.write(struct.pack('<Q', len(directory)) + directory)
+        for postings_by_key in builder.indexes.values():
+            for postings in postings_by_key.values():
+                f.write(_little_endian(postings))
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, len(offsets) - 1, offsets_position, filters_position,
+                            stat.st_size, stat.st_mtime_ns, digest))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, pack_path)
+
+def _little_endian(values):
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def read_header(pack_path):
+    """The pack's header fields as a tuple, or None if the file is missing or not a pack"""
+    try:
+        with open(pack_path, 'rb') as f:
+            data = f.read(HEADER.size)
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    header = HEADER.unpack(data)
+    if header[0] != MAGIC or header[1] != VERSION:
+        return None
+    return header
+
+class QuestionPack:
+    """
+    Read-only sequence of Questions backed by a memory-mapped question pack.
+
+    Opening a pack only maps the file; a Question is decoded the first time
+    its index is used. Recently used Questions are kept in a small LRU cache
+    so a game's current question is not decoded on every answer. One pack
+    can be shared by every game in the process.
+    """
+
+    def __init__(self, pack_path, source_file=None, cache_size=4096):
+        self.pack_path = pack_path
+        self.source_file = source_file  # Recorded on every Question decoded from the pack
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # index -> Question
+        self.lock = threading.Lock()
+        with open(pack_path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self.index_offset, self.filters_offset = HEADER.unpack_from(self.map)[:5]
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{pack_path} is not a version {VERSION} question pack')
+        self.views = []  # memoryviews into the map, released on close
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('question index out of range')
+
+        with self.lock:
+            question = self.cache.get(index)
+            if question is not None:
+                self.cache.move_to_end(index)
+                return question
+
+        start, end = OFFSET.unpack_from(self.map, self.index_offset + index * 8)
+        (question_text, question_type, options, correct_answer, source_line,
+         category, difficulty, tags) = json.loads(self.map[start:end])
+        question = Question(question_text, question_type, options, correct_answer,
+                            self.source_file, source_line, category, difficulty, tuple(tags))
+        with self.lock:
+            # Another thread may have decoded it meanwhile; keep one shared instance
+            question = self.cache.setdefault(index, question)
+            self.cache.move_to_end(index)
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return question
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def indexes(self):
+        """Category / difficulty / tag indexes stored in the pack: {kind: {key: sorted indices}}.
+
+        The arrays are zero-copy views of the mapped file on little-endian machines.
+        """
+        (length,) = struct.unpack_from('<Q', self.map, self.filters_offset)
+        start = self.filters_offset + 8
+        directory = json.loads(self.map[start:start + length])
+        arrays_start = start + length
+        mapped = memoryview(self.map)
+        self.views.append(mapped)
+        indexes = {}
+        for kind, entries in directory.items():
+            indexes[kind] = {}
+            for key, (position, count) in entries.items():
+                begin = arrays_start + position
+                if sys.byteorder == 'little':
+                    view = mapped[begin:begin + count * 4].cast('I')
+                    self.views.append(view)
+                else:
+                    view = array('I', self.map[begin:begin + count * 4])
+                    view.byteswap()
+                indexes[kind][key] = view
+        return indexes
+
+    def close(self):
+        self.cache.clear()
+        for view in reversed(self.views):
+            view.release()
+        self.views = []
+        self.map.close()
+
+def load_pack(source_path, pack_path=None):
+    """Open the compiled pack for a markdown bank, recompiling it only when the bank changed.
+
+    The pack is reused when the bank's size and mtime match the header; if
+    only the mtime differs, the content hash decides.
+    """
+    pack_path = pack_path or source_path + '.pack'
+    stat = os.stat(source_path)
+    header = read_header(pack_path)
+    if header is not None:
+        size, mtime_ns, digest = header[5:]
+        if size == stat.st_size and mtime_ns == stat.st_mtime_ns:
+            return QuestionPack(pack_path, source_path)
+        if size == stat.st_size and digest == source_digest(source_path):
+            # Same content with a new mtime (copied or touched); remember the new mtime
+            with open(pack_path, 'r+b') as f:
+                f.write(HEADER.pack(*header[:6], stat.st_mtime_ns, digest))
+            return QuestionPack(pack_path, source_path)
+    compile_pack(source_path, pack_path)
+    return QuestionPack(pack_path, source_path)
@@ -0,0 +1,271 @@
+import copy
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+from question_bank import find_bank_files
+from trivia_parser import TriviaParser
+
+CHUNK = 1 << 16  # Bytes compared per step when diffing old and new file content
+
+def common_prefix(a, b):
+    """Length of the common prefix of two strings, compared chunk by chunk in C"""
+    limit = min(len(a), len(b))
+    start = 0
+    while start < limit:
+        end = min(start + CHUNK, limit)
+        if a[start:end] != b[start:end]:
+            # Binary search for the first difference inside this chunk
+            low, high = start, end
+            while high - low > 1:
+                middle = (low + high) // 2
+                if a[start:middle] == b[start:middle]:
+                    low = middle
+                else:
+                    high = middle
+            return low if a[start:low + 1] != b[start:low + 1] else low + 1
+        start = end
+    return limit
+
+def common_suffix(a, b, limit):
+    """Length of the common suffix of two strings, at most limit"""
+    length_a, length_b = len(a), len(b)
+    done = 0
+    while done < limit:
+        step = min(CHUNK, limit - done)
+        if a[length_a - done - step:length_a - done] != b[length_b - done - step:length_b - done]:
+            low, high = 0, step  # low characters (beyond done) are known to match
+            while high - low > 1:
+                middle = (low + high) // 2
+                if a[length_a - done - middle:length_a - done] == b[length_b - done - middle:length_b - done]:
+                    low = middle
+                else:
+                    high = middle
+            if a[length_a - done - low - 1:length_a - done] == b[length_b - done - low - 1:length_b - done]:
+                low += 1
+            return done + low
+        done += step
+    return limit
+
+def _at_line(question, line):
+    """question as found on line; a copy if it moved, so readers of the previous list never see it change"""
+    if question.source_line == line:
+        return question
+    moved = copy.copy(question)
+    moved.source_line = line
+    return moved
+
+class _WatchedFile:
+    __slots__ = ('path', 'mtime_ns', 'size', 'content', 'pattern', 'starts', 'ends', 'questions')
+
+    def __init__(self, path):
+        self.path = path
+        self.mtime_ns = None
+        self.size = None
+        self.content = None  # Text the blocks below were split from
+        self.pattern = None  # Split pattern chosen for that text
+        self.starts = array('q')  # Offset of each block's stripped text
+        self.ends = array('q')
+        self.questions = []  # Question parsed from each block
+
+class QuestionReloader:
+    """
+    Watches question files and rebuilds the question list when they change.
+
+    A changed file is diffed against its previous content (common prefix and
+    suffix, compared in C), and only the blocks overlapping the edited range
+    are split and parsed again, with the same rules iter_parse applies at
+    startup; every other block keeps its Question object (a copy if it moved
+    to another line). Edits that change how the whole file is split (a
+    different first separator style) fall back to a full split.
+    The rebuilt list is always a new list (the old one is never modified),
+    handed to on_reload(questions) so callers can swap it in atomically.
+    Polling runs on a background thread, so a reload never delays requests
+    or game timers.
+    """
+
+    def __init__(self, source, on_reload, interval=1.0, category_from_file=False):
+        self.source = source
+        self.on_reload = on_reload
+        self.interval = interval
+        self.category_from_file = category_from_file  # Same default as load_bank for multi-file banks
+        self.files = {}  # path -> _WatchedFile
+        self.questions = []
+        self.reloads = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def load(self):
+        """Parse every file once; returns the question list"""
+        self.check(notify=False)
+        return self.questions
+
+    def check(self, notify=True):
+        """Reparse changed files; returns the number of blocks parsed, or None if nothing changed"""
+        paths = find_bank_files(self.source)
+        changed = set(self.files) != set(paths)
+        parsed = 0
+        files = {}
+        for path in paths:
+            watched = self.files.get(path) or _WatchedFile(path)
+            files[path] = watched
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if (stat.st_mtime_ns, stat.st_size) == (watched.mtime_ns, watched.size):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            watched.mtime_ns, watched.size = stat.st_mtime_ns, stat.st_size
+            if content == watched.content:
+                continue
+            parsed += self._update(watched, content)
+            changed = True
+        if not changed:
+            return None
+
+        self.files = files
+        if len(paths) == 1:
+            questions = list(files[paths[0]].questions)
+        else:
+            questions = []
+            for path in paths:
+                questions.extend(files[path].questions)
+        self.questions = questions
+        if notify:
+            self.reloads += 1
+            self.on_reload(questions)
+        return parsed
+
+    def _parse(self, parser, block, path):
+        question = parser.parse_block(block)
+        question.source_file = path
+        if self.category_from_file and not question.category:
+            question.category = os.path.splitext(os.path.basename(path))[0]
+        return question
+
+    def _questions_for(self, parser, path, content, spans, old_blocks, line, position):
+        """Questions for spans (which start at the given line and offset); returns (questions, parsed).
+        
+        A block whose text is in old_blocks [(text, question)] keeps that
+        question. If the new blocks and the unmatched old ones pair up one to
+        one, they are edits of each other and keep the old uids, so games
+        follow an edited question to its new version.
+        """
+        previous = {}
+        for text, question in old_blocks:
+            previous.setdefault(text, []).append(question)
+        questions = []
+        fresh = []
+        kept = set()
+        for offset, block in spans:
+            line += content.count('\n', position, offset)
+            position = offset
+            reused = previous.get(block)
+            if reused:
+                question = reused.pop(0)
+                kept.add(id(question))
+                questions.append(_at_line(question, line))
+            else:
+                question = self._parse(parser, block, path)
+                question.source_line = line
+                questions.append(question)
+                fresh.append(question)
+        replaced = [question for _, question in old_blocks if id(question) not in kept]
+        if len(replaced) == len(fresh):
+            for question, old_question in zip(fresh, replaced):
+                question.uid = old_question.uid
+        return questions, len(fresh)
+
+    def _update(self, watched, content):
+        """Bring one file's blocks up to date with its new content; returns blocks parsed"""
+        parser = TriviaParser(watched.path)
+        pattern = parser._stream_split_pattern(content)
+        old = watched.content
+        if old is None or pattern is None or pattern is not watched.pattern or not watched.questions:
+            return self._split_all(watched, parser, content, pattern)
+
+        # Edited range: [prefix, len - suffix) in both old and new content
+        prefix = common_prefix(old, content)
+        suffix = common_suffix(old, content, min(len(old), len(content)) - prefix)
+        old_end = len(old) - suffix
+        delta = len(content) - len(old)
+        starts, ends, count = watched.starts, watched.ends, len(watched.questions)
+
+        # Blocks touching the edit, plus their neighbours across a separator that may have changed
+        first = max(bisect_right(starts, prefix) - 1, 0)
+        last = min(bisect_left(starts, old_end), count - 1)
+        window_start = ends[first - 1] if first > 0 else 0
+        window_end = starts[last + 1] if last + 1 < count else len(old)
+        new_window_end = window_end + delta if last + 1 < count else len(content)
+
+        # The window starts after the previous block's text, so its leading piece is only the
+        # unchanged whitespace before a separator. Text between the window's last separator
+        # and the next kept block would belong to that block, so the whole file is split instead.
+        spans = parser._split_spans(content, pattern, window_start, new_window_end)
+        if last + 1 < count:
+            tail = pattern.split(content[window_start:new_window_end])[-1]
+            if tail.strip():
+                return self._split_all(watched, parser, content, pattern)
+
+        # Reuse Questions of window blocks whose text did not change
+        old_blocks = [(old[starts[index]:ends[index]], watched.questions[index]) for index in range(first, last + 1)]
+        window_questions, parsed = self._questions_for(parser, watched.path, content, spans, old_blocks,
+                                                       content.count('\n', 0, window_start) + 1, window_start)
+
+        # Blocks after the window moved by delta characters and line_delta lines
+        tail_questions = watched.questions[last + 1:]
+        line_delta = content.count('\n', prefix, len(content) - suffix) - old.count('\n', prefix, old_end)
+        if line_delta:
+            tail_questions = [_at_line(question, question.source_line + line_delta) for question in tail_questions]
+        tail_starts, tail_ends = starts[last + 1:], ends[last + 1:]
+        if delta:
+            tail_starts = array('q', [offset + delta for offset in tail_starts])
+            tail_ends = array('q', [offset + delta for offset in tail_ends])
+
+        watched.starts = starts[:first] + array('q', [offset for offset, _ in spans]) + tail_starts
+        watched.ends = ends[:first] + array('q', [offset + len(block) for offset, block in spans]) + tail_ends
+        watched.questions = watched.questions[:first] + window_questions + tail_questions
+        watched.content = content
+        return parsed
+
+    def _split_all(self, watched, parser, content, pattern):
+        """Split the whole file, reusing Questions of blocks whose text is unchanged"""
+        old_blocks = []
+        if watched.content is not None:
+            old_blocks = [(watched.content[start:end], question)
+                          for start, end, question in zip(watched.starts, watched.ends, watched.questions)]
+        spans = parser._split_question_spans(content, pattern)
+        questions, parsed = self._questions_for(parser, watched.path, content, spans, old_blocks, 1, 0)
+        watched.content = content
+        watched.pattern = pattern
+        watched.starts = array('q', [offset for offset, _ in spans])
+        watched.ends = array('q', [offset + len(block) for offset, block in spans])
+        watched.questions = questions
+        return parsed
+
+    def start(self):
+        """Load the files (if not loaded yet) and start polling for changes"""
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._run, name='question-reloader', daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        if not self.files:
+            self.load()
+        while not self.stop_event.wait(self.interval):
+            try:
+                start = time.perf_counter()
+                parsed = self.check()
+                if parsed is not None:
+                    print(f"Reloaded questions: {parsed} blocks parsed "
+                          f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+            except Exception as e:
+                print(f"Question reload error: {e}")
+
+    def stop(self):
+        self.stop_event.set()
@@ -0,0 +1,225 @@
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import chain, filterfalse, repeat
+from operator import lt
+
+TOKEN = re.compile(r'\w+')
+QUERY_TERM = re.compile(r'(\w+)(\*?)')
+MAX_LOOKUP_TERMS = 16  # Prefix groups larger than this are checked against the question's own words
+KEY_GAP = 1 << 20  # Room between neighbouring questions' keys for questions inserted by a reload
+MAX_SINGLE_EDITS = 8  # Postings changed by more keys than this are merged in one pass instead
+
+def question_terms(question):
+    """Lower-cased words of a question's text, options and answer"""
+    answer = question.correct_answer if isinstance(question.correct_answer, str) else ''
+    return set(TOKEN.findall(' '.join([question.question_text, *question.options, answer]).lower()))
+
+def _contains(postings, question_index):
+    position = bisect_left(postings, question_index)
+    return position < len(postings) and postings[position] == question_index
+
+class QuestionSearch:
+    """
+    In-memory inverted index over question text, options and answers.
+
+    Every word maps to the sorted array of keys of the questions containing
+    it, and a sorted word list serves prefix queries by bisection. Keys
+    increase with the bank order, with room in between, so a reload can
+    give inserted questions keys of their own and only touch the postings
+    of the words of questions it added, edited or removed (update()).
+    A query's terms must all match; "term*" matches any word starting with
+    term. Matches are produced in bank order from the rarest term, the other
+    terms being checked per candidate, so a page of results costs about
+    as much as the candidates it looks at, whatever the bank size.
+    """
+
+    def __init__(self, questions):
+        self.lock = threading.RLock()  # Held by search() and update(); hold it to read self.questions with a page
+        self._build(questions)
+
+    def _build(self, questions):
+        self.questions = questions
+        self.keys = array('q', range(0, len(questions) * KEY_GAP, KEY_GAP))  # Aligned with self.questions
+        postings = defaultdict(list)
+        for key, question in zip(self.keys, questions):
+            # list.append through map: one C-level call per word, missing words get a new list
+            list(map(list.append, map(postings.__getitem__, question_terms(question)), repeat(key)))
+        self.terms = sorted(postings)
+        # Aligned with self.terms, so a prefix's words are one slice of each
+        self.postings = [array('q', postings.pop(term)) for term in self.terms]
+        self.sizes = array('I', map(len, self.postings))
+        self.positions = {question.uid: index for index, question in enumerate(questions)}
+
+    def __len__(self):
+        return len(self.questions)
+
+    def update(self, questions):
+        """Switch to a reloaded question list, reindexing only questions that are new, edited or gone.
+        
+        Questions are followed by uid. A reload that replaces most of the
+        bank, or runs out of room between two keys, is indexed from scratch.
+        """
+        with self.lock:
+            old_questions, old_keys = self.questions, self.keys
+            old_index = list(map(self.positions.get, (question.uid for question in questions)))
+            survivors = [index for index in old_index if index is not None]
+            if not all(map(lt, survivors, survivors[1:])):
+                # Questions that moved are removed and added again
+                kept = set(_increasing([(index, position) for position, index in enumerate(old_index)
+                                        if index is not None]))
+                old_index = [index if position in kept else None for position, index in enumerate(old_index)]
+            keys = None if 2 * old_index.count(None) > len(questions) else self._keys(old_index, old_keys)
+            if keys is None:
+                self._build(questions)
+                return
+            added = defaultdict(list)
+            removed = defaultdict(set)
+            present = {index for index in old_index if index is not None}
+            for index, question in enumerate(old_questions):
+                if index not in present:
+                    for term in question_terms(question):
+                        removed[term].add(old_keys[index])
+            for key, index, question in zip(keys, old_index, questions):
+                if index is None:
+                    for term in question_terms(question):
+                        added[term].append(key)
+                    continue
+                old = old_questions[index]
+                if (old.question_text is not question.question_text or old.options is not question.options
+                        or old.correct_answer is not question.correct_answer):
+                    old_terms, new_terms = question_terms(old), question_terms(question)
+                    for term in old_terms - new_terms:
+                        removed[term].add(key)
+                    for term in new_terms - old_terms:
+                        added[term].append(key)
+            for term in set(added).union(removed):
+                self._change_postings(term, added.get(term, ()), removed.get(term, ()))
+            self.questions = questions
+            self.keys = keys
+            self.positions = {question.uid: index for index, question in enumerate(questions)}
+
+    @staticmethod
+    def _keys(old_index, old_keys):
+        """Keys for the new list: survivors keep theirs, each run of new questions spreads over its gap"""
+        keys = array('q')
+        run = 0
+        previous = None
+        for index in old_index:
+            if index is None:
+                run += 1
+                continue
+            key = old_keys[index]
+            if run:
+                low = key - KEY_GAP * (run + 1) if previous is None else previous
+                step = (key - low) // (run + 1)
+                if step == 0:
+                    return None
+                keys.extend(range(low + step, low + step * (run + 1), step))
+                run = 0
+            keys.append(key)
+            previous = key
+        if previous is None:
+            return None
+        keys.extend(range(previous + KEY_GAP, previous + KEY_GAP * (run + 1), KEY_GAP))
+        return keys
+
+    def _change_postings(self, term, added, removed):
+        position = bisect_left(self.terms, term)
+        if position == len(self.terms) or self.terms[position] != term:
+            self.terms.insert(position, term)
+            self.postings.insert(position, array('q'))
+            self.sizes.insert(position, 0)
+        postings = self.postings[position]
+        if len(added) + len(removed) > MAX_SINGLE_EDITS:
+            postings = array('q', sorted(chain(filterfalse(removed.__contains__, postings), added)))
+        else:
+            for key in removed:
+                del postings[bisect_left(postings, key)]
+            for key in added:
+                postings.insert(bisect_left(postings, key), key)
+        if postings:
+            self.postings[position] = postings
+            self.sizes[position] = len(postings)
+        else:
+            del self.terms[position], self.postings[position], self.sizes[position]
+
+    def _range(self, term, prefix):
+        """Positions in self.terms of the words matching one query term"""
+        start = bisect_left(self.terms, term)
+        if prefix:
+            return start, bisect_left(self.terms, term + '\U0010ffff', start)
+        return start, start + (start < len(self.terms) and self.terms[start] == term)
+
+    def search(self, query, offset=0, limit=20):
+        """Indices of matching questions in bank order, and whether more follow the page"""
+        terms = [(term, bool(star)) for term, star in QUERY_TERM.findall(query.lower())]
+        if not terms:
+            return [], False
+        with self.lock:
+            return self._search(terms, offset, limit)
+
+    def _search(self, terms, offset, limit):
+        groups = []
+        for term, prefix in terms:
+            start, end = self._range(term, prefix)
+            if start == end:
+                return [], False
+            groups.append((sum(self.sizes[start:end]), prefix, term, self.postings[start:end]))
+        groups.sort(key=lambda entry: entry[0])
+
+        driver = groups[0]
+        if len(driver[3]) > 1 and driver[0] * 64 >= len(self.questions):
+            # Broad prefix: walk a single word's postings if the query has one, else the bank in order
+            driver = next((group for group in groups if len(group[3]) == 1), None)
+        if driver is None:
+            candidates = self.keys
+        elif len(driver[3]) == 1:
+            candidates = driver[3][0]
+        else:
+            candidates = sorted(set().union(*driver[3]))
+        checks = [group for group in groups if group is not driver]
+        checks.sort(key=lambda entry: len(entry[3]) > MAX_LOOKUP_TERMS)  # Binary searches before word checks
+
+        matches = []
+        wanted = offset + limit + 1
+        for key in candidates:
+            words = None
+            for _, prefix, term, group in checks:
+                if len(group) <= MAX_LOOKUP_TERMS:
+                    if not any(_contains(postings, key) for postings in group):
+                        break
+                else:
+                    if words is None:
+                        words = question_terms(self.questions[bisect_left(self.keys, key)])
+                    if not (any(word.startswith(term) for word in words) if prefix else term in words):
+                        break
+            else:
+                matches.append(key)
+                if len(matches) == wanted:
+                    break
+        page = [bisect_left(self.keys, key) for key in matches[offset:offset + limit]]
+        return page, len(matches) == wanted
+
+def _increasing(pairs):
+    """Second items of a longest run of (value, item) pairs whose values strictly increase"""
+    tails = []  # Smallest last value of an increasing run of each length
+    tail_at = []
+    previous = [None] * len(pairs)
+    for position, (value, _) in enumerate(pairs):
+        length = bisect_left(tails, value)
+        previous[position] = tail_at[length - 1] if length else None
+        if length == len(tails):
+            tails.append(value)
+            tail_at.append(position)
+        else:
+            tails[length] = value
+            tail_at[length] = position
+    result = []
+    position = tail_at[-1] if tail_at else None
+    while position is not None:
+        result.append(pairs[position][1])
+        position = previous[position]
+    return result
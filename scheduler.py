@@ -0,0 +1,137 @@
+import math
+import threading
+import time
+
+class TimerHandle:
+    """A scheduled callback; call cancel() to stop it from firing"""
+    __slots__ = ('deadline', 'tick', 'callback', 'args', 'cancelled')
+
+    def __init__(self, deadline, tick, callback, args):
+        self.deadline = deadline
+        self.tick = tick
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+class TimerWheel:
+    """
+    Hashed timing wheel driven by a single background thread.
+
+    Deadlines are absolute values of a monotonic clock, so timers do not drift
+    no matter how late an individual callback runs. Scheduling and cancelling
+    are O(1); each tick only looks at the handles in one wheel slot. The
+    thread sleeps on a condition variable while nothing is scheduled. Under
+    eventlet or gevent (see async_mode.py) the thread and the condition are
+    green, so waiting for the next tick never blocks the event loop.
+
+    time_scale is how many clock seconds pass per real second; a clock that
+    runs faster than real time (as when traffic.py replays a recording at
+    10x) needs it so the thread does not sleep through the next tick.
+    """
+
+    def __init__(self, tick_interval=0.02, slots=1024, clock=time.monotonic, time_scale=1.0):
+        self.tick_interval = tick_interval
+        self.slots = slots
+        self.clock = clock
+        self.time_scale = time_scale
+        self.wheel = [[] for _ in range(slots)]
+        self.origin = clock()
+        self.current_tick = 0  # Next tick to be processed
+        self.pending = 0
+        self.stopped = False
+        self.lock = threading.Lock()
+        self.wakeup = threading.Condition(self.lock)
+        self.thread = None
+
+    def schedule_at(self, deadline, callback, *args):
+        """Run callback(*args) once the clock reaches deadline"""
+        with self.lock:
+            tick = max(math.ceil((deadline - self.origin) / self.tick_interval), self.current_tick)
+            handle = TimerHandle(deadline, tick, callback, args)
+            self.wheel[tick % self.slots].append(handle)
+            self.pending += 1
+            if self.thread is None or not self.thread.is_alive():
+                self.stopped = False
+                self.thread = threading.Thread(target=self._run, name='timer-wheel', daemon=True)
+                self.thread.start()
+            self.wakeup.notify()
+        return handle
+
+    def schedule(self, delay, callback, *args):
+        """Run callback(*args) after delay seconds"""
+        return self.schedule_at(self.clock() + delay, callback, *args)
+
+    def stop(self):
+        """Stop the background thread; pending timers are dropped"""
+        with self.lock:
+            self.stopped = True
+            self.wheel = [[] for _ in range(self.slots)]
+            self.pending = 0
+            self.wakeup.notify()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def _collect_due(self, now):
+        """Pop every handle whose tick has passed; must hold the lock"""
+        due = []
+        last_tick = int((now - self.origin) / self.tick_interval)
+        # A long stall only needs to visit each slot once
+        end_tick = min(last_tick, self.current_tick + self.slots - 1)
+        for tick in range(self.current_tick, end_tick + 1):
+            slot = self.wheel[tick % self.slots]
+            if not slot:
+                continue
+            keep = []
+            for handle in slot:
+                if handle.tick <= last_tick or handle.cancelled:
+                    self.pending -= 1
+                    if not handle.cancelled:
+                        due.append(handle)
+                else:
+                    keep.append(handle)
+            self.wheel[tick % self.slots] = keep
+        self.current_tick = last_tick + 1
+        due.sort(key=lambda handle: handle.deadline)
+        return due
+
+    def _run(self):
+        while True:
+            with self.lock:
+                while self.pending == 0 and not self.stopped:
+                    self.wakeup.wait()
+                if self.stopped:
+                    return
+                target = self.origin + self.current_tick * self.tick_interval
+                now = self.clock()
+                if now < target:
+                    self.wakeup.wait((target - now) / self.time_scale)
+                    continue
+                due = self._collect_due(now)
+
+            for handle in due:
+                if handle.cancelled:
+                    continue
+                try:
+                    handle.callback(*handle.args)
+                except Exception as e:
+                    print(f"Timer callback error: {e}")
+
+_shared_scheduler = None
+_shared_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    """Return the process-wide TimerWheel shared by every game"""
+    global _shared_scheduler
+    with _shared_scheduler_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = TimerWheel()
+        return _shared_scheduler
+
+def set_scheduler(scheduler):
+    """Make scheduler the process-wide one; only affects objects built afterwards"""
+    global _shared_scheduler
+    with _shared_scheduler_lock:
+        _shared_scheduler = scheduler
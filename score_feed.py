@@ -0,0 +1,113 @@
+import threading
+
+from scheduler import get_scheduler
+
+class ScoreboardFeed:
+    """
+    Coalesced, versioned scoreboard updates for one game.
+
+    Game changes only mark the feed with the team they touched; at most
+    once per interval those teams are compared with what clients were last
+    sent and one score_update goes out with the differences: the changed
+    fields of teams that changed (plus their id, rank and tie-break order),
+    and the ids of teams that are gone. A flush costs the teams marked since
+    the last one, not the whole scoreboard. Clients order teams by score,
+    then order, so ranks of teams that merely moved are not sent. Every
+    diff bumps the version by one; a client that sees a gap asks for
+    snapshot().
+    """
+
+    def __init__(self, game, emit, interval=0.25, scheduler=None):
+        self.game = game
+        self.emit = emit  # emit(event, data) to every client of the game
+        self.interval = interval
+        self.scheduler = scheduler or get_scheduler()
+        self.version = 0
+        self.entries = {}  # team_id -> entry (without rank) as of self.version
+        # Game commands mark the feed while a flush may be waiting on the game,
+        # so scheduling and flushing use separate locks
+        self.schedule_lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.changed = set()  # Teams marked since the last flush
+        self.rescan = True  # Compare every team on the next flush: nothing was sent yet
+        self.handle = None  # Pending flush
+        self.last_flush = None
+        self.stopped = False
+
+    def mark_changed(self, team_id=None):
+        """Schedule a flush; every change until it runs goes out in the same diff.
+        
+        team_id is the team that changed; None compares every team.
+        """
+        with self.schedule_lock:
+            if self.stopped:
+                return
+            if team_id is None:
+                self.rescan = True
+            else:
+                self.changed.add(team_id)
+            if self.handle is not None:
+                return
+            now = self.scheduler.clock()
+            due = now if self.last_flush is None else max(now, self.last_flush + self.interval)
+            self.handle = self.scheduler.schedule_at(due, self.flush)
+
+    def flush(self):
+        """Emit the changes since the last diff, if there are any"""
+        with self.schedule_lock:
+            self.handle = None
+            self.last_flush = self.scheduler.clock()
+        with self.flush_lock:
+            self._catch_up()
+
+    def snapshot(self):
+        """Every team's entry, with its rank, as of the current version, for clients that missed a diff"""
+        with self.flush_lock:
+            if self.rescan:
+                self._catch_up()  # Nothing to take a snapshot of before the first full comparison
+            teams = sorted(self.entries.values(), key=lambda entry: (-entry['score'], entry['order']))
+            return {'version': self.version,
+                    'teams': [dict(entry, rank=rank) for rank, entry in enumerate(teams, 1)]}
+
+    def _catch_up(self):
+        """Diff the marked teams against self.entries and emit it; must hold flush_lock"""
+        with self.schedule_lock:
+            if self.stopped:
+                return
+            team_ids = None if self.rescan else self.changed
+            self.changed = set()
+            self.rescan = False
+        if team_ids is not None and not team_ids:
+            return
+        changed = []
+        current = set()
+        for entry in self.game.get_scoreboard_entries(team_ids):
+            team_id = entry['team_id']
+            rank = entry.pop('rank')
+            current.add(team_id)
+            previous = self.entries.get(team_id)
+            self.entries[team_id] = entry
+            if previous is None:
+                changed.append(dict(entry, rank=rank))
+                continue
+            change = {key: value for key, value in entry.items() if previous[key] != value}
+            if change:
+                change['team_id'] = team_id
+                change['rank'] = rank
+                changed.append(change)
+        removed = [team_id for team_id in (self.entries if team_ids is None else team_ids)
+                   if team_id not in current and team_id in self.entries]
+        for team_id in removed:
+            del self.entries[team_id]
+        if not changed and not removed:
+            return
+        self.version += 1
+        # Emitted under the lock so clients see the versions in order
+        self.emit('score_update', {'version': self.version, 'changed': changed, 'removed': removed})
+
+    def stop(self):
+        with self.schedule_lock:
+            self.stopped = True
+            if self.handle is not None:
+                self.handle.cancel()
+                self.handle = None
@@ -0,0 +1,110 @@
+"""
+Serialization of HTTP responses and Socket.IO packets.
+
+TRIVIA_JSON picks the JSON encoder: 'orjson' (the default when it is
+installed) or 'json' (the standard library). Set TRIVIA_SOCKET_SERIALIZER
+to 'msgpack' to send Socket.IO packets as MessagePack instead of JSON; it
+needs the msgpack package, and the pages then load the msgpack build of
+the Socket.IO client.
+
+The module itself has the dumps()/loads() interface python-socketio and
+engine.io expect of a json module.
+"""
+
+import json
+import os
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_BACKEND = os.environ.get('TRIVIA_JSON') or ('orjson' if orjson is not None else 'json')
+SOCKET_SERIALIZER = os.environ.get('TRIVIA_SOCKET_SERIALIZER') or 'json'
+
+if JSON_BACKEND not in ('orjson', 'json'):
+    raise ValueError(f"TRIVIA_JSON must be 'orjson' or 'json', not {JSON_BACKEND!r}")
+if JSON_BACKEND == 'orjson' and orjson is None:
+    raise RuntimeError('TRIVIA_JSON=orjson needs the orjson package')
+if SOCKET_SERIALIZER not in ('json', 'msgpack'):
+    raise ValueError(f"TRIVIA_SOCKET_SERIALIZER must be 'json' or 'msgpack', not {SOCKET_SERIALIZER!r}")
+if SOCKET_SERIALIZER == 'msgpack' and msgpack is None:
+    raise RuntimeError('TRIVIA_SOCKET_SERIALIZER=msgpack needs the msgpack package')
+
+# python-socketio's name for the packet format
+SOCKET_PACKETS = 'msgpack' if SOCKET_SERIALIZER == 'msgpack' else 'default'
+SOCKET_CLIENT_JS = ('https://cdn.socket.io/4.0.0/socket.io.msgpack.min.js' if SOCKET_SERIALIZER == 'msgpack'
+                    else 'https://cdn.socket.io/4.0.0/socket.io.min.js')
+
+if JSON_BACKEND == 'orjson':
+    # Datetimes go to the default hook so responses keep Flask's HTTP date format
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumpb(obj, default=None):
+        """Compact JSON of obj as UTF-8 bytes"""
+        return orjson.dumps(obj, default=default, option=ORJSON_OPTIONS)
+
+    def dumps(obj, **kwargs):
+        # orjson output is always compact; the separators Socket.IO asks for are implied
+        return orjson.dumps(obj, option=ORJSON_OPTIONS).decode()
+
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+else:
+    def dumpb(obj, default=None):
+        """Compact JSON of obj as UTF-8 bytes"""
+        return json.dumps(obj, default=default, separators=(',', ':')).encode()
+
+    def dumps(obj, **kwargs):
+        return json.dumps(obj, **kwargs)
+
+    def loads(s, **kwargs):
+        return json.loads(s, **kwargs)
+
+class RawJSON:
+    """An already encoded JSON object; jsonify() and emit_to_room() send its bytes as they are"""
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    def __eq__(self, other):
+        return isinstance(other, RawJSON) and other.data == self.data
+
+    def __hash__(self):
+        return hash(self.data)
+
+    def decode(self):
+        return loads(self.data)
+
+def extend(raw, fields):
+    """RawJSON of the object raw with fields added in front; fields must not repeat its keys"""
+    if not fields:
+        return raw
+    encoded = dumpb(fields)
+    if raw.data == b'{}':
+        return RawJSON(encoded)
+    return RawJSON(encoded[:-1] + b',' + raw.data[1:])
+
+class JSONProvider(DefaultJSONProvider):
+    """Flask's JSON through the configured encoder; RawJSON responses skip encoding"""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)  # Indentation and the like are left to the standard library
+        return dumpb(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        data = obj.data if isinstance(obj, RawJSON) else dumpb(obj, default=self.default)
+        return self._app.response_class(data, mimetype=self.mimetype)
@@ -0,0 +1,69 @@
+"""
+The python-socketio, python-engineio and Flask-SocketIO internals traffic.py relies on.
+
+Recording packets and replaying them through Flask-SocketIO test clients
+needs a few attributes none of these packages document. Every use of them
+goes through this module, which checks first that the installed versions
+are the ones requirements.txt pins and that the attributes are still
+there, and stops with an error naming the mismatch otherwise.
+"""
+
+from importlib.metadata import PackageNotFoundError, version
+
+import socketio
+from flask_socketio.test_client import SocketIOTestClient
+
+PINNED = {'python-socketio': '5.8', 'Flask-SocketIO': '5.3'}  # Major.minor of requirements.txt's pins
+_checked = False
+
+def check():
+    """Raise RuntimeError unless the pinned versions, with the internals used here, are installed"""
+    global _checked
+    if _checked:
+        return
+    for package, pinned in PINNED.items():
+        try:
+            installed = version(package)
+        except PackageNotFoundError:
+            installed = None
+        if installed is None or installed.split('.')[:2] != pinned.split('.'):
+            raise RuntimeError(f"traffic recording and replay use {package} internals and need {pinned}.x "
+                               f"(see requirements.txt); {installed or 'none'} is installed")
+    for owner, name in ((socketio.Server, '_send_packet'), (socketio.Server, '_handle_eio_disconnect'),
+                        (SocketIOTestClient, 'clients')):
+        if not hasattr(owner, name):
+            raise RuntimeError(f"{owner.__module__}.{owner.__name__} has no {name}; "
+                               f"traffic.py needs the versions pinned in requirements.txt")
+    _checked = True
+
+def engineio_handler(eio, event):
+    """The handler the Socket.IO server registered on its Engine.IO server for event"""
+    check()
+    handlers = getattr(eio, 'handlers', None)
+    if not isinstance(handlers, dict) or event not in handlers:
+        raise RuntimeError(f"{type(eio).__module__}.{type(eio).__name__} has no {event} handler in handlers; "
+                           f"traffic.py needs the versions pinned in requirements.txt")
+    return handlers[event]
+
+def deliver_to_test_clients(server):
+    """Hand packets written straight to Engine.IO (see fanout.emit_to_room) to the test clients they address.
+
+    Test clients only see what goes through server._send_packet, which
+    their constructor replaces with a function that queues the packet.
+    """
+    check()
+    send = server.eio.send
+
+    def deliver(eio_sid, data):
+        if eio_sid in SocketIOTestClient.clients:
+            server._send_packet(eio_sid, server.packet_class(encoded_packet=data))
+        else:
+            send(eio_sid, data)
+
+    server.eio.send = deliver
+
+def drop_test_client(server, client):
+    """Close a test client's connection as if its transport went away (no DISCONNECT packet)"""
+    check()
+    server._handle_eio_disconnect(client.eio_sid)
+    SocketIOTestClient.clients.pop(client.eio_sid, None)
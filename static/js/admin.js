@@ -1,5 +1,9 @@
 const socket = io();
 let gameStatus = null;
+let questionSearchTimer = null;
+let adminTimer = null; // Timer state with the server deadline, counted down locally
+let adminTimerInterval = null;
+startClockSync(socket);
 
 document.addEventListener('DOMContentLoaded', function() {
     loadGameStatus();
@@ -17,6 +21,11 @@ function setupEventListeners() {
     document.getElementById('next-question').addEventListener('click', nextQuestion);
     document.getElementById('prev-question').addEventListener('click', prevQuestion);
     document.getElementById('set-question').addEventListener('click', setQuestion);
+    document.getElementById('question-search').addEventListener('input', function() {
+        // Search once typing pauses
+        clearTimeout(questionSearchTimer);
+        questionSearchTimer = setTimeout(() => searchQuestions(0), 200);
+    });
     
     // Team management listeners
     document.getElementById('update-team-name').addEventListener('click', updateTeamName);
@@ -29,8 +38,8 @@ function setupEventListeners() {
     
     // Socket listeners
     socket.on('game_status_update', updateGameStatus);
-    socket.on('score_update', function(scoreboard) {
-        updateScoreboard(scoreboard);
+    trackScoreboard(socket, updateScoreboard);
+    socket.on('score_update', function() {
         loadGameStatus(); // Refresh status when scores update (answers submitted)
     });
     socket.on('teams_update', updateTeams);
@@ -38,10 +47,8 @@ function setupEventListeners() {
         loadGameStatus(); // Refresh status when question changes
     });
     
-    // Timer-specific socket events for real-time updates
-    socket.on('timer_update', function(data) {
-        updateAdminTimerRealtime(data.time_remaining, data.bonus_points, data.expired);
-    });
+    // Timer-specific socket events: sent at start, resume and bonus tier boundaries only
+    socket.on('timer_update', updateAdminTimer);
     
     socket.on('timer_expired', function() {
         showAdminTimerExpired();
@@ -116,8 +123,12 @@ function updateQuestionDisplay(status) {
         // Update answer progress
         updateAnswerProgress(status.answer_summary);
         
-        // Update team answers
-        updateTeamAnswers(status.team_answers);
+        // Update team answers (socket status broadcasts only carry the summary)
+        if (status.team_answers) {
+            updateTeamAnswers(status.team_answers);
+        } else {
+            loadGameStatus();
+        }
         
         // Update timer display
         updateAdminTimer(status.timer);
@@ -126,6 +137,7 @@ function updateQuestionDisplay(status) {
         questionSection.style.display = 'none';
         // Hide timer section when game is not active
         document.getElementById('admin-timer-status').style.display = 'none';
+        stopAdminCountdown();
     }
 }
 
@@ -197,6 +209,7 @@ function updateTeamAnswers(teamAnswers) {
 }
 
 function updateAdminTimer(timerData) {
+    stopAdminCountdown();
     if (!timerData) {
         document.getElementById('admin-timer-status').style.display = 'none';
         return;
@@ -225,6 +238,29 @@ function updateAdminTimer(timerData) {
     } else if (percentage <= 50) {
         timerBar.classList.add('warning');
     }
+    
+    // A running timer carries its deadline; count down locally until the next server update
+    if (timerData.deadline) {
+        adminTimer = timerData;
+        noteServerTime(timerData.server_time);
+        adminTimerInterval = setInterval(tickAdminTimer, 250);
+    }
+}
+
+function tickAdminTimer() {
+    const state = timerStateAt(adminTimer, serverNow());
+    updateAdminTimerRealtime(state.timeRemaining, state.bonusPoints, state.timeRemaining <= 0);
+    if (state.timeRemaining <= 0) {
+        stopAdminCountdown();
+    }
+}
+
+function stopAdminCountdown() {
+    if (adminTimerInterval) {
+        clearInterval(adminTimerInterval);
+        adminTimerInterval = null;
+    }
+    adminTimer = null;
 }
 
 function updateAdminTimerRealtime(timeRemaining, bonusPoints, expired) {
@@ -381,6 +417,65 @@ async function setQuestion() {
     }
 }
 
+async function searchQuestions(offset) {
+    const query = document.getElementById('question-search').value.trim();
+    const resultsDiv = document.getElementById('question-search-results');
+    
+    if (!query) {
+        resultsDiv.innerHTML = '';
+        return;
+    }
+    
+    try {
+        const response = await fetch(`/admin/api/questions/search?q=${encodeURIComponent(query)}&offset=${offset}`);
+        const result = await response.json();
+        if (offset === 0) {
+            resultsDiv.innerHTML = '';
+        }
+        const moreButton = resultsDiv.querySelector('.search-more');
+        if (moreButton) {
+            moreButton.remove();
+        }
+        
+        if (!result.success) {
+            resultsDiv.textContent = result.error;
+            return;
+        }
+        if (offset === 0 && result.results.length === 0) {
+            resultsDiv.textContent = 'No matching questions';
+            return;
+        }
+        
+        result.results.forEach(question => {
+            const item = document.createElement('div');
+            item.className = 'search-result';
+            // Text is set through textContent, so question text is never parsed as HTML
+            item.textContent = question.question_number
+                ? `#${question.question_number} ${question.question_text}`
+                : `${question.question_text} (${result.stale ? 'bank is being reloaded' : 'not in this game'})`;
+            if (question.question_number) {
+                item.classList.add('selectable');
+                item.addEventListener('click', () => {
+                    document.getElementById('question-number').value = question.question_number;
+                    setQuestion();
+                });
+            }
+            resultsDiv.appendChild(item);
+        });
+        
+        if (result.has_more) {
+            const more = document.createElement('button');
+            more.className = 'btn btn-primary search-more';
+            more.textContent = 'More results';
+            more.addEventListener('click', () => searchQuestions(offset + result.results.length));
+            resultsDiv.appendChild(more);
+        }
+    } catch (error) {
+        console.error('Error searching questions:', error);
+        showMessage('Error searching questions', 'error');
+    }
+}
+
 async function loadScoreboard() {
     try {
         const response = await fetch('/api/scoreboard');
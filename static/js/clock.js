@@ -0,0 +1,43 @@
+// Server clock estimate for countdowns driven by server deadlines
+let clockOffset = 0; // Server clock minus ours, in ms
+let clockSyncRtt = Infinity; // Round trip of the sample clockOffset came from
+
+function syncClock(socket, samples) {
+    const sentAt = Date.now();
+    socket.emit('clock_sync', sentAt, function(reply) {
+        const receivedAt = Date.now();
+        // The shortest round trip gives the tightest midpoint estimate
+        if (receivedAt - sentAt < clockSyncRtt) {
+            clockSyncRtt = receivedAt - sentAt;
+            clockOffset = reply.server_time - (sentAt + receivedAt) / 2;
+        }
+        if (samples > 1) {
+            syncClock(socket, samples - 1);
+        }
+    });
+}
+
+function startClockSync(socket) {
+    socket.on('connect', function() {
+        clockSyncRtt = Infinity;
+        syncClock(socket, 3);
+    });
+}
+
+function noteServerTime(serverTime) {
+    // Until the handshake answers, use the server clock a payload was sent with (off by one-way latency)
+    if (clockSyncRtt === Infinity && serverTime) {
+        clockOffset = serverTime - Date.now();
+    }
+}
+
+function serverNow() {
+    return Date.now() + clockOffset;
+}
+
+function timerStateAt(timerData, now) {
+    // Seconds left (rounded up like the server) and bonus points on offer at server time now
+    const timeRemaining = Math.max(0, Math.ceil((timerData.deadline - now) / 1000));
+    const tier = (timerData.bonus_schedule || []).find(entry => now < entry.ends_at);
+    return {timeRemaining: timeRemaining, bonusPoints: tier ? tier.bonus_points : 0};
+}
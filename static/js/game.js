@@ -1,4 +1,5 @@
 const socket = io();
+startClockSync(socket);
 let currentQuestion = null;
 let selectedAnswer = null;
 let timerInterval = null;
@@ -19,7 +20,7 @@ function setupEventListeners() {
     });
     
     // Socket event listeners
-    socket.on('score_update', updateScoreboard);
+    trackScoreboard(socket, updateScoreboard);
     socket.on('new_question', function(question) {
         currentQuestion = question;
         displayQuestion(question);
@@ -31,6 +32,13 @@ function setupEventListeners() {
             startTimer(question.timer);
         }
     });
+    // Sent after new_question to teams that already answered it
+    socket.on('question_state', function(state) {
+        if (currentQuestion && currentQuestion.question_number === state.question_number) {
+            Object.assign(currentQuestion, state);
+            displayQuestion(currentQuestion);
+        }
+    });
     socket.on('game_status_update', updateGameStatus);
     socket.on('game_stopped', function(data) {
         showGameStopped(data.scoreboard);
@@ -50,9 +58,9 @@ function setupEventListeners() {
         resumeTimer();
     });
     
-    // Timer-specific socket events
+    // Timer-specific socket events: sent at start, resume and bonus tier boundaries only
     socket.on('timer_update', function(data) {
-        updateTimer(data.time_remaining, data.bonus_points, data.expired);
+        startTimer(data);
     });
     
     socket.on('timer_expired', function() {
@@ -415,8 +423,12 @@ function startTimer(timerData) {
     currentTimer = {
         timeRemaining: timerData.time_remaining || 60,
         bonusPoints: timerData.bonus_points || 6,
-        totalTime: timerData.total_time || 60
+        totalTime: timerData.total_time || 60,
+        // Server deadline and bonus schedule; the countdown is computed from these locally
+        deadline: timerData.deadline,
+        bonus_schedule: timerData.bonus_schedule
     };
+    noteServerTime(timerData.server_time);
     
     // Show timer section
     document.getElementById('timer-section').style.display = 'block';
@@ -427,33 +439,18 @@ function startTimer(timerData) {
     }
     
     // Start countdown
-    updateTimerDisplay();
-    timerInterval = setInterval(function() {
-        if (currentTimer.timeRemaining > 0) {
-            currentTimer.timeRemaining--;
-            // Update bonus points based on remaining time
-            const elapsed = currentTimer.totalTime - currentTimer.timeRemaining;
-            currentTimer.bonusPoints = getBonusPointsForTime(elapsed);
-            updateTimerDisplay();
-        } else {
-            onTimerExpired();
-        }
-    }, 1000);
+    tickTimer();
+    // Sub-second ticks so the display flips close to each whole second of the deadline
+    timerInterval = setInterval(tickTimer, 250);
 }
 
-function updateTimer(timeRemaining, bonusPoints, expired) {
-    if (expired) {
+function tickTimer() {
+    Object.assign(currentTimer, timerStateAt(currentTimer, serverNow()));
+    if (currentTimer.timeRemaining > 0) {
+        updateTimerDisplay();
+    } else {
         onTimerExpired();
-        return;
     }
-    
-    currentTimer = {
-        timeRemaining: timeRemaining,
-        bonusPoints: bonusPoints,
-        totalTime: currentTimer ? currentTimer.totalTime : 60
-    };
-    
-    updateTimerDisplay();
 }
 
 function updateTimerDisplay() {
@@ -490,13 +487,6 @@ function updateTimerDisplay() {
     }
 }
 
-function getBonusPointsForTime(elapsedSeconds) {
-    // Start with 6 points, deduct 1 point every 10 seconds
-    // 0-10s: 6 points, 10-20s: 5 points, 20-30s: 4 points, 30-40s: 3 points, 40-50s: 2 points, 50-60s: 1 point, 60s+: 0 points
-    const points = 6 - Math.floor(elapsedSeconds / 10);
-    return Math.max(0, points); // Ensure points never go below 0
-}
-
 function pauseTimer() {
     if (timerInterval) {
         clearInterval(timerInterval);
@@ -0,0 +1,38 @@
+// Scoreboard kept current from versioned score_update diffs
+function trackScoreboard(socket, render) {
+    const teams = new Map(); // team_id -> scoreboard entry
+    let version = null;
+    let snapshotPending = false;
+
+    function show() {
+        // Same order as the server: score, then the order teams were created in
+        render(Array.from(teams.values()).sort((a, b) => b.score - a.score || a.order - b.order));
+    }
+
+    function requestSnapshot() {
+        if (snapshotPending) return;
+        snapshotPending = true;
+        socket.emit('scoreboard_snapshot', function(snapshot) {
+            snapshotPending = false;
+            teams.clear();
+            snapshot.teams.forEach(team => teams.set(team.team_id, team));
+            version = snapshot.version;
+            show();
+        });
+    }
+
+    socket.on('connect', requestSnapshot);
+    socket.on('score_update', function(diff) {
+        if (version !== null && diff.version <= version) {
+            return; // Already part of the snapshot
+        }
+        if (version === null || diff.version !== version + 1) {
+            requestSnapshot(); // Missed a diff
+            return;
+        }
+        diff.changed.forEach(change => teams.set(change.team_id, Object.assign(teams.get(change.team_id) || {}, change)));
+        diff.removed.forEach(teamId => teams.delete(teamId));
+        version = diff.version;
+        show();
+    });
+}
@@ -0,0 +1,267 @@
+import json
+import sqlite3
+import threading
+import time
+from itertools import groupby
+
+from async_mode import run_blocking
+from models import normalize_player_name
+from scheduler import get_scheduler
+
+class GameStorage:
+    """
+    Storage backend interface for TriviaGame.
+
+    A game always keeps its live state in memory; a backend receives every
+    recorded state change (see TriviaGame._record) and persists whatever it
+    needs. This base class is the in-memory backend: it stores nothing.
+    """
+
+    def open_game(self, game_code, resume=False):
+        """Start recording a game; resume continues the last unfinished game with this code"""
+
+    def record(self, game, event, data):
+        """Persist one state change; game already reflects it"""
+
+    def end_game(self, game_code):
+        """The game was discarded; later games with this code are recorded separately"""
+
+    def flush(self):
+        """Write anything still buffered"""
+
+    def close(self):
+        self.flush()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_code TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    ended_at REAL,
+    started INTEGER NOT NULL DEFAULT 0,
+    paused INTEGER NOT NULL DEFAULT 0,
+    current_question INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS games_by_code ON games (game_code, ended_at);
+CREATE TABLE IF NOT EXISTS teams (
+    game_id INTEGER NOT NULL,
+    team_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    icon TEXT,
+    score INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    removed_at REAL,
+    PRIMARY KEY (game_id, team_id)
+);
+CREATE TABLE IF NOT EXISTS players (
+    game_id INTEGER NOT NULL,
+    team_id TEXT NOT NULL,
+    player_key TEXT NOT NULL,
+    player_name TEXT NOT NULL,
+    joined_at REAL NOT NULL,
+    PRIMARY KEY (game_id, team_id, player_key)
+);
+CREATE INDEX IF NOT EXISTS players_by_key ON players (player_key);
+CREATE TABLE IF NOT EXISTS answers (
+    game_id INTEGER NOT NULL,
+    question_index INTEGER NOT NULL,
+    team_id TEXT NOT NULL,
+    answer TEXT,
+    correct INTEGER NOT NULL,
+    answer_time REAL NOT NULL,
+    points INTEGER NOT NULL,
+    answered_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answers_by_team ON answers (game_id, team_id);
+"""
+
+# Statements are module constants so sqlite3's per-connection statement cache
+# always hands back the same prepared statement
+INSERT_GAME = 'INSERT INTO games (game_code, created_at) VALUES (?, ?)'
+FIND_OPEN_GAME = 'SELECT id FROM games WHERE game_code = ? AND ended_at IS NULL ORDER BY id DESC LIMIT 1'
+HAS_TEAMS = 'SELECT 1 FROM teams WHERE game_id = ? LIMIT 1'
+END_GAME = 'UPDATE games SET ended_at = ? WHERE id = ?'
+UPDATE_GAME_STATE = 'UPDATE games SET started = ?, paused = ?, current_question = ? WHERE id = ?'
+INSERT_TEAM = ('INSERT OR REPLACE INTO teams (game_id, team_id, name, icon, score, created_at) '
+               'VALUES (?, ?, ?, ?, 0, ?)')
+RENAME_TEAM = 'UPDATE teams SET name = ? WHERE game_id = ? AND team_id = ?'
+SET_TEAM_ICON = 'UPDATE teams SET icon = ? WHERE game_id = ? AND team_id = ?'
+REMOVE_TEAM = 'UPDATE teams SET removed_at = ? WHERE game_id = ? AND team_id = ?'
+UPDATE_SCORE = 'UPDATE teams SET score = ? WHERE game_id = ? AND team_id = ?'
+INSERT_PLAYER = ('INSERT OR IGNORE INTO players (game_id, team_id, player_key, player_name, joined_at) '
+                 'VALUES (?, ?, ?, ?, ?)')
+DELETE_PLAYER = 'DELETE FROM players WHERE game_id = ? AND team_id = ? AND player_key = ?'
+INSERT_ANSWER = ('INSERT INTO answers (game_id, question_index, team_id, answer, correct, '
+                 'answer_time, points, answered_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)')
+
+class SQLiteStorage(GameStorage):
+    """
+    SQLite backend keeping teams, players, answers and scores for every game.
+
+    The database runs in WAL mode. Recorded changes are turned into rows and
+    queued; a commit scheduled on the shared timer wheel writes everything
+    queued in one transaction (group commit), with runs of the same statement
+    sent through executemany. submit_answer therefore never waits on the
+    disk. Finished games stay in the database, so results can be queried
+    across games and restarts.
+    """
+
+    def __init__(self, path, commit_interval=0.05, scheduler=None):
+        self.path = path
+        self.commit_interval = commit_interval
+        self.scheduler = scheduler or get_scheduler()
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None,
+                                  cached_statements=64)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+        self.db_lock = threading.Lock()  # Serializes use of the connection
+        self.lock = threading.Lock()  # Guards the pending queue
+        self.pending = []  # (statement, params) waiting for the next commit
+        self.commit_handle = None
+        self.game_ids = {}  # game_code -> games.id of the game being recorded
+        self.commits = 0
+        self.closed = False
+
+    def open_game(self, game_code, resume=False):
+        with self.db_lock:
+            row = self.db.execute(FIND_OPEN_GAME, (game_code,)).fetchone()
+            now = time.time()
+            if row is not None and not resume and self.db.execute(HAS_TEAMS, (row[0],)).fetchone():
+                # The previous game with this code was not recovered; close it off
+                self.db.execute(END_GAME, (now, row[0]))
+                row = None
+            if row is None:
+                game_id = self.db.execute(INSERT_GAME, (game_code, now)).lastrowid
+            else:
+                game_id = row[0]
+        self.game_ids[game_code] = game_id
+        return game_id
+
+    def _game_id(self, game_code):
+        game_id = self.game_ids.get(game_code)
+        if game_id is None:
+            game_id = self.open_game(game_code)
+        return game_id
+
+    def record(self, game, event, data):
+        game_id = self._game_id(game.game_code)
+        now = time.time()
+        rows = []
+        if event == 'submit_answer':
+            team = game.teams[data['team_id']]
+            correct = game.answer_store.get(data['question_index']).is_correct(team.ordinal)
+            answer = data['answer']
+            rows.append((INSERT_ANSWER, (
+                game_id, data['question_index'], team.id,
+                answer if isinstance(answer, str) else json.dumps(answer),
+                int(correct), data['answer_time'],
+                1 + data['bonus_points'] if correct else 0, now)))
+            if correct:
+                rows.append((UPDATE_SCORE, (team.score, game_id, team.id)))
+        elif event == 'create_team':
+            team_id = data['team_id']
+            rows.append((INSERT_TEAM, (game_id, team_id, data['team_name'], data['icon'], now)))
+            rows.append((INSERT_PLAYER, self._player_row(game_id, team_id, data['player_name'], now)))
+        elif event in ('join_team', 'add_player_to_team'):
+            rows.append((INSERT_PLAYER, self._player_row(game_id, data['team_id'], data['player_name'], now)))
+        elif event in ('leave_team', 'remove_player_from_team'):
+            team_id = data['team_id']
+            rows.append((DELETE_PLAYER, (game_id, team_id, normalize_player_name(data['player_name']))))
+            if team_id not in game.teams:
+                rows.append((REMOVE_TEAM, (now, game_id, team_id)))
+        elif event == 'delete_team':
+            rows.append((REMOVE_TEAM, (now, game_id, data['team_id'])))
+        elif event == 'update_team_name':
+            rows.append((RENAME_TEAM, (data['new_name'], game_id, data['team_id'])))
+        elif event == 'set_team_icon':
+            rows.append((SET_TEAM_ICON, (data['icon'], game_id, data['team_id'])))
+        else:
+            # start/stop/pause/resume and question changes
+            rows.append((UPDATE_GAME_STATE, (int(game.game_started), int(game.game_paused),
+                                             game.current_question_index, game_id)))
+        self._enqueue(rows)
+
+    @staticmethod
+    def _player_row(game_id, team_id, player_name, now):
+        return (game_id, team_id, normalize_player_name(player_name), player_name, now)
+
+    def _enqueue(self, rows):
+        with self.lock:
+            if self.closed:
+                return
+            self.pending.extend(rows)
+            if self.commit_handle is None:
+                self.commit_handle = self.scheduler.schedule(self.commit_interval, self.flush)
+
+    def end_game(self, game_code):
+        game_id = self.game_ids.pop(game_code, None)
+        if game_id is not None:
+            self._enqueue([(END_GAME, (time.time(), game_id))])
+
+    def flush(self):
+        """Commit every queued row in a single transaction"""
+        with self.lock:
+            rows, self.pending = self.pending, []
+            self.commit_handle = None
+        if not rows:
+            return
+        with self.db_lock:
+            # The disk write runs off the event loop under eventlet/gevent
+            run_blocking(self._write, rows)
+
+    def _write(self, rows):
+        try:
+            self.db.execute('BEGIN')
+            for statement, group in groupby(rows, key=lambda row: row[0]):
+                self.db.executemany(statement, [params for _, params in group])
+            self.db.execute('COMMIT')
+            self.commits += 1
+        except sqlite3.Error as e:
+            if self.db.in_transaction:
+                self.db.execute('ROLLBACK')
+            print(f"Error writing game data to {self.path}: {e}")
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            if self.commit_handle:
+                self.commit_handle.cancel()
+                self.commit_handle = None
+        self.flush()
+        with self.db_lock:
+            self.db.close()
+
+    # History queries (pending rows are committed first so results are current)
+
+    def _query(self, sql, params=()):
+        self.flush()
+        with self.db_lock:
+            cursor = self.db.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def list_games(self, limit=50):
+        """Most recent games with their team and answer counts"""
+        return self._query(
+            'SELECT g.id, g.game_code, g.created_at, g.ended_at, g.current_question, '
+            '(SELECT COUNT(*) FROM teams t WHERE t.game_id = g.id) AS teams_count, '
+            '(SELECT COUNT(*) FROM answers a WHERE a.game_id = g.id) AS answers_count '
+            'FROM games g ORDER BY g.id DESC LIMIT ?', (limit,))
+
+    def game_results(self, game_id):
+        """Final scoreboard of one game, including teams that were removed"""
+        return self._query(
+            'SELECT team_id, name, icon, score, removed_at, '
+            '(SELECT COUNT(*) FROM answers a WHERE a.game_id = t.game_id AND a.team_id = t.team_id) AS answered, '
+            '(SELECT COUNT(*) FROM answers a WHERE a.game_id = t.game_id AND a.team_id = t.team_id '
+            'AND a.correct) AS correct '
+            'FROM teams t WHERE game_id = ? ORDER BY score DESC, created_at', (game_id,))
+
+    def player_history(self, player_name):
+        """Every game a player took part in, with their team's score"""
+        return self._query(
+            'SELECT g.id AS game_id, g.game_code, g.created_at, t.team_id, t.name AS team_name, t.score '
+            'FROM players p JOIN teams t ON t.game_id = p.game_id AND t.team_id = p.team_id '
+            'JOIN games g ON g.id = p.game_id WHERE p.player_key = ? ORDER BY g.id DESC',
+            (normalize_player_name(player_name),))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test the column-wise answer store
+Runs in-process against AnswerStore; no server needed.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from answer_store import AnswerStore, QuestionAnswers, TEXT_ANSWER
+
+OPTIONS = ['Alpha', 'Bravo', 'Charlie']
+
+def build_sheet():
+    sheet = QuestionAnswers()
+    sheet.record(0, 2, None, True, 3.5)
+    sheet.record(4, TEXT_ANSWER, 'paris', False, 7.0)  # Leaves ordinals 1-3 empty
+    sheet.record(5, TEXT_ANSWER, 'paris', False, 8.0)
+    sheet.record(6, TEXT_ANSWER, ['not', 'hashable'], False, 9.0)
+    return sheet
+
+def test_record_and_read():
+    print("\n=== Recording and reading answers ===")
+    sheet = build_sheet()
+    assert sheet.answer(0, OPTIONS) == 'Charlie', f"Wrong option answer: {sheet.answer(0, OPTIONS)}"
+    assert sheet.answer(4, OPTIONS) == 'paris' and sheet.answer(5, OPTIONS) == 'paris', "Wrong text answer"
+    assert sheet.answer(6, OPTIONS) == ['not', 'hashable'], "Unhashable answer lost"
+    assert sheet.texts.count('paris') == 1, f"Text not interned: {sheet.texts}"
+    assert sheet.is_correct(0) is True and sheet.is_correct(4) is False, "Wrong correctness"
+    assert sheet.answer_time(0) == 3.5, f"Wrong time: {sheet.answer_time(0)}"
+    for ordinal in (1, 3, 7, 100):
+        assert not sheet.has_answered(ordinal), f"Ordinal {ordinal} reported as answered"
+        assert sheet.answer(ordinal, OPTIONS) is None and sheet.is_correct(ordinal) is None, \
+            f"Ordinal {ordinal} has an answer"
+    assert (sheet.answered_count, sheet.correct_count) == (4, 1), \
+        f"Wrong counts: {sheet.answered_count}, {sheet.correct_count}"
+    print("✓ Option and text answers, gaps and counts")
+
+def test_clear():
+    print("\n=== Clearing a team ===")
+    store = AnswerStore()
+    store.for_question(0).record(0, 1, None, True, 1.0)
+    store.for_question(1).record(0, 0, None, False, 2.0)
+    store.for_question(1).record(1, 1, None, True, 2.0)
+    assert store.answered_count(0) == 2, "Wrong answered count"
+    store.clear_team(0)
+    store.clear_team(0)  # Clearing twice must not change the counts again
+    assert store.answered_count(0) == 0, "Team still has answers"
+    assert not store.has_answered(0, 0), "Answer not cleared"
+    sheet = store.get(1)
+    assert (sheet.answered_count, sheet.correct_count) == (1, 1), \
+        f"Wrong counts: {sheet.answered_count}, {sheet.correct_count}"
+    assert store.get(5) is None, "Unplayed question has a sheet"
+    print("✓ Clearing a team removes its answers and keeps the counts right")
+
+def test_state_round_trip():
+    print("\n=== Snapshot round trip ===")
+    store = AnswerStore()
+    store.questions[3] = build_sheet()
+    restored = AnswerStore.from_state(store.to_state())
+    sheet = restored.get(3)
+    for ordinal in range(8):
+        assert sheet.answer(ordinal, OPTIONS) == store.get(3).answer(ordinal, OPTIONS), f"Ordinal {ordinal} differs"
+        assert sheet.answer_time(ordinal) == store.get(3).answer_time(ordinal), f"Time {ordinal} differs"
+    assert (sheet.answered_count, sheet.correct_count) == (4, 1), "Counts not restored"
+    sheet.record(7, TEXT_ANSWER, 'paris', False, 1.0)
+    assert sheet.texts.count('paris') == 1, "Interning lost after restore"
+    print("✓ to_state/from_state keeps answers, times, counts and interning")
+
+if __name__ == '__main__':
+    try:
+        test_record_and_read()
+        test_clear()
+        test_state_round_trip()
+        print("\n✅ All answer store tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
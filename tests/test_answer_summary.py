@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test the answer summary and per-team answer pages of the game status
+Runs in-process against TriviaGame; no server needed.
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import TriviaGame, Question
+
+QUESTIONS = [
+    Question('Pick the planet', 'multiple_choice', ['Mars', 'Moon', 'Sun', 'Comet'], 'Mars'),
+    Question('Capital of France?', 'fill_in_blank', [], 'Paris'),
+    Question('Pick a river', 'multiple_choice', ['Nile', 'Alps'], 'Nile'),
+]
+ANSWERS = {0: ['Mars', 'Moon', 'Sun', 'mars', 'Pluto'], 1: ['Paris', ' paris ', 'Lyon', ''], 2: ['Nile', 'Alps']}
+
+def recount(game):
+    """teams_answered and correct_answers from the full per-team list"""
+    team_answers = game.get_game_status()['team_answers']
+    return (sum(answer['has_answered'] for answer in team_answers),
+            sum(bool(answer['is_correct']) for answer in team_answers))
+
+def check(game, expected, label):
+    status = game.get_game_status()
+    summary = status['answer_summary']
+    counts = (summary['teams_answered'], summary['correct_answers'])
+    assert counts == recount(game), f"{label}: summary {counts} differs from the team list {recount(game)}"
+    assert counts == expected, f"{label}: summary {counts}, expected {expected}"
+    assert summary['teams_total'] == len(game.teams), f"{label}: wrong team total"
+    pages = []
+    for offset in range(0, len(game.teams) + 7, 7):
+        pages.extend(game.get_game_status(offset=offset, limit=7)['team_answers'])
+    assert pages == status['team_answers'], f"{label}: pages differ from the full list"
+    assert 'team_answers' not in game.get_game_status(include_team_answers=False), f"{label}: list not left out"
+
+def test_summary():
+    print("\n=== Summary counts while teams answer ===")
+    rng = random.Random(8)
+    game = TriviaGame()
+    game.load_questions(QUESTIONS)
+    team_ids = [game.create_team(f'Team {i}', f'Player {i}')['team_id'] for i in range(40)]
+    game.start_game()
+    for question_index, question in enumerate(QUESTIONS):
+        if question_index:
+            game.next_question()
+        answered = {}
+        check(game, (0, 0), f"Question {question_index + 1} before answers")
+        for team_id in rng.sample(team_ids, 30):
+            answer = rng.choice(ANSWERS[question_index])
+            if game.submit_answer(team_id, answer)['success']:
+                answered[team_id] = game._check_answer(answer, question.correct_answer)
+            game.submit_answer(team_id, rng.choice(ANSWERS[question_index]))  # Refused: already answered
+            check(game, (len(answered), sum(answered.values())), f"Question {question_index + 1}")
+        removed = rng.choice(list(answered))
+        game.delete_team(removed)
+        team_ids.remove(removed)
+        del answered[removed]
+        check(game, (len(answered), sum(answered.values())), f"Question {question_index + 1} after a delete")
+    print("✓ Kept counts match a recount of the per-team list, through refusals and team deletes")
+    print("✓ Paged per-team lists add up to the full list")
+
+if __name__ == '__main__':
+    try:
+        test_summary()
+        print("\n✅ All answer summary tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
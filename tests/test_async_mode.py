@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test serving in each async mode: patching, run_blocking, the timer wheel and fan-out yields
+Runs app.py in-process in a child interpreter per mode (patching cannot be undone); no server needed.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from async_mode import ASYNC_MODES
+from fanout import YIELD_EVERY
+
+# Runs in the child: reports what the selected mode does, as JSON on the last line of output
+CHILD = r'''
+import json, sys, time
+sys.path.insert(0, ROOT)
+import app as trivia_app
+import async_mode
+import socketio
+from fanout import emit_to_room, YIELD_EVERY
+from scheduler import get_scheduler
+
+mode = async_mode.ASYNC_MODE
+if mode == 'eventlet':
+    from eventlet.patcher import original
+    native_sleep = original('time').sleep
+elif mode == 'gevent':
+    from gevent import monkey
+    native_sleep = monkey.get_original('time', 'sleep')
+else:
+    native_sleep = time.sleep
+
+def count_ticks(blocking_call):
+    """Ticks a background task gets in while blocking_call holds the CPU for 0.3 s"""
+    ticks = []
+    def ticker():
+        for _ in range(100):
+            ticks.append(1)
+            trivia_app.socketio.sleep(0.01)
+    trivia_app.socketio.start_background_task(ticker)
+    trivia_app.socketio.sleep(0.02)
+    before = len(ticks)
+    blocking_call(native_sleep, 0.3)
+    return len(ticks) - before
+
+fired = []
+get_scheduler().schedule(0.05, fired.append, 'tick')
+trivia_app.socketio.sleep(0.5)
+
+server = socketio.Server(async_mode=mode)
+server.eio.send = lambda eio_sid, data: None
+yields = []
+server.sleep = lambda seconds=0: yields.append(seconds)
+for number in range(YIELD_EVERY * 2 + 10):
+    server.manager.enter_room(server.manager.connect(f'eio-{number}', '/'), '/', 'room', f'eio-{number}')
+emit_to_room(server, 'score_update', {'version': 1}, 'room')
+
+print(json.dumps({
+    'socketio_mode': trivia_app.socketio.async_mode,
+    'debug': trivia_app.DEBUG,
+    'ticks_with_run_blocking': count_ticks(async_mode.run_blocking),
+    'ticks_with_plain_call': count_ticks(lambda fn, *args: fn(*args)),
+    'timer_fired': fired,
+    'fanout_yields': len(yields),
+}))
+'''.replace('ROOT', repr(ROOT))
+
+def run_child(mode, **env):
+    environment = {key: value for key, value in os.environ.items() if not key.startswith('TRIVIA_')}
+    environment.update(TRIVIA_ASYNC_MODE=mode, **env)
+    return subprocess.run([sys.executable, '-c', CHILD], capture_output=True, text=True, timeout=120,
+                          cwd=ROOT, env=environment)
+
+def test_unknown_mode():
+    print("\n=== Unknown mode ===")
+    result = run_child('asyncio')
+    assert result.returncode != 0 and 'TRIVIA_ASYNC_MODE must be one of' in result.stderr, \
+        f"Unknown mode not refused: {result.stderr[-300:]}"
+    print("✓ An unknown TRIVIA_ASYNC_MODE stops the server with the modes it accepts")
+
+def test_modes():
+    for mode in ASYNC_MODES:
+        print(f"\n=== {mode} ===")
+        result = run_child(mode)
+        assert result.returncode == 0, f"{mode}: child failed: {result.stderr[-800:]}"
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        assert report['socketio_mode'] == mode, f"Socket.IO runs in {report['socketio_mode']}"
+        assert report['debug'] is False, "Debug on without TRIVIA_DEBUG=1"
+        print(f"✓ Socket.IO serves in {mode} mode with debug off")
+
+        assert report['timer_fired'] == ['tick'], f"Timer wheel did not fire: {report['timer_fired']}"
+        print("✓ The timer wheel fires")
+
+        assert report['ticks_with_run_blocking'] >= 10, \
+            f"Only {report['ticks_with_run_blocking']} ticks while run_blocking held a native thread"
+        if mode != 'threading':
+            assert report['ticks_with_plain_call'] <= 2, \
+                f"{report['ticks_with_plain_call']} ticks during a plain blocking call; is the standard library patched?"
+            print("✓ Blocking work in run_blocking leaves the event loop running; a plain call stalls it")
+        else:
+            print("✓ run_blocking is a plain call and other threads keep running")
+
+        expected = 0 if mode == 'threading' else 2
+        assert report['fanout_yields'] == expected, f"{report['fanout_yields']} yields, expected {expected}"
+        print(f"✓ A room emit to {YIELD_EVERY * 2 + 10} clients yields {expected} times")
+
+if __name__ == '__main__':
+    try:
+        test_unknown_mode()
+        test_modes()
+        print("\n✅ All async mode tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test that the game's command queue runs commands one at a time
+Runs in-process against CommandQueue and TriviaGame; no server needed.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from command_queue import CommandQueue
+from models import TriviaGame, Question
+
+THREADS = 8
+COMMANDS = 500
+
+def run_threads(target):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def test_single_writer():
+    print("\n=== Commands never overlap ===")
+    queue = CommandQueue()
+    state = {'active': 0, 'overlaps': 0, 'count': 0}
+    order = {i: [] for i in range(THREADS)}
+
+    def increment(thread_index, n):
+        state['active'] += 1
+        if state['active'] > 1:
+            state['overlaps'] += 1
+        count = state['count']
+        time.sleep(0)  # Invite a thread switch in the middle of the update
+        state['count'] = count + 1
+        order[thread_index].append(n)
+        state['active'] -= 1
+
+    run_threads(lambda i: [queue.run(increment, i, n) for n in range(COMMANDS)])
+    assert state['overlaps'] == 0, f"{state['overlaps']} commands overlapped"
+    assert state['count'] == THREADS * COMMANDS, f"Lost updates: {state['count']}"
+    assert queue.executed == THREADS * COMMANDS, f"Executed {queue.executed}"
+    assert all(order[i] == list(range(COMMANDS)) for i in order), "Commands ran out of order"
+    print("✓ No overlap, no lost updates, each caller's commands in order")
+
+def test_results_and_errors():
+    print("\n=== Results, errors and nested commands ===")
+    queue = CommandQueue()
+
+    def fail():
+        raise ValueError('boom')
+
+    def outer():
+        return queue.run(lambda: 'inner') + ' from outer'
+
+    assert queue.run(lambda x, y=0: x + y, 2, y=3) == 5, "Wrong result"
+    try:
+        queue.run(fail)
+        raise AssertionError("Error not raised to the caller")
+    except ValueError as e:
+        assert str(e) == 'boom', f"Wrong error: {e}"
+    assert queue.run(outer) == 'inner from outer', "Nested command failed"
+    assert queue.run(lambda: 'after') == 'after', "Queue stuck after an error"
+    print("✓ Results and errors reach their caller; nested commands run inline")
+
+def test_concurrent_answers():
+    print("\n=== Concurrent answers to one game ===")
+    game = TriviaGame()
+    game.load_questions([Question('Pick c', 'multiple_choice', ['a', 'b', 'c', 'd'], 'c')])
+    team_ids = [game.create_team(f'Team {i}', f'Player {i}')['team_id'] for i in range(THREADS * 20)]
+    game.start_game()
+
+    def answer(thread_index):
+        for team_id in team_ids[thread_index::THREADS]:
+            assert game.submit_answer(team_id, 'c')['success'], "Answer rejected"
+            assert not game.submit_answer(team_id, 'a')['success'], "Second answer accepted"
+
+    run_threads(answer)
+    status = game.get_game_status()
+    assert status['answer_summary']['teams_answered'] == len(team_ids), f"Answers lost: {status['answer_summary']}"
+    scores = {team['score'] for team in game.get_scoreboard_entries()}
+    assert len(scores) == 1 and scores.pop() > 0, f"Inconsistent scores: {scores}"
+    game.stop_game()
+    print("✓ Every team answered exactly once")
+
+if __name__ == '__main__':
+    try:
+        test_single_writer()
+        test_results_and_errors()
+        test_concurrent_answers()
+        print("\n✅ All command queue tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
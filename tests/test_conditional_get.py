@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test the ETags of the polled JSON endpoints: which changes move them, and 304s
+Runs in-process against the Flask test client; no server needed.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as trivia_app
+from models import Question
+
+ENDPOINTS = ('teams', 'scoreboard', 'question', 'status')
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def build():
+    """A fresh game room with one team, and a test client logged in as its player and as admin"""
+    registry = trivia_app.registry
+    code = registry.create_game()['game_code']
+    room_game = registry.get(code)
+    room_game.clock = Clock()  # Whole seconds of countdown are part of some versions
+    room_game.load_questions([Question(f'Question {i}?', 'multiple_choice', ['Left', 'Right'], 'Right')
+                              for i in range(3)])
+    team_id = room_game.create_team('Alpha', 'Ann')['team_id']
+    client = trivia_app.app.test_client()
+    with client.session_transaction() as session:
+        session.update(admin_logged_in=True, game_code=code, team_id=team_id, player_name='Ann')
+    paths = {'teams': f'/games/{code}/api/teams', 'scoreboard': f'/games/{code}/api/scoreboard',
+             'question': f'/games/{code}/api/question', 'status': f'/games/{code}/admin/api/status'}
+    return code, room_game, team_id, client, paths
+
+def etags(client, paths):
+    result = {}
+    for name, path in paths.items():
+        response = client.get(path)
+        assert response.status_code == 200, f"{name}: {response.status_code}"
+        assert response.headers['Cache-Control'] == 'no-cache', f"{name}: not revalidated"
+        result[name] = response.headers['ETag']
+    return result
+
+def check(client, paths, before, expected, label):
+    """ETags after a change: those in expected moved, the others did not; returns them"""
+    after = etags(client, paths)
+    moved = {name for name in ENDPOINTS if after[name] != before[name]}
+    assert moved == set(expected), f"{label}: ETags of {sorted(moved)} moved, expected {sorted(expected)}"
+    print(f"✓ {label}: {', '.join(sorted(expected)) or 'nothing'} changed")
+    return after
+
+def test_etags():
+    print("\n=== Which changes move which ETags ===")
+    code, room_game, team_id, client, paths = build()
+    tags = etags(client, paths)
+    assert etags(client, paths) == tags, "ETags moved without a change"
+
+    room_game.create_team('Beta', 'Bob')
+    tags = check(client, paths, tags, ENDPOINTS, "New team")
+    room_game.start_game()
+    tags = check(client, paths, tags, ('question', 'status'), "Game started")
+    room_game.clock.now += 1.5
+    tags = check(client, paths, tags, ('question', 'status'), "Countdown ticked")
+    room_game.submit_answer(team_id, 'Right')
+    tags = check(client, paths, tags, ENDPOINTS, "Answer scored")
+    room_game.next_question()
+    tags = check(client, paths, tags, ('question', 'status'), "Next question")
+    room_game.update_team_name(team_id, 'Alpha Prime')
+    tags = check(client, paths, tags, ENDPOINTS, "Team renamed")
+
+    other = trivia_app.registry.create_game()['game_code']
+    other_game = trivia_app.registry.get(other)
+    other_game.create_team('Elsewhere', 'Eve')
+    other_game.start_game()
+    tags = check(client, paths, tags, (), "Change in another game")
+    trivia_app.registry.remove_game(other)
+    trivia_app.registry.remove_game(code)
+
+def test_not_modified():
+    print("\n=== If-None-Match ===")
+    code, room_game, team_id, client, paths = build()
+    tags = etags(client, paths)
+    for name, path in paths.items():
+        response = client.get(path, headers={'If-None-Match': tags[name]})
+        assert response.status_code == 304 and not response.data, f"{name}: {response.status_code}"
+        assert response.headers['ETag'] == tags[name], f"{name}: 304 without its ETag"
+    print("✓ The current ETag gets an empty 304")
+
+    room_game.submit_answer(team_id, 'Left')  # Wrong, but still a recorded answer
+    room_game.create_team('Gamma', 'Gus')
+    for name, path in paths.items():
+        response = client.get(path, headers={'If-None-Match': tags[name]})
+        assert response.status_code == 200 and response.json is not None, f"{name}: {response.status_code}"
+        if name in ('teams', 'scoreboard'):
+            assert b'Gamma' in response.data, f"{name}: body from before the change"
+    assert response.json['teams_count'] == 2, "status: body from before the change"
+    print("✓ An old ETag gets the new body")
+    trivia_app.registry.remove_game(code)
+
+if __name__ == '__main__':
+    try:
+        test_etags()
+        test_not_modified()
+        print("\n✅ All conditional GET tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
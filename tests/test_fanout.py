@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test emit_to_room: one frame per client in the room, encoded once
+Runs in-process against a python-socketio Server whose engine.io send collects packets; no server needed.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import socketio
+from socketio import packet
+
+import fanout
+from fanout import emit_to_room
+from serializer import RawJSON, dumpb
+
+ROOM = 'game:test'
+PAYLOAD = {'question_text': 'Pick the planet', 'options': ['Mars', 'Moon'], 'timer': {'time_remaining': 58}}
+
+class CountingPacket(packet.Packet):
+    encodes = 0
+
+    def encode(self):
+        CountingPacket.encodes += 1
+        return super().encode()
+
+def build(client_count, manager=None, namespace='/'):
+    """A server with client_count clients in ROOM and one outside it, and the frames sent to each"""
+    server = socketio.Server(client_manager=manager)
+    sent = []
+    server.eio.send = lambda eio_sid, data: sent.append((eio_sid, data))
+    for number in range(client_count + 1):
+        sid = server.manager.connect(f'eio-{number}', namespace)
+        if number:
+            server.manager.enter_room(sid, namespace, ROOM, f'eio-{number}')
+    return server, sent
+
+def expected_frame(namespace='/'):
+    return packet.Packet(packet.EVENT, namespace=namespace, data=['new_question', PAYLOAD]).encode()
+
+def check_frames(sent, client_count, namespace='/', label=''):
+    eio_sids = [eio_sid for eio_sid, _ in sent]
+    assert sorted(eio_sids) == sorted(f'eio-{number}' for number in range(1, client_count + 1)), \
+        f"{label}: frames went to {sorted(eio_sids)}"
+    assert {data for _, data in sent} == {expected_frame(namespace)}, f"{label}: frames differ from Packet.encode()"
+
+def test_one_encode():
+    print("\n=== Dict payloads ===")
+    for namespace in ('/', '/game'):
+        server, sent = build(50, namespace=namespace)
+        server.packet_class = CountingPacket
+        CountingPacket.encodes = 0
+        emit_to_room(server, 'new_question', PAYLOAD, ROOM, namespace=namespace)
+        check_frames(sent, 50, namespace, f"Namespace {namespace}")
+        assert CountingPacket.encodes == 1, f"Namespace {namespace}: encoded {CountingPacket.encodes} times"
+    print("✓ Each client in the room gets exactly one frame, the packet is encoded once")
+
+    server, sent = build(0)
+    emit_to_room(server, 'new_question', PAYLOAD, ROOM, namespace='/nobody')
+    emit_to_room(server, 'new_question', PAYLOAD, 'game:empty')
+    assert not sent, "Frames sent with no one to receive them"
+    print("✓ An empty room or unused namespace sends nothing")
+
+def test_raw_json():
+    print("\n=== RawJSON payloads ===")
+    encoded = []
+    raw_event_packet = fanout.raw_event_packet
+    fanout.raw_event_packet = lambda *args: encoded.append(args) or raw_event_packet(*args)
+    try:
+        for namespace in ('/', '/game'):
+            encoded.clear()
+            server, sent = build(50, namespace=namespace)
+            emit_to_room(server, 'new_question', RawJSON(dumpb(PAYLOAD)), ROOM, namespace=namespace)
+            check_frames(sent, 50, namespace, f"RawJSON in namespace {namespace}")
+            assert len(encoded) == 1, f"Namespace {namespace}: packet built {len(encoded)} times"
+    finally:
+        fanout.raw_event_packet = raw_event_packet
+    print("✓ Pre-encoded data is wrapped once into the frame Packet.encode() builds")
+
+def test_message_queue_fallback():
+    print("\n=== Other managers ===")
+    class QueueManager(socketio.BaseManager):
+        """Stands in for a message-queue manager: anything but the in-process BaseManager"""
+
+    server, sent = build(20, manager=QueueManager())
+    emitted = []
+    emit = server.emit
+    server.emit = lambda *args, **kwargs: emitted.append((args, kwargs)) or emit(*args, **kwargs)
+    emit_to_room(server, 'new_question', RawJSON(dumpb(PAYLOAD)), ROOM)
+    assert len(emitted) == 1 and emitted[0][0][1] == PAYLOAD, f"Not handed to server.emit decoded: {emitted}"
+    check_frames(sent, 20, label="Through server.emit")
+    print("✓ Managers other than BaseManager go through server.emit with decoded data")
+
+if __name__ == '__main__':
+    try:
+        test_one_encode()
+        test_raw_json()
+        test_message_queue_fallback()
+        print("\n✅ All fan-out tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test the team and player caps applied by the game registry
+Runs in-process against GameRegistry; no server needed.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_registry import GameRegistry, DEFAULT_GAME_CODE
+
+def fill(game, teams):
+    """Create teams until one is refused; returns how many were accepted"""
+    for i in range(teams):
+        if not game.create_team(f'Team {i}', f'Player {i}')['success']:
+            return i
+    return teams
+
+def test_uncapped_by_default():
+    print("\n=== Default settings ===")
+    registry = GameRegistry(sweep_interval=0)
+    default_game = registry.get_default()
+    assert fill(default_game, 1500) == 1500, "Default room refused teams"
+    code = registry.create_game()['game_code']
+    assert fill(registry.get(code), 1500) == 1500, "New room refused teams"
+    team_id = next(iter(registry.get(code).teams))
+    for i in range(50):
+        assert registry.get(code).join_team(team_id, f'Member {i}')['success'], "Player refused"
+    print("✓ More than 1000 teams and 20 players per team accepted")
+
+def test_caps():
+    print("\n=== Configured caps ===")
+    registry = GameRegistry(max_teams_per_game=3, max_players_per_team=2, sweep_interval=0)
+    code = registry.create_game()['game_code']
+    game = registry.get(code)
+    assert fill(game, 10) == 3, "Team cap not applied"
+    team_id = next(iter(game.teams))
+    assert game.join_team(team_id, 'Second')['success'], "Second player refused"
+    assert not game.join_team(team_id, 'Third')['success'], "Player cap not applied"
+    assert registry.get_default().max_teams is None, "Default room capped"
+    assert fill(registry.games[DEFAULT_GAME_CODE], 10) == 10, "Default room refused teams"
+    print("✓ Caps apply to created rooms but not the default room")
+
+if __name__ == '__main__':
+    try:
+        test_uncapped_by_default()
+        test_caps()
+        print("\n✅ All game registry tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test the content-addressed icon store, its cache of processed uploads, and the /icons route
+Runs in-process against IconStore and the Flask test client; no server needed.
+"""
+
+import base64
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+import app as trivia_app
+import icon_store
+from icon_store import IconStore, THUMBNAIL_SIZE, decode_data_url, icon_url
+
+def image_bytes(color, size=(300, 200), image_format='PNG', **options):
+    output = io.BytesIO()
+    Image.new('RGB', size, color).save(output, image_format, **options)
+    return output.getvalue()
+
+def data_url(data, mime='image/png'):
+    return f'data:{mime};base64,{base64.b64encode(data).decode()}'
+
+class CountingThumbnails:
+    """Stands in for make_thumbnail and counts the images it processes"""
+
+    def __init__(self):
+        self.calls = 0
+        self.make_thumbnail = icon_store.make_thumbnail
+
+    def __call__(self, data):
+        self.calls += 1
+        return self.make_thumbnail(data)
+
+def counting():
+    counter = CountingThumbnails()
+    icon_store.make_thumbnail = counter
+    return counter
+
+def test_content_hash():
+    print("\n=== Content hashes ===")
+    counter = counting()
+    try:
+        store = IconStore()
+        red = image_bytes('red')
+        icon_hash = store.add(red)
+        thumbnail = store.get(icon_hash)
+        with Image.open(io.BytesIO(thumbnail)) as image:
+            assert image.format == 'PNG' and max(image.size) == THUMBNAIL_SIZE, f"Thumbnail {image.format} {image.size}"
+        assert counter.calls == 1, f"Processed {counter.calls} times"
+        print("✓ An upload is stored as a PNG thumbnail under its hash")
+
+        assert [store.add(red) for _ in range(100)] == [icon_hash] * 100, "Same upload got another hash"
+        assert counter.calls == 1, f"Re-uploads processed again: {counter.calls} calls"
+        print("✓ Re-uploading the same bytes is a cache hit and is not processed again")
+
+        recompressed = image_bytes('red', compress_level=0)
+        assert recompressed != red and store.add(recompressed) == icon_hash, "Same thumbnail stored twice"
+        assert counter.calls == 2 and len(store.icons) == 1, "Different bytes of the same image stored twice"
+        assert store.add(image_bytes('blue')) != icon_hash and len(store.icons) == 2, "Different image not stored"
+        print("✓ Different uploads with the same thumbnail share one icon; different images do not")
+    finally:
+        icon_store.make_thumbnail = counter.make_thumbnail
+
+def test_directory():
+    print("\n=== Icon directory ===")
+    with tempfile.TemporaryDirectory() as directory:
+        icon_hash = IconStore(directory).add(image_bytes('green'))
+        assert os.listdir(directory) == [f'{icon_hash}.png'], f"Directory holds {os.listdir(directory)}"
+        restarted = IconStore(directory)
+        assert restarted.get(icon_hash) is not None and icon_hash in restarted.icons, "Icon lost on restart"
+        with open(os.path.join(directory, 'secret.png'), 'wb') as f:
+            f.write(b'not an icon')
+        for name in ('secret', '../secret', 'f' * 64):
+            assert restarted.get(name) is None, f"{name!r} read from the directory"
+    print("✓ Thumbnails survive a restart, and only hashes are looked up on disk")
+
+def test_decode_data_url():
+    print("\n=== Upload checks ===")
+    png = image_bytes('red')
+    assert decode_data_url(data_url(png)) == png, "PNG data URL not decoded"
+    assert decode_data_url(data_url(image_bytes('red', image_format='WEBP'), 'image/webp'))[8:12] == b'WEBP'
+    for bad in (None, 'http://example.com/a.png', 'data:text/plain;base64,aGk=', 'data:image/png,raw',
+                'data:image/png;base64,%%%', data_url(b'GIF80a not an image'), data_url(b'\x00' * 5000)):
+        try:
+            decode_data_url(bad)
+            raise AssertionError(f"{bad!r:.40} accepted")
+        except ValueError:
+            pass
+    oversized = 'data:image/png;base64,' + 'A' * (icon_store.MAX_ICON_BYTES * 4 // 3 + 8)
+    try:
+        decode_data_url(oversized)
+        raise AssertionError("Oversized upload accepted")
+    except ValueError:
+        pass
+    print("✓ Only base64 data URLs of a known image format and size get to the workers")
+
+def test_icon_route():
+    print("\n=== Team icons over HTTP ===")
+    registry = trivia_app.registry
+    code = registry.create_game()['game_code']
+    room_game = registry.get(code)
+    client = trivia_app.app.test_client()
+    icon = data_url(image_bytes('purple', size=(640, 480), image_format='JPEG'), 'image/jpeg')
+    response = client.post(f'/games/{code}/api/teams', json={'team_name': 'Icons', 'player_name': 'Ivy',
+                                                               'team_icon': icon})
+    assert response.status_code == 200, response.json
+    team = room_game.teams[response.json['team_id']]
+    for _ in range(100):
+        if team.icon:
+            break
+        time.sleep(0.05)
+    assert team.icon and team.icon.startswith('/icons/'), f"Team icon {team.icon!r} not set"
+    icon_hash = team.icon.rsplit('/', 1)[1]
+    assert team.icon == icon_url(icon_hash), "Icon URL is not the hash"
+
+    response = client.get(team.icon)
+    assert response.status_code == 200 and response.mimetype == 'image/png', f"{response.status_code}"
+    assert 'immutable' in response.headers['Cache-Control'], "Icon not cacheable forever"
+    assert response.headers['ETag'] == f'"{icon_hash}"', "ETag is not the hash"
+    assert client.get(team.icon, headers={'If-None-Match': f'"{icon_hash}"'}).status_code == 304, "No 304"
+    assert client.get(icon_url('0' * 64)).status_code == 404, "Unknown icon found"
+    response = client.post(f'/games/{code}/api/teams', json={'team_name': 'Bad', 'player_name': 'Bo',
+                                                               'team_icon': 'data:image/png;base64,AAAA'})
+    assert response.status_code == 400 and len(room_game.teams) == 1, "Bad icon accepted"
+    registry.remove_game(code)
+    print("✓ Uploaded icons are served by hash, cached forever and revalidated with 304")
+
+if __name__ == '__main__':
+    try:
+        test_content_hash()
+        test_directory()
+        test_decode_data_url()
+        test_icon_route()
+        print("\n✅ All icon store tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test that a game recovers its state from the journal and its snapshots
+Runs in-process against TriviaGame and GameJournal; no server needed.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from journal import GameJournal
+from models import TriviaGame, Question
+
+QUESTIONS = [Question(f'Question {i}', 'multiple_choice', ['a', 'b', 'c', 'd'], 'c') for i in range(5)]
+
+def play(directory, snapshot_every=0, journal=None):
+    """Play a short game against a journal; returns the state it should recover to and the event count"""
+    game = TriviaGame()
+    game.load_questions(QUESTIONS)
+    game.attach_journal(journal or GameJournal(directory, snapshot_every=snapshot_every))
+    team_ids = [game.create_team(f'Team {i}', f'Captain {i}')['team_id'] for i in range(6)]
+    for i, team_id in enumerate(team_ids):
+        game.join_team(team_id, f'Player {i}')
+    game.start_game()
+    for question_index in range(3):
+        for i, team_id in enumerate(team_ids):
+            game.submit_answer(team_id, 'abcd'[(i + question_index) % 4])
+        game.set_question(question_index + 1)
+    game.add_player_to_team(team_ids[1], 'Player 0')
+    game.delete_team(team_ids[2])
+    game.pause_game()
+    state = game.to_snapshot()
+    events = game.journal.seq
+    game.journal.close()
+    game.stop_game()
+    return state, events
+
+def recover(directory):
+    game = TriviaGame()
+    game.load_questions(QUESTIONS)
+    replayed = game.attach_journal(GameJournal(directory))
+    state = game.to_snapshot()
+    game.journal.close()
+    game.stop_game()
+    return state, replayed
+
+def test_replay():
+    print("\n=== Recovery by replaying the journal ===")
+    with tempfile.TemporaryDirectory() as directory:
+        expected, events = play(directory)
+        state, replayed = recover(directory)
+        assert replayed == events, f"Replayed {replayed} of {events} events"
+        assert state == expected, "Recovered state differs"
+    print(f"✓ Replaying {replayed} events restores the game")
+
+def test_snapshots():
+    print("\n=== Recovery from a snapshot plus the tail ===")
+    with tempfile.TemporaryDirectory() as directory:
+        expected, events = play(directory, snapshot_every=7)
+        assert os.path.exists(os.path.join(directory, 'snapshot.pickle')), "No snapshot written"
+        assert sorted(os.listdir(directory)) == ['journal.jsonl', 'snapshot.pickle'], \
+            f"Rotated journals left behind: {os.listdir(directory)}"
+        state, replayed = recover(directory)
+        # A snapshot still being written when the next one is due makes the game skip that one
+        assert replayed < events, f"Replayed all {replayed} events despite the snapshot"
+        assert state == expected, "Recovered state differs"
+    print("✓ Snapshot plus tail restores the game; covered journals are deleted")
+
+def test_failed_snapshot():
+    print("\n=== A snapshot that never reached the disk ===")
+    with tempfile.TemporaryDirectory() as directory:
+        journal = GameJournal(directory, snapshot_every=7)
+
+        def fail(state):
+            raise OSError('disk full')
+        journal._write_snapshot_file = fail
+        expected, _ = play(directory, journal=journal)
+        assert not os.path.exists(os.path.join(directory, 'snapshot.pickle')), "Snapshot written"
+        state, _ = recover(directory)
+        assert state == expected, "Events in rotated journals were lost"
+    print("✓ Events in rotated journals are replayed")
+
+def test_torn_tail():
+    print("\n=== Torn final line ===")
+    with tempfile.TemporaryDirectory() as directory:
+        expected, _ = play(directory)
+        journal_path = os.path.join(directory, 'journal.jsonl')
+        with open(journal_path, 'ab') as f:
+            f.write(b'{"seq": 999999, "event": "create_te')
+        state, _ = recover(directory)
+        assert state == expected, "Recovered state differs"
+        with open(journal_path, 'rb') as f:
+            assert f.read().endswith(b'\n'), "Torn line not cut off"
+    print("✓ A torn final line is dropped and cut off")
+
+if __name__ == '__main__':
+    try:
+        test_replay()
+        test_snapshots()
+        test_failed_snapshot()
+        test_torn_tail()
+        print("\n✅ All journal tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test the incremental leaderboard against a sorted reference
+Runs in-process against Leaderboard; no server needed.
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leaderboard import Leaderboard
+
+def reference_order(scores, added):
+    """Stable sort by score, ties in the order teams were added"""
+    return sorted(scores, key=lambda team_id: (-scores[team_id], added.index(team_id)))
+
+def test_random_updates():
+    print("\n=== Random adds, updates and removals ===")
+    rng = random.Random(7)
+    board = Leaderboard(initial_capacity=4)
+    scores = {}
+    added = []
+    for step in range(3000):
+        action = rng.random()
+        if action < 0.3 or not scores:
+            team_id = f'team-{step}'
+            score = rng.randrange(20)
+            board.add(team_id, score)
+            scores[team_id] = score
+            added.append(team_id)
+        elif action < 0.85:
+            team_id = rng.choice(list(scores))
+            # Occasionally jump far past the current capacity to force a rebuild
+            scores[team_id] = rng.randrange(500) if rng.random() < 0.05 else scores[team_id] + rng.randrange(3)
+            board.update(team_id, scores[team_id])
+        else:
+            team_id = rng.choice(list(scores))
+            board.remove(team_id)
+            del scores[team_id]
+
+        if step % 100 == 0:
+            expected = reference_order(scores, added)
+            assert board.range() == expected, f"Order differs at step {step}"
+            for team_id in rng.sample(expected, min(10, len(expected))):
+                assert board.rank_of(team_id) == expected.index(team_id), f"Wrong rank for {team_id}"
+    print("✓ Order and ranks match a stable sort by score")
+
+    expected = reference_order(scores, added)
+    for start, count in [(0, 5), (3, 10), (len(expected) - 2, 5), (len(expected), 5), (-1, 3)]:
+        assert board.range(start, count) == expected[max(start, 0):max(start, 0) + count], \
+            f"Wrong page at {start}"
+    assert board.top(3) == expected[:3], "Wrong top 3"
+    print("✓ Pages and top-K match the reference")
+
+def test_unknown_team():
+    print("\n=== Unknown teams ===")
+    board = Leaderboard()
+    board.add('a', 5)
+    board.remove('missing')
+    assert board.rank_of('missing') is None, "Rank for unknown team"
+    assert board.score_of('missing') is None, "Score for unknown team"
+    try:
+        board.add('b', -1)
+        raise AssertionError("Negative score accepted")
+    except ValueError:
+        pass
+    assert board.range() == ['a'], f"Board changed: {board.range()}"
+    print("✓ Unknown teams and negative scores are handled")
+
+if __name__ == '__main__':
+    try:
+        test_random_updates()
+        test_unknown_team()
+        print("\n✅ All leaderboard tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
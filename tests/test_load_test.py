@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test the load generator: answer arrival times, and a small game played end to end
+Starts app.py on a free localhost port through load_test.py; the test server on port 5001 is not needed.
+"""
+
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from load_test import arrival_delay
+
+TEAMS, PLAYERS, QUESTIONS = 4, 10, 2
+
+def test_arrival_delay():
+    print("\n=== Answer arrival times ===")
+    rng = random.Random(5)
+    window = 20
+    medians = {}
+    for distribution in ('lognormal', 'uniform', 'exponential', 'burst'):
+        delays = [arrival_delay(distribution, window, rng) for _ in range(5000)]
+        assert 0.05 <= min(delays) and max(delays) <= window * 0.95, f"{distribution}: answers outside the window"
+        medians[distribution] = statistics.median(delays)
+    assert abs(medians['lognormal'] - window / 3) < 0.5, f"lognormal median {medians['lognormal']:.2f} s"
+    assert abs(medians['uniform'] - window * 0.95 / 2) < 0.5, f"uniform median {medians['uniform']:.2f} s"
+    assert medians['burst'] < 0.5 < medians['exponential'] < window / 4, f"Medians {medians}"
+    print("✓ Every distribution answers within the window, with the medians it describes")
+
+def test_small_game():
+    print("\n=== A small game ===")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'report.json')
+        environment = {key: value for key, value in os.environ.items() if not key.startswith('TRIVIA_')}
+        result = subprocess.run([sys.executable, 'load_test.py', '--teams', str(TEAMS), '--players', str(PLAYERS),
+                                 '--questions', str(QUESTIONS), '--window', '2', '--json', path],
+                                cwd=ROOT, env=environment, capture_output=True, text=True, timeout=180)
+        assert result.returncode == 0, f"load_test.py failed: {result.stderr[-800:]}"
+        with open(path) as f:
+            report = json.load(f)
+    answers = report['answers']
+    assert answers['count'] == PLAYERS * QUESTIONS, f"{answers['count']} answers sent"
+    assert answers['results'].get('accepted') == TEAMS * QUESTIONS, f"Results {answers['results']}"
+    assert sum(answers['results'].values()) == answers['count'], f"Unexplained answers: {answers['results']}"
+    assert answers['latency_ms']['p50'] is not None, "No answer latencies"
+    print(f"✓ {PLAYERS} players in {TEAMS} teams: one accepted answer per team and question, teammates turned away")
+
+    assert report['events_received'].get('new_question') == PLAYERS * QUESTIONS, f"Events {report['events_received']}"
+    assert report['new_question_delay_ms']['count'] == PLAYERS * QUESTIONS, "new_question deliveries not timed"
+    assert report['score_update_delay_ms']['count'] > 0, "No score_update delivery timed"
+    print("✓ Every player gets each question, and question and score delivery are timed")
+    assert 'players in' in result.stdout and '/api/answer' in result.stdout, "Report not printed"
+    print("✓ The report is printed and written as JSON")
+
+if __name__ == '__main__':
+    try:
+        test_arrival_delay()
+        test_small_game()
+        print("\n✅ All load generator tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,75 @@
+import requests
+
+BASE_URL = 'http://localhost:5001'
+
+def test_multi_game_rooms():
+    print("Testing multiple concurrent game rooms...")
+    
+    admin_session = requests.Session()
+    admin_response = admin_session.post(f'{BASE_URL}/admin/login',
+                                      data={'password': 'admin123'},
+                                      allow_redirects=False)
+    assert admin_response.status_code == 302, "Admin login failed"
+    print("✓ Admin logged in")
+    
+    # Test 1: Create a second game room
+    print("\n=== Test 1: Create Game Room ===")
+    create_response = admin_session.post(f'{BASE_URL}/admin/api/games', json={})
+    result = create_response.json()
+    assert result.get('success'), f"Failed to create game: {result}"
+    game_code = result['game_code']
+    print(f"✓ Created game {game_code}")
+    
+    games = admin_session.get(f'{BASE_URL}/admin/api/games').json()
+    assert any(g['game_code'] == game_code for g in games), f"Game not listed: {games}"
+    print("✓ Game listed in registry")
+    
+    # Test 2: Join the room and create a team there
+    print("\n=== Test 2: Create Team In Room ===")
+    player_session = requests.Session()
+    join_response = player_session.get(f'{BASE_URL}/join/{game_code}', allow_redirects=False)
+    assert join_response.status_code == 302, f"Expected redirect but got {join_response.status_code}"
+    team_response = player_session.post(f'{BASE_URL}/api/teams', json={
+        'team_name': 'Room Team',
+        'player_name': 'Room Player'
+    })
+    assert team_response.json().get('success'), "Failed to create team in room"
+    team_id = team_response.json()['team_id']
+    print("✓ Team created in room")
+    
+    # Test 3: Teams are isolated between rooms
+    print("\n=== Test 3: Room Isolation ===")
+    room_teams = requests.get(f'{BASE_URL}/games/{game_code}/api/teams').json()
+    assert any(t['id'] == team_id for t in room_teams), "Team missing from its room"
+    default_teams = requests.get(f'{BASE_URL}/api/teams').json()
+    assert not any(t['id'] == team_id for t in default_teams), "Team leaked into default game"
+    print("✓ Team only visible in its own room")
+    
+    status = player_session.get(f'{BASE_URL}/api/player/status').json()
+    assert status.get('has_team') and status.get('team_id') == team_id, f"Bad player status: {status}"
+    print("✓ Player session follows the room")
+    
+    # Test 4: Unknown rooms are rejected
+    print("\n=== Test 4: Unknown Room ===")
+    missing = requests.get(f'{BASE_URL}/games/NOPE00/api/teams')
+    assert missing.status_code == 404, f"Expected 404 but got {missing.status_code}"
+    print("✓ Unknown game code returns 404")
+    
+    # Cleanup
+    delete_response = admin_session.delete(f'{BASE_URL}/admin/api/games/{game_code}')
+    assert delete_response.json().get('success'), "Failed to delete game"
+    print("✓ Game deleted")
+    
+    return True
+
+if __name__ == '__main__':
+    try:
+        success = test_multi_game_rooms()
+        if success:
+            print("\n✅ All multi-game tests passed!")
+        else:
+            print("\n❌ Some tests failed!")
+    except Exception as e:
+        print(f"\n❌ Test error: {e}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test that the streaming question parser matches parse()
+Runs in-process against TriviaParser; no server needed.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trivia_parser import TriviaParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BODIES = [
+    ("What is the capital of France?\n\nA) London\nB) Berlin\nC) **Paris**\nD) Madrid\n\n**Answer: Paris**\n"),
+    ("Fill in the blank: The largest planet is ________.\n\nAnswer: Jupiter\n"),
+    ("**Which language did Guido van Rossum create?**\n- A Java\n- B Python (correct)\n- C Ruby\n"),
+    ("Question 4: Pick a number\n1) one\n2) two ✓\n3) three\n"),
+    ("Who wrote Hamlet?\nCategory: Literature\nDifficulty: easy\nTags: plays, classics\nSolution: Shakespeare\n"),
+]
+
+def write_bank(directory, name, marker):
+    """A bank using one marker style; {n} in the marker is the question number"""
+    parts = ['# Sample Trivia Questions\n\n']
+    for n, body in enumerate(BODIES, 1):
+        parts.append(marker.format(n=n) + body + '\n')
+    path = os.path.join(directory, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(''.join(parts))
+    return path
+
+def fields(question):
+    return (question.question_text, question.question_type, question.options, question.correct_answer)
+
+def check_parity(path):
+    parser = TriviaParser(path)
+    expected = [fields(question) for question in parser.parse()]
+    streamed = list(parser.iter_parse())
+    assert [fields(question) for question in streamed] == expected, \
+        f"{os.path.basename(path)}: iter_parse differs from parse()"
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    for question in streamed:
+        assert question.source_file == path, f"Wrong source file: {question.source_file}"
+        first_word = question.question_text.split()[0]
+        assert first_word in lines[question.source_line - 1], \
+            f"Line {question.source_line} is not the start of {question.question_text!r}"
+    return len(expected)
+
+def test_marker_styles():
+    print("\n=== Every marker style ===")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, marker in [('h2.md', '## {n}. '), ('h3.md', '### '), ('numbered.md', '{n}. '),
+                             ('bold.md', '**Question {n}**\n'), ('blank_after.md', '##\n\n')]:
+            count = check_parity(write_bank(directory, name, marker))
+            assert count == len(BODIES), f"{name}: parsed {count} questions"
+            print(f"✓ {name}: {count} questions match")
+
+def test_single_question():
+    print("\n=== File without separators ===")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'single.md')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n\n' + BODIES[0])
+        assert check_parity(path) == 1, "Expected a single question"
+        empty = os.path.join(directory, 'empty.md')
+        open(empty, 'w').close()
+        assert check_parity(empty) == 0, "Questions parsed from an empty file"
+    print("✓ Whole file as one question; empty file gives none")
+
+def test_metadata():
+    print("\n=== Category, difficulty and tags ===")
+    with tempfile.TemporaryDirectory() as directory:
+        question = list(TriviaParser(write_bank(directory, 'meta.md', '## ')).iter_parse())[-1]
+    assert (question.category, question.difficulty, question.tags) == \
+        ('Literature', 'easy', ('plays', 'classics')), \
+        f"Wrong metadata: {question.category}, {question.difficulty}, {question.tags}"
+    assert question.correct_answer == 'Shakespeare', f"Wrong answer: {question.correct_answer}"
+    print("✓ Metadata lines are read and kept out of the answer")
+
+def test_sample_bank():
+    print("\n=== Shipped questions.md ===")
+    count = check_parity(os.path.join(ROOT, 'questions.md'))
+    print(f"✓ {count} questions match")
+
+if __name__ == '__main__':
+    try:
+        test_marker_styles()
+        test_single_question()
+        test_metadata()
+        test_sample_bank()
+        print("\n✅ All parser tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test the player-to-team index against a scan of every team's roster
+Runs in-process against TriviaGame; no server needed.
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import TriviaGame, normalize_player_name
+
+NAMES = ['Ann', 'ann', ' ANN ', 'Bob', 'bob ', 'Cy', 'Dee', 'Eve', 'Fay', 'Gus']
+
+def scanned_index(game):
+    """Normalized name -> ids of the teams with that player, from the rosters"""
+    index = {}
+    for team_id, team in game.teams.items():
+        for player_name in team.players:
+            index.setdefault(normalize_player_name(player_name), set()).add(team_id)
+    return index
+
+def check(game, label):
+    indexed = {key: set(team_ids) for key, team_ids in game.player_index.items()}
+    assert indexed == scanned_index(game), f"{label}: index differs from the rosters"
+    for name in NAMES:
+        team_id = game.find_player_team(name)
+        members = scanned_index(game).get(normalize_player_name(name), set())
+        assert (team_id is None) == (not members) and (team_id is None or team_id in members), \
+            f"{label}: {name!r} found on {team_id}, rosters have {members}"
+
+def test_random_changes():
+    print("\n=== Random team and player changes ===")
+    rng = random.Random(3)
+    game = TriviaGame()
+    for step in range(2000):
+        team_ids = list(game.teams)
+        action = rng.random()
+        name = rng.choice(NAMES)
+        if action < 0.2 or not team_ids:
+            game.create_team(f'Team {step}', name)
+        elif action < 0.4:
+            game.join_team(rng.choice(team_ids), name)
+        elif action < 0.55:
+            team_id = rng.choice(team_ids)
+            game.leave_team(team_id, rng.choice(game.teams[team_id].players))
+        elif action < 0.7:
+            game.add_player_to_team(rng.choice(team_ids), name)
+        elif action < 0.85:
+            team_id = rng.choice(team_ids)
+            game.remove_player_from_team(team_id, rng.choice(game.teams[team_id].players))
+        else:
+            game.delete_team(rng.choice(team_ids))
+        check(game, f"Step {step}")
+    print("✓ 2000 creates, joins, leaves, moves and deletes keep the index equal to the rosters")
+
+    restored = TriviaGame()
+    restored._restore_snapshot(game.to_snapshot())
+    check(restored, "Restored snapshot")
+    print("✓ A restored snapshot rebuilds the index")
+
+def test_lookup():
+    print("\n=== Lookups ===")
+    game = TriviaGame()
+    first = game.create_team('First', 'Ann')['team_id']
+    second = game.create_team('Second', 'Bob')['team_id']
+    assert game.find_player_team('  aNN ') == first, "Lookup is not case- and space-insensitive"
+    assert not game.join_team(first, 'ANN')['success'], "Same name joined a team twice"
+    assert game.join_team(second, 'ann')['success'], "Name refused on another team"
+    assert game.find_player_team('Ann') == first, "Earliest membership does not win"
+    game.leave_team(first, 'Ann')
+    assert first not in game.teams and game.find_player_team('Ann') == second, "Left membership still found"
+    assert game.find_player_team('Nobody') is None, "Unknown player found"
+    print("✓ Case-insensitive, earliest membership first, and None for unknown players")
+
+if __name__ == '__main__':
+    try:
+        test_random_changes()
+        test_lookup()
+        print("\n✅ All player index tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test the admin endpoint that assembles a game's questions from the bank
+Runs in-process against the Flask test client; no server needed.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as trivia_app
+from models import Question
+from question_bank import QuestionBank
+
+def admin_client():
+    questions = [Question(f'Question {i}', 'fill_in_blank', [], 'x', category='Even' if i % 2 == 0 else 'Odd',
+                          difficulty='easy', tags=('tagged',)) for i in range(40)]
+    registry = trivia_app.registry
+    registry.questions = questions
+    registry.question_bank = QuestionBank(questions)
+    code = registry.create_game()['game_code']
+    client = trivia_app.app.test_client()
+    with client.session_transaction() as session:
+        session['admin_logged_in'] = True
+    return client, f'/games/{code}/admin/api/questions/assemble'
+
+def test_assemble():
+    print("\n=== Assembling questions ===")
+    client, url = admin_client()
+    response = client.post(url, json={'count': 5, 'categories': ['even'], 'tags': ['tagged'], 'exclude_recent': 2})
+    assert response.status_code == 200 and response.json['success'], f"Not assembled: {response.json}"
+    print("✓ Valid filters assemble a game")
+
+def test_invalid_input():
+    print("\n=== Invalid input ===")
+    client, url = admin_client()
+    for data in [{'count': 0}, {'count': 'ten'}, {'exclude_recent': 'two'}, {'exclude_recent': -1},
+                 {'exclude_recent': 1.5}, {'categories': 'Even'}, {'difficulties': {'easy': True}},
+                 {'tags': [1, 2]}, {'tags': 'tagged'}]:
+        response = client.post(url, json=data)
+        assert response.status_code == 400, f"{data} gave {response.status_code}"
+        assert not response.json['success'] and response.json['error'], f"{data} gave {response.json}"
+    print("✓ Bad count, exclude_recent and filter lists are refused with 400")
+
+if __name__ == '__main__':
+    try:
+        test_assemble()
+        test_invalid_input()
+        print("\n✅ All question assemble tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
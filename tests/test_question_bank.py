@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test loading a question bank split over several files
+Runs in-process against question_bank; no server needed.
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Question
+from question_bank import QuestionBank, find_bank_files, load_bank
+
+FILES = {
+    'science.md': "# Science\n## What is H2O?\nAnswer: Water\n\n## What is NaCl?\nAnswer: Salt\n",
+    'history/ancient.md': "# Ancient\n## Who built the pyramids?\nAnswer: Egyptians\nCategory: Egypt\n",
+    'history/modern.md': "# Modern\n## When did WW2 end?\nA) 1945 (correct)\nB) 1950\nDifficulty: easy\n",
+    'notes.txt': "# Notes\n## Not a question file\nAnswer: ignored\n",
+}
+
+def write_files(directory):
+    for name, content in FILES.items():
+        path = os.path.join(directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+def fields(question):
+    return (question.question_text, question.options, question.correct_answer, question.source_file,
+            question.source_line, question.category, question.difficulty, question.tags)
+
+def test_find_files():
+    print("\n=== Finding bank files ===")
+    with tempfile.TemporaryDirectory() as directory:
+        write_files(directory)
+        expected = [os.path.join(directory, name)
+                    for name in ('history/ancient.md', 'history/modern.md', 'science.md')]
+        assert find_bank_files(directory) == expected, f"Wrong files: {find_bank_files(directory)}"
+        assert find_bank_files(os.path.join(directory, 'history', '*.md')) == expected[:2], "Glob failed"
+        assert find_bank_files(expected[2]) == expected[2:], "Single file failed"
+        assert find_bank_files(os.path.join(directory, 'missing.md')) == [], "Missing file matched"
+    print("✓ Directories (recursively), globs and single files")
+
+def test_load_order():
+    print("\n=== Loading in a fixed order ===")
+    with tempfile.TemporaryDirectory() as directory:
+        write_files(directory)
+        in_process = load_bank(directory, workers=1)
+        pooled = load_bank(directory, workers=2)
+    texts = [question.question_text for question in in_process]
+    assert texts == ['Who built the pyramids?', 'When did WW2 end?', 'What is H2O?', 'What is NaCl?'], \
+        f"Wrong order: {texts}"
+    assert [fields(question) for question in pooled] == [fields(question) for question in in_process], \
+        "Process pool changed the bank"
+    print("✓ Same questions in path order with and without the process pool")
+
+    categories = [question.category for question in in_process]
+    assert categories == ['Egypt', 'modern', 'science', 'science'], f"Wrong categories: {categories}"
+    assert in_process[1].difficulty == 'easy', "Difficulty lost"
+    assert [question.source_line for question in in_process] == [2, 2, 2, 5], "Wrong source lines"
+    assert in_process[3].source_file.endswith('science.md'), "Wrong source file"
+    print("✓ Categories fall back to the file name; source file and line are kept")
+
+def test_sampling():
+    print("\n=== Sampling questions for a game ===")
+    questions = [Question(f'Question {i}', 'fill_in_blank', [], 'x', category='Even' if i % 2 == 0 else 'Odd',
+                          difficulty=('easy', 'medium', 'hard')[i % 3]) for i in range(60)]
+    bank = QuestionBank(questions)
+    rng = random.Random(5)
+    picked = bank.sample(9, categories=['even'], rng=rng)
+    assert len(set(picked)) == 9 and all(index % 2 == 0 for index in picked), f"Wrong picks: {picked}"
+    picked = bank.sample(9, mixed_difficulty=True, rng=rng)
+    levels = [questions[index].difficulty for index in picked]
+    assert sorted(levels.count(level) for level in ('easy', 'medium', 'hard')) == [3, 3, 3], \
+        f"Not spread over difficulties: {levels}"
+    print("✓ Filters and mixed difficulty")
+
+    first = bank.assemble(30, rng=rng)
+    second = bank.sample(30, exclude_recent=1, rng=rng)
+    assert not set(second) & {questions.index(question) for question in first}, "Recent questions reused"
+    print("✓ exclude_recent skips the last game's questions")
+
+    plain = QuestionBank([Question(f'Plain {i}', 'fill_in_blank', [], 'x') for i in range(10)])
+    picked = plain.sample(4, mixed_difficulty=True, rng=rng)
+    assert len(set(picked)) == 4, f"No questions from a bank without difficulties: {picked}"
+    assert plain.sample(4, mixed_difficulty=True, difficulties=['hard'], rng=rng) == [], \
+        "Questions for a difficulty nobody has"
+    print("✓ mixed_difficulty on a bank without difficulties samples uniformly")
+
+if __name__ == '__main__':
+    try:
+        test_find_files()
+        test_load_order()
+        test_sampling()
+        print("\n✅ All question bank tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test near-duplicate detection against a brute-force Jaccard scan
+Runs in-process against question_dedupe; no server needed.
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Question
+from question_dedupe import DedupeIndex, DuplicateFinder, dedupe, jaccard, shingles
+
+THRESHOLD = 0.7
+VOCABULARY = [f'word{i}' for i in range(300)]
+
+def build_bank(rng, size):
+    """Random questions where about one in five rewords an earlier one"""
+    questions = []
+    for index in range(size):
+        if index > 10 and rng.random() < 0.2:
+            source = questions[rng.randrange(index)]
+            words = source.question_text.split()
+            if rng.random() < 0.5:
+                words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+            words.insert(rng.randrange(len(words)), rng.choice(VOCABULARY))
+            questions.append(Question(' '.join(words), 'multiple_choice', list(source.options), source.correct_answer))
+            continue
+        options = [rng.choice(VOCABULARY) for _ in range(4)]
+        questions.append(Question(' '.join(rng.sample(VOCABULARY, 12)) + '?', 'multiple_choice',
+                                  options, options[0]))
+    return questions
+
+def brute_force(questions, threshold):
+    """Clusters from comparing every pair: connected components of the similar pairs"""
+    words = [shingles(question) for question in questions]
+    parent = list(range(len(questions)))
+
+    def root(index):
+        while parent[index] != index:
+            index = parent[index]
+        return index
+
+    for a in range(len(questions)):
+        for b in range(a + 1, len(questions)):
+            if jaccard(words[a], words[b]) >= threshold:
+                parent[max(root(a), root(b))] = min(root(a), root(b))
+    clusters = {}
+    for index in range(len(questions)):
+        clusters.setdefault(root(index), []).append(index)
+    return sorted(members for members in clusters.values() if len(members) > 1)
+
+def similar_pairs(questions, threshold):
+    words = [shingles(question) for question in questions]
+    return [(a, b) for a in range(len(questions)) for b in range(a + 1, len(questions))
+            if jaccard(words[a], words[b]) >= threshold]
+
+def test_against_brute_force():
+    print("\n=== LSH clusters against all pairs ===")
+    questions = build_bank(random.Random(4), 600)
+    clusters = DuplicateFinder(THRESHOLD).find(questions)
+    expected = brute_force(questions, THRESHOLD)
+    component = {index: number for number, members in enumerate(expected) for index in members}
+    for members in clusters:
+        assert len({component.get(index) for index in members}) == 1 and members[0] in component, \
+            f"Cluster {members} joins questions that are not near-duplicates"
+    print(f"✓ {len(clusters)} clusters, each within one brute-force cluster")
+
+    found = {index: number for number, members in enumerate(clusters) for index in members}
+    pairs = similar_pairs(questions, 0.9)
+    missed = [(a, b) for a, b in pairs if a not in found or found[a] != found.get(b)]
+    assert pairs and not missed, f"Missed {len(missed)} of {len(pairs)} pairs above 0.9: {missed[:5]}"
+    total = len(similar_pairs(questions, THRESHOLD))
+    caught = sum(1 for a, b in similar_pairs(questions, THRESHOLD) if a in found and found[a] == found.get(b))
+    assert caught >= 0.9 * total, f"Only {caught} of {total} similar pairs found"
+    print(f"✓ Every pair above 0.9 and {caught} of {total} above {THRESHOLD} found")
+
+    kept, _ = dedupe(questions, THRESHOLD)
+    assert kept == [question for index, question in enumerate(questions)
+                    if index not in found or clusters[found[index]][0] == index], "Wrong questions kept"
+    print("✓ The first question of each cluster is kept")
+
+def test_incremental():
+    print("\n=== Updating the index as the bank is reloaded ===")
+    rng = random.Random(9)
+    questions = build_bank(rng, 400)
+    index = DedupeIndex(THRESHOLD)
+    hashed = []
+    band_keys = index.finder.band_keys
+
+    def counting_band_keys(batch):
+        hashed.append(len(batch))
+        return band_keys(batch)
+
+    index.finder.band_keys = counting_band_keys
+    assert index.update(questions) == dedupe(questions, THRESHOLD), "First update differs from dedupe()"
+    hashed.clear()
+    assert index.update(list(questions)) == dedupe(questions, THRESHOLD), "Unchanged reload differs"
+    assert not hashed, f"Unchanged reload hashed {hashed} questions"
+    print("✓ Same result as dedupe(); an unchanged reload hashes nothing")
+
+    for step in range(30):
+        action = rng.choice(['insert', 'delete', 'edit', 'copy'])
+        position = rng.randrange(len(questions))
+        if action == 'insert':
+            questions.insert(position, build_bank(rng, 1)[0])
+        elif action == 'delete':
+            del questions[position]
+        elif action == 'edit':
+            source = questions[position]
+            questions[position] = Question(source.question_text + ' extra', source.question_type,
+                                           source.options, source.correct_answer)
+        else:
+            questions.insert(position, Question(questions[rng.randrange(len(questions))].question_text,
+                                                'fill_in_blank', [], 'x'))
+        hashed.clear()
+        result = index.update(list(questions))
+        assert result == dedupe(questions, THRESHOLD), f"Step {step} ({action}) differs from dedupe()"
+        assert sum(hashed) <= 1, f"Step {step} ({action}) hashed {sum(hashed)} questions"
+    print("✓ 30 inserts, deletes and edits match dedupe(), hashing only the changed question")
+
+    assert index.update([]) == ([], []), "Empty bank"
+    assert not index.band_keys and not index.pairs and not any(index.buckets), "Removed questions kept"
+    print("✓ Questions that leave the bank are forgotten")
+
+if __name__ == '__main__':
+    try:
+        test_against_brute_force()
+        test_incremental()
+        print("\n✅ All question dedupe tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
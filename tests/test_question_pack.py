@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test that question packs match the bank and are rebuilt when it changes
+Runs in-process against question_pack; no server needed.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import question_pack
+from question_bank import IndexBuilder
+from trivia_parser import TriviaParser
+
+BANK = """# Pack Test
+
+## What is the capital of France?
+A) London
+B) **Paris**
+Category: Geography
+Difficulty: easy
+
+## Who wrote Hamlet?
+Answer: Shakespeare
+Category: Literature
+Tags: plays, classics
+"""
+
+compiles = []
+compile_pack = question_pack.compile_pack
+
+def counting_compile(source_path, pack_path):
+    compiles.append(source_path)
+    compile_pack(source_path, pack_path)
+
+question_pack.compile_pack = counting_compile
+
+def write(path, content, mtime_ns=None):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def fields(question):
+    return (question.question_text, question.question_type, question.options, question.correct_answer,
+            question.source_file, question.source_line, question.category, question.difficulty, question.tags)
+
+def load(path):
+    """Open the bank's pack and return (texts, pack)"""
+    pack = question_pack.load_pack(path)
+    return [question.question_text for question in pack], pack
+
+def test_contents():
+    print("\n=== Pack contents ===")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bank.md')
+        write(path, BANK)
+        pack = question_pack.load_pack(path)
+        parsed = list(TriviaParser(path).iter_parse())
+        assert [fields(question) for question in pack] == [fields(question) for question in parsed], \
+            "Pack differs from the parsed bank"
+        assert pack[-1] is pack[1], "Decoded question not cached"
+        builder = IndexBuilder()
+        for index, question in enumerate(parsed):
+            builder.add(index, question)
+        indexes = {kind: {key: list(postings) for key, postings in by_key.items()}
+                   for kind, by_key in pack.indexes().items()}
+        expected = {kind: {key: list(postings) for key, postings in by_key.items()}
+                    for kind, by_key in builder.indexes.items()}
+        assert indexes == expected, f"Wrong indexes: {indexes}"
+        pack.close()
+    print("✓ Questions and filter indexes match the parsed bank")
+
+def test_invalidation():
+    print("\n=== Rebuilding when the bank changes ===")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bank.md')
+        write(path, BANK, mtime_ns=1_000_000_000)
+        compiles.clear()
+        _, pack = load(path)
+        pack.close()
+        assert len(compiles) == 1, "Pack not compiled on first load"
+
+        _, pack = load(path)
+        pack.close()
+        assert len(compiles) == 1, "Unchanged bank recompiled"
+        print("✓ Unchanged bank reuses the pack")
+
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        _, pack = load(path)
+        pack.close()
+        assert len(compiles) == 1, "Touched bank recompiled"
+        assert question_pack.read_header(path + '.pack')[6] == 2_000_000_000, "New mtime not stored"
+        print("✓ Touched bank with the same content reuses the pack")
+
+        # Same size, new content: only the hash tells them apart
+        write(path, BANK.replace('Paris', 'Parys'), mtime_ns=3_000_000_000)
+        _, pack = load(path)
+        assert len(compiles) == 2, "Edited bank of the same size not recompiled"
+        assert pack[0].options == ['London', 'Parys'], f"Stale options: {pack[0].options}"
+        pack.close()
+        print("✓ Same-size edit is recompiled")
+
+        write(path, BANK + "\n## How many legs does a spider have?\nAnswer: 8\n")
+        texts, pack = load(path)
+        pack.close()
+        assert len(compiles) == 3 and len(texts) == 3, f"Added question missing: {texts}"
+        print("✓ Added question is recompiled")
+
+        with open(path + '.pack', 'r+b') as f:
+            f.write(b'JUNK')
+        texts, pack = load(path)
+        pack.close()
+        assert len(compiles) == 4 and len(texts) == 3, "Damaged pack not rebuilt"
+        print("✓ Damaged pack is rebuilt")
+
+if __name__ == '__main__':
+    try:
+        test_contents()
+        test_invalidation()
+        print("\n✅ All question pack tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
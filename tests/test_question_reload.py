@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Test reloading edited question files and that answers survive a reload
+Runs in-process against QuestionReloader and TriviaGame; no server needed.
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import TriviaGame
+from question_bank import load_bank
+from question_reloader import QuestionReloader
+
+def fields(question):
+    return (question.question_text, question.question_type, question.options, question.correct_answer,
+            question.source_file, question.source_line, question.category)
+
+class BankFiles:
+    """Question files on disk, each write given a new mtime so the reloader always sees it"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.mtime_ns = 1_000_000_000
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        self.mtime_ns += 1_000_000_000
+        os.utime(path, ns=(self.mtime_ns, self.mtime_ns))
+
+def bank_text(count, answers=None):
+    blocks = ['# Reload Bank\n']
+    for i in range(count):
+        blocks.append(f'## Question {i}?\nA) one\nB) two\nAnswer: {(answers or {}).get(i, "one")}\n')
+    return '\n'.join(blocks)
+
+def test_reloader():
+    print("\n=== Reloading edited question files ===")
+    with tempfile.TemporaryDirectory() as directory:
+        files = BankFiles(directory)
+        files.write('a.md', bank_text(30))
+        files.write('b.md', bank_text(5))
+        reloaded = []
+        reloader = QuestionReloader(directory, reloaded.append, category_from_file=True)
+        questions = reloader.load()
+        assert [fields(q) for q in questions] == [fields(q) for q in load_bank(directory, workers=1)], \
+            "Initial load differs from load_bank"
+        assert reloader.check() is None and not reloaded, "Reloaded without changes"
+
+        rng = random.Random(2)
+        content = bank_text(30)
+        for step in range(25):
+            previous = reloader.questions
+            previous_fields = [fields(q) for q in previous]
+            # A question that only moved is a copy sharing its parsed text
+            before = {id(q.question_text) for q in previous}
+            edit = rng.choice(['answer', 'insert', 'delete', 'blank lines'])
+            if edit == 'answer':
+                content = content.replace('Answer: one', 'Answer: two', 1)
+            elif edit == 'insert':
+                position = content.index('## ', rng.randrange(len(content) // 2))
+                content = content[:position] + f'## Added {step}?\nAnswer: new\n\n' + content[position:]
+            elif edit == 'delete':
+                start = content.index('## ', rng.randrange(len(content) // 2))
+                end = content.find('## ', start + 3)
+                content = content[:start] + (content[end:] if end != -1 else '')
+            else:
+                position = content.index('\n', rng.randrange(len(content) - 1))
+                content = content[:position] + '\n\n' + content[position:]
+            files.write('a.md', content)
+            parsed = reloader.check()
+            assert parsed is not None and reloaded[-1] is reloader.questions, f"No reload after {edit}"
+            expected = load_bank(directory, workers=1)
+            assert [fields(q) for q in reloader.questions] == [fields(q) for q in expected], \
+                f"Reloaded bank differs from a fresh parse after {edit} (step {step})"
+            reused = sum(id(q.question_text) in before for q in reloader.questions)
+            assert reused >= len(reloader.questions) - parsed, f"Unchanged questions reparsed after {edit}"
+            assert [fields(q) for q in previous] == previous_fields, f"Previous list changed by {edit}"
+        print("✓ Random edits match a fresh parse and keep unchanged questions")
+        print("✓ The previous question list is never modified")
+
+        files.write('c.md', bank_text(2))
+        reloader.check()
+        assert len(reloader.questions) == len(load_bank(directory, workers=1)), "Added file missing"
+        os.remove(os.path.join(directory, 'b.md'))
+        reloader.check()
+        assert all(not q.source_file.endswith('b.md') for q in reloader.questions), "Removed file kept"
+        print("✓ Added and removed files are picked up")
+
+def test_mixed_markers():
+    print("\n=== Files mixing separator styles ===")
+    with tempfile.TemporaryDirectory() as directory:
+        files = BankFiles(directory)
+        # parse() would split on ## (its preferred marker); iter_parse settles on the first one, "1."
+        content = ('# Mixed\n1. First?\nAnswer: a\n\n2. Second?\n## Not a separator here\nAnswer: b\n\n'
+                   '3. Third?\nAnswer: c\n')
+        files.write('mixed.md', content)
+        reloader = QuestionReloader(directory, lambda questions: None, category_from_file=True)
+        assert [fields(q) for q in reloader.load()] == [fields(q) for q in load_bank(directory, workers=1)], \
+            "Initial load differs from load_bank"
+        for edit in [('Answer: c', 'Answer: C'), ('# Mixed\n', '# Mixed\n## Early?\nAnswer: e\n'),
+                     ('## Early?\nAnswer: e\n', '')]:
+            content = content.replace(*edit)
+            files.write('mixed.md', content)
+            reloader.check()
+            assert [fields(q) for q in reloader.questions] == [fields(q) for q in load_bank(directory, workers=1)], \
+                f"Reload differs from load_bank after {edit}"
+    print("✓ Reloads split mixed files the way startup does")
+
+class ReloadedGame:
+    """A game playing a one-file bank that is hot-reloaded as the file is edited"""
+
+    def __init__(self, directory, content):
+        self.files = BankFiles(directory)
+        self.content = content
+        self.files.write('bank.md', content)
+        self.game = TriviaGame()
+        self.reloader = QuestionReloader(os.path.join(directory, 'bank.md'), self.swap)
+        self.game.load_questions(self.reloader.load())
+        self.previous = self.reloader.questions
+        self.team_id = self.game.create_team('Reload Team', 'Player')['team_id']
+        self.game.start_game()
+
+    def swap(self, questions):
+        assert self.game.swap_questions(self.previous, questions), "Reload not applied"
+        self.previous = questions
+
+    def edit(self, old, new):
+        assert old in self.content, f"{old!r} not in the bank"
+        self.content = self.content.replace(old, new, 1)
+        self.files.write('bank.md', self.content)
+        assert self.reloader.check() is not None, "Edit not picked up"
+
+    def answer(self, question_index):
+        return self.game.get_team_answer(self.team_id, question_index)
+
+def choice_question(text, options='ABCD'):
+    return f'## {text}\n' + ''.join(f'{label}) {label.lower()}\n' for label in options) + 'Answer: d\n\n'
+
+def submitted_answer(game):
+    return game.get_game_status()['team_answers'][0]['submitted_answer']
+
+def test_reordered_options():
+    print("\n=== Reordered options ===")
+    with tempfile.TemporaryDirectory() as directory:
+        reloaded = ReloadedGame(directory, '# Bank\n' + choice_question('Pick one'))
+        game = reloaded.game
+        assert game.submit_answer(reloaded.team_id, 'd')['success'], "Answer not accepted"
+        reloaded.edit('A) a\nB) b\nC) c\nD) d', 'A) d\nB) c\nC) b\nD) a')
+        assert reloaded.answer(0) == 'd', f"Wrong answer: {reloaded.answer(0)}"
+        assert submitted_answer(game) == 'd', f"Wrong answer in status: {submitted_answer(game)}"
+        game.stop_game()
+    print("✓ Submitted answer still 'd' after the options were reordered")
+
+def test_removed_options():
+    print("\n=== Removed options ===")
+    with tempfile.TemporaryDirectory() as directory:
+        reloaded = ReloadedGame(directory, '# Bank\n' + choice_question('Pick one'))
+        game = reloaded.game
+        assert game.submit_answer(reloaded.team_id, 'd')['success'], "Answer not accepted"
+        reloaded.edit('C) c\nD) d\nAnswer: d', 'Answer: a')
+        assert submitted_answer(game) == 'd', f"Wrong answer in status: {submitted_answer(game)}"
+        status = game.get_game_status()
+        assert status['answer_summary']['teams_answered'] == 1, f"Answer lost: {status['answer_summary']}"
+        game.stop_game()
+    print("✓ Answer to a removed option is kept as text")
+
+def test_questions_moved():
+    print("\n=== Questions inserted and deleted above answered ones ===")
+    with tempfile.TemporaryDirectory() as directory:
+        reloaded = ReloadedGame(directory, '# Bank\n' + ''.join(choice_question(f'Question {i}?') for i in range(4)))
+        game = reloaded.game
+        for question_index, answer in enumerate('abc'):
+            game.set_question(question_index)
+            assert game.submit_answer(reloaded.team_id, answer)['success'], "Answer not accepted"
+        current = game.questions[game.current_question_index].question_text
+
+        # New question on top, its options in another order than the questions below
+        reloaded.edit('## Question 0?', choice_question('Inserted?', 'DCBA') + '## Question 0?')
+        assert [reloaded.answer(i) for i in range(5)] == [None, 'a', 'b', 'c', None], \
+            f"Answers did not move with their questions: {[reloaded.answer(i) for i in range(5)]}"
+        assert game.current_question_index == 3, f"Current question not followed: {game.current_question_index}"
+        assert game.questions[game.current_question_index].question_text == current, "Current question changed"
+        print("✓ Answers and the current question move down with an inserted question")
+
+        reloaded.edit(choice_question('Question 0?'), '')
+        assert [reloaded.answer(i) for i in range(3)] == [None, 'b', 'c'], \
+            f"Wrong answers after a delete: {[reloaded.answer(i) for i in range(3)]}"
+        assert game.questions[game.current_question_index].question_text == current, "Current question changed"
+        print("✓ A deleted question takes its answers with it; later ones move up")
+
+        reloaded.edit('## Question 1?', '## Question one?')
+        assert reloaded.answer(1) == 'b', f"Edited question lost its answer: {reloaded.answer(1)}"
+        print("✓ An edited question keeps its answers")
+        game.stop_game()
+
+if __name__ == '__main__':
+    try:
+        test_reloader()
+        test_mixed_markers()
+        test_reordered_options()
+        test_removed_options()
+        test_questions_moved()
+        print("\n✅ All question reload tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
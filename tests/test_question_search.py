@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Test the admin question search against a brute-force scan
+Runs in-process against QuestionSearch; no server needed.
+"""
+
+import copy
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Question
+from question_search import QuestionSearch, question_terms
+
+WORDS = ['capital', 'capybara', 'car', 'france', 'french', 'planet', 'plan', 'python', 'pyramid',
+         'river', 'rivet', 'ocean', 'oak', 'moon', 'mountain', 'zebra']
+
+def build_questions(rng, count):
+    questions = []
+    for i in range(count):
+        words = rng.sample(WORDS, 4)
+        options = [rng.choice(WORDS).title() for _ in range(rng.choice([0, 2, 4]))]
+        answer = rng.choice(options) if options else rng.choice(WORDS)
+        question_type = 'multiple_choice' if options else 'fill_in_blank'
+        # item0..item39: prefix queries on "item" cover more words than MAX_LOOKUP_TERMS
+        questions.append(Question(f'Which {words[0]} {words[1]} {words[2]} item{i % 40}?', question_type,
+                                  options, answer if i % 7 else None))
+    return questions
+
+def reference(questions, query):
+    """Every matching index, by checking each question's words"""
+    terms = [(term.rstrip('*'), term.endswith('*')) for term in query.lower().split()]
+    matches = []
+    for index, question in enumerate(questions):
+        words = question_terms(question)
+        if all(any(word.startswith(term) for word in words) if prefix else term in words
+               for term, prefix in terms):
+            matches.append(index)
+    return matches
+
+def test_against_scan():
+    print("\n=== Random queries against a full scan ===")
+    rng = random.Random(11)
+    questions = build_questions(rng, 3000)
+    search = QuestionSearch(questions)
+    assert len(search) == len(questions), "Wrong size"
+    queries = ['capital', 'CAPITAL France', 'ca*', 'c*', 'p* r*', 'plan*', 'py* oak', 'zebra moon river',
+               'riv* mou*', 'which', 'nothing', 'cap* nothing*', 'french frenchy', 'item*',
+               'capital item*', 'zebra item1*', 'item7 oak', 'it* moon']
+    for _ in range(40):
+        queries.append(' '.join(rng.choice(WORDS)[:rng.randint(1, 5)] + rng.choice(['', '*'])
+                                for _ in range(rng.randint(1, 3))))
+    for query in queries:
+        expected = reference(questions, query)
+        for offset, limit in [(0, 20), (0, 5000), (15, 10), (len(expected) - 3, 10)]:
+            offset = max(offset, 0)
+            page, has_more = search.search(query, offset, limit)
+            assert page == expected[offset:offset + limit], f"{query!r} page at {offset} differs"
+            assert has_more == (len(expected) > offset + limit), f"{query!r} has_more wrong at {offset}"
+    print(f"✓ {len(queries)} queries match a full scan, on every page")
+
+def test_empty_queries():
+    print("\n=== Queries without terms ===")
+    search = QuestionSearch(build_questions(random.Random(1), 10))
+    for query in ['', '   ', '*', '?!']:
+        assert search.search(query) == ([], False), f"Results for {query!r}"
+    assert QuestionSearch([]).search('capital') == ([], False), "Results from an empty bank"
+    print("✓ Empty queries and empty banks give no results")
+
+def test_update():
+    print("\n=== Following a reloaded bank ===")
+    rng = random.Random(23)
+    questions = build_questions(rng, 500)
+    search = QuestionSearch(questions)
+    queries = ['capital', 'ca*', 'p* r*', 'zebra moon', 'item1*', 'item7 oak', 'fresh*', 'fresh zebra']
+    changed = []
+    change_postings = search._change_postings
+
+    def counting_change_postings(term, added, removed):
+        changed.append(term)
+        change_postings(term, added, removed)
+
+    search._change_postings = counting_change_postings
+    for step in range(60):
+        previous = questions
+        questions = [copy.copy(question) for question in questions]  # Reloads copy moved questions
+        action = rng.choice(['insert', 'insert run', 'delete', 'edit', 'move'])
+        position = rng.randrange(len(questions))
+        touched = []
+        if action == 'insert':
+            questions.insert(position, Question(f'Fresh zebra {step}?', 'fill_in_blank', [], 'x'))
+        elif action == 'insert run':
+            questions[position:position] = [Question(f'Fresh run {step} {i}', 'fill_in_blank', [], 'x')
+                                             for i in range(rng.randint(2, 30))]
+        elif action == 'delete':
+            del questions[position:position + rng.randint(1, 5)]
+        elif action == 'edit':
+            edited = Question(questions[position].question_text + ' fresh', 'fill_in_blank', [], 'oak')
+            edited.uid = questions[position].uid
+            touched = [questions[position], edited]
+            questions[position] = edited
+        else:
+            target = rng.randrange(len(questions))
+            # A question moved by one place is as much its neighbour moving the other way
+            touched = questions[max(position - 1, 0):position + 2] + questions[max(target - 1, 0):target + 2]
+            questions.insert(target, questions.pop(position))
+        old_uids = {question.uid for question in previous}
+        new_uids = {question.uid for question in questions}
+        touched += [question for question in previous if question.uid not in new_uids]
+        touched += [question for question in questions if question.uid not in old_uids]
+        changed.clear()
+        search.update(questions)
+        words = set().union(*map(question_terms, touched))
+        assert set(changed) <= words, f"Step {step} ({action}) changed unrelated words {set(changed) - words}"
+        fresh = QuestionSearch(questions)
+        assert search.terms == fresh.terms and list(search.sizes) == list(fresh.sizes), \
+            f"Step {step} ({action}): postings differ from a fresh index"
+        for query in queries:
+            assert search.search(query, 0, 5000)[0] == reference(questions, query), \
+                f"Step {step} ({action}): {query!r} differs from a full scan"
+    print("✓ 60 inserts, deletes, edits and moves match a fresh index, touching only their words")
+
+    for _ in range(40):  # Keep inserting at the same spot until the gap there runs out
+        questions = questions[:1] + [Question('Squeezed zebra', 'fill_in_blank', [], 'x')] + questions[1:]
+        search.update(questions)
+    assert search.search('squeezed', 0, 100) == (list(range(1, 41)), False), "Wrong squeezed questions"
+    search.update(questions[:3])
+    assert search.search('zebra', 0, 100) == (reference(questions[:3], 'zebra'), False), "Wrong after cut"
+    print("✓ Reindexed from scratch when the keys run out or most of the bank changes")
+
+def test_admin_endpoint():
+    print("\n=== Admin search during a reload ===")
+    import app as trivia_app
+    questions = build_questions(random.Random(3), 50)
+    registry = trivia_app.registry
+    registry.questions = questions
+    registry.question_search = QuestionSearch(questions)
+    code = registry.create_game()['game_code']
+    registry.get(code).load_questions(questions)
+    client = trivia_app.app.test_client()
+    with client.session_transaction() as session:
+        session['admin_logged_in'] = True
+
+    def search(query):
+        response = client.get(f'/games/{code}/admin/api/questions/search?q={query}&limit=100')
+        assert response.status_code == 200, f"Search failed: {response.status_code}"
+        return response.json
+
+    expected = reference(questions, 'capital')
+    result = search('capital')
+    assert not result['stale'], "Fresh index reported stale"
+    assert [item['question_number'] for item in result['results']] == [index + 1 for index in expected], \
+        "Wrong question numbers"
+
+    reloaded = [Question('Capital of nowhere?', 'fill_in_blank', [], 'x')] + questions
+    trivia_app.reload_questions(reloaded)
+    result = search('capital')
+    assert not result['stale'], "Updated index reported stale"
+    assert result['results'][0]['question_text'] == 'Capital of nowhere?', "Reload not in the index"
+    assert [item['question_number'] for item in result['results']] == [1] + [index + 2 for index in expected], \
+        "Question numbers not resolved against the reloaded bank"
+    print("✓ A reload updates the index; numbers follow the reloaded bank")
+
+    registry.questions = questions  # Replaced behind the index's back
+    result = search('capital')
+    assert result['stale'] and all(item['question_number'] is None for item in result['results']), \
+        f"Stale index not reported: {result}"
+    assert result['results'][0]['question_text'] == 'Capital of nowhere?', "Results not from the index's list"
+    print("✓ An index behind the bank reports stale instead of wrong numbers")
+
+if __name__ == '__main__':
+    try:
+        test_against_scan()
+        test_empty_queries()
+        test_update()
+        test_admin_endpoint()
+        print("\n✅ All question search tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Test the versioned scoreboard diffs games send through their ScoreboardFeed
+Runs in-process against TriviaGame on a simulated clock; no server needed.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import TriviaGame, Question
+from scheduler import TimerHandle
+from score_feed import ScoreboardFeed
+
+class SimulatedScheduler:
+    """Runs scheduled callbacks in deadline order on a simulated clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.handles = []
+
+    def clock(self):
+        return self.now
+
+    def schedule_at(self, deadline, callback, *args):
+        handle = TimerHandle(deadline, 0, callback, args)
+        self.handles.append(handle)
+        return handle
+
+    def run_until(self, end):
+        while True:
+            due = [handle for handle in self.handles if not handle.cancelled and handle.deadline <= end]
+            if not due:
+                break
+            handle = min(due, key=lambda handle: handle.deadline)
+            self.handles.remove(handle)
+            self.now = max(self.now, handle.deadline)
+            handle.callback(*handle.args)
+        self.now = max(self.now, end)
+
+class Client:
+    """Applies score_update diffs the way static/js/scoreboard.js does"""
+
+    def __init__(self, feed):
+        self.feed = feed
+        self.teams = {}
+        self.version = None
+        self.snapshots = 0
+
+    def request_snapshot(self):
+        snapshot = self.feed.snapshot()
+        self.snapshots += 1
+        self.teams = {team['team_id']: dict(team) for team in snapshot['teams']}
+        self.version = snapshot['version']
+
+    def receive(self, diff):
+        if self.version is not None and diff['version'] <= self.version:
+            return
+        if self.version is None or diff['version'] != self.version + 1:
+            self.request_snapshot()
+            return
+        for change in diff['changed']:
+            self.teams.setdefault(change['team_id'], {}).update(change)
+        for team_id in diff['removed']:
+            del self.teams[team_id]
+        self.version = diff['version']
+
+    def board(self):
+        """(team_id, name, score, players) in the order the scoreboard shows them"""
+        teams = sorted(self.teams.values(), key=lambda team: (-team['score'], team['order']))
+        return [(team['team_id'], team['team_name'], team['score'], team['players']) for team in teams]
+
+def game_board(game):
+    return [(entry['team_id'], entry['team_name'], entry['score'], entry['players'])
+            for entry in game.get_scoreboard_entries()]
+
+def build():
+    scheduler = SimulatedScheduler()
+    game = TriviaGame(scheduler=scheduler)
+    game.clock = scheduler.clock
+    game.load_questions([Question(f'Question {i}?', 'multiple_choice', ['Left', 'Right'], 'Right')
+                         for i in range(3)])
+    diffs = []
+    game.score_feed = ScoreboardFeed(game, lambda event, data: diffs.append(data), scheduler=scheduler)
+    return scheduler, game, diffs
+
+def test_diffs():
+    print("\n=== Diffs from game changes ===")
+    scheduler, game, diffs = build()
+    first = game.create_team('Alpha', 'Ann')['team_id']
+    second = game.create_team('Beta', 'Bob')['team_id']
+    client = Client(game.score_feed)
+    client.request_snapshot()
+    assert client.board() == game_board(game), "Snapshot differs from the game"
+    assert [team['rank'] for team in game.score_feed.snapshot()['teams']] == [1, 2], "Snapshot without ranks"
+    print("✓ Snapshot holds every team with its rank")
+
+    third = game.create_team('Gamma', 'Gus')['team_id']
+    scheduler.run_until(scheduler.now + 1)
+    assert diffs[-1]['changed'] == [dict(game.get_scoreboard_entries([third])[0])], f"Wrong diff: {diffs[-1]}"
+    client.receive(diffs[-1])
+    assert client.board() == game_board(game), "New team not applied"
+    print("✓ A new team goes out in full")
+
+    game.start_game()
+    scheduler.run_until(scheduler.now + 1)
+    sent = len(diffs)
+    game.submit_answer(second, 'Right')
+    game.submit_answer(third, 'Right')
+    scheduler.run_until(scheduler.now + 0.1)
+    assert len(diffs) == sent + 1, "Answers in one interval not coalesced into one diff"
+    changed = {change['team_id']: change for change in diffs[-1]['changed']}
+    assert set(changed) == {second, third}, f"Wrong teams in the diff: {diffs[-1]}"
+    assert all(set(change) == {'team_id', 'rank', 'score'} for change in changed.values()), \
+        f"Unchanged fields sent: {diffs[-1]}"
+    assert (changed[second]['rank'], changed[third]['rank']) == (1, 2), f"Wrong ranks: {diffs[-1]}"
+    client.receive(diffs[-1])
+    assert client.board() == game_board(game), "Score change not applied"
+    print("✓ Score changes coalesce into one diff of the changed fields and ranks")
+
+    game.delete_team(first)
+    scheduler.run_until(scheduler.now + 1)
+    assert diffs[-1]['removed'] == [first] and diffs[-1]['changed'] == [], f"Wrong diff: {diffs[-1]}"
+    client.receive(diffs[-1])
+    assert client.board() == game_board(game), "Removal not applied"
+    print("✓ A removed team goes out as its id")
+
+    game.stop_game()
+    game.start_game()
+    game.next_question()
+    sent = len(diffs)
+    game.submit_answer(third, 'Right')
+    scheduler.run_until(scheduler.now + 1)
+    assert len(diffs) == sent + 1 and diffs[-1]['changed'][0]['team_id'] == third, \
+        "No diff after the game was stopped and started"
+    print("✓ The feed carries on after the game is stopped and started again")
+
+def test_skipped_version():
+    print("\n=== Client that missed a diff ===")
+    scheduler, game, diffs = build()
+    team_ids = [game.create_team(f'Team {i}', f'Player {i}')['team_id'] for i in range(4)]
+    client = Client(game.score_feed)
+    client.request_snapshot()
+    game.start_game()
+    game.submit_answer(team_ids[2], 'Right')
+    scheduler.run_until(scheduler.now + 1)
+    game.join_team(team_ids[0], 'Late')
+    scheduler.run_until(scheduler.now + 1)
+    assert len(diffs) >= 2, "Expected two diffs"
+    client.receive(diffs[-1])  # diffs[-2] never arrived
+    assert client.snapshots == 2, "Gap in versions did not ask for a snapshot"
+    assert client.version == game.score_feed.version and client.board() == game_board(game), \
+        "Snapshot after the gap differs from the game"
+    client.receive(diffs[-2])
+    assert client.board() == game_board(game), "Late old diff applied over the snapshot"
+    print("✓ A version gap is filled by a snapshot; older diffs are then ignored")
+
+def test_flush_cost():
+    print("\n=== Flushes look at the marked teams only ===")
+    scheduler, game, diffs = build()
+    team_ids = [game.create_team(f'Team {i}', f'Player {i}')['team_id'] for i in range(200)]
+    scheduler.run_until(scheduler.now + 1)
+    looked_at = []
+    entries = game.get_scoreboard_entries
+
+    def counting_entries(team_ids=None):
+        result = entries(team_ids)
+        looked_at.append(len(result))
+        return result
+
+    game.get_scoreboard_entries = counting_entries
+    game.start_game()
+    game.submit_answer(team_ids[150], 'Right')
+    game.update_team_name(team_ids[7], 'Renamed')
+    scheduler.run_until(scheduler.now + 1)
+    assert looked_at == [2], f"Flush compared {looked_at} teams"
+    assert {change['team_id'] for change in diffs[-1]['changed']} == {team_ids[150], team_ids[7]}, \
+        f"Wrong diff: {diffs[-1]}"
+    print("✓ Two changed teams out of 200: two entries compared")
+
+if __name__ == '__main__':
+    try:
+        test_diffs()
+        test_skipped_version()
+        test_flush_cost()
+        print("\n✅ All score feed tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test that each JSON backend, RawJSON payloads and Socket.IO packets decode to what the standard library encodes
+Runs in-process against serializer.py, a bare Flask app and python-socketio packets; no server needed.
+"""
+
+import importlib.util
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+from flask.json.provider import DefaultJSONProvider
+from socketio import packet
+
+import fanout
+import serializer
+from models import TriviaGame, Question
+
+SERIALIZER_PY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'serializer.py')
+PAYLOADS = [
+    {'question_text': 'Café «crème»? 🍰', 'options': ['a"b', 'back\\slash', 'tab\there', 'line\nbreak', ' ', '']},
+    {'ints': [0, -1, 2 ** 53 + 1, 2 ** 63 - 1, -2 ** 63], 'floats': [0.1, 1e20, -2.5e-8, 1 / 3, 0.0],
+     'flags': [True, False, None]},
+    {1: 'int key', 'nested': {'empty': {}, 'lists': [[], [{}], [[1, 'two']]]}},
+    [], 'plain string', 42,
+]
+
+def backend(name):
+    """A fresh copy of serializer.py with TRIVIA_JSON=name"""
+    previous = os.environ.get('TRIVIA_JSON')
+    os.environ['TRIVIA_JSON'] = name
+    try:
+        spec = importlib.util.spec_from_file_location(f'serializer_{name}', SERIALIZER_PY)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        if previous is None:
+            del os.environ['TRIVIA_JSON']
+        else:
+            os.environ['TRIVIA_JSON'] = previous
+
+def backends():
+    names = ['json'] + (['orjson'] if serializer.orjson is not None else [])
+    if len(names) == 1:
+        print("✓ orjson is not installed; only the standard library backend is checked")
+    return [(name, backend(name)) for name in names]
+
+def stdlib(obj):
+    """obj after a round trip through the standard library"""
+    return json.loads(json.dumps(obj))
+
+def test_round_trip():
+    print("\n=== Encoding and decoding ===")
+    for name, module in backends():
+        for obj in PAYLOADS:
+            expected = stdlib(obj)
+            assert json.loads(module.dumpb(obj)) == expected, f"{name}: dumpb({obj!r:.40}) decodes differently"
+            assert json.loads(module.dumps(obj)) == expected, f"{name}: dumps({obj!r:.40}) decodes differently"
+            assert module.loads(json.dumps(obj)) == expected, f"{name}: loads differs from json.loads"
+            assert module.RawJSON(module.dumpb(obj)).decode() == expected, f"{name}: RawJSON does not round trip"
+        print(f"✓ {name}: dumpb/dumps/loads and RawJSON agree with the standard library")
+
+def test_extend():
+    print("\n=== Extending encoded objects ===")
+    for name, module in backends():
+        raw = module.RawJSON(module.dumpb(PAYLOADS[0]))
+        fields = {'question_number': 3, 'timer': {'deadline': 1700000060000}, 'note': 'ünïcode'}
+        extended = module.extend(raw, fields)
+        assert json.loads(extended.data) == stdlib({**fields, **PAYLOADS[0]}), f"{name}: extend() differs"
+        assert list(json.loads(extended.data)) == list(fields) + list(PAYLOADS[0]), f"{name}: wrong key order"
+        assert module.extend(raw, {}) is raw, f"{name}: no fields should return the payload itself"
+        assert json.loads(module.extend(module.RawJSON(b'{}'), fields).data) == stdlib(fields), f"{name}: empty"
+        print(f"✓ {name}: extend() equals merging the dicts before encoding")
+
+    game = TriviaGame()
+    question = Question('Pick the planet', 'multiple_choice', ['Mars', 'Moon'], 'Mars', category='Space')
+    game.load_questions([question])
+    payload = game.get_current_question(already_answered=False)
+    assert isinstance(payload, serializer.RawJSON) and question.public_json() is question.public_json()
+    expected = {'question_number': 1, 'total_questions': 1, 'game_started': False, 'game_paused': False,
+                'already_answered': False, **question.to_dict()}
+    assert payload.decode() == expected, f"Question payload {payload.decode()} differs from {expected}"
+    assert 'correct_answer' not in payload.decode(), "Answer leaked into the payload"
+    print("✓ A question's encoded payload decodes to to_dict() plus the per-game fields")
+
+def test_flask_responses():
+    print("\n=== Flask responses ===")
+    when = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+    reference = Flask('reference')
+    with reference.app_context():
+        expected_date = json.loads(DefaultJSONProvider(reference).dumps({'when': when}))
+    for name, module in backends():
+        flask_app = Flask(f'serializer_{name}')
+        flask_app.json = module.JSONProvider(flask_app)
+        raw = module.RawJSON(module.dumpb(PAYLOADS[0]))
+        with flask_app.app_context():
+            response = jsonify(raw)
+            assert response.data == raw.data and response.mimetype == 'application/json', f"{name}: RawJSON re-encoded"
+            for obj in PAYLOADS:
+                assert json.loads(jsonify(obj).data) == stdlib(obj), f"{name}: jsonify({obj!r:.40}) differs"
+            assert json.loads(jsonify({'when': when}).data) == expected_date, f"{name}: dates differ from Flask's"
+            assert json.loads(flask_app.json.dumps(PAYLOADS[1], indent=2)) == stdlib(PAYLOADS[1]), f"{name}: indent"
+        print(f"✓ {name}: jsonify sends RawJSON bytes as they are and encodes the rest like Flask")
+
+def test_socket_packets():
+    print("\n=== Socket.IO packets ===")
+    for name, module in backends():
+        class Packet(packet.Packet):
+            json = module
+
+        for obj in PAYLOADS:
+            encoded = Packet(packet.EVENT, data=['new_question', obj]).encode()
+            assert packet.Packet(encoded_packet=encoded).data == ['new_question', stdlib(obj)], f"{name}: packet differs"
+            decoded = Packet(encoded_packet=packet.Packet(packet.EVENT, data=['new_question', obj]).encode()).data
+            assert decoded == ['new_question', stdlib(obj)], f"{name}: decoded packet differs"
+            for namespace in ('/', '/game'):
+                raw = packet.Packet(encoded_packet=fanout.raw_event_packet(
+                    'new_question', module.RawJSON(module.dumpb(obj)), namespace))
+                built = packet.Packet(encoded_packet=packet.Packet(
+                    packet.EVENT, namespace=namespace, data=['new_question', obj]).encode())
+                assert (raw.packet_type, raw.namespace, raw.data) == (built.packet_type, built.namespace, built.data), \
+                    f"{name}: raw packet in {namespace} differs"
+        print(f"✓ {name}: packets, and packets built around RawJSON, decode like the standard library's")
+
+if __name__ == '__main__':
+    try:
+        test_round_trip()
+        test_extend()
+        test_flask_responses()
+        test_socket_packets()
+        print("\n✅ All serializer tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
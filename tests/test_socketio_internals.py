@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test the adapter around the Socket.IO internals the traffic replay uses
+Runs in-process against app.py's Socket.IO server and test clients; no server needed.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as trivia_app
+import socketio_internals
+from fanout import emit_to_room
+from game_registry import DEFAULT_GAME_CODE
+
+def test_version_check():
+    print("\n=== Version check ===")
+    socketio_internals.check()
+    print("✓ Installed versions match requirements.txt")
+
+    installed = socketio_internals.version
+    socketio_internals.version = lambda package: '6.0.0' if package == 'python-socketio' else installed(package)
+    socketio_internals._checked = False
+    try:
+        socketio_internals.check()
+        raise AssertionError("Unpinned python-socketio accepted")
+    except RuntimeError as e:
+        assert 'python-socketio' in str(e) and '5.8.x' in str(e) and '6.0.0' in str(e), f"Unclear error: {e}"
+    finally:
+        socketio_internals.version = installed
+        socketio_internals._checked = False
+    try:
+        socketio_internals.engineio_handler(trivia_app.socketio.server.eio, 'no_such_event')
+        raise AssertionError("Missing handler returned")
+    except RuntimeError as e:
+        assert 'no_such_event' in str(e), f"Unclear error: {e}"
+    print("✓ Another version or a missing internal stops with an error naming it")
+
+def test_test_clients():
+    print("\n=== Test clients ===")
+    server = trivia_app.socketio.server
+    room = trivia_app.game_room(DEFAULT_GAME_CODE)
+    socketio_internals.deliver_to_test_clients(server)
+    clients = [trivia_app.socketio.test_client(trivia_app.app) for _ in range(3)]
+    emit_to_room(server, 'score_update', {'version': 1, 'changed': [], 'removed': []}, room)
+    for client in clients:
+        received = [message for message in client.get_received() if message['name'] == 'score_update']
+        assert [message['args'][0]['version'] for message in received] == [1], f"Wrong packets: {received}"
+    print("✓ Room emits that skip the packet queue reach every test client once")
+
+    socketio_internals.drop_test_client(server, clients[0])
+    assert clients[0].eio_sid not in clients[0].clients, "Dropped client still registered"
+    participants = {eio_sid for _, eio_sid in server.manager.get_participants('/', room)}
+    assert clients[0].eio_sid not in participants, "Dropped client still in the game room"
+    assert {client.eio_sid for client in clients[1:]} <= participants, "Other clients left the room"
+    emit_to_room(server, 'score_update', {'version': 2, 'changed': [], 'removed': []}, room)
+    assert [message['args'][0]['version'] for message in clients[1].get_received()] == [2], "Room emit lost"
+    print("✓ A dropped client leaves its rooms without disturbing the others")
+    for client in clients[1:]:
+        client.disconnect()
+
+if __name__ == '__main__':
+    try:
+        test_version_check()
+        test_test_clients()
+        print("\n✅ All Socket.IO internals tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test that the SQLite game store follows team membership changes
+Runs in-process against TriviaGame and SQLiteStorage; no server needed.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import TriviaGame
+from storage import SQLiteStorage
+
+def test_move_player():
+    print("\n=== Admin moves a player to another team ===")
+    with tempfile.TemporaryDirectory() as directory:
+        storage = SQLiteStorage(os.path.join(directory, 'games.db'))
+        game = TriviaGame()
+        game.game_code = 'STORE1'
+        game_id = storage.open_game(game.game_code)
+        game.storage = storage
+
+        old_team = game.create_team('Old Team', 'Mover')['team_id']
+        new_team = game.create_team('New Team', 'Stayer')['team_id']
+        assert game.add_player_to_team(new_team, 'Mover')['success'], "Move failed"
+        storage.flush()
+
+        history = storage.player_history('Mover')
+        assert [row['team_id'] for row in history] == [new_team], f"Stale membership: {history}"
+        print("✓ Player is only listed in the new team")
+
+        results = {row['team_id']: row for row in storage.game_results(game_id)}
+        assert results[old_team]['removed_at'] is not None, "Emptied team not marked removed"
+        assert results[new_team]['removed_at'] is None, "New team marked removed"
+        print("✓ Team emptied by the move is marked removed")
+        storage.close()
+
+if __name__ == '__main__':
+    try:
+        test_move_player()
+        print("\n✅ All storage tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test timer deadlines: the server's timer payload, clock_sync, and the client countdown from a synced clock offset
+Runs in-process against TriviaGame and app.py's Socket.IO server; no server needed. The
+client countdown runs static/js/clock.js under node, and is skipped if node is not installed.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as trivia_app
+from models import TriviaGame, Question
+
+CLOCK_JS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'js', 'clock.js')
+WALL_START = 1_700_000_000.0  # Server wall clock when the question starts, in seconds
+MONOTONIC_START = 500.0
+# Milliseconds into the question, around whole seconds and bonus tier ends
+CHECKPOINTS = [0, 1, 999, 1000, 1001, 9999, 10000, 10001, 35500, 49999, 50000, 59999, 60000, 61000]
+
+class Clock:
+    def __init__(self):
+        self.now = MONOTONIC_START
+
+    def __call__(self):
+        return self.now
+
+def build():
+    """A started game whose wall clock reads WALL_START when its monotonic clock reads MONOTONIC_START"""
+    game = TriviaGame()
+    game.clock = Clock()
+    game.wall_clock = lambda: WALL_START + (game.clock.now - MONOTONIC_START)
+    game.load_questions([Question('Pick the planet', 'multiple_choice', ['Mars', 'Moon'], 'Mars')])
+    game.create_team('Alpha', 'Ann')
+    game.start_game()
+    return game
+
+def expected_at(game, elapsed_ms):
+    """Seconds left and bonus points on offer elapsed_ms into the question, as the server scores them"""
+    game.clock.now = MONOTONIC_START + elapsed_ms / 1000
+    elapsed = game.clock() - game.question_start_time
+    return {'timeRemaining': game.get_time_remaining(), 'bonusPoints': game.get_bonus_points(elapsed)}
+
+def run_clock_js(harness):
+    with open(CLOCK_JS) as f:
+        source = f.read()
+    result = subprocess.run(['node', '-e', source + '\n' + harness], capture_output=True, text=True, timeout=30)
+    assert result.returncode == 0, f"node failed: {result.stderr}"
+    return json.loads(result.stdout)
+
+def test_timer_state():
+    print("\n=== Timer payload ===")
+    game = build()
+    timer = game.get_timer_state()
+    assert timer['deadline'] == round((WALL_START + 60) * 1000), f"Deadline {timer['deadline']} is not 60s after the start"
+    assert timer['server_time'] == round(WALL_START * 1000), "server_time is not the wall clock"
+    ends = [tier['ends_at'] for tier in timer['bonus_schedule']]
+    assert ends == [round((WALL_START + seconds) * 1000) for seconds in range(10, 70, 10)], f"Tier ends {ends}"
+    assert [tier['bonus_points'] for tier in timer['bonus_schedule']] == [6, 5, 4, 3, 2, 1], "Wrong tier bonuses"
+    print("✓ Deadline and bonus tier ends are wall-clock milliseconds from the question start")
+
+    game.clock.now += 12.25
+    later = game.get_timer_state()
+    assert later['deadline'] == timer['deadline'], "Deadline moved while the timer ran"
+    assert later['server_time'] == timer['server_time'] + 12250, "server_time did not follow the clock"
+    assert (later['time_remaining'], later['bonus_points']) == (48, 5), f"Wrong countdown: {later}"
+    game.pause_game()
+    assert game.get_timer_state() is None, "Paused game still has a running timer"
+    game.clock.now += 30
+    game.resume_game()
+    resumed = game.get_timer_state()
+    assert resumed['deadline'] == timer['deadline'], "Resume moved the deadline"
+    assert resumed['server_time'] == later['server_time'] + 30000, "server_time did not follow the clock"
+    print("✓ The deadline holds while the timer runs, and a resumed timer keeps it")
+
+def test_clock_sync_event():
+    print("\n=== clock_sync ===")
+    client = trivia_app.socketio.test_client(trivia_app.app)
+    before = time.time() * 1000
+    reply = client.emit('clock_sync', 12345, callback=True)
+    after = time.time() * 1000
+    assert reply['client_time'] == 12345, f"Client time not echoed: {reply}"
+    assert before - 1 <= reply['server_time'] <= after + 1, f"server_time {reply['server_time']} is not now"
+    client.disconnect()
+    print("✓ clock_sync echoes the client's send time with the server's time in milliseconds")
+
+def test_client_countdown():
+    print("\n=== Client countdown from a synced clock offset ===")
+    if shutil.which('node') is None:
+        print("✓ Skipped: node is not installed")
+        return
+    game = build()
+    timer = game.get_timer_state()
+    offset = -7250  # Server clock minus the client's, in ms
+    # Round trips of the three handshake samples; the 80 ms one gives the estimate
+    harness = f"""
+        const input = {json.dumps({'timer': timer, 'offset': offset, 'round_trips': [300, 80, 200],
+                                   'checkpoints': CHECKPOINTS})};
+        let clientNow = input.timer.server_time - input.offset;
+        Date.now = () => clientNow;
+        const socket = {{
+            handlers: {{}},
+            on(event, handler) {{ this.handlers[event] = handler; }},
+            emit(event, sentAt, ack) {{
+                const roundTrip = input.round_trips.shift();
+                clientNow += roundTrip;
+                ack({{client_time: sentAt, server_time: sentAt + input.offset + roundTrip / 2}});
+            }}
+        }};
+        noteServerTime(input.timer.server_time - 40);  // A payload that spent 40 ms in flight
+        const early = clockOffset;
+        startClockSync(socket);
+        socket.handlers.connect();
+        const synced = clockOffset;
+        noteServerTime(input.timer.server_time);  // Later payloads do not override the handshake
+        const states = input.checkpoints.map(elapsed => {{
+            clientNow = input.timer.server_time + elapsed - input.offset;
+            return timerStateAt(input.timer, serverNow());
+        }});
+        console.log(JSON.stringify({{early: early, synced: synced, final: clockOffset, states: states}}));
+    """
+    result = run_clock_js(harness)
+    assert result['early'] == offset - 40, f"Offset from a payload {result['early']}, expected {offset - 40}"
+    assert result['synced'] == offset and result['final'] == offset, f"Handshake offset {result['synced']}"
+    print("✓ The handshake finds the offset from the shortest round trip; a payload only stands in before it")
+
+    for elapsed, state in zip(CHECKPOINTS, result['states']):
+        expected = expected_at(game, elapsed)
+        assert state == expected, f"{elapsed} ms in: client shows {state}, server scores {expected}"
+    print(f"✓ With the offset applied, a client {-offset} ms behind counts down with the server's seconds and bonus tiers")
+
+if __name__ == '__main__':
+    try:
+        test_timer_state()
+        test_clock_sync_event()
+        test_client_countdown()
+        print("\n✅ All timer sync tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test that timers on the shared timer wheel fire on time and can be cancelled
+Runs in-process against TimerWheel and TriviaGame; no server needed.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import TriviaGame, Question
+from scheduler import TimerWheel
+
+SPEED = 100  # The game timer test runs a 60 s question in about 0.6 s
+
+class FastClock:
+    """Monotonic clock running SPEED times faster than real time"""
+
+    def __init__(self):
+        self.start = time.monotonic()
+
+    def __call__(self):
+        return (time.monotonic() - self.start) * SPEED
+
+def test_firing_order():
+    print("\n=== Timers fire in deadline order, never early ===")
+    wheel = TimerWheel(tick_interval=0.005, slots=8)
+    fired = []
+    done = threading.Event()
+    start = wheel.clock()
+
+    def record(name, deadline):
+        fired.append((name, wheel.clock() >= deadline))
+        if len(fired) == 4:
+            done.set()
+
+    # 0.2 s is 40 ticks, more than the 8 slots, so that timer laps the wheel several times
+    for name, delay in [('c', 0.2), ('a', 0.02), ('b', 0.05), ('now', 0)]:
+        wheel.schedule_at(start + delay, record, name, start + delay)
+    assert done.wait(2), f"Timers did not fire: {fired}"
+    wheel.stop()
+    assert [name for name, _ in fired] == ['now', 'a', 'b', 'c'], f"Wrong order: {fired}"
+    assert all(on_time for _, on_time in fired), f"Timer fired early: {fired}"
+    print("✓ Timers fired in order, none before its deadline")
+
+def test_cancel():
+    print("\n=== Cancelled timers do not fire ===")
+    wheel = TimerWheel(tick_interval=0.005)
+    fired = []
+    cancelled = wheel.schedule(0.03, fired.append, 'cancelled')
+    wheel.schedule(0.06, fired.append, 'kept')
+    cancelled.cancel()
+    time.sleep(0.2)
+    assert fired == ['kept'], f"Wrong timers fired: {fired}"
+    assert wheel.pending == 0, f"Handles left on the wheel: {wheel.pending}"
+
+    wheel.schedule(0.03, fired.append, 'after stop')
+    wheel.stop()
+    time.sleep(0.1)
+    assert fired == ['kept'], f"Timer fired after stop: {fired}"
+    print("✓ Cancelled and stopped timers never run")
+
+def test_question_timer():
+    print("\n=== Question timer ticks at bonus tiers and expires ===")
+    clock = FastClock()
+    wheel = TimerWheel(tick_interval=0.02 * SPEED, clock=clock, time_scale=SPEED)
+    game = TriviaGame(scheduler=wheel)
+    game.clock = clock
+    game.load_questions([Question('Timed', 'multiple_choice', ['a', 'b'], 'a')])
+    tiers = []
+    expired = threading.Event()
+    game.bonus_tier_callbacks.append(tiers.append)
+    game.timer_expired_callbacks.append(expired.set)
+
+    game.start_game()
+    assert expired.wait(5), "Timer did not expire"
+    assert tiers == [6, 5, 4, 3, 2, 1, 0], f"Wrong bonus tiers: {tiers}"
+    assert game.get_time_remaining() == 0, "Time left after expiry"
+    print("✓ One tick per bonus tier, then expiry")
+
+    tiers.clear()
+    expired.clear()
+    game.set_question(0)
+    game.pause_question_timer()
+    time.sleep(0.8)
+    assert not expired.is_set(), "Paused timer expired"
+    game.stop_game()
+    wheel.stop()
+    print("✓ Pausing cancels the pending ticks")
+
+if __name__ == '__main__':
+    try:
+        test_firing_order()
+        test_cancel()
+        test_question_timer()
+        print("\n✅ All timer wheel tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+Recording and replay of real traffic
+Usage: TRIVIA_RECORD=night.jsonl.gz python app.py
+       python traffic.py night.jsonl.gz [--speed 10] [--workers 16] [--json report.json]
+
+With TRIVIA_RECORD set, app.py installs a TrafficRecorder: every HTTP
+request (except the Socket.IO transport's own) and every packet a client
+sends over Socket.IO is written to that file as one compact JSON line with
+its time since the server started. A name ending in .gz is compressed.
+Clients are told apart by their session cookie, so a player's requests and
+socket connections stay together; the log records what clients sent, not
+what the server answered beyond the status code and the identifiers (team
+ids, game codes) it handed out. Admin logins are recorded with their
+password, so treat a recording like the server's secret key.
+
+Replaying runs the log against app.py in this process through Flask and
+Flask-SocketIO test clients, one set per recorded client, at the recorded
+pace divided by --speed. Game timers, the scoreboard feed and every other
+scheduled job run on a virtual clock that advances --speed times faster
+than real time, so a question still closes after 60 of the recording's
+seconds. Identifiers the replayed server hands out replace the recorded
+ones in later requests; a request that refers to one waits until the
+replay has handed it out, as the client had to wait for the response that
+told it. Requests of one client run in order on one worker; different
+clients run concurrently. The report gives throughput, how far behind
+schedule requests started (the replay falls behind once the server cannot
+keep up), latency percentiles per endpoint and socket event, and how many
+of each event the replayed sockets received. The app is
+configured by the same TRIVIA_* variables as when it recorded; use the same
+question bank, or answers will not grade the same way.
+"""
+
+import argparse
+import atexit
+import gzip
+import io
+import itertools
+import json
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+from socketio import packet
+from werkzeug.http import parse_cookie
+
+import socketio_internals
+
+LOG_FORMAT = 1
+FLUSH_INTERVAL = 1.0  # Seconds between flushes of the recording, so a killed server loses little
+# Identifiers the server hands out in JSON responses, which later requests refer to
+ISSUED_ID = re.compile(r'"(id|[a-z_]*_id|game_code)":\s*"([^"]+)"')
+TOKEN = re.compile(r'[A-Za-z0-9_-]+')
+ID_WAIT = 10  # Seconds a replayed request waits for the identifier it refers to to be handed out
+
+def issued_ids(body):
+    """[key, value] of every identifier in a JSON response body, in order"""
+    return [list(match) for match in ISSUED_ID.findall(body.decode('utf-8', 'replace'))]
+
+def percentiles(values, points=(50, 95, 99)):
+    """{point: value} by nearest rank, or None for no values"""
+    if not values:
+        return {point: None for point in points}
+    ordered = sorted(values)
+    return {point: ordered[max(0, -(-point * len(ordered) // 100) - 1)] for point in points}
+
+def open_log(path, mode):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+class TrafficRecorder:
+    """
+    WSGI middleware and Engine.IO hooks writing a server's incoming traffic to a log.
+
+    Each line after the header is a JSON array starting with the seconds since
+    install() and a kind (ids are the issued_ids() of the response, when it
+    handed out one not seen before):
+      [t, 'h', client, method, path, content_type, body, conditional, status, ms, ids]
+      [t, 'c', connection, client]             Engine.IO connection opened
+      [t, 'e', connection, type, data, ack_id] Socket.IO packet from the client
+      [t, 'd', connection]                     Engine.IO connection closed
+    """
+
+    def __init__(self, path, metadata=None):
+        self.path = path
+        self.metadata = metadata or {}
+        self.file = None  # Opened on the first entry, so the reloader's parent process leaves no empty log
+        self.lock = threading.Lock()
+        self.start = None
+        self.started_at = None
+        self.last_flush = 0
+        self.cookie_name = 'session'
+        self.packet_class = None
+        self.clients = {}  # Session cookie value -> client number
+        self.issued = set()  # Identifiers already recorded in a response
+        self.connections = {}  # Engine.IO sid -> connection number
+        self.client_numbers = itertools.count(1)
+        self.connection_numbers = itertools.count(1)
+
+    def install(self, app, socketio):
+        """Record app's HTTP requests and socketio's packets from now on"""
+        self.start = time.monotonic()
+        self.started_at = time.time()
+        self.cookie_name = app.config['SESSION_COOKIE_NAME']
+        self.packet_class = socketio.server.packet_class
+        app.wsgi_app = self.wrap(app.wsgi_app)
+        eio = socketio.server.eio
+        for event, record in (('connect', self._record_connect), ('message', self._record_message),
+                              ('disconnect', self._record_disconnect)):
+            eio.on(event, self._recording(record, socketio_internals.engineio_handler(eio, event)))
+        atexit.register(self.close)
+
+    def wrap(self, wsgi_app):
+        """WSGI middleware around wsgi_app that records each request"""
+        def middleware(environ, start_response):
+            path = environ.get('PATH_INFO', '')
+            if path.startswith('/socket.io'):
+                return wsgi_app(environ, start_response)  # Packets are recorded by the Engine.IO handlers
+            t = self._now()
+            length = int(environ.get('CONTENT_LENGTH') or 0)
+            body = environ['wsgi.input'].read(length) if length else b''
+            environ['wsgi.input'] = io.BytesIO(body)
+            client = self._client(environ.get('HTTP_COOKIE'))
+            status = []
+            is_json = []
+
+            def recording_start_response(status_line, headers, exc_info=None):
+                status.append(int(status_line.split(' ', 1)[0]))
+                for name, value in headers:
+                    if name.lower() == 'content-type' and value.startswith('application/json'):
+                        is_json.append(True)
+                    if name.lower() == 'set-cookie' and value.startswith(self.cookie_name + '='):
+                        # The client's next requests carry the new cookie
+                        cookie = value[len(self.cookie_name) + 1:].split(';', 1)[0]
+                        with self.lock:
+                            self.clients[cookie] = client
+                return start_response(status_line, headers, exc_info)
+
+            started = time.perf_counter()
+            response = wsgi_app(environ, recording_start_response)
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+            ids = None
+            if is_json:
+                chunks = list(response)
+                if hasattr(response, 'close'):
+                    response.close()
+                response = chunks
+                ids = issued_ids(b''.join(chunks))
+                with self.lock:
+                    if ids and not self.issued.issuperset(value for _, value in ids):
+                        self.issued.update(value for _, value in ids)
+                    else:
+                        ids = None
+            if environ.get('QUERY_STRING'):
+                path += '?' + environ['QUERY_STRING']
+            self._write([t, 'h', client, environ['REQUEST_METHOD'], path, environ.get('CONTENT_TYPE') or None,
+                         body.decode('utf-8', 'replace'), int('HTTP_IF_NONE_MATCH' in environ),
+                         status[0] if status else None, elapsed_ms, ids])
+            return response
+        return middleware
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    def _now(self):
+        return round(time.monotonic() - self.start, 4)
+
+    def _client(self, cookie_header):
+        cookie = parse_cookie(cookie_header or '').get(self.cookie_name)
+        with self.lock:
+            client = self.clients.get(cookie) if cookie else None
+            if client is None:
+                client = next(self.client_numbers)
+                if cookie:
+                    self.clients[cookie] = client
+            return client
+
+    def _recording(self, record, handler):
+        def recording_handler(*args):
+            try:
+                record(*args)
+            except Exception as e:
+                print(f"Traffic recording error: {e}")
+            return handler(*args)
+        return recording_handler
+
+    def _record_connect(self, eio_sid, environ, *args):
+        t = self._now()
+        client = self._client(environ.get('HTTP_COOKIE'))
+        with self.lock:
+            connection = self.connections[eio_sid] = next(self.connection_numbers)
+        self._write([t, 'c', connection, client])
+
+    def _record_message(self, eio_sid, data, *args):
+        t = self._now()
+        connection = self.connections.get(eio_sid)
+        if connection is None:
+            return
+        pkt = self.packet_class(encoded_packet=data)
+        if pkt.attachment_count:
+            return  # Binary attachments are not recorded; the game's clients never send any
+        self._write([t, 'e', connection, pkt.packet_type, pkt.data, pkt.id])
+
+    def _record_disconnect(self, eio_sid, *args):
+        t = self._now()
+        with self.lock:
+            connection = self.connections.pop(eio_sid, None)
+        if connection is not None:
+            self._write([t, 'd', connection])
+
+    def _write(self, entry):
+        line = json.dumps(entry, separators=(',', ':'), ensure_ascii=False) + '\n'
+        with self.lock:
+            if self.file is None:
+                self.file = open_log(self.path, 'w')
+                self.file.write(json.dumps(dict(self.metadata, format=LOG_FORMAT, started_at=self.started_at)) + '\n')
+            self.file.write(line)
+            now = time.monotonic()
+            if now - self.last_flush >= FLUSH_INTERVAL:
+                self.file.flush()
+                self.last_flush = now
+
+def read_traffic(path):
+    """The header and the entries of a recording, in time order; a line cut off by a crash is dropped"""
+    entries = []
+    with open_log(path, 'r') as f:
+        header = json.loads(f.readline() or '{}')
+        try:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    pass
+        except EOFError:
+            pass  # Compressed stream cut off
+    if header.get('format', LOG_FORMAT) != LOG_FORMAT:
+        raise ValueError(f"{path} is in recording format {header['format']}, this version reads {LOG_FORMAT}")
+    entries.sort(key=lambda entry: entry[0])
+    return header, entries
+
+class VirtualClock:
+    """A monotonic clock running speed times faster than real time from when it is created"""
+
+    def __init__(self, speed):
+        self.speed = speed
+        self.origin = time.monotonic()
+
+    def __call__(self):
+        return self.origin + (time.monotonic() - self.origin) * self.speed
+
+class ReplayClient:
+    """One recorded client: its HTTP cookies and the ETags it was sent"""
+
+    def __init__(self, http):
+        self.http = http
+        self.etags = {}  # Path -> ETag of the last response, sent back by conditional requests
+
+class DeliveryCounter:
+    """Takes a test client's place as its list of received events, counting them by name instead"""
+
+    def __init__(self, counts, lock):
+        self.counts = counts
+        self.lock = lock
+
+    def append(self, message):
+        with self.lock:
+            self.counts[message['name']] += 1
+
+class TrafficReplayer:
+    """Replays recorded entries against the app module's app and socketio"""
+
+    def __init__(self, trivia, entries, speed=1.0, workers=16):
+        self.trivia = trivia
+        self.entries = entries
+        self.speed = speed
+        self.urls = trivia.app.url_map.bind('localhost')
+        self.clients = {}  # Client number -> ReplayClient
+        self.connection_clients = {}  # Connection number -> client number
+        self.sockets = {}  # Connection number -> SocketIOTestClient
+        self.ids = {}  # Recorded identifier -> the one the replayed server handed out instead
+        self.id_issued = threading.Condition()
+        # Recorded identifier -> time of the response that handed it out
+        self.issued_at = {}
+        for entry in entries:
+            if entry[1] == 'h' and entry[10]:
+                for _, value in entry[10]:
+                    self.issued_at.setdefault(value, entry[0])
+        self.queues = [queue.Queue() for _ in range(workers)]
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)  # Label -> seconds
+        self.lags = []  # Seconds each entry started behind its scheduled time
+        self.errors = Counter()
+        self.status_changed = Counter()
+        self.delivered = Counter()  # Event name -> deliveries to replayed sockets
+        # emit_to_room writes straight to Engine.IO, past the test clients' packet queues; without
+        # this the replay would not receive new_question or score_update
+        socketio_internals.deliver_to_test_clients(trivia.socketio.server)
+
+    def run(self):
+        """Replay every entry; returns the wall-clock seconds it took"""
+        threads = [threading.Thread(target=self._work, args=(work,), daemon=True) for work in self.queues]
+        for thread in threads:
+            thread.start()
+        start = time.perf_counter()
+        for entry in self.entries:
+            due = start + entry[0] / self.speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            if entry[1] == 'h':
+                client = entry[2]
+            elif entry[1] == 'c':
+                client = self.connection_clients[entry[2]] = entry[3]
+            else:
+                client = self.connection_clients.get(entry[2], 0)
+            self.queues[client % len(self.queues)].put((due, entry))
+        for work in self.queues:
+            work.put(None)
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start
+
+    def _work(self, work):
+        while True:
+            item = work.get()
+            if item is None:
+                return
+            due, entry = item
+            entry = self._resolve(entry)
+            started = time.perf_counter()
+            try:
+                label = self._replay(entry)
+            except Exception as e:
+                label = None
+                self.errors[f'{entry[1]}: {type(e).__name__}: {e}'] += 1
+            elapsed = time.perf_counter() - started
+            with self.lock:
+                self.lags.append(max(0.0, started - due))
+                if label:
+                    self.latencies[label].append(elapsed)
+
+    def _client(self, number):
+        client = self.clients.get(number)
+        if client is None:
+            client = self.clients[number] = ReplayClient(self.trivia.app.test_client())
+        return client
+
+    def _replay(self, entry):
+        """Send one entry; returns the label its latency is reported under"""
+        if entry[1] == 'h':
+            _, _, number, method, path, content_type, body, conditional, status, _, ids = entry
+            client = self._client(number)
+            headers = {}
+            if conditional and path in client.etags:
+                headers['If-None-Match'] = client.etags[path]
+            data = b''
+            try:
+                response = client.http.open(path, method=method, data=body.encode(), content_type=content_type,
+                                            headers=headers)
+                data = response.get_data()
+                response.close()
+            finally:
+                if ids:
+                    self._issue(ids, issued_ids(data))
+            if response.headers.get('ETag'):
+                client.etags[path] = response.headers['ETag']
+            label = self._endpoint(method, path)
+            if status is not None and response.status_code != status:
+                self.status_changed[f'{label}: {status} -> {response.status_code}'] += 1
+            return label
+        if entry[1] == 'c':
+            self._client(entry[3])  # The socket itself connects with the Socket.IO CONNECT packet
+            return None
+        if entry[1] == 'd':
+            socket = self.sockets.pop(entry[2], None)
+            if socket is not None:
+                socketio_internals.drop_test_client(self.trivia.socketio.server, socket)
+            return 'socket close'
+
+        _, _, connection, packet_type, data, ack_id = entry
+        if packet_type == packet.CONNECT:
+            client = self._client(self.connection_clients[connection])
+            socket = self.trivia.socketio.test_client(self.trivia.app, flask_test_client=client.http, auth=data)
+            socket.queue = DeliveryCounter(self.delivered, self.lock)
+            self.sockets[connection] = socket
+            return 'socket connect'
+        socket = self.sockets.get(connection)
+        if socket is None or not socket.is_connected():
+            raise RuntimeError('socket not connected')
+        if packet_type == packet.DISCONNECT:
+            socket.disconnect()
+            return 'socket disconnect'
+        if packet_type == packet.EVENT:
+            socket.emit(data[0], *data[1:], callback=ack_id is not None)
+            return f'socket {data[0]}'
+        return None  # Acknowledgements of server events carry no work
+
+    def _resolve(self, entry):
+        """entry with the recorded identifiers it refers to replaced by the replayed server's"""
+        if not self.issued_at:
+            return entry
+        if entry[1] == 'h':
+            return entry[:4] + [self._translate(entry[4], entry[0]), entry[5],
+                                self._translate(entry[6], entry[0])] + entry[7:]
+        if entry[1] == 'e' and entry[3] == packet.EVENT:
+            return entry[:4] + [json.loads(self._translate(json.dumps(entry[4]), entry[0]))] + entry[5:]
+        return entry
+
+    def _translate(self, text, t):
+        def replace(match):
+            token = match.group()
+            if self.issued_at.get(token, t) >= t:
+                return token  # Not an identifier the client had been told about yet
+            with self.id_issued:
+                self.id_issued.wait_for(lambda: token in self.ids, ID_WAIT)
+            return self.ids.get(token, token)
+        return TOKEN.sub(replace, text) if text else text
+
+    def _issue(self, ids, replayed):
+        """Map recorded identifiers to the replayed ones; any without a counterpart stay as recorded"""
+        with self.id_issued:
+            for index, (key, recorded) in enumerate(ids):
+                if index < len(replayed) and replayed[index][0] == key:
+                    self.ids.setdefault(recorded, replayed[index][1])
+                else:
+                    self.ids.setdefault(recorded, recorded)
+            self.id_issued.notify_all()
+
+    def _endpoint(self, method, path):
+        try:
+            endpoint, _ = self.urls.match(path.split('?', 1)[0], method)
+            return f'{method} {endpoint}'
+        except Exception:
+            return f'{method} {path.split("?", 1)[0]}'
+
+def build_report(path, header, replayer, replay_time):
+    def milliseconds(values):
+        return {f'p{point}': None if value is None else round(value * 1000, 2)
+                for point, value in percentiles(values).items()}
+
+    recorded_time = replayer.entries[-1][0] if replayer.entries else 0
+    return {
+        'recording': path, 'questions': header.get('questions'), 'speed': replayer.speed,
+        'entries': len(replayer.entries), 'recorded_s': round(recorded_time, 2), 'replay_s': round(replay_time, 2),
+        'achieved_speed': round(recorded_time / replay_time, 2) if replay_time else None,
+        'per_second': round(len(replayer.entries) / replay_time, 1) if replay_time else None,
+        'lag_ms': dict(milliseconds(replayer.lags), max=round(max(replayer.lags, default=0) * 1000, 2)),
+        'latency_ms': {label: dict(milliseconds(values), count=len(values))
+                       for label, values in sorted(replayer.latencies.items(), key=lambda item: -len(item[1]))},
+        'errors': dict(replayer.errors.most_common()),
+        'status_changed': dict(replayer.status_changed.most_common()),
+        'delivered': dict(replayer.delivered.most_common()),
+    }
+
+def print_report(report):
+    print(f"\n{report['entries']} entries over {report['recorded_s']} s recorded, replayed at {report['speed']}x "
+          f"in {report['replay_s']} s ({report['achieved_speed']}x achieved, {report['per_second']} entries/s)")
+    lag = report['lag_ms']
+    print(f"behind schedule: p50 {lag['p50']} ms, p95 {lag['p95']} ms, p99 {lag['p99']} ms, max {lag['max']} ms")
+    print(f"{'':>36} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for label, latency in report['latency_ms'].items():
+        print(f"{label:>36} {latency['count']:>7} " +
+              ' '.join(f"{'-' if latency[point] is None else latency[point]:>8}" for point in ('p50', 'p95', 'p99')))
+    if report['delivered']:
+        print('events delivered: ' + ', '.join(f'{name} {count}' for name, count in report['delivered'].items()))
+    for title, counts in (('errors', report['errors']), ('status differs from the recording', report['status_changed'])):
+        if counts:
+            print(f"{title}:")
+            for label, count in counts.items():
+                print(f"  {count:>6}  {label}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded game night against the app in this process')
+    parser.add_argument('recording', help='log written by the server with TRIVIA_RECORD set')
+    parser.add_argument('--speed', type=float, default=1.0, help='replay this many times faster (1 to 100)')
+    parser.add_argument('--workers', type=int, default=16, help='threads replaying clients concurrently')
+    parser.add_argument('--json', help='also write the report here as JSON')
+    options = parser.parse_args()
+    if not 1 <= options.speed <= 100:
+        parser.error('--speed must be between 1 and 100')
+
+    # Green threads (TRIVIA_ASYNC_MODE) and the virtual clock must be in place before app.py builds its games
+    import async_mode
+    async_mode.monkey_patch()
+    from scheduler import TimerWheel, set_scheduler
+    clock = VirtualClock(options.speed)
+    # Ticks stay 20 ms apart in real time
+    set_scheduler(TimerWheel(tick_interval=0.02 * options.speed, clock=clock, time_scale=options.speed))
+    os.environ.pop('TRIVIA_RECORD', None)  # Do not record the replay
+    import app as trivia
+
+    game_factory = trivia.registry.game_factory
+
+    def virtual_game(game_code):
+        room_game = game_factory(game_code)
+        room_game.clock = clock
+        return room_game
+
+    trivia.registry.game_factory = virtual_game
+    trivia.registry.clock = clock
+    header, entries = read_traffic(options.recording)
+    if header.get('questions') and header['questions'] != trivia.QUESTIONS_SOURCE:
+        print(f"Recorded with questions from {header['questions']}, replaying with {trivia.QUESTIONS_SOURCE}")
+    trivia.load_question_bank()
+
+    replayer = TrafficReplayer(trivia, entries, options.speed, options.workers)
+    report = build_report(options.recording, header, replayer, replayer.run())
+    print_report(report)
+    if options.json:
+        with open(options.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
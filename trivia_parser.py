@@ -1,10 +1,161 @@
 import re
 from models import Question
 
+# Precompiled patterns for iter_parse. Lines are matched with their newline still
+# attached, so a separator's trailing \s+ behaves as it does on the whole file.
+SEPARATOR_PATTERNS = [
+    re.compile(r'##\s+'),  # ## headers
+    re.compile(r'###\s+'),  # ### headers
+    re.compile(r'\d+\.\s+'),  # Numbered questions like "1. "
+    re.compile(r'\*\*Question\s+\d+\*\*'),  # **Question 1**
+]
+HEADER_ONLY = re.compile(r'#[^#]')
+# Whole-file split patterns used by parse(), in order of preference
+SPLIT_PATTERNS = [
+    re.compile(r'\n##\s+'),  # ## headers
+    re.compile(r'\n###\s+'),  # ### headers
+    re.compile(r'\n\d+\.\s+'),  # Numbered questions like "1. "
+    re.compile(r'\n\*\*Question\s+\d+\*\*'),  # **Question 1**
+]
+HEADER_BLOCK = re.compile(r'^#[^#].*$')
+QUESTION_PREFIX = re.compile(r'Question\s+\d+[:\.]?\s*', re.IGNORECASE)
+NUMBER_PREFIX = re.compile(r'\d+\.\s*')
+OPTION = re.compile(r'[A-Da-d]\)\s+(.+)|[1-4]\)\s+(.+)|-\s*[A-Da-d][\)\.]?\s+(.+)|\*\s*[A-Da-d][\)\.]?\s+(.+)')
+CORRECT_MARKER = re.compile(r'\*\*.*?\*\*|_.*?_|\(correct\)|\[correct\]|✓', re.IGNORECASE)
+METADATA_LINE = re.compile(r'(Category|Difficulty|Tags?):\s*(.+)', re.IGNORECASE)
+ANSWER_LINE = re.compile(r'Answer:\s*(.+)|Correct\s*Answer:\s*(.+)|Solution:\s*(.+)'
+                         r'|\*\*Answer\*\*:\s*(.+)|\*\*Answer:\s*(.+?)\*\*$', re.IGNORECASE)
+
+def _unbold(text):
+    """Strip **bold** wrapping the whole text"""
+    if len(text) >= 4 and text.startswith('**') and text.endswith('**'):
+        return text[2:-2]
+    return text
+
 class TriviaParser:
     def __init__(self, file_path):
         self.file_path = file_path
     
+    def iter_parse(self):
+        """Yield Questions from a single line-by-line pass over the file.
+        
+        Memory stays constant however large the bank is: only the current
+        question's lines are held. Each Question records its source file and
+        the line its text starts on, plus any "Category:", "Difficulty:" and
+        "Tags:" lines in its block. Questions are split on the same markers as
+        parse(), but the first marker style seen is used for the rest of the
+        file (parse() picks the style by searching the whole file first), so
+        the two only differ on files that mix marker styles.
+        """
+        separator = None
+        seen_separator = False
+        absorbing = False  # A separator's trailing whitespace runs on past its own line
+        lines = []  # Stripped, non-empty lines of the current block
+        block_line = 0  # Line number of the current block's first line
+        
+        with open(self.file_path, 'r', encoding='utf-8') as file:
+            numbered = enumerate(file, 1)
+            # The first line can never be a separator (they follow a newline)
+            for line_number, raw_line in numbered:
+                line = raw_line.strip()
+                if line:
+                    lines.append(line)
+                    block_line = line_number
+                break
+            
+            for line_number, raw_line in numbered:
+                if absorbing:
+                    # Blank lines belong to the previous separator, and the next line
+                    # is not at the start of a line as far as the markers are concerned
+                    line = raw_line.strip()
+                    if line:
+                        absorbing = False
+                        lines.append(line)
+                        block_line = line_number
+                    continue
+                
+                if separator is None:
+                    for pattern in SEPARATOR_PATTERNS:
+                        match = pattern.match(raw_line)
+                        if match:
+                            separator = pattern
+                            break
+                else:
+                    match = separator.match(raw_line)
+                
+                if match:
+                    seen_separator = True
+                    question = self._parse_block_lines(lines, skip_header=True)
+                    if question:
+                        question.source_file = self.file_path
+                        question.source_line = block_line
+                        yield question
+                    lines = []
+                    line = raw_line[match.end():].strip()
+                    absorbing = match.end() == len(raw_line) and raw_line.endswith('\n')
+                else:
+                    line = raw_line.strip()
+                if line:
+                    if not lines:
+                        block_line = line_number
+                    lines.append(line)
+        
+        # Without any separator the whole file is a single question
+        question = self._parse_block_lines(lines, skip_header=seen_separator)
+        if question:
+            question.source_file = self.file_path
+            question.source_line = block_line
+            yield question
+    
+    def _parse_block_lines(self, lines, skip_header):
+        """Build a Question from a block's lines in one pass (same rules as _parse_question_block)"""
+        if not lines:
+            return None
+        question_text = lines[0]
+        if skip_header and len(lines) == 1 and HEADER_ONLY.match(question_text):
+            return None  # Header-only block like "# Sample Trivia Questions"
+        
+        options = []
+        marked_answer = None
+        metadata = {}
+        answer_line = ANSWER_LINE.match(question_text)
+        for line in lines[1:]:
+            option = OPTION.match(line)
+            if option:
+                option_text = _unbold(option.group(option.lastindex).strip())
+                options.append(option_text)
+                if CORRECT_MARKER.search(line):
+                    marked_answer = option_text
+            else:
+                field = METADATA_LINE.match(line)
+                if field:
+                    metadata[field.group(1).lower().rstrip('s')] = field.group(2).strip()
+                    continue
+            if answer_line is None:
+                answer_line = ANSWER_LINE.match(line)
+        
+        # Same clean-up as _parse_question_block, with slicing instead of re.sub
+        prefix = QUESTION_PREFIX.match(question_text)
+        if prefix:
+            question_text = question_text[prefix.end():]
+        prefix = NUMBER_PREFIX.match(question_text)
+        if prefix:
+            question_text = question_text[prefix.end():]
+        if question_text.startswith('**'):
+            end = question_text.find('**', 2)
+            if end != -1:
+                question_text = question_text[2:end] + question_text[end + 2:]
+        
+        correct_answer = marked_answer
+        if correct_answer is None and answer_line is not None:
+            correct_answer = _unbold(answer_line.group(answer_line.lastindex).strip())
+        
+        tags = metadata.get('tag')
+        tags = tuple(tag.strip() for tag in tags.split(',') if tag.strip()) if tags else ()
+        question_type = 'multiple_choice' if options else 'fill_in_blank'
+        return Question(question_text, question_type, options, correct_answer,
+                        category=metadata.get('category'), difficulty=metadata.get('difficulty'), tags=tags)
+    
     def parse(self):
         questions = []
         
@@ -22,28 +173,57 @@ class TriviaParser:
         return questions
     
     def _split_questions(self, content):
+        return [block for _, block in self._split_question_spans(content, self._split_pattern(content))]
+    
+    def _split_question_spans(self, content, pattern):
+        """Split content on pattern into stripped question blocks, each with the offset where its text starts"""
+        if pattern is None:
+            # If no clear separators found, treat as single question
+            stripped = content.strip()
+            return [(len(content) - len(content.lstrip()), stripped)] if stripped else []
+        return self._split_spans(content, pattern)
+    
+    def _split_pattern(self, content):
+        """The first of SPLIT_PATTERNS found in content, or None"""
         # Split by markdown headers (## or ###) or numbered questions
-        patterns = [
-            r'\n##\s+',  # ## headers
-            r'\n###\s+', # ### headers  
-            r'\n\d+\.\s+', # Numbered questions like "1. "
-            r'\n\*\*Question\s+\d+\*\*', # **Question 1**
-        ]
+        for pattern in SPLIT_PATTERNS:
+            if pattern.search(content):
+                return pattern
+        return None
+    
+    def _stream_split_pattern(self, content):
+        """The split pattern iter_parse settles on: the marker style that appears first, or None"""
+        found = None
+        first = len(content)
+        for pattern in SPLIT_PATTERNS:
+            match = pattern.search(content)
+            if match and match.start() < first:
+                found = pattern
+                first = match.start()
+        return found
+    
+    def _split_spans(self, content, pattern, start=0, end=None):
+        """Split content[start:end] on pattern into (offset, stripped block) pairs"""
+        end = len(content) if end is None else end
+        pieces = []
+        for match in pattern.finditer(content, start, end):
+            pieces.append((start, content[start:match.start()]))
+            start = match.end()
+        pieces.append((start, content[start:end]))
         
-        for pattern in patterns:
-            if re.search(pattern, content):
-                blocks = re.split(pattern, content)
-                # Remove empty blocks and header-only blocks, return non-empty ones
-                filtered_blocks = []
-                for block in blocks:
-                    block = block.strip()
-                    # Skip empty blocks and header-only blocks (like "# Sample Trivia Questions")
-                    if block and not re.match(r'^#[^#].*$', block):
-                        filtered_blocks.append(block)
-                return filtered_blocks
-        
-        # If no clear separators found, treat as single question
-        return [content.strip()] if content.strip() else []
+        # Remove empty blocks and header-only blocks, return non-empty ones
+        filtered_blocks = []
+        for offset, block in pieces:
+            stripped = block.strip()
+            # Skip empty blocks and header-only blocks (like "# Sample Trivia Questions")
+            if stripped and not HEADER_BLOCK.match(stripped):
+                filtered_blocks.append((offset + len(block) - len(block.lstrip()), stripped))
+        return filtered_blocks
+    
+    def parse_block(self, block):
+        """Parse one stripped block from _split_question_spans (used by hot reload, which splits like iter_parse)"""
+        lines = [line.strip() for line in block.split('\n') if line.strip()]
+        return self._parse_block_lines(lines, skip_header=False)
     
     def _parse_question_block(self, block):
         lines = [line.strip() for line in block.split('\n') if line.strip()]